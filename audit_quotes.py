@@ -40,6 +40,16 @@ def load_db():
 
 
 def load_used_ids():
+    """Drawn quote IDs from the deck in quotes.db, or the legacy config list before migration."""
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT quote_id FROM quote_deck WHERE drawn = 1 ORDER BY quote_id")
+        return [row[0] for row in cursor.fetchall()]
+    except sqlite3.OperationalError:
+        pass
+    finally:
+        conn.close()
     if not os.path.exists(CONFIG_PATH):
         return []
     with open(CONFIG_PATH, "r") as f:
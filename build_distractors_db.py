@@ -6,7 +6,11 @@ database for the Daily Quote cog.
 Run once to populate, re-run anytime to refresh:
     python3 build_distractors_db.py
 
-Requires TMDB_API_KEY in the .env file.
+After changing quotes.db, refresh only the precomputed candidate index
+(no TMDb calls):
+    python3 build_distractors_db.py --index-only
+
+Requires TMDB_API_KEY in the .env file (not needed for --index-only).
 """
 
 import json
@@ -20,6 +24,7 @@ import urllib.error
 
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(SCRIPT_DIR, "distractors.db")
+QUOTES_DB_PATH = os.path.join(SCRIPT_DIR, "quotes.db")
 ENV_PATH = os.path.join(SCRIPT_DIR, ".env")
 BASE_URL = "https://api.themoviedb.org/3"
 
@@ -42,6 +47,9 @@ GENRE_MAP = {
 # Skip these — not useful as trivia distractors
 SKIP_GENRE_IDS = {99, 10763, 10764, 10766, 10767, 10770}
 
+# Ranked candidates kept per tier in the precomputed index; the cog samples 3
+CANDIDATES_PER_TIER = 25
+
 
 # ---------------------------------------------------------------------------
 # Helpers
@@ -61,9 +69,6 @@ def get_api_key():
 
 
 API_KEY = get_api_key()
-if not API_KEY:
-    print("ERROR: TMDB_API_KEY not found. Add it to .env or export it.")
-    sys.exit(1)
 
 
 def tmdb_get(path, params=None):
@@ -206,6 +211,113 @@ def create_db(conn):
     conn.commit()
 
 
+# ---------------------------------------------------------------------------
+# Precomputed candidate index
+# ---------------------------------------------------------------------------
+
+def _ranked(rows, exclude, limit=CANDIDATES_PER_TIER):
+    """First `limit` distinct names from `rows` that aren't in `exclude` (which is extended in place)."""
+    out = []
+    for name in rows:
+        if name in exclude:
+            continue
+        exclude.add(name)
+        out.append(name)
+        if len(out) >= limit:
+            break
+    return out
+
+
+def build_candidate_index(conn):
+    """Precompute tiered distractor candidates for every (title, character) in quotes.db.
+
+    Mirrors the tiers the Daily Quote cog used to query at runtime:
+      movie:     same type + primary genre + decade -> same type + genre -> same type
+      character: same title by cast order -> same type + genre leads -> same type leads
+    Each tier is ranked by TMDb vote count and franchise siblings (other titles
+    the same character is quoted from) are already excluded, so the cog only
+    does a keyed lookup and samples from the best tier that has candidates.
+    """
+    if not os.path.exists(QUOTES_DB_PATH):
+        print(f"  No quotes database at {QUOTES_DB_PATH} — skipping candidate index\n")
+        return 0
+
+    qconn = sqlite3.connect(QUOTES_DB_PATH)
+    qcur = qconn.cursor()
+    columns = {row[1] for row in qcur.execute("PRAGMA table_info(quotes)")}
+    year_col = "year" if "year" in columns else "NULL"
+    tv_col = "is_tv" if "is_tv" in columns else "0"
+    qcur.execute(f"""
+        SELECT movie_title, character, MIN(genre), MIN({year_col}), MAX({tv_col})
+        FROM quotes GROUP BY movie_title, character
+    """)
+    pairs = qcur.fetchall()
+    qcur.execute("SELECT DISTINCT character, movie_title FROM quotes")
+    titles_by_character = {}
+    for character, title in qcur.fetchall():
+        titles_by_character.setdefault(character, set()).add(title)
+    qconn.close()
+
+    c = conn.cursor()
+    c.execute("DROP TABLE IF EXISTS distractor_candidates")
+    c.execute("""
+        CREATE TABLE distractor_candidates (
+            question_type TEXT NOT NULL,
+            movie_title TEXT NOT NULL,
+            character TEXT NOT NULL,
+            tiers TEXT NOT NULL,
+            PRIMARY KEY (question_type, movie_title, character)
+        )
+    """)
+
+    c.execute("SELECT title, year, LOWER(COALESCE(genres, '')), is_tv FROM titles ORDER BY vote_count DESC")
+    titles = c.fetchall()
+    c.execute("""
+        SELECT ch.character_name, ch.cast_order, t.title, LOWER(COALESCE(t.genres, '')), t.is_tv
+        FROM characters ch JOIN titles t ON ch.title_id = t.id
+        ORDER BY t.vote_count DESC, ch.cast_order
+    """)
+    characters = c.fetchall()
+    cast_by_title = {}
+    for name, order, title, _, _ in sorted(characters, key=lambda r: r[1] if r[1] is not None else 999):
+        cast_by_title.setdefault(title, []).append(name)
+
+    rows = []
+    for movie_title, character, genre, year, is_tv in pairs:
+        is_tv = is_tv or 0
+        primary_genre = (genre or "").split(",")[0].strip().lower()
+
+        # Movie question: franchise siblings are excluded up front
+        exclude = {movie_title} | titles_by_character.get(character, set())
+        same_type = [t for t in titles if t[3] == is_tv]
+        same_genre = [t for t in same_type if primary_genre in t[2]]
+        movie_tiers = []
+        if year:
+            decade_start = (year // 10) * 10
+            movie_tiers.append(_ranked(
+                (t[0] for t in same_genre if t[1] is not None and decade_start <= t[1] <= decade_start + 9), exclude
+            ))
+        movie_tiers.append(_ranked((t[0] for t in same_genre), exclude))
+        movie_tiers.append(_ranked((t[0] for t in same_type), exclude))
+
+        # Character question: same-title cast stays in cast order
+        exclude = {character}
+        char_tiers = [
+            _ranked(cast_by_title.get(movie_title, []), exclude),
+            _ranked((ch[0] for ch in characters
+                     if ch[4] == is_tv and primary_genre in ch[3] and ch[1] is not None and ch[1] <= 2), exclude),
+            _ranked((ch[0] for ch in characters
+                     if ch[4] == is_tv and ch[1] is not None and ch[1] <= 3), exclude),
+        ]
+
+        rows.append(("movie", movie_title, character, json.dumps(movie_tiers)))
+        rows.append(("character", movie_title, character, json.dumps(char_tiers)))
+
+    c.executemany("INSERT OR REPLACE INTO distractor_candidates VALUES (?, ?, ?, ?)", rows)
+    conn.commit()
+    return len(pairs)
+
+
 # ---------------------------------------------------------------------------
 # Main
 # ---------------------------------------------------------------------------
@@ -216,6 +328,20 @@ def main():
     print("=" * 60)
     print()
 
+    if "--index-only" in sys.argv[1:]:
+        if not os.path.exists(DB_PATH):
+            print(f"ERROR: {DB_PATH} not found. Run without --index-only first.")
+            sys.exit(1)
+        conn = sqlite3.connect(DB_PATH)
+        n_pairs = build_candidate_index(conn)
+        conn.close()
+        print(f"  Indexed distractor candidates for {n_pairs:,} title/character pairs\n")
+        return
+
+    if not API_KEY:
+        print("ERROR: TMDB_API_KEY not found. Add it to .env or export it.")
+        sys.exit(1)
+
     # -- Fetch titles --
     print("  [1/3] Fetching titles from TMDb...\n")
     movies = fetch_titles("movie", pages=30, min_votes=500)
@@ -262,6 +388,9 @@ def main():
     conn.commit()
     print("\n")
 
+    # -- Candidate index --
+    n_pairs = build_candidate_index(conn)
+
     # -- Stats --
     print("  [3/3] Summary\n")
     cursor.execute("SELECT COUNT(*) FROM titles WHERE is_tv = 0")
@@ -275,6 +404,7 @@ def main():
     print(f"  Movies:            {n_movies:,}")
     print(f"  TV Shows:          {n_tv:,}")
     print(f"  Unique Characters: {n_chars:,}")
+    print(f"  Indexed Quotes:    {n_pairs:,} title/character pairs")
     print("=" * 60)
 
     print("\n  By Decade:")
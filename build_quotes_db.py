@@ -796,6 +796,28 @@ def create_db(conn):
     cursor.execute("CREATE INDEX idx_difficulty ON quotes(difficulty)")
     cursor.execute("CREATE INDEX idx_is_tv ON quotes(is_tv)")
     cursor.execute("CREATE INDEX idx_year ON quotes(year)")
+    # Shuffled draw order for the daily quote cog (see QUOTE_DECK_SCHEMA in cogs/daily_quote.py)
+    cursor.execute("DROP TABLE IF EXISTS quote_deck")
+    cursor.execute("""
+        CREATE TABLE quote_deck (
+            quote_id INTEGER PRIMARY KEY,
+            difficulty TEXT NOT NULL DEFAULT 'easy',
+            drawn INTEGER NOT NULL DEFAULT 0,
+            position INTEGER NOT NULL
+        )
+    """)
+    cursor.execute("CREATE INDEX idx_deck_draw ON quote_deck(drawn, difficulty, position)")
+    cursor.execute("CREATE INDEX idx_deck_order ON quote_deck(drawn, position)")
+    conn.commit()
+
+
+def deal_deck(conn):
+    """Give every quote a random position in the (freshly created) deck."""
+    cursor = conn.cursor()
+    cursor.execute(
+        "INSERT OR IGNORE INTO quote_deck (quote_id, difficulty, position) "
+        "SELECT id, difficulty, random() FROM quotes"
+    )
     conn.commit()
 
 
@@ -809,13 +831,33 @@ def backup_used_quotes(conn):
         return {}
 
 
-def reconcile_used_ids(conn, old_mapping):
-    """Map old used_quote_ids to new IDs after rebuild."""
+def load_config():
     if not os.path.exists(CONFIG_PATH):
-        return
+        return None
     with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-        config = json.load(f)
-    old_used = config.get("global_data", {}).get("used_quote_ids", [])
+        return json.load(f)
+
+
+def backup_used_ids(conn, config):
+    """Drawn IDs from the old quote deck, falling back to the legacy used_quote_ids config list."""
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT quote_id FROM quote_deck WHERE drawn = 1")
+        return [row[0] for row in cursor.fetchall()]
+    except Exception:
+        pass
+    if not config:
+        return []
+    return config.get("global_data", {}).get("used_quote_ids", [])
+
+
+def reconcile_used_ids(conn, old_mapping, old_used, config):
+    """Map old used IDs to new IDs after rebuild and mark them drawn in the new deck."""
+    if config and "used_quote_ids" in config.get("global_data", {}):
+        # The deck is now the source of truth; drop the legacy list so the cog doesn't re-import stale IDs
+        del config["global_data"]["used_quote_ids"]
+        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
+            json.dump(config, f, indent=4)
     if not old_used:
         return
 
@@ -839,10 +881,9 @@ def reconcile_used_ids(conn, old_mapping):
             print(f"  WARNING: Used quote (old ID {old_id}) not found in new DB — was it removed?")
             print(f"           Quote: \"{old_quote[:50]}...\" from \"{old_title}\"")
 
-    config["global_data"]["used_quote_ids"] = new_used
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(config, f, indent=4)
-    print(f"  Reconciled {len(new_used)}/{len(old_used)} used quote IDs in config")
+    cursor.executemany("UPDATE quote_deck SET drawn = 1 WHERE quote_id = ?", [(qid,) for qid in new_used])
+    conn.commit()
+    print(f"  Reconciled {len(new_used)}/{len(old_used)} used quote IDs in the quote deck")
 
 
 def main():
@@ -850,6 +891,8 @@ def main():
 
     # Back up existing data for ID reconciliation
     old_mapping = backup_used_quotes(conn)
+    config = load_config()
+    old_used = backup_used_ids(conn, config)
 
     create_db(conn)
     cursor = conn.cursor()
@@ -884,6 +927,7 @@ def main():
         diff_counts[difficulty] += 1
 
     conn.commit()
+    deal_deck(conn)
 
     # Stats
     cursor.execute("SELECT COUNT(*) FROM quotes")
@@ -923,7 +967,7 @@ def main():
     # Reconcile used IDs
     if old_mapping:
         print("  Reconciling used quote IDs...")
-        reconcile_used_ids(conn, old_mapping)
+        reconcile_used_ids(conn, old_mapping, old_used, config)
     else:
         print("  No old database found — skipping ID reconciliation")
 
@@ -936,6 +980,7 @@ def main():
 
     conn.close()
     print(f"\n  Database saved to: {DB_PATH}")
+    print("  Refresh distractor candidates with: python3 build_distractors_db.py --index-only")
 
 
 if __name__ == "__main__":
@@ -29,6 +29,19 @@ class CoreCog(commands.Cog):
             except Exception as e:
                 await ctx.send(f"❌ Failed to sync globally: {e}")
 
+    @commands.command()
+    @commands.is_owner()
+    async def renderstats(self, ctx: commands.Context):
+        """Shows queue depth and timings for the shared card renderer."""
+        stats = self.bot.render_service.stats()
+        queued = ", ".join(f"lane {lane}: {n}" for lane, n in sorted(stats['queued'].items())) or "none"
+        await ctx.send(
+            f"**Render service**\n"
+            f"Queued: {queued} | In flight: {stats['in_flight']} | Idle pages: {stats['idle_pages']}\n"
+            f"Renders: {stats['renders']} ({stats['failures']} failed) | "
+            f"Avg render: {stats['avg_render_ms']}ms | Avg wait: {stats['avg_wait_ms']}ms | Max wait: {stats['max_wait_ms']}ms"
+        )
+
 # This async function is required for the cog to be loaded
 async def setup(bot: commands.Bot):
     await bot.add_cog(CoreCog(bot))
@@ -31,82 +31,53 @@ class HenrikDevAPI:
 
     def __init__(self, bot):
         self.bot = bot
-        self._session: Optional['aiohttp.ClientSession'] = None
+        # Shared keep-alive pool; api.henrikdev.xyz is held to 25 req/min by its token bucket
+        self.http = bot.http_client
         self._semaphore = asyncio.Semaphore(25)  # Stay under 30 req/min limit
-        self._last_requests: List[float] = []
         self._last_transient_error_at: float = 0  # Epoch time of last 5xx — used to avoid burning retry budget
         # Get API key from environment
         self._api_key = os.getenv("HENRIK_API_KEY")
         if not self._api_key:
             logger.warning("HENRIK_API_KEY not set - Valorant stats fetching will not work")
 
-    async def _get_session(self):
-        """Get or create aiohttp session."""
-        if self._session is None or self._session.closed:
-            import aiohttp
-            self._session = aiohttp.ClientSession()
-        return self._session
-
-    async def _rate_limit(self):
-        """Enforce rate limiting."""
-        now = asyncio.get_event_loop().time()
-        # Remove requests older than 60 seconds
-        self._last_requests = [t for t in self._last_requests if now - t < 60]
-
-        if len(self._last_requests) >= 25:
-            # Wait until oldest request is 60s old
-            wait_time = 60 - (now - self._last_requests[0])
-            if wait_time > 0:
-                await asyncio.sleep(wait_time)
-
-        self._last_requests.append(now)
-
     async def _request(self, endpoint: str, _retry: bool = True) -> Optional[dict]:
         """Make a rate-limited request to the API. Retries once on 429/timeout."""
-        import aiohttp
         if not self._api_key:
             logger.warning("Skipping HenrikDev API request - no API key configured")
             return None
         async with self._semaphore:
-            await self._rate_limit()
-            session = await self._get_session()
             headers = {"Authorization": self._api_key}
             url = f"{self.BASE_URL}{endpoint}"
             try:
-                timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout
-                async with session.get(url, headers=headers, timeout=timeout) as resp:
-                    if resp.status == 200:
-                        return await resp.json()
-                    elif resp.status == 401:
-                        logger.warning(f"HenrikDev API unauthorized for {endpoint} - check HENRIK_API_KEY")
-                        return None
-                    elif resp.status == 429:
-                        logger.warning(f"HenrikDev API rate limited on {endpoint}")
-                        if _retry:
-                            logger.info(f"HenrikDev API: Retrying {endpoint} after 10s rate limit delay")
-                            await asyncio.sleep(10)
-                            return await self._request(endpoint, _retry=False)
-                        return None
-                    elif resp.status >= 500:
-                        # Server-side error — transient, retry once with backoff
-                        logger.warning(f"HenrikDev API server error on {endpoint}: HTTP {resp.status}")
-                        if _retry:
-                            logger.info(f"HenrikDev API: Retrying {endpoint} after 30s server error delay")
-                            await asyncio.sleep(30)
-                            return await self._request(endpoint, _retry=False)
-                        # Final failure — record timestamp so callers can detect API outage
-                        import time as _time
-                        self._last_transient_error_at = _time.monotonic()
-                        return None
-                    else:
-                        body = await resp.text()
-                        logger.warning(f"HenrikDev API error on {endpoint}: HTTP {resp.status} - {body[:200]}")
-                        return None
+                resp = await self.http.get(url, headers=headers, timeout=30)
+                if resp.status == 200:
+                    return resp.json()
+                elif resp.status == 401:
+                    logger.warning(f"HenrikDev API unauthorized for {endpoint} - check HENRIK_API_KEY")
+                    return None
+                elif resp.status == 429:
+                    logger.warning(f"HenrikDev API rate limited on {endpoint}")
+                    if _retry:
+                        logger.info(f"HenrikDev API: Retrying {endpoint} after 10s rate limit delay")
+                        await asyncio.sleep(10)
+                        return await self._request(endpoint, _retry=False)
+                    return None
+                elif resp.status >= 500:
+                    # Server-side error — transient, retry once with backoff
+                    logger.warning(f"HenrikDev API server error on {endpoint}: HTTP {resp.status}")
+                    if _retry:
+                        logger.info(f"HenrikDev API: Retrying {endpoint} after 30s server error delay")
+                        await asyncio.sleep(30)
+                        return await self._request(endpoint, _retry=False)
+                    # Final failure — record timestamp so callers can detect API outage
+                    import time as _time
+                    self._last_transient_error_at = _time.monotonic()
+                    return None
+                else:
+                    logger.warning(f"HenrikDev API error on {endpoint}: HTTP {resp.status} - {resp.text()[:200]}")
+                    return None
             except asyncio.TimeoutError:
                 logger.warning(f"HenrikDev API request timed out (30s): {endpoint}")
-                if self._session and not self._session.closed:
-                    await self._session.close()
-                self._session = None
                 if _retry:
                     logger.info(f"HenrikDev API: Retrying {endpoint} after timeout")
                     await asyncio.sleep(5)
@@ -114,9 +85,6 @@ class HenrikDevAPI:
                 return None
             except Exception as e:
                 logger.error(f"HenrikDev API request failed for {endpoint}: {e}")
-                if self._session and not self._session.closed:
-                    await self._session.close()
-                self._session = None
                 return None
 
     async def get_custom_match_history(self, name: str, tag: str, region: str = 'na') -> Optional[List[dict]]:
@@ -558,9 +526,7 @@ class HenrikDevAPI:
         return matches
 
     async def close(self):
-        """Close the aiohttp session."""
-        if self._session and not self._session.closed:
-            await self._session.close()
+        """Nothing to release; the shared HTTP client is closed with the bot."""
 
 
 # =============================================================================
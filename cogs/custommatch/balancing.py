@@ -0,0 +1,202 @@
+from typing import Optional, List, Dict, Tuple, Iterable, FrozenSet, NamedTuple
+import logging
+
+logger = logging.getLogger('custommatch')
+
+
+# =============================================================================
+# EXACT MMR TEAM BALANCER
+# =============================================================================
+
+class SplitCandidate(NamedTuple):
+    """One red/blue assignment that survived the MMR tolerance window."""
+    mmr_diff: int
+    role_penalty: int
+    repeat_penalty: int
+    red: FrozenSet[int]
+
+
+def enumerate_balanced_splits(
+    pid_list: List[int],
+    mmr_map: Dict[int, int],
+    role_prefs: Dict[int, Tuple[str, Optional[str]]],
+    *,
+    tolerance: int,
+    separated_pairs: Iterable[Tuple[int, int]] = (),
+    prev_map: Optional[Dict[int, str]] = None,
+    shuffle_from: Optional[Dict[int, str]] = None,
+    min_swap_pct: float = 0.0,
+) -> List[SplitCandidate]:
+    """Return every even split whose MMR diff is within `tolerance` of the best.
+
+    Produces exactly the candidates the old brute-force loop over
+    itertools.combinations() kept for tier 1, but walks the splits with a
+    branch-and-bound search instead:
+
+      * Players are visited in descending MMR order and the first one is
+        pinned to one side, so each unordered split is visited once and
+        scored in both red/blue orientations at the leaf.
+      * At every node the smallest/largest reachable team sum is read off
+        prefix sums; subtrees that can't get within `tolerance` of the best
+        diff found so far are skipped.
+      * Role counts, secondary-role coverage, repeat and swap counters are
+        carried down the recursion, so a leaf costs O(#roles) rather than a
+        rescan of both rosters.
+
+    separated_pairs lists (a, b) players that must end up on opposite teams.
+    Pairs must not share players.  When shuffle_from is set, orientations
+    where fewer than min_swap_pct of players change teams are dropped (the
+    caller decides what to do if that leaves nothing).
+
+    role_penalty matches _role_diversity_penalty(red) + _role_diversity_penalty(blue),
+    and repeat_penalty counts players sitting on the same team as in prev_map.
+    """
+    n = len(pid_list)
+    if n < 2 or n % 2 != 0:
+        raise ValueError(f"enumerate_balanced_splits needs an even roster, got {n}")
+    team_size = n // 2
+
+    order = sorted(pid_list, key=lambda p: mmr_map[p], reverse=True)
+    mmrs = [mmr_map[p] for p in order]
+    total = sum(mmrs)
+    prefix = [0]
+    for m in mmrs:
+        prefix.append(prefix[-1] + m)
+
+    index = {p: i for i, p in enumerate(order)}
+    partner = [-1] * n
+    for a, b in separated_pairs:
+        ia, ib = index[a], index[b]
+        partner[ia] = ib
+        partner[ib] = ia
+
+    # Roles are mapped to small ints; -1 means 'fill' / no secondary
+    role_ids: Dict[object, int] = {}
+    primary: List[int] = []
+    for p in order:
+        prefs = role_prefs.get(p)
+        role = prefs[0] if prefs else 'fill'
+        primary.append(-1 if role == 'fill' else role_ids.setdefault(role, len(role_ids)))
+    secondary: List[int] = []
+    for p in order:
+        prefs = role_prefs.get(p)
+        sec = prefs[1] if prefs else None
+        secondary.append(role_ids.setdefault(sec, len(role_ids)) if sec and sec != 'fill' else -1)
+    n_roles = len(role_ids)
+    tot_primary = [0] * n_roles
+    tot_secondary = [0] * n_roles
+    for r in primary:
+        if r >= 0:
+            tot_primary[r] += 1
+    for r in secondary:
+        if r >= 0:
+            tot_secondary[r] += 1
+    side_primary = [0] * n_roles
+    side_secondary = [0] * n_roles
+
+    prev_map = prev_map or {}
+    was_red = [1 if prev_map.get(p) == 'red' else 0 for p in order]
+    was_blue = [1 if prev_map.get(p) == 'blue' else 0 for p in order]
+    tot_red, tot_blue = sum(was_red), sum(was_blue)
+
+    check_swap = bool(shuffle_from) and min_swap_pct > 0
+    forced_red = [1 if shuffle_from and shuffle_from.get(p) == 'red' else 0 for p in order]
+    tot_forced = sum(forced_red)
+
+    in_side = [False] * n
+    chosen: List[int] = []
+    best = [float('inf')]
+    found: List[SplitCandidate] = []
+
+    def role_penalty() -> int:
+        penalty = 0
+        for r in range(n_roles):
+            a = side_primary[r]
+            b = tot_primary[r] - a
+            if a > 2:
+                penalty += (a - 2) * (a - 2)
+            if b > 2:
+                penalty += (b - 2) * (b - 2)
+            if a == 0:
+                penalty += side_secondary[r]
+            if b == 0:
+                penalty += tot_secondary[r] - side_secondary[r]
+        return penalty
+
+    def leaf(i: int, s: int, c_red: int, c_blue: int, c_forced: int):
+        # Everyone from i onward lands on the other side; check their pairs
+        for k in range(i, n):
+            j = partner[k]
+            if j != -1 and not in_side[j]:
+                return
+        diff = abs(2 * s - total)
+        if diff > best[0] + tolerance:
+            return
+
+        orientations = []
+        # Side as red
+        if not check_swap or (team_size + tot_forced - 2 * c_forced) / n >= min_swap_pct:
+            orientations.append((True, c_red + (tot_blue - c_blue)))
+        # Side as blue
+        if not check_swap or (team_size - tot_forced + 2 * c_forced) / n >= min_swap_pct:
+            orientations.append((False, (tot_red - c_red) + c_blue))
+        if not orientations:
+            return
+
+        if diff < best[0]:
+            best[0] = diff
+        pen = role_penalty()
+        side = frozenset(order[k] for k in chosen)
+        for side_is_red, repeat in orientations:
+            red = side if side_is_red else frozenset(p for p in order if p not in side)
+            found.append(SplitCandidate(diff, pen, repeat, red))
+
+    def visit(i: int, s: int, c_red: int, c_blue: int, c_forced: int):
+        need = team_size - len(chosen)
+        if need == 0:
+            leaf(i, s, c_red, c_blue, c_forced)
+            return
+        if need > n - i:
+            return
+
+        # Bound: best diff reachable by taking `need` more from order[i:]
+        hi = s + prefix[i + need] - prefix[i]
+        lo = s + prefix[n] - prefix[n - need]
+        if 2 * hi < total:
+            gap = total - 2 * hi
+        elif 2 * lo > total:
+            gap = 2 * lo - total
+        else:
+            gap = 0
+        if gap > best[0] + tolerance:
+            return
+
+        j = partner[i]
+        can_take = i == 0 or j == -1 or j > i or not in_side[j]
+        can_skip = i != 0 and (j == -1 or j > i or in_side[j])
+
+        if can_take:
+            in_side[i] = True
+            chosen.append(i)
+            r = primary[i]
+            if r >= 0:
+                side_primary[r] += 1
+            r2 = secondary[i]
+            if r2 >= 0:
+                side_secondary[r2] += 1
+            visit(i + 1, s + mmrs[i], c_red + was_red[i], c_blue + was_blue[i],
+                  c_forced + forced_red[i])
+            if r2 >= 0:
+                side_secondary[r2] -= 1
+            if r >= 0:
+                side_primary[r] -= 1
+            chosen.pop()
+            in_side[i] = False
+
+        if can_skip:
+            visit(i + 1, s, c_red, c_blue, c_forced)
+
+    visit(0, 0, 0, 0, 0)
+
+    cutoff = best[0] + tolerance
+    return [c for c in found if c.mmr_diff <= cutoff]
@@ -31,9 +31,11 @@ from .models import (
     safe_display_name, sanitize_for_codeblock,
     display_width, pad_to_width, truncate_to_width,
 )
+from .balancing import enumerate_balanced_splits
 from .database import DatabaseHelper, DB_PATH, init_db, migrate_db
 from .api_clients import HenrikDevAPI, MarvelRivalsAPI, RivalsVisionClient, RivalsScoreboardResult
 from .stats_generator import StatsCardGenerator, PLAYWRIGHT_AVAILABLE
+from utils.render_service import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
 from .views_settings import (
     BaseMatchView, ConfirmView, GameSelectDropdown, SettingsView,
     RivalsSettingsView, RivalsIGNResolverView, RivalsCorrectStatsModal,
@@ -144,7 +146,7 @@ class CustomMatch(commands.Cog):
         # Start periodic cleanup of expired pending uploads
         self.pending_upload_cleanup_task = asyncio.create_task(self._pending_upload_cleanup())
         # Initialize stats card generator
-        await self.stats_generator.initialize()
+        await self.stats_generator.initialize(self.bot.render_service)
         logger.info("CustomMatch cog loaded, database initialized.")
 
     async def restore_queues(self):
@@ -1718,12 +1720,13 @@ class CustomMatch(commands.Cog):
             all_pids = red_team + blue_team
             role_prefs = await DatabaseHelper.get_bulk_role_prefs(all_pids, game.game_id)
 
+        all_stats = await DatabaseHelper.get_bulk_player_stats(red_team + blue_team, game.game_id)
+
         # Build red team lines with MMR
         red_lines = []
         red_total_mmr = 0
         for pid in red_team:
-            stats = await DatabaseHelper.get_player_stats(pid, game.game_id)
-            mmr = stats.effective_mmr
+            mmr = all_stats[pid].effective_mmr
             red_total_mmr += mmr
             red_lines.append(self._build_mmr_log_line(
                 guild, pid, mmr, role_prefs, role_emojis, is_rivals
@@ -1733,8 +1736,7 @@ class CustomMatch(commands.Cog):
         blue_lines = []
         blue_total_mmr = 0
         for pid in blue_team:
-            stats = await DatabaseHelper.get_player_stats(pid, game.game_id)
-            mmr = stats.effective_mmr
+            mmr = all_stats[pid].effective_mmr
             blue_total_mmr += mmr
             blue_lines.append(self._build_mmr_log_line(
                 guild, pid, mmr, role_prefs, role_emojis, is_rivals
@@ -1861,7 +1863,9 @@ class CustomMatch(commands.Cog):
                 return
 
             players = await DatabaseHelper.get_match_players(match_id)
-            igns = await DatabaseHelper.get_match_igns(match_id)
+            igns = await DatabaseHelper.get_bulk_player_igns(
+                [p["player_id"] for p in players], game.game_id
+            )
             short_id = match.get("short_id") or str(match_id)
 
             red_players = [p for p in players if p["team"] == "red"]
@@ -2486,20 +2490,13 @@ class CustomMatch(commands.Cog):
                             except Exception as e:
                                 logger.warning(f"Failed to send MMR correction log: {e}")
 
-            # Batch all DB checks in a single connection
-            async with DatabaseHelper._get_db() as db:
-                # Check blacklist
-                async with db.execute(
-                    "SELECT blacklisted_until FROM players WHERE player_id = ?",
-                    (user.id,)
-                ) as cursor:
-                    row = await cursor.fetchone()
-                    if row and row[0]:
-                        until = datetime.fromisoformat(row[0])
-                        if until > datetime.now(timezone.utc):
-                            await interaction.followup.send("You are blacklisted from queues.", ephemeral=True)
-                            return
+            # Blacklist is served from DatabaseHelper's read cache
+            if await DatabaseHelper.is_blacklisted(user.id):
+                await interaction.followup.send("You are blacklisted from queues.", ephemeral=True)
+                return
 
+            # Batch the remaining DB checks in a single connection
+            async with DatabaseHelper._get_db() as db:
                 # Check suspension
                 async with db.execute(
                     """SELECT suspended_until, reason FROM suspensions
@@ -3459,8 +3456,8 @@ class CustomMatch(commands.Cog):
         force_shuffle_from: Optional[Dict[int, str]] = None,
         min_swap_pct: float = 0.0,
     ) -> Tuple[List[int], List[int]]:
-        """Balance teams by enumerating all splits and picking among the
-        best-balanced candidates with role-diversity + anti-repeat tiebreakers,
+        """Balance teams by searching all splits (see enumerate_balanced_splits)
+        and picking among the best-balanced candidates with role-diversity + anti-repeat tiebreakers,
         then randomizing within the remaining set so back-to-back queues of
         the same roster don't replay the identical match.
 
@@ -3479,11 +3476,9 @@ class CustomMatch(commands.Cog):
         For odd-sized or very small rosters, falls back to the legacy
         snake-draft balancer.
         """
-        # Get all player stats
-        players_with_mmr = []
-        for pid in player_ids:
-            stats = await DatabaseHelper.get_player_stats(pid, game_id)
-            players_with_mmr.append((pid, stats.effective_mmr))
+        # Get all player stats in one query
+        all_stats = await DatabaseHelper.get_bulk_player_stats(player_ids, game_id)
+        players_with_mmr = [(pid, all_stats[pid].effective_mmr) for pid in player_ids]
 
         n = len(players_with_mmr)
         if n < 2:
@@ -3496,7 +3491,6 @@ class CustomMatch(commands.Cog):
         if n % 2 != 0 or n < 4:
             return self._balance_teams_legacy(players_with_mmr, role_prefs)
 
-        team_size = n // 2
         pid_list = [pid for pid, _ in players_with_mmr]
         mmr_map = {pid: mmr for pid, mmr in players_with_mmr}
 
@@ -3521,37 +3515,26 @@ class CustomMatch(commands.Cog):
             and bottom2 != top1 and bottom2 != top2
         )
 
-        pid_set = set(pid_list)
-        candidates = []  # (mmr_diff, role_penalty, repeat_penalty, red_frozen)
-        for red_group in itertools.combinations(pid_list, team_size):
-            # Enforce top-2 separation: skip any split where both are on the same team
-            red_set_quick = set(red_group)
-            if top1 in red_set_quick and top2 in red_set_quick:
-                continue
-            if top1 not in red_set_quick and top2 not in red_set_quick:
-                continue
-            # Enforce bottom-2 separation
-            if apply_bottom_sep:
-                if bottom1 in red_set_quick and bottom2 in red_set_quick:
-                    continue
-                if bottom1 not in red_set_quick and bottom2 not in red_set_quick:
-                    continue
-            blue_list = [p for p in pid_list if p not in red_set_quick]
-            red_sum = sum(mmr_map[p] for p in red_group)
-            blue_sum = sum(mmr_map[p] for p in blue_list)
-            mmr_diff = abs(red_sum - blue_sum)
-            role_penalty = (
-                _role_diversity_penalty(list(red_group), role_prefs)
-                + _role_diversity_penalty(blue_list, role_prefs)
+        separated = [(top1, top2)]
+        if apply_bottom_sep:
+            separated.append((bottom1, bottom2))
+
+        def _enumerate(pairs, shuffle_from):
+            return enumerate_balanced_splits(
+                pid_list, mmr_map, role_prefs,
+                tolerance=SHAKE_MMR_TOLERANCE,
+                separated_pairs=pairs,
+                prev_map=prev_map,
+                shuffle_from=shuffle_from,
+                min_swap_pct=min_swap_pct,
             )
-            if prev_map:
-                repeat_penalty = (
-                    sum(1 for p in red_group if prev_map.get(p) == 'red')
-                    + sum(1 for p in blue_list if prev_map.get(p) == 'blue')
-                )
-            else:
-                repeat_penalty = 0
-            candidates.append((mmr_diff, role_penalty, repeat_penalty, frozenset(red_group)))
+
+        # Candidates are (mmr_diff, role_penalty, repeat_penalty, red_frozen),
+        # already restricted to Tier 1.  The min-swap filter is only a
+        # preference: if nothing passes it, fall back to the unfiltered set.
+        candidates = _enumerate(separated, force_shuffle_from)
+        if not candidates and force_shuffle_from:
+            candidates = _enumerate(separated, None)
 
         # Fallback: if bottom-2 constraint left no candidates, retry without it
         if not candidates and apply_bottom_sep:
@@ -3559,45 +3542,13 @@ class CustomMatch(commands.Cog):
                 f"balance_teams_mmr: bottom-2 separation over-constrained for game {game_id}, "
                 f"retrying without bottom-2 constraint"
             )
-            for red_group in itertools.combinations(pid_list, team_size):
-                red_set_quick = set(red_group)
-                if top1 in red_set_quick and top2 in red_set_quick:
-                    continue
-                if top1 not in red_set_quick and top2 not in red_set_quick:
-                    continue
-                blue_list = [p for p in pid_list if p not in red_set_quick]
-                red_sum = sum(mmr_map[p] for p in red_group)
-                blue_sum = sum(mmr_map[p] for p in blue_list)
-                mmr_diff = abs(red_sum - blue_sum)
-                role_penalty = (
-                    _role_diversity_penalty(list(red_group), role_prefs)
-                    + _role_diversity_penalty(blue_list, role_prefs)
-                )
-                if prev_map:
-                    repeat_penalty = (
-                        sum(1 for p in red_group if prev_map.get(p) == 'red')
-                        + sum(1 for p in blue_list if prev_map.get(p) == 'blue')
-                    )
-                else:
-                    repeat_penalty = 0
-                candidates.append((mmr_diff, role_penalty, repeat_penalty, frozenset(red_group)))
-
-        # Filter by minimum swap percentage when force-shuffling
-        if force_shuffle_from and min_swap_pct > 0:
-            def _swap_pct(cand):
-                red_frozen = cand[3]
-                changed = sum(
-                    1 for p in pid_list
-                    if (p in red_frozen) != (force_shuffle_from.get(p) == 'red')
-                )
-                return changed / len(pid_list)
-            filtered = [c for c in candidates if _swap_pct(c) >= min_swap_pct]
-            if filtered:
-                candidates = filtered
+            candidates = _enumerate(separated[:1], force_shuffle_from)
+            if not candidates and force_shuffle_from:
+                candidates = _enumerate(separated[:1], None)
 
         # Tier 1: within SHAKE_MMR_TOLERANCE of best MMR diff
         best_mmr = min(c[0] for c in candidates)
-        tier1 = [c for c in candidates if c[0] <= best_mmr + SHAKE_MMR_TOLERANCE]
+        tier1 = candidates
         # Tier 2: minimum role penalty among tier1
         best_role = min(c[1] for c in tier1)
         tier2 = [c for c in tier1 if c[1] == best_role]
@@ -3609,8 +3560,7 @@ class CustomMatch(commands.Cog):
         tier3 = [c for c in tier2 if c[2] == best_repeat]
 
         logger.debug(
-            f"balance_teams_mmr: {len(candidates)} total, "
-            f"{len(tier1)} tier1, {len(tier2)} tier2, {len(tier3)} tier3, "
+            f"balance_teams_mmr: {len(tier1)} tier1, {len(tier2)} tier2, {len(tier3)} tier3, "
             f"best_mmr_diff={best_mmr}, best_repeat={best_repeat}"
         )
 
@@ -3628,7 +3578,7 @@ class CustomMatch(commands.Cog):
         """Snake-draft top 4 then combinatorial assignment of the rest.
 
         Preserved as the fallback for odd-sized rosters and queues with fewer
-        than 4 players, which the full-enumeration path doesn't handle.
+        than 4 players, which the exact split search doesn't handle.
         """
         # Sort by MMR descending
         players_with_mmr = sorted(players_with_mmr, key=lambda x: x[1], reverse=True)
@@ -3709,10 +3659,8 @@ class CustomMatch(commands.Cog):
         # Select captains based on method
         if game.captain_selection == CaptainSelection.HIGHEST_MMR:
             # Get two highest MMR players
-            players_with_mmr = []
-            for pid in player_ids:
-                stats = await DatabaseHelper.get_player_stats(pid, game.game_id)
-                players_with_mmr.append((pid, stats.effective_mmr))
+            all_stats = await DatabaseHelper.get_bulk_player_stats(player_ids, game.game_id)
+            players_with_mmr = [(pid, all_stats[pid].effective_mmr) for pid in player_ids]
             players_with_mmr.sort(key=lambda x: x[1], reverse=True)
             red_captain = players_with_mmr[0][0]
             blue_captain = players_with_mmr[1][0]
@@ -4454,7 +4402,7 @@ class CustomMatch(commands.Cog):
         """Post team embeds to match channel and queue channel. Reused by normal flow and mode vote."""
         match_data = await DatabaseHelper.get_match(match_id)
         short_id = match_data.get("short_id", str(match_id)) if match_data else str(match_id)
-        igns = await DatabaseHelper.get_match_igns(match_id)
+        igns = await DatabaseHelper.get_bulk_player_igns(red_team + blue_team, game.game_id)
 
         embed = discord.Embed(
             title=f"{game.name} Match {short_id}",
@@ -4820,9 +4768,7 @@ class CustomMatch(commands.Cog):
         losers = [p["player_id"] for p in players if p["team"] != winning_team.value]
 
         # Single-pass: fetch all player stats once, compute averages + changes from that
-        all_stats = {}
-        for pid in winners + losers:
-            all_stats[pid] = await DatabaseHelper.get_player_stats(pid, game.game_id)
+        all_stats = await DatabaseHelper.get_bulk_player_stats(winners + losers, game.game_id)
 
         now = datetime.now(timezone.utc)
 
@@ -4945,6 +4891,12 @@ class CustomMatch(commands.Cog):
                            VALUES (?, ?, ?, ?, ?, ?)""",
                         (pid, game.game_id, match_id, old_mmr, stats.mmr, stats.mmr - old_mmr)
                     )
+                # Keep the materialized monthly leaderboard and streaks in the same transaction
+                await DatabaseHelper.bump_monthly_stats(
+                    _mmr_db, game.game_id, DatabaseHelper.month_key(now),
+                    [(pid, 1, 0) for pid in winners] + [(pid, 0, 1) for pid in losers]
+                )
+                await DatabaseHelper.record_streak_results(_mmr_db, game.game_id, winners, losers)
                 await _mmr_db.commit()
 
             # Update rivalries
@@ -4958,10 +4910,15 @@ class CustomMatch(commands.Cog):
                 decided_at=datetime.now(timezone.utc).isoformat()
             )
 
+            # Drop cached cards that showed these players / this game
+            await self.stats_generator.cache.invalidate(
+                f"game:{game.game_id}", *(f"player:{pid}" for pid in winners + losers)
+            )
+
             # Update MMR roles for all players (Discord API, safe outside lock)
+            fresh_stats = await DatabaseHelper.get_bulk_player_stats(winners + losers, game.game_id)
             for pid in winners + losers:
-                stats = await DatabaseHelper.get_player_stats(pid, game.game_id)
-                await self.update_mmr_roles(guild, pid, game.game_id, stats.effective_mmr)
+                await self.update_mmr_roles(guild, pid, game.game_id, fresh_stats[pid].effective_mmr)
 
             # Cancel timeout task
             if match_id in self.match_timeout_tasks:
@@ -5086,6 +5043,8 @@ class CustomMatch(commands.Cog):
         while not self.bot.is_closed():
             try:
                 await asyncio.sleep(3600)  # Check every hour
+                # monthly_player_stats buckets by UTC month; no-op until it changes
+                await DatabaseHelper.roll_monthly_stats()
                 now = datetime.now(EST)
                 if now.month != last_month:
                     last_month = now.month
@@ -5217,7 +5176,9 @@ class CustomMatch(commands.Cog):
                                 game = game_obj or await DatabaseHelper.get_game(game_id)
                                 if game and stats:
                                     logger.info(f"Match #{match_id}: Generating scoreboard (game_channel={game.game_channel_id})")
-                                    scoreboard_embed, scoreboard_file = await self._generate_match_scoreboard(guild, match_id)
+                                    scoreboard_embed, scoreboard_file = await self._generate_match_scoreboard(
+                                        guild, match_id, priority=PRIORITY_BACKGROUND
+                                    )
                                     logger.info(f"Match #{match_id}: Scoreboard generated (has_file={scoreboard_file is not None})")
 
                                     # Send to game channel
@@ -7597,6 +7558,7 @@ class CustomMatch(commands.Cog):
                                 'value': f'{best_current}W'})
 
         return {
+            'guild_id': guild.id,
             'period_title': period_title,
             'game_name': game.name,
             'total_matches': total_matches,
@@ -8092,8 +8054,12 @@ class CustomMatch(commands.Cog):
         except discord.Forbidden:
             logger.warning(f"No permission to send leaderboard in channel {channel.id}")
 
-    async def _generate_match_scoreboard(self, guild: discord.Guild, match_id: int) -> Tuple[discord.Embed, Optional[discord.File]]:
-        """Generate a scoreboard image for a match. Returns (embed, file_or_none)."""
+    async def _generate_match_scoreboard(self, guild: discord.Guild, match_id: int,
+                                         priority: int = PRIORITY_INTERACTIVE) -> Tuple[discord.Embed, Optional[discord.File]]:
+        """Generate a scoreboard image for a match. Returns (embed, file_or_none).
+
+        Pass PRIORITY_BACKGROUND when nobody is waiting on the result (auto-posted scoreboards).
+        """
         match = await DatabaseHelper.get_match(match_id)
         if not match:
             return discord.Embed(description="Match not found.", color=COLOR_NEUTRAL), None
@@ -8155,7 +8121,7 @@ class CustomMatch(commands.Cog):
             'blue_players': blue_players_list
         }
 
-        image = await self.stats_generator.generate_scoreboard_image(scoreboard_data)
+        image = await self.stats_generator.generate_scoreboard_image(scoreboard_data, priority=priority)
         if image:
             image.seek(0)
             file = discord.File(image, filename='scoreboard.png')
@@ -8290,6 +8256,13 @@ class CustomMatch(commands.Cog):
     # COMMANDS
     # -------------------------------------------------------------------------
 
+    @commands.command(name="cm_recompute_streaks")
+    @commands.is_owner()
+    async def recompute_streaks_cmd(self, ctx: commands.Context):
+        """Rebuild the player_streaks table from match history."""
+        written = await DatabaseHelper.recompute_streaks()
+        await ctx.send(f"Recomputed streaks for {written:,} player/game pairs.")
+
     @app_commands.command(name="cm_settings", description="Open the settings panel (Server Admin)")
     async def settings_cmd(self, interaction: discord.Interaction):
         if not interaction.user.guild_permissions.administrator:
@@ -8670,7 +8643,7 @@ class CustomMatch(commands.Cog):
             await self._check_and_update_ign(target.id, game_config.game_id)
 
         # Try to use image generation if available
-        if self.stats_generator.browser:
+        if self.stats_generator.renderer:
             await interaction.response.defer()
 
             if is_valorant:
@@ -8681,8 +8654,9 @@ class CustomMatch(commands.Cog):
                 seasonal_data = await self._gather_stats_data(target, game_config, monthly=True, guild=interaction.guild)
                 lifetime_data = await self._gather_stats_data(target, game_config, monthly=False, guild=interaction.guild)
 
-                seasonal_image = await self.stats_generator.generate_stats_image(seasonal_data)
-                lifetime_image = await self.stats_generator.generate_stats_image(lifetime_data)
+                tags = (f"player:{target.id}", f"game:{game_config.game_id}")
+                seasonal_image = await self.stats_generator.generate_stats_image(seasonal_data, cache_tags=tags)
+                lifetime_image = await self.stats_generator.generate_stats_image(lifetime_data, cache_tags=tags)
 
                 if seasonal_image and lifetime_image:
                     images = {'seasonal': seasonal_image, 'lifetime': lifetime_image}
@@ -9059,8 +9033,12 @@ class CustomMatch(commands.Cog):
                 return
 
             # Try image generation
-            if self.stats_generator.browser:
-                image = await self.stats_generator.generate_h2h_image(data)
+            if self.stats_generator.renderer:
+                image = await self.stats_generator.generate_h2h_image(
+                    data,
+                    cache_tags=(f"player:{interaction.user.id}", f"player:{user.id}",
+                                f"game:{game_config.game_id}"),
+                )
                 if image:
                     image.seek(0)
                     file = discord.File(image, filename='h2h.png')
@@ -9585,10 +9563,14 @@ class CustomMatch(commands.Cog):
 
         if is_rivals_game(game_config):
             data = await self._gather_rivals_serverstats_data(interaction.guild, game_config, monthly=True)
-            image = await self.stats_generator.generate_rivals_serverstats_image(data)
+            image = await self.stats_generator.generate_rivals_serverstats_image(
+                data, cache_tags=(f"game:{game_config.game_id}",)
+            )
         else:
             data = await self._gather_serverstats_data(interaction.guild, game_config, monthly=True)
-            image = await self.stats_generator.generate_serverstats_image(data)
+            image = await self.stats_generator.generate_serverstats_image(
+                data, cache_tags=(f"game:{game_config.game_id}",)
+            )
 
         if image:
             image.seek(0)
@@ -1,9 +1,11 @@
 import aiosqlite
 import asyncio
+import copy
 import logging
 import json
+import time
 from datetime import datetime, timezone, timedelta
-from typing import Optional, List, Dict, Tuple
+from typing import Optional, List, Dict, Tuple, Any, Hashable
 from pathlib import Path
 from contextlib import asynccontextmanager
 from zoneinfo import ZoneInfo
@@ -372,6 +374,30 @@ CREATE TABLE IF NOT EXISTS secondary_modes (
     FOREIGN KEY (game_id) REFERENCES games(game_id) ON DELETE CASCADE
 );
 
+-- Materialized monthly leaderboard (month = 'YYYY-MM' in UTC), kept in step with
+-- match finalization / reversal and admin adjustments
+CREATE TABLE IF NOT EXISTS monthly_player_stats (
+    game_id INTEGER NOT NULL,
+    month TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    wins INTEGER DEFAULT 0,
+    losses INTEGER DEFAULT 0,
+    PRIMARY KEY (game_id, month, player_id)
+);
+CREATE INDEX IF NOT EXISTS idx_monthly_player_stats_rank
+    ON monthly_player_stats(game_id, month, wins DESC, losses ASC);
+
+-- Current / longest streaks per player per game, kept in step with finalize + reversal
+CREATE TABLE IF NOT EXISTS player_streaks (
+    player_id INTEGER NOT NULL,
+    game_id INTEGER NOT NULL,
+    current_win INTEGER DEFAULT 0,
+    current_loss INTEGER DEFAULT 0,
+    longest_win INTEGER DEFAULT 0,
+    longest_loss INTEGER DEFAULT 0,
+    PRIMARY KEY (player_id, game_id)
+);
+
 -- Performance indexes
 CREATE INDEX IF NOT EXISTS idx_matches_winning_cancelled ON matches(winning_team, cancelled);
 CREATE INDEX IF NOT EXISTS idx_match_players_player_id ON match_players(player_id);
@@ -386,6 +412,15 @@ async def init_db():
         await db.executescript(SCHEMA)
         await db.commit()
     await migrate_db()
+    DatabaseHelper._cache.clear()
+    await DatabaseHelper.roll_monthly_stats()
+    async with DatabaseHelper._get_db() as db:
+        async with db.execute("SELECT 1 FROM player_streaks LIMIT 1") as cursor:
+            has_streaks = await cursor.fetchone()
+    if not has_streaks:
+        rebuilt = await DatabaseHelper.recompute_streaks()
+        if rebuilt:
+            logger.info(f"Backfilled player_streaks for {rebuilt} player/game pairs")
 
 async def migrate_db():
     """Run database migrations to add new columns to existing tables."""
@@ -654,6 +689,62 @@ async def migrate_db():
 
         await db.commit()
 
+# =============================================================================
+# READ-THROUGH CACHE
+# =============================================================================
+
+READ_CACHE_TTL_SECONDS = 300
+READ_CACHE_MAX_ENTRIES = 10_000  # per namespace; a full namespace is simply dropped
+
+_MISS = object()
+
+
+class ReadCache:
+    """In-process memo for hot, rarely-written lookups (games, config, roles, blacklist).
+
+    Entries are grouped into namespaces that match the table they mirror.  Every
+    DatabaseHelper setter for that table calls invalidate(), which drops the
+    namespace and bumps its version; a reader that started its query before the
+    bump won't store its (possibly stale) result.  The TTL only guards against
+    edits made outside DatabaseHelper, e.g. from the sqlite3 shell.
+    """
+
+    def __init__(self, ttl: float = READ_CACHE_TTL_SECONDS):
+        self.ttl = ttl
+        self._data: Dict[str, Dict[Hashable, Tuple[float, Any]]] = {}
+        self._versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def version(self, ns: str) -> int:
+        return self._versions.get(ns, 0)
+
+    def get(self, ns: str, key: Hashable) -> Any:
+        """Return the cached value, or _MISS."""
+        entry = self._data.get(ns, {}).get(key)
+        if entry is None or entry[0] < time.monotonic():
+            self.misses += 1
+            return _MISS
+        self.hits += 1
+        return entry[1]
+
+    def put(self, ns: str, key: Hashable, value: Any, version: int):
+        if self._versions.get(ns, 0) != version:
+            return
+        bucket = self._data.setdefault(ns, {})
+        if len(bucket) >= READ_CACHE_MAX_ENTRIES:
+            bucket.clear()
+        bucket[key] = (time.monotonic() + self.ttl, value)
+
+    def invalidate(self, *namespaces: str):
+        for ns in namespaces:
+            self._data.pop(ns, None)
+            self._versions[ns] = self._versions.get(ns, 0) + 1
+
+    def clear(self):
+        self.invalidate(*(set(self._data) | set(self._versions)))
+
+
 # =============================================================================
 # DATABASE HELPERS
 # =============================================================================
@@ -661,6 +752,7 @@ async def migrate_db():
 class DatabaseHelper:
     """Helper class for database operations."""
     _db: Optional[aiosqlite.Connection] = None
+    _cache = ReadCache()
 
     @classmethod
     async def connect(cls):
@@ -692,10 +784,17 @@ class DatabaseHelper:
 
     @staticmethod
     async def get_config(key: str) -> Optional[str]:
+        cache = DatabaseHelper._cache
+        value = cache.get('config', key)
+        if value is not _MISS:
+            return value
+        version = cache.version('config')
         async with DatabaseHelper._get_db() as db:
             async with db.execute("SELECT value FROM config WHERE key = ?", (key,)) as cursor:
                 row = await cursor.fetchone()
-                return row[0] if row else None
+                value = row[0] if row else None
+        cache.put('config', key, value, version)
+        return value
 
     @staticmethod
     async def set_config(key: str, value: str):
@@ -705,6 +804,7 @@ class DatabaseHelper:
                 (key, value)
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('config')
 
     @staticmethod
     async def get_role_emojis() -> dict:
@@ -722,38 +822,38 @@ class DatabaseHelper:
         """Save Rivals role emojis to config as JSON."""
         await DatabaseHelper.set_config("role_emojis", json.dumps(emojis))
 
+    @staticmethod
+    async def _cached_game_query(key: tuple, sql: str, params: tuple) -> Optional[GameConfig]:
+        """Single-game lookup through the 'games' cache. Returns a private copy."""
+        cache = DatabaseHelper._cache
+        game = cache.get('games', key)
+        if game is _MISS:
+            version = cache.version('games')
+            async with DatabaseHelper._get_db() as db:
+                async with db.execute(sql, params) as cursor:
+                    row = await cursor.fetchone()
+            game = DatabaseHelper._row_to_game_config(row) if row else None
+            cache.put('games', key, game, version)
+        # Callers routinely tweak the config they get back before saving it
+        return copy.deepcopy(game)
+
     @staticmethod
     async def get_game(game_id: int) -> Optional[GameConfig]:
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute(
-                "SELECT * FROM games WHERE game_id = ?", (game_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    return None
-                return DatabaseHelper._row_to_game_config(row)
+        return await DatabaseHelper._cached_game_query(
+            ('id', game_id), "SELECT * FROM games WHERE game_id = ?", (game_id,)
+        )
 
     @staticmethod
     async def get_game_by_name(name: str) -> Optional[GameConfig]:
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute(
-                "SELECT * FROM games WHERE name = ?", (name,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    return None
-                return DatabaseHelper._row_to_game_config(row)
+        return await DatabaseHelper._cached_game_query(
+            ('name', name), "SELECT * FROM games WHERE name = ?", (name,)
+        )
 
     @staticmethod
     async def get_game_by_channel(channel_id: int) -> Optional[GameConfig]:
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute(
-                "SELECT * FROM games WHERE queue_channel_id = ?", (channel_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if not row:
-                    return None
-                return DatabaseHelper._row_to_game_config(row)
+        return await DatabaseHelper._cached_game_query(
+            ('channel', channel_id), "SELECT * FROM games WHERE queue_channel_id = ?", (channel_id,)
+        )
 
     @staticmethod
     def _row_to_game_config(row) -> GameConfig:
@@ -811,10 +911,16 @@ class DatabaseHelper:
 
     @staticmethod
     async def get_all_games() -> List[GameConfig]:
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute("SELECT * FROM games") as cursor:
-                rows = await cursor.fetchall()
-                return [DatabaseHelper._row_to_game_config(row) for row in rows]
+        cache = DatabaseHelper._cache
+        games = cache.get('games', ('all',))
+        if games is _MISS:
+            version = cache.version('games')
+            async with DatabaseHelper._get_db() as db:
+                async with db.execute("SELECT * FROM games") as cursor:
+                    rows = await cursor.fetchall()
+            games = [DatabaseHelper._row_to_game_config(row) for row in rows]
+            cache.put('games', ('all',), games, version)
+        return copy.deepcopy(games)
 
     @staticmethod
     async def add_game(name: str, player_count: int, queue_type: str = "mmr",
@@ -826,7 +932,8 @@ class DatabaseHelper:
                 (name, player_count, queue_type, captain_selection)
             )
             await db.commit()
-            return cursor.lastrowid
+        DatabaseHelper._cache.invalidate('games')
+        return cursor.lastrowid
 
     # Valid column names for games table - prevents SQL injection
     VALID_GAME_COLUMNS = {
@@ -878,12 +985,29 @@ class DatabaseHelper:
                     params
                 )
                 await db.commit()
+        DatabaseHelper._cache.invalidate('games')
 
     @staticmethod
     async def delete_game(game_id: int):
         async with DatabaseHelper._get_db() as db:
             await db.execute("DELETE FROM games WHERE game_id = ?", (game_id,))
             await db.commit()
+        DatabaseHelper._cache.invalidate('games', 'mmr_roles')
+
+    @staticmethod
+    def _row_to_player_stats(row) -> PlayerStats:
+        """Helper to convert a player_game_stats row to PlayerStats."""
+        return PlayerStats(
+            player_id=row[0],
+            game_id=row[1],
+            mmr=row[2],
+            games_played=row[3],
+            wins=row[4],
+            losses=row[5],
+            admin_offset=row[6],
+            last_played=datetime.fromisoformat(row[7]) if row[7] else None,
+            returning_games_remaining=row[8] if len(row) > 8 and row[8] else 0
+        )
 
     @staticmethod
     async def get_player_stats(player_id: int, game_id: int) -> PlayerStats:
@@ -895,17 +1019,25 @@ class DatabaseHelper:
                 row = await cursor.fetchone()
                 if not row:
                     return PlayerStats(player_id=player_id, game_id=game_id, is_new=True)
-                return PlayerStats(
-                    player_id=row[0],
-                    game_id=row[1],
-                    mmr=row[2],
-                    games_played=row[3],
-                    wins=row[4],
-                    losses=row[5],
-                    admin_offset=row[6],
-                    last_played=datetime.fromisoformat(row[7]) if row[7] else None,
-                    returning_games_remaining=row[8] if len(row) > 8 and row[8] else 0
-                )
+                return DatabaseHelper._row_to_player_stats(row)
+
+    @staticmethod
+    async def get_bulk_player_stats(player_ids: List[int], game_id: int) -> Dict[int, PlayerStats]:
+        """Batch fetch stats for a roster. Players with no row get a fresh PlayerStats (is_new=True)."""
+        result = {}
+        if player_ids:
+            async with DatabaseHelper._get_db() as db:
+                placeholders = ",".join("?" for _ in player_ids)
+                async with db.execute(
+                    f"SELECT * FROM player_game_stats WHERE game_id = ? AND player_id IN ({placeholders})",
+                    [game_id] + list(player_ids)
+                ) as cursor:
+                    for row in await cursor.fetchall():
+                        result[row[0]] = DatabaseHelper._row_to_player_stats(row)
+        for pid in player_ids:
+            if pid not in result:
+                result[pid] = PlayerStats(player_id=pid, game_id=game_id, is_new=True)
+        return result
 
     @staticmethod
     async def update_player_stats(stats: PlayerStats):
@@ -924,13 +1056,19 @@ class DatabaseHelper:
     @staticmethod
     async def get_mmr_roles(game_id: int) -> Dict[int, int]:
         """Returns {role_id: mmr_value}"""
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute(
-                "SELECT role_id, mmr_value FROM game_mmr_roles WHERE game_id = ?",
-                (game_id,)
-            ) as cursor:
-                rows = await cursor.fetchall()
-                return {row[0]: row[1] for row in rows}
+        cache = DatabaseHelper._cache
+        roles = cache.get('mmr_roles', game_id)
+        if roles is _MISS:
+            version = cache.version('mmr_roles')
+            async with DatabaseHelper._get_db() as db:
+                async with db.execute(
+                    "SELECT role_id, mmr_value FROM game_mmr_roles WHERE game_id = ?",
+                    (game_id,)
+                ) as cursor:
+                    rows = await cursor.fetchall()
+            roles = {row[0]: row[1] for row in rows}
+            cache.put('mmr_roles', game_id, roles, version)
+        return dict(roles)
 
     @staticmethod
     async def set_mmr_role(game_id: int, role_id: int, mmr_value: int, label: str = None):
@@ -941,6 +1079,7 @@ class DatabaseHelper:
                 (game_id, role_id, mmr_value, label)
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('mmr_roles')
 
     @staticmethod
     async def get_mmr_roles_with_labels(game_id: int) -> Dict[int, dict]:
@@ -961,19 +1100,24 @@ class DatabaseHelper:
                 (game_id, role_id)
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('mmr_roles')
 
     @staticmethod
     async def is_blacklisted(player_id: int) -> bool:
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute(
-                "SELECT blacklisted_until FROM players WHERE player_id = ?",
-                (player_id,)
-            ) as cursor:
-                row = await cursor.fetchone()
-                if not row or not row[0]:
-                    return False
-                until = datetime.fromisoformat(row[0])
-                return until > datetime.now(timezone.utc)
+        # Cache the expiry rather than the verdict so a ban lapses on time
+        cache = DatabaseHelper._cache
+        until = cache.get('blacklist', player_id)
+        if until is _MISS:
+            version = cache.version('blacklist')
+            async with DatabaseHelper._get_db() as db:
+                async with db.execute(
+                    "SELECT blacklisted_until FROM players WHERE player_id = ?",
+                    (player_id,)
+                ) as cursor:
+                    row = await cursor.fetchone()
+            until = datetime.fromisoformat(row[0]) if row and row[0] else None
+            cache.put('blacklist', player_id, until, version)
+        return until is not None and until > datetime.now(timezone.utc)
 
     @staticmethod
     async def blacklist_player(player_id: int, until: Optional[datetime] = None):
@@ -987,6 +1131,7 @@ class DatabaseHelper:
                 (player_id, until.isoformat(), until.isoformat())
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('blacklist')
 
     @staticmethod
     async def unblacklist_player(player_id: int):
@@ -996,6 +1141,7 @@ class DatabaseHelper:
                 (player_id,)
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('blacklist')
 
     @staticmethod
     async def get_blacklisted_players() -> List[Tuple[int, datetime]]:
@@ -1528,48 +1674,95 @@ class DatabaseHelper:
             )
             await db.commit()
 
+    # -------------------------------------------------------------------------
+    # MONTHLY LEADERBOARD MATERIALIZATION
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    def month_key(when: Optional[datetime] = None) -> str:
+        """'YYYY-MM' bucket (UTC) used by monthly_player_stats."""
+        return (when or datetime.now(timezone.utc)).astimezone(timezone.utc).strftime("%Y-%m")
+
+    @staticmethod
+    async def bump_monthly_stats(db, game_id: int, month: str, deltas: List[Tuple[int, int, int]]):
+        """Apply (player_id, wins_delta, losses_delta) rows to monthly_player_stats.
+
+        Runs on the caller's connection and does not commit, so it lands in the
+        same transaction as the match / adjustment write it mirrors.
+        """
+        if not deltas:
+            return
+        await db.executemany(
+            """INSERT INTO monthly_player_stats (game_id, month, player_id, wins, losses)
+               VALUES (?, ?, ?, ?, ?)
+               ON CONFLICT(game_id, month, player_id) DO UPDATE SET
+                   wins = wins + excluded.wins,
+                   losses = losses + excluded.losses""",
+            [(game_id, month, pid, w, l) for pid, w, l in deltas]
+        )
+
+    @staticmethod
+    async def rebuild_monthly_stats(month: Optional[str] = None):
+        """Recompute one month of monthly_player_stats from matches + admin adjustments."""
+        month = month or DatabaseHelper.month_key()
+        async with DatabaseHelper._get_db() as db:
+            await db.execute("DELETE FROM monthly_player_stats WHERE month = ?", (month,))
+            await db.execute(
+                """INSERT OR REPLACE INTO monthly_player_stats (game_id, month, player_id, wins, losses)
+                   SELECT game_id, ?, player_id, SUM(wins), SUM(losses) FROM (
+                       SELECT m.game_id, mp.player_id,
+                              SUM(CASE WHEN m.winning_team = mp.team THEN 1 ELSE 0 END) as wins,
+                              SUM(CASE WHEN m.winning_team != mp.team THEN 1 ELSE 0 END) as losses
+                       FROM match_players mp
+                       JOIN matches m ON mp.match_id = m.match_id
+                       WHERE m.winning_team IN ('red', 'blue') AND m.cancelled = 0
+                             AND COALESCE(m.is_secondary, 0) = 0
+                             AND substr(COALESCE(m.decided_at, m.ended_at), 1, 7) = ?
+                       GROUP BY m.game_id, mp.player_id
+                       UNION ALL
+                       SELECT game_id, player_id, SUM(wins_delta), SUM(losses_delta)
+                       FROM admin_stat_adjustments
+                       WHERE substr(adjusted_at, 1, 7) = ?
+                       GROUP BY game_id, player_id
+                   )
+                   GROUP BY game_id, player_id""",
+                (month, month, month)
+            )
+            await db.commit()
+
+    @staticmethod
+    async def roll_monthly_stats():
+        """Start a fresh month in monthly_player_stats once the UTC month changes.
+
+        Rebuilds the new month from source (catching anything decided across the
+        boundary) and drops months older than the previous one. Cheap no-op
+        while the month hasn't changed.
+        """
+        month = DatabaseHelper.month_key()
+        if await DatabaseHelper.get_config("monthly_stats_month") == month:
+            return
+        await DatabaseHelper.rebuild_monthly_stats(month)
+        first_of_month = datetime.now(timezone.utc).replace(day=1)
+        prev_month = DatabaseHelper.month_key(first_of_month - timedelta(days=1))
+        async with DatabaseHelper._get_db() as db:
+            await db.execute("DELETE FROM monthly_player_stats WHERE month < ?", (prev_month,))
+            await db.commit()
+        await DatabaseHelper.set_config("monthly_stats_month", month)
+        logger.info(f"monthly_player_stats rolled over to {month}")
+
     @staticmethod
     async def get_leaderboard(game_id: int, monthly: bool = True, limit: int = 20) -> List[dict]:
         """Get leaderboard for a game."""
         async with DatabaseHelper._get_db() as db:
             if monthly:
-                # Get current month start
-                now = datetime.now(timezone.utc)
-                month_start = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
-
-                # Get wins/losses from matches this month + admin adjustments
+                # Indexed top-N over the materialized month
                 query = """
-                    WITH match_stats AS (
-                        SELECT mp.player_id,
-                               SUM(CASE WHEN m.winning_team = mp.team THEN 1 ELSE 0 END) as wins,
-                               SUM(CASE WHEN m.winning_team != mp.team THEN 1 ELSE 0 END) as losses
-                        FROM match_players mp
-                        JOIN matches m ON mp.match_id = m.match_id
-                        WHERE m.game_id = ? AND m.winning_team IS NOT NULL
-                              AND m.decided_at >= ? AND m.cancelled = 0
-                        GROUP BY mp.player_id
-                    ),
-                    admin_stats AS (
-                        SELECT player_id,
-                               SUM(wins_delta) as wins,
-                               SUM(losses_delta) as losses
-                        FROM admin_stat_adjustments
-                        WHERE game_id = ? AND adjusted_at >= ?
-                        GROUP BY player_id
-                    ),
-                    combined AS (
-                        SELECT player_id, wins, losses FROM match_stats
-                        UNION ALL
-                        SELECT player_id, wins, losses FROM admin_stats
-                    )
-                    SELECT player_id, SUM(wins) as wins, SUM(losses) as losses
-                    FROM combined
-                    GROUP BY player_id
+                    SELECT player_id, wins, losses FROM monthly_player_stats
+                    WHERE game_id = ? AND month = ?
                     ORDER BY wins DESC, losses ASC
                     LIMIT ?
                 """
-                async with db.execute(query, (game_id, month_start.isoformat(),
-                                              game_id, month_start.isoformat(), limit)) as cursor:
+                async with db.execute(query, (game_id, DatabaseHelper.month_key(), limit)) as cursor:
                     rows = await cursor.fetchall()
             else:
                 # All-time from player_game_stats
@@ -1678,6 +1871,20 @@ class DatabaseHelper:
                 row = await cursor.fetchone()
                 return row[0] if row else None
 
+    @staticmethod
+    async def get_bulk_player_igns(player_ids: List[int], game_id: int) -> Dict[int, str]:
+        """Batch fetch IGNs for multiple players. Players without an IGN are omitted."""
+        if not player_ids:
+            return {}
+        async with DatabaseHelper._get_db() as db:
+            placeholders = ",".join("?" for _ in player_ids)
+            async with db.execute(
+                f"SELECT player_id, ign FROM player_igns WHERE game_id = ? AND player_id IN ({placeholders})",
+                [game_id] + list(player_ids)
+            ) as cursor:
+                rows = await cursor.fetchall()
+                return {row[0]: row[1] for row in rows}
+
     @staticmethod
     async def set_player_ign(player_id: int, game_id: int, ign: str, puuid: str = None):
         """Set a player's IGN for a specific game, optionally storing the PUUID.
@@ -1731,9 +1938,10 @@ class DatabaseHelper:
         # Roster pass — ensures current match roster wins on any collision.
         try:
             match_players = await DatabaseHelper.get_match_players(match_id)
-            for mp in match_players:
-                pid = mp["player_id"]
-                ign = await DatabaseHelper.get_player_ign(pid, game_id)
+            roster_igns = await DatabaseHelper.get_bulk_player_igns(
+                [mp["player_id"] for mp in match_players], game_id
+            )
+            for pid, ign in roster_igns.items():
                 if ign:
                     lookup[ign.strip().lower()] = pid
         except Exception as e:
@@ -2274,6 +2482,7 @@ class DatabaseHelper:
             # Remove from leaderboard-visible players table
             await db.execute("DELETE FROM players WHERE player_id = ?", (player_id,))
             await db.commit()
+        DatabaseHelper._cache.invalidate('blacklist')
 
     @staticmethod
     async def adjust_player_stats(player_id: int, game_id: int, wins_delta: int, losses_delta: int,
@@ -2293,6 +2502,10 @@ class DatabaseHelper:
                    VALUES (?, ?, ?, ?, ?)""",
                 (player_id, game_id, wins_delta, losses_delta, adjusted_by)
             )
+            await DatabaseHelper.bump_monthly_stats(
+                db, game_id, DatabaseHelper.month_key(),
+                [(player_id, wins_delta, losses_delta)]
+            )
             await db.commit()
 
     @staticmethod
@@ -2378,6 +2591,24 @@ class DatabaseHelper:
             if not rows:
                 return False
 
+            # Take the match back out of its month on the materialized leaderboard
+            async with db.execute(
+                """SELECT game_id, winning_team, COALESCE(decided_at, ended_at), cancelled, is_secondary
+                   FROM matches WHERE match_id = ?""",
+                (match_id,)
+            ) as cursor:
+                match_row = await cursor.fetchone()
+            if (match_row and match_row[1] in ('red', 'blue') and match_row[2]
+                    and not match_row[3] and not match_row[4]):
+                async with db.execute(
+                    "SELECT player_id, team FROM match_players WHERE match_id = ?", (match_id,)
+                ) as cursor:
+                    roster = await cursor.fetchall()
+                await DatabaseHelper.bump_monthly_stats(
+                    db, match_row[0], match_row[2][:7],
+                    [(pid, -1, 0) if team == match_row[1] else (pid, 0, -1) for pid, team in roster]
+                )
+
             # Reverse all changes atomically within this single connection
             for player_id, game_id, mmr_before, mmr_after in rows:
                 change = mmr_after - mmr_before
@@ -2406,6 +2637,14 @@ class DatabaseHelper:
                 "UPDATE matches SET winning_team = NULL, decided_at = NULL, ended_at = NULL WHERE match_id = ?",
                 (match_id,)
             )
+
+            # The reversed match may sit anywhere in a streak, so rebuild the roster's rows
+            if match_row:
+                async with db.execute(
+                    "SELECT player_id FROM match_players WHERE match_id = ?", (match_id,)
+                ) as cursor:
+                    roster_ids = [r[0] for r in await cursor.fetchall()]
+                await DatabaseHelper.recompute_streaks(match_row[0], roster_ids, db=db)
             await db.commit()
 
         return True
@@ -2912,9 +3151,123 @@ class DatabaseHelper:
                 row = await cursor.fetchone()
                 return dict(row) if row else {}
 
+    # -------------------------------------------------------------------------
+    # STREAKS
+    # -------------------------------------------------------------------------
+
+    @staticmethod
+    async def record_streak_results(db, game_id: int, winners: List[int], losers: List[int]):
+        """Advance player_streaks for a freshly decided match.
+
+        Runs on the caller's connection without committing, so it shares the
+        finalize transaction.
+        """
+        if winners:
+            await db.executemany(
+                """INSERT INTO player_streaks
+                   (player_id, game_id, current_win, current_loss, longest_win, longest_loss)
+                   VALUES (?, ?, 1, 0, 1, 0)
+                   ON CONFLICT(player_id, game_id) DO UPDATE SET
+                       current_win = current_win + 1,
+                       current_loss = 0,
+                       longest_win = MAX(longest_win, current_win + 1)""",
+                [(pid, game_id) for pid in winners]
+            )
+        if losers:
+            await db.executemany(
+                """INSERT INTO player_streaks
+                   (player_id, game_id, current_win, current_loss, longest_win, longest_loss)
+                   VALUES (?, ?, 0, 1, 0, 1)
+                   ON CONFLICT(player_id, game_id) DO UPDATE SET
+                       current_loss = current_loss + 1,
+                       current_win = 0,
+                       longest_loss = MAX(longest_loss, current_loss + 1)""",
+                [(pid, game_id) for pid in losers]
+            )
+
+    @staticmethod
+    async def recompute_streaks(game_id: Optional[int] = None, player_ids: Optional[List[int]] = None,
+                                db=None) -> int:
+        """Rebuild player_streaks from match history.
+
+        With no arguments every row is rebuilt; game_id/player_ids narrow it
+        down (reversals only touch the affected roster). When `db` is given the
+        work joins the caller's transaction and is not committed here.
+        Returns the number of player/game rows written.
+        """
+        where = ["m.winning_team IN ('red', 'blue')", "m.cancelled = 0", "COALESCE(m.is_secondary, 0) = 0"]
+        scope = []
+        params: list = []
+        if game_id is not None:
+            where.append("m.game_id = ?")
+            scope.append("game_id = ?")
+            params.append(game_id)
+        if player_ids is not None:
+            if not player_ids:
+                return 0
+            placeholders = ",".join("?" for _ in player_ids)
+            where.append(f"mp.player_id IN ({placeholders})")
+            scope.append(f"player_id IN ({placeholders})")
+            params.extend(player_ids)
+
+        async def run(conn) -> int:
+            async with conn.execute(
+                f"""SELECT mp.player_id, m.game_id,
+                           CASE WHEN mp.team = m.winning_team THEN 1 ELSE 0 END as won
+                    FROM matches m
+                    JOIN match_players mp ON m.match_id = mp.match_id
+                    WHERE {' AND '.join(where)}
+                    ORDER BY mp.player_id, m.game_id, COALESCE(m.decided_at, m.ended_at), m.match_id""",
+                params
+            ) as cursor:
+                rows = await cursor.fetchall()
+
+            # key -> [current_win, current_loss, longest_win, longest_loss]
+            streaks: Dict[Tuple[int, int], List[int]] = {}
+            for pid, gid, won in rows:
+                st = streaks.setdefault((pid, gid), [0, 0, 0, 0])
+                if won:
+                    st[0] += 1
+                    st[1] = 0
+                    st[2] = max(st[2], st[0])
+                else:
+                    st[1] += 1
+                    st[0] = 0
+                    st[3] = max(st[3], st[1])
+
+            scope_sql = f" WHERE {' AND '.join(scope)}" if scope else ""
+            await conn.execute(f"DELETE FROM player_streaks{scope_sql}", params)
+            await conn.executemany(
+                """INSERT INTO player_streaks
+                   (player_id, game_id, current_win, current_loss, longest_win, longest_loss)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(pid, gid, *st) for (pid, gid), st in streaks.items()]
+            )
+            return len(streaks)
+
+        if db is not None:
+            return await run(db)
+        async with DatabaseHelper._get_db() as conn:
+            written = await run(conn)
+            await conn.commit()
+            return written
+
     @staticmethod
     async def get_player_streak_stats(player_id: int, game_id: int, monthly: bool = False) -> dict:
         """Get longest winning and losing streaks for a player."""
+        if not monthly:
+            async with DatabaseHelper._get_db() as db:
+                async with db.execute(
+                    "SELECT longest_win, longest_loss FROM player_streaks WHERE player_id = ? AND game_id = ?",
+                    (player_id, game_id)
+                ) as cursor:
+                    row = await cursor.fetchone()
+            return {
+                'longest_win_streak': row[0] if row else 0,
+                'longest_loss_streak': row[1] if row else 0,
+            }
+
+        # Monthly streaks only cover one month of history, so walk it directly
         async with DatabaseHelper._get_db() as db:
 
             date_filter = ""
@@ -2964,42 +3317,13 @@ class DatabaseHelper:
             return {}
         async with DatabaseHelper._get_db() as db:
             placeholders = ','.join('?' for _ in player_ids)
-            query = f"""
-                SELECT mp.player_id, m.match_id,
-                       CASE WHEN mp.team = m.winning_team THEN 1 ELSE 0 END as won,
-                       m.decided_at
-                FROM matches m
-                JOIN match_players mp ON m.match_id = mp.match_id
-                WHERE mp.player_id IN ({placeholders})
-                  AND m.game_id = ? AND m.winning_team IS NOT NULL
-                ORDER BY mp.player_id, m.decided_at DESC
-            """
-            async with db.execute(query, (*player_ids, game_id)) as cursor:
+            async with db.execute(
+                f"""SELECT player_id, current_win FROM player_streaks
+                    WHERE game_id = ? AND player_id IN ({placeholders}) AND current_win >= 3""",
+                (game_id, *player_ids)
+            ) as cursor:
                 rows = await cursor.fetchall()
-
-        # Group by player and count consecutive wins from most recent
-        streaks: Dict[int, int] = {}
-        current_pid = None
-        streak = 0
-        for row in rows:
-            pid = row['player_id']
-            if pid != current_pid:
-                if current_pid is not None and streak is not None and streak >= 3:
-                    streaks[current_pid] = streak
-                current_pid = pid
-                streak = 0
-            if streak is not None:
-                if row['won']:
-                    streak += 1
-                else:
-                    if streak >= 3:
-                        streaks[pid] = streak
-                    streak = None  # Stop counting for this player
-        # Handle last player
-        if current_pid is not None and streak is not None and streak >= 3:
-            streaks[current_pid] = streak
-
-        return streaks
+        return {row[0]: row[1] for row in rows}
 
     @staticmethod
     async def get_all_teammate_stats(player_id: int, game_id: int, monthly: bool = False) -> dict:
@@ -3086,10 +3410,16 @@ class DatabaseHelper:
     @staticmethod
     async def get_mod_roles() -> List[int]:
         """Get all mod role IDs."""
-        async with DatabaseHelper._get_db() as db:
-            async with db.execute("SELECT role_id FROM mod_roles") as cursor:
-                rows = await cursor.fetchall()
-                return [row[0] for row in rows]
+        cache = DatabaseHelper._cache
+        roles = cache.get('mod_roles', None)
+        if roles is _MISS:
+            version = cache.version('mod_roles')
+            async with DatabaseHelper._get_db() as db:
+                async with db.execute("SELECT role_id FROM mod_roles") as cursor:
+                    rows = await cursor.fetchall()
+            roles = [row[0] for row in rows]
+            cache.put('mod_roles', None, roles, version)
+        return list(roles)
 
     @staticmethod
     async def add_mod_role(role_id: int):
@@ -3100,6 +3430,7 @@ class DatabaseHelper:
                 (role_id,)
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('mod_roles')
 
     @staticmethod
     async def remove_mod_role(role_id: int):
@@ -3110,6 +3441,7 @@ class DatabaseHelper:
                 (role_id,)
             )
             await db.commit()
+        DatabaseHelper._cache.invalidate('mod_roles')
 
     @staticmethod
     async def get_match_valorant_id(match_id: int) -> Optional[str]:
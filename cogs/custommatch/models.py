@@ -545,6 +545,10 @@ H2H_TEMPLATE_PATH = Path(__file__).parent.parent / "templates" / "h2h_card.html"
 FONTS_PATH = Path(__file__).parent.parent.parent / "fonts"
 H2H_BG_PATH = Path(__file__).parent.parent / "Images" / "custommatch" / "h2hbackground.png"
 
+# Rendered card cache (content-addressed PNGs, LRU-evicted past the size cap)
+RENDER_CACHE_PATH = Path("data/render_cache/custommatch")
+RENDER_CACHE_MAX_BYTES = 200 * 1024 * 1024
+
 # =============================================================================
 # DATA CLASSES
 # =============================================================================
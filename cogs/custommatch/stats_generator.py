@@ -1,9 +1,8 @@
-import asyncio
 import base64
+import functools
 import io
 import logging
-import random
-from typing import Optional
+from typing import Optional, Iterable
 from pathlib import Path
 
 from .models import (
@@ -11,28 +10,51 @@ from .models import (
     LEADERBOARD_TEMPLATE_PATH, SERVERSTATS_TEMPLATE_PATH, SIMPLE_STATS_TEMPLATE_PATH,
     RIVALS_RESULTS_TEMPLATE_PATH, RIVALS_SERVERSTATS_TEMPLATE_PATH,
     RIVALS_STATS_TEMPLATE_PATH, H2H_TEMPLATE_PATH, H2H_BG_PATH, FONTS_PATH,
+    RENDER_CACHE_PATH, RENDER_CACHE_MAX_BYTES,
 )
-
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+from utils.render_cache import RenderCache
+from utils.render_service import PLAYWRIGHT_AVAILABLE, PRIORITY_INTERACTIVE
 
 logger = logging.getLogger('custommatch')
 
 
+def cached_card(template_attr: str):
+    """Serve a generate_*_image method from the render cache.
+
+    The key is the method name, the raw template and the call's input data,
+    so any change to the underlying stats yields a fresh render.  Callers may
+    pass cache_tags=(...) so the entry can be invalidated eagerly.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, cache_tags: Iterable[str] = (), **kwargs):
+            if not self.renderer:
+                return None
+            template = getattr(self, template_attr) or ''
+            payload = [args, {k: v for k, v in kwargs.items() if k != 'priority'}]
+            key = RenderCache.make_key(func.__name__, template, payload)
+            if key:
+                cached = await self.cache.get(key)
+                if cached is not None:
+                    return io.BytesIO(cached)
+            image = await func(self, *args, **kwargs)
+            if image is not None and key and image.getbuffer().nbytes:
+                await self.cache.put(key, image.getvalue(), cache_tags)
+            return image
+        return wrapper
+    return decorator
+
+
 # =============================================================================
 # STATS CARD GENERATOR
 # =============================================================================
 
 class StatsCardGenerator:
-    """Generates stats card images using Playwright and HTML templates."""
+    """Generates stats card images from HTML templates via the bot's shared RenderService."""
 
     def __init__(self):
-        self.browser = None
-        self.playwright = None
-        self._page_semaphore = asyncio.Semaphore(3)
+        self.renderer = None
+        self.cache = RenderCache(RENDER_CACHE_PATH, max_bytes=RENDER_CACHE_MAX_BYTES)
         # Cached templates (loaded once in initialize)
         self._stats_template: Optional[str] = None
         self._match_template: Optional[str] = None
@@ -45,21 +67,13 @@ class StatsCardGenerator:
         self._rivals_stats_template: Optional[str] = None
         self._h2h_template: Optional[str] = None
 
-    async def initialize(self):
-        """Initialize the browser and cache templates."""
-        if not PLAYWRIGHT_AVAILABLE:
+    async def initialize(self, renderer):
+        """Attach the shared renderer and cache templates."""
+        if not PLAYWRIGHT_AVAILABLE or renderer is None:
             logger.warning("Playwright not available. Stats cards will use embeds.")
             return False
 
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                args=[
-                    '--font-render-hinting=none',
-                    '--disable-lcd-text',
-                    '--enable-font-antialiasing',
-                ]
-            )
             # Cache all templates at startup
             for attr, path in [
                 ('_stats_template', STATS_TEMPLATE_PATH),
@@ -77,6 +91,7 @@ class StatsCardGenerator:
                     setattr(self, attr, path.read_text(encoding='utf-8'))
                 else:
                     logger.warning(f"Template not found at {path}")
+            self.renderer = renderer
             logger.info("Stats card generator initialized.")
             return True
         except Exception as e:
@@ -84,15 +99,17 @@ class StatsCardGenerator:
             return False
 
     async def close(self):
-        """Close the browser."""
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """Detach from the renderer (the browser itself is owned by the bot)."""
+        self.renderer = None
+
+    async def _render(self, html: str, *, width: int, height: int, priority: int = PRIORITY_INTERACTIVE, **kwargs) -> bytes:
+        """Screenshot a filled template at `width`, growing the viewport to fit the content."""
+        return await self.renderer.render(html, width=width, height=height, priority=priority, **kwargs)
 
+    @cached_card('_stats_template')
     async def generate_stats_image(self, player_data: dict) -> Optional[io.BytesIO]:
         """Generate a stats card image from player data."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -263,34 +280,20 @@ class StatsCardGenerator:
             )
 
             # Render to image with 2x scale for better quality
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 580, 'height': 500},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-
-                    # Wait for fonts to load
-                    await page.wait_for_timeout(100)
-
-                    # Get the actual content height
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 580, 'height': body_height + 40})
-
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=580, height=500, pad=40)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating stats card: {e}")
             return None
 
+    @cached_card('_match_template')
     async def generate_match_image(self, match_data: dict) -> Optional[io.BytesIO]:
         """Generate a match scoreboard image from match data."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -401,34 +404,21 @@ class StatsCardGenerator:
             )
 
             # Render to image
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 520, 'height': 500},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-
-                    # Wait for fonts to load
-                    await page.wait_for_timeout(100)
-
-                    # Get the actual content height
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 520, 'height': body_height + 20})
-
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=520, height=500)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating match card: {e}")
             return None
 
-    async def generate_scoreboard_image(self, scoreboard_data: dict) -> Optional[io.BytesIO]:
+    @cached_card('_scoreboard_template')
+    async def generate_scoreboard_image(self, scoreboard_data: dict,
+                                        priority: int = PRIORITY_INTERACTIVE) -> Optional[io.BytesIO]:
         """Generate a full match scoreboard image showing all 10 players."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -567,31 +557,20 @@ class StatsCardGenerator:
             )
 
             # Render to image
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 850, 'height': 600},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 850, 'height': body_height + 20})
-
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=850, height=600, priority=priority)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating scoreboard card: {e}")
             return None
 
+    @cached_card('_leaderboard_template')
     async def generate_leaderboard_image(self, leaderboard_data: dict) -> Optional[io.BytesIO]:
         """Generate a leaderboard image with two columns (1-10 and 11-20)."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -655,22 +634,10 @@ class StatsCardGenerator:
             )
 
             # Render to image with higher resolution
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 900, 'height': 600},
-                    device_scale_factor=3
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 900, 'height': body_height + 20})
-
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=900, height=600, scale=3)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
@@ -686,9 +653,10 @@ class StatsCardGenerator:
         ('#38bdf8', 56, 189, 248),   # Sky
     ]
 
+    @cached_card('_serverstats_template')
     async def generate_serverstats_image(self, data: dict) -> Optional[io.BytesIO]:
         """Generate a server stats card image."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -697,8 +665,9 @@ class StatsCardGenerator:
                 logger.error("Server stats template not cached")
                 return None
 
-            # Pick a random accent color
-            accent_hex, accent_r, accent_g, accent_b = random.choice(self.SERVERSTATS_ACCENT_COLORS)
+            # Accent color is fixed per guild so it is covered by the render cache key
+            accents = self.SERVERSTATS_ACCENT_COLORS
+            accent_hex, accent_r, accent_g, accent_b = accents[data.get('guild_id', 0) % len(accents)]
 
             # Build maps bar HTML (horizontal bar chart style)
             maps_data = data.get('maps', [])
@@ -774,31 +743,20 @@ class StatsCardGenerator:
                 leaders_html=leaders_html
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 580, 'height': 500},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 580, 'height': body_height + 40})
-
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=580, height=500, pad=40)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating server stats card: {e}")
             return None
 
+    @cached_card('_simple_stats_template')
     async def generate_simple_stats_image(self, player_data: dict) -> Optional[io.BytesIO]:
         """Generate a simplified stats card for non-Valorant games."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -873,28 +831,17 @@ class StatsCardGenerator:
                 recent_matches_html=recent_matches_html,
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 560, 'height': 400},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 560, 'height': body_height + 20})
-
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=560, height=400)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating simple stats card: {e}")
             return None
 
+    @cached_card('_rivals_results_template')
     async def generate_rivals_results_image(
         self,
         red_players: list,
@@ -902,7 +849,7 @@ class StatsCardGenerator:
         winning_team: str,
     ) -> Optional[io.BytesIO]:
         """Generate a Marvel Rivals post-match results card."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -963,29 +910,20 @@ class StatsCardGenerator:
                 blue_rows=blue_rows,
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 920, 'height': 800},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 920, 'height': body_height + 20})
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=920, height=800)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating rivals results card: {e}")
             return None
 
+    @cached_card('_rivals_serverstats_template')
     async def generate_rivals_serverstats_image(self, data: dict) -> Optional[io.BytesIO]:
         """Generate a Marvel Rivals server stats card."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -1028,29 +966,20 @@ class StatsCardGenerator:
                 leaders_html=leaders_html,
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 1200, 'height': 800},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 1200, 'height': body_height + 20})
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self._render(html, width=1200, height=800)
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating rivals server stats card: {e}")
             return None
 
+    @cached_card('_rivals_stats_template')
     async def generate_rivals_stats_image(self, data: dict) -> Optional[io.BytesIO]:
         """Generate a Marvel Rivals per-player stats card."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -1151,35 +1080,29 @@ class StatsCardGenerator:
                 recent_matches_html=recent_matches_html,
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 1180, 'height': 900},
-                    device_scale_factor=3,
-                )
-                try:
-                    await page.set_content(html, wait_until='domcontentloaded')
-                    # Block until @font-face resources are loaded so Cinzel
-                    # doesn't fall back mid-paint on the first few renders.
-                    try:
-                        await page.evaluate('() => document.fonts.ready')
-                    except Exception:
-                        pass
-                    await page.wait_for_timeout(120)
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 1180, 'height': body_height + 24})
-                    screenshot = await page.screenshot(type='png', omit_background=False)
-                finally:
-                    await page.close()
+            screenshot = await self._render(
+                html,
+                width=1180,
+                height=900,
+                scale=3,
+                wait_ms=120,
+                pad=24,
+                wait_for_fonts=True,
+                wait_until='domcontentloaded',
+            )
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
             logger.error(f"Error generating rivals stats card: {e}")
             return None
 
+    @cached_card('_h2h_template')
     async def generate_h2h_image(self, data: dict) -> Optional[io.BytesIO]:
         """Generate a premium Head-to-Head comparison card."""
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -1292,24 +1215,19 @@ class StatsCardGenerator:
                 teammate_html=teammate_html,
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 1180, 'height': 900},
-                    device_scale_factor=3,
-                )
-                try:
-                    await page.set_content(html, wait_until='domcontentloaded')
-                    try:
-                        await page.evaluate('() => document.fonts.ready')
-                    except Exception:
-                        pass
-                    await page.wait_for_timeout(150)
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 1180, 'height': body_height + 24})
-                    screenshot = await page.screenshot(type='png', omit_background=False)
-                finally:
-                    await page.close()
+            screenshot = await self._render(
+                html,
+                width=1180,
+                height=900,
+                scale=3,
+                wait_ms=150,
+                pad=24,
+                wait_for_fonts=True,
+                wait_until='domcontentloaded',
+            )
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
@@ -3996,10 +3996,14 @@ class ServerStatsToggleView(discord.ui.View):
         guild = interaction.guild
         if is_rivals_game(game):
             data = await self.cog._gather_rivals_serverstats_data(guild, game, monthly=new_monthly)
-            image = await self.cog.stats_generator.generate_rivals_serverstats_image(data)
+            image = await self.cog.stats_generator.generate_rivals_serverstats_image(
+                data, cache_tags=(f"game:{game.game_id}",)
+            )
         else:
             data = await self.cog._gather_serverstats_data(guild, game, monthly=new_monthly)
-            image = await self.cog.stats_generator.generate_serverstats_image(data)
+            image = await self.cog.stats_generator.generate_serverstats_image(
+                data, cache_tags=(f"game:{game.game_id}",)
+            )
         if image:
             image.seek(0)
             filename = 'serverstats.png'
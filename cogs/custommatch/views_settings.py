@@ -1490,6 +1490,8 @@ class StatsWipeConfirmView(discord.ui.View):
                 # Clear admin stat adjustments — must be wiped with stats or they re-apply
                 # on next restart via reconcile_player_stats(), corrupting the fresh season
                 await db.execute("DELETE FROM admin_stat_adjustments")
+                await db.execute("DELETE FROM monthly_player_stats")
+                await db.execute("DELETE FROM player_streaks")
 
                 # Clear stale stats retry rows (completed/exhausted) — pending rows for
                 # active matches are intentionally left so in-flight fetches can finish
@@ -1529,7 +1531,7 @@ class TestStatsCardView(discord.ui.View):
         await interaction.response.defer()
 
         # Check if stats generator is available
-        if not self.cog.stats_generator.browser:
+        if not self.cog.stats_generator.renderer:
             await interaction.followup.send(
                 "**Stats Card Generator Status: NOT WORKING**\n\n"
                 "The Playwright browser is not initialized.\n"
@@ -1664,7 +1666,7 @@ class TestStatsCardView(discord.ui.View):
         await interaction.response.defer()
 
         # Check if stats generator is available
-        if not self.cog.stats_generator.browser:
+        if not self.cog.stats_generator.renderer:
             await interaction.followup.send(
                 "**Stats Card Generator Status: NOT WORKING**\n\n"
                 "Playwright browser not initialized. Stats will use embeds only.",
@@ -12,6 +12,8 @@ import json
 import logging
 from pathlib import Path
 
+from utils import database
+
 # =====================================================================================
 # UTILS & CONSTANTS
 # =====================================================================================
@@ -28,6 +30,20 @@ POST_TIME = time(19, 0)  # 7 PM CT
 QUOTE_TIMEZONE = ZoneInfo("America/Chicago")
 DEFAULT_LOW_QUOTE_ALERT_DAYS = 30
 
+# Shuffled deck of quote IDs kept alongside the quotes table. Each quote is
+# dealt a random position once; a draw takes the lowest undrawn position (per
+# difficulty when possible) and the deck is reshuffled only when it runs dry.
+QUOTE_DECK_SCHEMA = """
+CREATE TABLE IF NOT EXISTS quote_deck (
+    quote_id INTEGER PRIMARY KEY,
+    difficulty TEXT NOT NULL DEFAULT 'easy',
+    drawn INTEGER NOT NULL DEFAULT 0,
+    position INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_deck_draw ON quote_deck(drawn, difficulty, position);
+CREATE INDEX IF NOT EXISTS idx_deck_order ON quote_deck(drawn, position);
+"""
+
 def load_config_quote():
     if os.path.exists(CONFIG_FILE_QUOTE):
         try:
@@ -187,9 +203,6 @@ class QuotePreviewConfirmDenyView(discord.ui.View):
 
         async with self.cog.config_lock:
             global_data = self.cog.get_global_data()
-            used = global_data.get("used_quote_ids", [])
-            if denied_id and denied_id in used:
-                used.remove(denied_id)
             global_data["pending_question_data"] = None
             self.cog.config_is_dirty = True
 
@@ -276,11 +289,7 @@ class ResetQuestionsConfirmView(discord.ui.View):
 
     @discord.ui.button(label="Confirm Reset", style=discord.ButtonStyle.danger)
     async def confirm(self, interaction: discord.Interaction, button: discord.ui.Button):
-        async with self.cog.config_lock:
-            global_data = self.cog.get_global_data()
-            count = len(global_data.get("used_quote_ids", []))
-            global_data["used_quote_ids"] = []
-            self.cog.config_is_dirty = True
+        count = await self.cog._reset_quote_deck()
         for item in self.children:
             item.disabled = True
         await interaction.response.edit_message(
@@ -559,8 +568,7 @@ class QuoteAdminPanelView(discord.ui.View):
 
     @discord.ui.button(label="Reset Questions", style=discord.ButtonStyle.danger, row=2)
     async def reset_questions(self, interaction: discord.Interaction, button: discord.ui.Button):
-        async with self.cog.config_lock:
-            count = len(self.cog.get_global_data().get("used_quote_ids", []))
+        count = await self.cog._count_used_quotes()
         total = await self.cog._get_total_quotes()
         await interaction.response.send_message(
             f"This will reset **{count}** used questions back to the unused pool ({total} total).\nAre you sure?",
@@ -594,7 +602,7 @@ class QuoteAdminPanelView(discord.ui.View):
         db_titles = 0
         if os.path.exists(self.cog.db_path):
             try:
-                async with aiosqlite.connect(self.cog.db_path) as db:
+                async with database.connect(self.cog.db_path) as db:
                     async with db.execute("SELECT COUNT(*) FROM quotes") as c:
                         db_total = (await c.fetchone())[0]
                     async with db.execute("SELECT COUNT(DISTINCT movie_title) FROM quotes") as c:
@@ -602,7 +610,7 @@ class QuoteAdminPanelView(discord.ui.View):
             except Exception as e:
                 log_quote.error(f"Error reading DB stats: {e}")
 
-        used_count = len(global_data.get("used_quote_ids", []))
+        used_count = await self.cog._count_used_quotes()
         remaining = db_total - used_count
         today_attempts = len(global_data.get("daily_interactions", []))
         alert_days = cfg.get("low_quote_alert_days", DEFAULT_LOW_QUOTE_ALERT_DAYS)
@@ -623,7 +631,7 @@ class QuoteAdminPanelView(discord.ui.View):
         dist_info = "Not loaded"
         if os.path.exists(self.cog.distractors_db_path):
             try:
-                async with aiosqlite.connect(self.cog.distractors_db_path) as ddb:
+                async with database.connect(self.cog.distractors_db_path) as ddb:
                     async with ddb.execute("SELECT COUNT(*) FROM titles") as c:
                         dist_titles = (await c.fetchone())[0]
                     async with ddb.execute("SELECT COUNT(DISTINCT character_name) FROM characters") as c:
@@ -686,6 +694,7 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
         self.bot.add_view(QuotePreviewView(self))
         # Detect new schema columns for graceful fallback
         await self._check_db_schema()
+        await self._sync_quote_deck()
 
     async def _check_db_schema(self):
         """Detect which columns exist so we can fall back gracefully on old DBs."""
@@ -696,7 +705,7 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
         if not os.path.exists(self.db_path):
             return
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 async with db.execute("PRAGMA table_info(quotes)") as cursor:
                     columns = {row[1] async for row in cursor}
             self._has_difficulty = "difficulty" in columns
@@ -755,7 +764,6 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
             "user_stats": {},
             "daily_question_data": None,
             "daily_interactions": [],
-            "used_quote_ids": [],
             "blocked_users": [],
             "pending_question_data": None,
         }
@@ -886,16 +894,13 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
 
                 reverted += 1
 
-            # Remove the quote from used pool so it can be reused correctly
             quote_id = q_data.get("quote_id") if q_data else None
-            used = global_data.get("used_quote_ids", [])
-            if quote_id and quote_id in used:
-                used.remove(quote_id)
-
             global_data["daily_interactions"] = []
             global_data["daily_question_data"] = None
             self.config_is_dirty = True
 
+        # Put the quote back in the deck so it can be reused correctly
+        await self._release_quote(quote_id)
         await self.save_config_now()
 
         return (
@@ -965,7 +970,7 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
         if not os.path.exists(self.db_path):
             return 0
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 async with db.execute("SELECT COUNT(*) FROM quotes") as c:
                     return (await c.fetchone())[0]
         except Exception:
@@ -973,9 +978,81 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
 
     async def _get_remaining_quotes(self) -> int:
         total = await self._get_total_quotes()
+        return total - await self._count_used_quotes()
+
+    # === Quote Deck ===
+
+    async def _deal_new_quotes(self, db: database.Connection):
+        """Give quotes missing from the deck a random position and drop rows for deleted quotes."""
+        difficulty_col = "difficulty" if self._has_difficulty else "'easy'"
+        await db.execute(
+            f"INSERT OR IGNORE INTO quote_deck (quote_id, difficulty, position) "
+            f"SELECT id, {difficulty_col}, random() FROM quotes"
+        )
+        await db.execute("DELETE FROM quote_deck WHERE quote_id NOT IN (SELECT id FROM quotes)")
+
+    async def _sync_quote_deck(self):
+        """Create the deck if needed, bring it in line with the quotes table and fold in legacy used_quote_ids."""
+        if not os.path.exists(self.db_path):
+            return
         async with self.config_lock:
-            used = len(self.get_global_data().get("used_quote_ids", []))
-        return total - used
+            legacy_used = self.get_global_data().get("used_quote_ids")
+        try:
+            async with database.connect(self.db_path) as db:
+                await db.executescript(QUOTE_DECK_SCHEMA)
+                await self._deal_new_quotes(db)
+                if self._has_difficulty:
+                    # Difficulty overrides may have changed since the quote was dealt
+                    await db.execute(
+                        "UPDATE quote_deck SET difficulty = (SELECT difficulty FROM quotes WHERE id = quote_id) "
+                        "WHERE difficulty IS NOT (SELECT difficulty FROM quotes WHERE id = quote_id)"
+                    )
+                if legacy_used:
+                    await db.executemany(
+                        "UPDATE quote_deck SET drawn = 1 WHERE quote_id = ?", [(qid,) for qid in legacy_used]
+                    )
+                await db.commit()
+        except Exception as e:
+            log_quote.error(f"Failed to sync quote deck: {e}")
+            return
+        if legacy_used is not None:
+            async with self.config_lock:
+                self.get_global_data().pop("used_quote_ids", None)
+                self.config_is_dirty = True
+            log_quote.info(f"Migrated {len(legacy_used)} used_quote_ids into the quote deck.")
+
+    async def _count_used_quotes(self) -> int:
+        if not os.path.exists(self.db_path):
+            return 0
+        try:
+            async with database.connect(self.db_path) as db:
+                async with db.execute("SELECT COUNT(*) FROM quote_deck WHERE drawn = 1") as c:
+                    return (await c.fetchone())[0]
+        except Exception:
+            return 0
+
+    async def _release_quote(self, quote_id: int | None):
+        """Return a drawn quote to the unused pool, keeping its deck position."""
+        if not quote_id or not os.path.exists(self.db_path):
+            return
+        try:
+            async with database.connect(self.db_path) as db:
+                await db.execute("UPDATE quote_deck SET drawn = 0 WHERE quote_id = ?", (quote_id,))
+                await db.commit()
+        except Exception as e:
+            log_quote.error(f"Failed to release quote ID {quote_id}: {e}")
+
+    async def _reset_quote_deck(self) -> int:
+        """Return every drawn quote to the pool and reshuffle. Returns how many were returned."""
+        if not os.path.exists(self.db_path):
+            return 0
+        async with database.connect(self.db_path) as db:
+            async with db.execute("SELECT COUNT(*) FROM quote_deck WHERE drawn = 1") as c:
+                count = (await c.fetchone())[0]
+            await self._deal_new_quotes(db)
+            await db.execute("UPDATE quote_deck SET drawn = 0, position = random()")
+            await db.commit()
+        return count
 
     def _pick_difficulty(self) -> str:
         """Weighted random: ~75% easy, ~20% medium, ~5% hard."""
@@ -992,11 +1069,8 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
             log_quote.error(f"Database not found at {self.db_path}")
             return None
 
-        async with self.config_lock:
-            used_ids = self.get_global_data().get("used_quote_ids", [])
-
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 db.row_factory = aiosqlite.Row
 
                 async with db.execute("SELECT COUNT(*) FROM quotes") as cursor:
@@ -1006,38 +1080,32 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
                     log_quote.error("No quotes found in database.")
                     return None
 
-                if len(used_ids) >= total_available:
-                    log_quote.info("All quotes have been used. Resetting used_quote_ids.")
-                    used_ids = []
-                    async with self.config_lock:
-                        self.get_global_data()["used_quote_ids"] = []
-                        self.config_is_dirty = True
+                async with db.execute("SELECT 1 FROM quote_deck WHERE drawn = 0 LIMIT 1") as cursor:
+                    deck_has_quotes = await cursor.fetchone() is not None
+                if not deck_has_quotes:
+                    log_quote.info("All quotes have been used. Reshuffling the quote deck.")
+                    await self._deal_new_quotes(db)
+                    await db.execute("UPDATE quote_deck SET drawn = 0, position = random()")
+                    await db.commit()
 
                 # Weighted difficulty selection (falls back if difficulty column missing)
                 row = None
                 difficulty = "easy"
                 if self._has_difficulty:
                     difficulty = self._pick_difficulty()
-                    if used_ids:
-                        placeholders = ",".join("?" for _ in used_ids)
-                        query = f"SELECT * FROM quotes WHERE id NOT IN ({placeholders}) AND difficulty = ? ORDER BY RANDOM() LIMIT 1"
-                        params = used_ids + [difficulty]
-                    else:
-                        query = "SELECT * FROM quotes WHERE difficulty = ? ORDER BY RANDOM() LIMIT 1"
-                        params = [difficulty]
-                    async with db.execute(query, params) as cursor:
+                    async with db.execute(
+                        "SELECT q.* FROM quote_deck d JOIN quotes q ON q.id = d.quote_id "
+                        "WHERE d.drawn = 0 AND d.difficulty = ? ORDER BY d.position LIMIT 1",
+                        (difficulty,)
+                    ) as cursor:
                         row = await cursor.fetchone()
 
                 # Fallback: any difficulty
                 if not row:
-                    if used_ids:
-                        placeholders = ",".join("?" for _ in used_ids)
-                        query = f"SELECT * FROM quotes WHERE id NOT IN ({placeholders}) ORDER BY RANDOM() LIMIT 1"
-                        params = used_ids
-                    else:
-                        query = "SELECT * FROM quotes ORDER BY RANDOM() LIMIT 1"
-                        params = []
-                    async with db.execute(query, params) as cursor:
+                    async with db.execute(
+                        "SELECT q.* FROM quote_deck d JOIN quotes q ON q.id = d.quote_id "
+                        "WHERE d.drawn = 0 ORDER BY d.position LIMIT 1"
+                    ) as cursor:
                         row = await cursor.fetchone()
                     if row and self._has_difficulty:
                         difficulty = row["difficulty"]
@@ -1082,11 +1150,11 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
                         # Both types are problematic — skip this quote and try another
                         log_quote.info(f"Skipping ambiguous quote {quote_id} (franchise char + name leaked)")
                         skipped_ids.append(quote_id)
-                        skip_exclude = used_ids + skipped_ids
-                        placeholders = ",".join("?" for _ in skip_exclude)
+                        placeholders = ",".join("?" for _ in skipped_ids)
                         async with db.execute(
-                            f"SELECT * FROM quotes WHERE id NOT IN ({placeholders}) ORDER BY RANDOM() LIMIT 1",
-                            skip_exclude
+                            f"SELECT q.* FROM quote_deck d JOIN quotes q ON q.id = d.quote_id "
+                            f"WHERE d.drawn = 0 AND d.quote_id NOT IN ({placeholders}) ORDER BY d.position LIMIT 1",
+                            skipped_ids
                         ) as cursor:
                             row = await cursor.fetchone()
                         if not row:
@@ -1143,9 +1211,8 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
                 random.shuffle(answers)
                 correct_index = answers.index(correct)
 
-                async with self.config_lock:
-                    self.get_global_data().setdefault("used_quote_ids", []).append(quote_id)
-                    self.config_is_dirty = True
+                await db.execute("UPDATE quote_deck SET drawn = 1 WHERE quote_id = ?", (quote_id,))
+                await db.commit()
 
                 return {
                     "quote": quote_text,
@@ -1164,7 +1231,7 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
             log_quote.error(f"Database error generating daily question: {e}", exc_info=True)
             return None
 
-    async def _get_movie_distractors(self, db: aiosqlite.Connection, correct_title: str,
+    async def _get_movie_distractors(self, db: database.Connection, correct_title: str,
                                       genre: str, year: int | None = None,
                                       is_tv: int = 0, curated_json: str | None = None,
                                       character: str | None = None) -> list:
@@ -1180,7 +1247,7 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
 
         # Step 2: TMDb distractors pool (primary source)
         if os.path.exists(self.distractors_db_path):
-            distractors = await self._tmdb_title_distractors(correct_title, genre, year, is_tv, character)
+            distractors = await self._tmdb_title_distractors(db, correct_title, genre, year, is_tv, character)
             if len(distractors) >= 3:
                 return distractors[:3]
         else:
@@ -1201,10 +1268,45 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
 
         return distractors[:3]
 
-    async def _tmdb_title_distractors(self, correct_title: str, genre: str,
+    async def _lookup_distractor_candidates(self, question_type: str, movie_title: str,
+                                            character: str) -> list | None:
+        """Fetch the precomputed candidate tiers built by build_distractors_db.py, if any."""
+        try:
+            async with database.connect(self.distractors_db_path) as ddb:
+                async with ddb.execute(
+                    "SELECT tiers FROM distractor_candidates WHERE question_type = ? AND movie_title = ? AND character = ?",
+                    (question_type, movie_title, character)
+                ) as cursor:
+                    row = await cursor.fetchone()
+        except aiosqlite.OperationalError:
+            # distractors.db predates the candidate index
+            return None
+        return json.loads(row[0]) if row else None
+
+    @staticmethod
+    def _sample_distractor_tiers(tiers: list, ordered_first: bool = False) -> list:
+        """Pick 3 distractors from the best tiers first; the first tier keeps its order if asked."""
+        picked = []
+        for i, tier in enumerate(tiers):
+            needed = 3 - len(picked)
+            if needed <= 0:
+                break
+            if i == 0 and ordered_first:
+                picked.extend(tier[:needed])
+            else:
+                picked.extend(random.sample(tier, min(needed, len(tier))))
+        return picked
+
+    async def _tmdb_title_distractors(self, db: database.Connection, correct_title: str, genre: str,
                                        year: int | None, is_tv: int,
                                        character: str | None = None) -> list:
         """Query distractors.db for believable movie/show title distractors."""
+        if character:
+            tiers = await self._lookup_distractor_candidates("movie", correct_title, character)
+            if tiers is not None:
+                return self._sample_distractor_tiers(tiers)
+
+        # Fallback for quotes added since the candidate index was built
         genres = [g.strip() for g in genre.split(",")]
         primary_genre = genres[0] if genres else ""
         distractors = []
@@ -1212,17 +1314,13 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
         # Build franchise-sibling exclusion from quotes DB
         franchise_exclude = set()
         if character:
-            try:
-                async with aiosqlite.connect(self.db_path) as qdb:
-                    async with qdb.execute(
-                        "SELECT DISTINCT movie_title FROM quotes WHERE character = ? AND movie_title != ?",
-                        (character, correct_title)
-                    ) as cursor:
-                        franchise_exclude = {r[0] for r in await cursor.fetchall()}
-            except Exception:
-                pass
+            async with db.execute(
+                "SELECT DISTINCT movie_title FROM quotes WHERE character = ? AND movie_title != ?",
+                (character, correct_title)
+            ) as cursor:
+                franchise_exclude = {r[0] for r in await cursor.fetchall()}
 
-        async with aiosqlite.connect(self.distractors_db_path) as ddb:
+        async with database.connect(self.distractors_db_path) as ddb:
             base_exclude = [correct_title] + list(franchise_exclude)
 
             # Tier A: Same type + primary genre + same decade
@@ -1269,7 +1367,7 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
 
         return distractors[:3]
 
-    async def _get_character_distractors(self, db: aiosqlite.Connection, correct_character: str,
+    async def _get_character_distractors(self, db: database.Connection, correct_character: str,
                                           movie_title: str, genre: str,
                                           year: int | None = None, is_tv: int = 0,
                                           curated_json: str | None = None) -> list:
@@ -1311,11 +1409,16 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
     async def _tmdb_character_distractors(self, correct_character: str, movie_title: str,
                                            genre: str, year: int | None, is_tv: int) -> list:
         """Query distractors.db for believable character name distractors."""
+        tiers = await self._lookup_distractor_candidates("character", movie_title, correct_character)
+        if tiers is not None:
+            return self._sample_distractor_tiers(tiers, ordered_first=True)
+
+        # Fallback for quotes added since the candidate index was built
         genres = [g.strip() for g in genre.split(",")]
         primary_genre = genres[0] if genres else ""
         distractors = []
 
-        async with aiosqlite.connect(self.distractors_db_path) as ddb:
+        async with database.connect(self.distractors_db_path) as ddb:
             exclude = [correct_character]
 
             # Tier A: Characters from the SAME movie in TMDb (best possible distractors)
@@ -1365,14 +1468,14 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
 
         return distractors[:3]
 
-    async def _pad_distractors(self, db: aiosqlite.Connection, correct: str, question_type: str, existing: list) -> list:
+    async def _pad_distractors(self, db: database.Connection, correct: str, question_type: str, existing: list) -> list:
         needed = 3 - len(existing)
         if needed <= 0:
             return existing
 
         # Try TMDb pool first
         if os.path.exists(self.distractors_db_path):
-            async with aiosqlite.connect(self.distractors_db_path) as ddb:
+            async with database.connect(self.distractors_db_path) as ddb:
                 exclude = [correct] + existing
                 excl_ph = ",".join("?" for _ in exclude)
                 if question_type == "movie":
@@ -1565,25 +1668,21 @@ class DailyQuote(commands.Cog, name="DailyQuote"):
         if not quote_id or not os.path.exists(self.db_path):
             return
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 await db.execute("DELETE FROM quotes WHERE id = ?", (quote_id,))
+                await db.execute("DELETE FROM quote_deck WHERE quote_id = ?", (quote_id,))
                 await db.commit()
             log_quote.info(f"Deleted used quote ID {quote_id} from database")
         except Exception as e:
             log_quote.error(f"Failed to delete quote ID {quote_id}: {e}")
 
     async def _retire_old_question(self):
-        """Delete the outgoing daily question from DB and clean used_quote_ids."""
+        """Delete the outgoing daily question from the DB and its quote deck."""
         async with self.config_lock:
-            global_data = self.get_global_data()
-            old_q = global_data.get("daily_question_data")
+            old_q = self.get_global_data().get("daily_question_data")
             if not old_q:
                 return
             old_id = old_q.get("quote_id")
-            used = global_data.get("used_quote_ids", [])
-            if old_id and old_id in used:
-                used.remove(old_id)
-                self.config_is_dirty = True
         await self._delete_quote_from_db(old_id)
 
     async def _trigger_daily_post(self, guild: discord.Guild):
@@ -11,7 +11,6 @@ import json
 import re
 import unicodedata
 import zoneinfo
-from collections import OrderedDict
 from io import BytesIO
 from PIL import Image
 from bs4 import BeautifulSoup
@@ -31,7 +30,9 @@ from .esports_shared import (
     VCT_CHALLENGERS_SUBREGION_KEYWORDS,
     LIQUIPEDIA_GAME_SLUGS, GAME_MAP_FALLBACK,
     logger, ensure_data_file, load_data_sync, save_data_sync,
-    safe_parse_datetime, get_game_vote_emoji, stitch_images, add_white_outline,
+    is_match_processed, purge_expired_data,
+    safe_parse_datetime, get_game_vote_emoji, add_white_outline,
+    EsportsImageCache, banner_layout, logo_target_size, compose_banner, placeholder_logo,
     LeaderboardView, VoteRevealView, VoteCycleView, BatchVoteRevealView, ResultDetailsView, EsportsAdminView,
     UnifiedUpcomingView, UnifiedResultView,
     MAX_LEADERBOARD_NAME_LENGTH, MAX_MAP_NAME_LENGTH
@@ -68,7 +69,8 @@ class GeminiMapClient:
     MODEL_NAME = "gemini-2.5-flash"
     API_BASE = "https://generativelanguage.googleapis.com/v1beta"
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, http, api_key: Optional[str] = None):
+        self.http = http
         self.api_key = api_key or os.environ.get("GEMINI_API_KEY_ESPORTS") or os.environ.get("GEMINI_API_KEY") or os.environ.get("GOOGLE_API_KEY")
         self._semaphore = asyncio.Semaphore(1)
         self._rate_limited_until: float = 0.0  # monotonic time
@@ -187,27 +189,24 @@ class GeminiMapClient:
             body["tools"] = [{"google_search": {}}]
 
         try:
-            timeout = aiohttp.ClientTimeout(total=60)
             async with self._semaphore:
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.post(
-                        url, json=body, params={"key": self.api_key}
-                    ) as resp:
-                        if resp.status == 429:
-                            # Back off for 5 minutes so scoreboard OCR gets
-                            # priority on the shared free-tier quota.
-                            self._rate_limited_until = _time.monotonic() + 300
-                            logger.warning(
-                                "GeminiMapClient: 429 rate limited — backing off 5 min"
-                            )
-                            return ""
-                        if resp.status != 200:
-                            error_text = await resp.text()
-                            logger.warning(
-                                f"Gemini API error {resp.status}: {error_text[:500]}"
-                            )
-                            return ""
-                        data = await resp.json()
+                resp = await self.http.post(
+                    url, json_body=body, params={"key": self.api_key}, timeout=60
+                )
+            if resp.status == 429:
+                # Back off for 5 minutes so scoreboard OCR gets
+                # priority on the shared free-tier quota.
+                self._rate_limited_until = _time.monotonic() + 300
+                logger.warning(
+                    "GeminiMapClient: 429 rate limited — backing off 5 min"
+                )
+                return ""
+            if resp.status != 200:
+                logger.warning(
+                    f"Gemini API error {resp.status}: {resp.text()[:500]}"
+                )
+                return ""
+            data = resp.json()
         except asyncio.TimeoutError:
             logger.warning("Gemini API call timed out")
             return ""
@@ -786,11 +785,11 @@ class Esports(commands.Cog):
         self.processing_matches = set() 
         self.test_game_idx = 0
         
-        self.image_cache = OrderedDict()
-        self.max_cache_size = MAX_IMAGE_CACHE_SIZE
+        self.http = bot.http_client
+        self.images = EsportsImageCache(self.http, max_images=MAX_IMAGE_CACHE_SIZE)
         
         self.emoji_map_cache = {}
-        self.gemini_maps = GeminiMapClient()
+        self.gemini_maps = GeminiMapClient(self.http)
 
         ensure_data_file()
         self._update_emoji_cache()
@@ -824,16 +823,14 @@ class Esports(commands.Cog):
         headers = {"Authorization": f"Bearer {self.api_key}"}
         url = f"https://api.pandascore.co{endpoint}"
         
-        timeout = aiohttp.ClientTimeout(total=30)
         for attempt in range(3):
             try:
-                async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(url, headers=headers, params=params) as resp:
-                        if resp.status == 200: return await resp.json()
-                        elif resp.status == 429:
-                            await asyncio.sleep(int(resp.headers.get("Retry-After", 2 ** attempt)))
-                        elif resp.status >= 500: await asyncio.sleep(1)
-                        else: return None
+                resp = await self.http.get(url, headers=headers, params=params, timeout=30, conditional=True)
+                if resp.status == 200: return resp.json()
+                elif resp.status == 429:
+                    await asyncio.sleep(int(resp.headers.get("Retry-After", 2 ** attempt)))
+                elif resp.status >= 500: await asyncio.sleep(1)
+                else: return None
             except Exception as e:
                 logger.debug(f"API request attempt {attempt+1} failed: {e}")
                 await asyncio.sleep(1)
@@ -841,16 +838,6 @@ class Esports(commands.Cog):
 
     # Regex to reject strings that look like times (e.g. "17:00UTC") instead of player names
     _TIME_PATTERN = re.compile(r'^\d{1,2}:\d{2}')
-    _last_liquipedia_request = 0.0  # rate limiter timestamp
-
-    async def _liquipedia_rate_limit(self):
-        """Enforce Liquipedia MediaWiki API rate limit: 1 request per 5 seconds."""
-        import time
-        now = time.monotonic()
-        elapsed = now - self._last_liquipedia_request
-        if elapsed < 5.0:
-            await asyncio.sleep(5.0 - elapsed)
-        Esports._last_liquipedia_request = time.monotonic()
 
     @staticmethod
     def _is_valid_player_name(name: str) -> bool:
@@ -887,14 +874,12 @@ class Esports(commands.Cog):
         }
 
         try:
-            await self._liquipedia_rate_limit()
-            timeout = aiohttp.ClientTimeout(total=15)
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                async with session.get(api_url, params=params) as resp:
-                    if resp.status != 200:
-                        logger.debug(f"Liquipedia API returned {resp.status} for {team_slug}")
-                        return []
-                    data = await resp.json()
+            # liquipedia.net is throttled to 1 request / 5s by the shared client
+            resp = await self.http.get(api_url, params=params, headers=headers, timeout=15, conditional=True)
+            if resp.status != 200:
+                logger.debug(f"Liquipedia API returned {resp.status} for {team_slug}")
+                return []
+            data = resp.json()
 
             parse_data = data.get('parse', {})
             html_content = parse_data.get('text', {}).get('*', '')
@@ -1014,14 +999,11 @@ class Esports(commands.Cog):
         }
 
         try:
-            await self._liquipedia_rate_limit()
-            timeout = aiohttp.ClientTimeout(total=15)
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                async with session.get(api_url, params=params) as resp:
-                    if resp.status != 200:
-                        logger.debug(f"Liquipedia verification: page returned {resp.status}, passing all matches through")
-                        return pending_new
-                    data = await resp.json()
+            resp = await self.http.get(api_url, params=params, headers=headers, timeout=15, conditional=True)
+            if resp.status != 200:
+                logger.debug(f"Liquipedia verification: page returned {resp.status}, passing all matches through")
+                return pending_new
+            data = resp.json()
 
             html = data.get('parse', {}).get('text', {}).get('*', '')
             if not html:
@@ -1085,14 +1067,11 @@ class Esports(commands.Cog):
         }
 
         try:
-            await self._liquipedia_rate_limit()
-            timeout = aiohttp.ClientTimeout(total=15)
-            async with aiohttp.ClientSession(timeout=timeout, headers=headers) as session:
-                async with session.get(api_url, params=params) as resp:
-                    if resp.status != 200:
-                        logger.debug(f"Liquipedia Matches page returned {resp.status}")
-                        return None
-                    data = await resp.json()
+            resp = await self.http.get(api_url, params=params, headers=headers, timeout=15, conditional=True)
+            if resp.status != 200:
+                logger.debug(f"Liquipedia Matches page returned {resp.status}")
+                return None
+            data = resp.json()
 
             html = data.get('parse', {}).get('text', {}).get('*', '')
             if not html:
@@ -1571,57 +1550,49 @@ class Esports(commands.Cog):
         return all(m.get("winner") in (0, 1) for m in map_data)
 
     # --- IMAGE & EMOJI MANAGEMENT ---
-    async def download_image(self, session, url):
-        if not url or not url.startswith(('http', 'https')): return None
-        if url in self.image_cache: 
-            self.image_cache.move_to_end(url)
-            return self.image_cache[url].copy()
-
-        try:
-            async def fetch(s):
-                async with s.get(url, timeout=10) as resp:
-                    if resp.status == 200:
-                        data = await resp.read()
-                        img = Image.open(BytesIO(data)).convert("RGBA")
-                        if len(self.image_cache) >= self.max_cache_size: self.image_cache.popitem(last=False)
-                        self.image_cache[url] = img
-                        return img.copy()
-            
-            if session: return await fetch(session)
-            async with aiohttp.ClientSession() as s: return await fetch(s)
-        except Exception as e:
-            logger.debug(f"Image download failed for {url}: {e}")
-            return None
-
     async def generate_banner(self, url_a, url_b, url_game, game_slug, is_result=False):
         t_ph = GAME_PLACEHOLDERS.get(game_slug, DEFAULT_GAME_ICON_FALLBACK)
 
-        # Download the three primary images in parallel
-        async with aiohttp.ClientSession() as session:
-            img_a, img_b, img_g = await asyncio.gather(
-                self.download_image(session, url_a),
-                self.download_image(session, url_b),
-                self.download_image(session, url_game),
-            )
-            # Only download placeholders if a primary image failed
-            img_team_p = None
-            img_game_p = None
-            needs = []
-            if not img_a or not img_b:
-                needs.append(('team', t_ph))
-            if not img_g:
-                needs.append(('game', DEFAULT_GAME_ICON_FALLBACK))
-            if needs:
-                results = await asyncio.gather(
-                    *(self.download_image(session, url) for _, url in needs)
-                )
-                for (kind, _), result in zip(needs, results):
-                    if kind == 'team':
-                        img_team_p = result
-                    else:
-                        img_game_p = result
+        # Resolve the three primary images in parallel (disk cache first, network on miss/stale)
+        logo_a, logo_b, logo_g = await asyncio.gather(
+            self.images.get_logo(url_a),
+            self.images.get_logo(url_b),
+            self.images.get_logo(url_game),
+        )
+        # Only resolve placeholders if a primary image failed
+        team_p = None
+        game_p = None
+        if not logo_a or not logo_b:
+            team_p = await self.images.get_logo(t_ph)
+        if not logo_g:
+            game_p = await self.images.get_logo(DEFAULT_GAME_ICON_FALLBACK)
+
+        blank = ("blank", placeholder_logo())
+        team_p = team_p or blank
+        game_p = game_p or blank
+        sources = {
+            "a": logo_a or team_p,
+            "b": logo_b or team_p,
+            "game": logo_g or game_p,
+        }
 
-        return await asyncio.to_thread(stitch_images, img_a, img_b, img_g, img_team_p, img_game_p, is_result, game_slug)
+        try:
+            key = self.images.banner_key(
+                (sources["a"][0], sources["b"][0], sources["game"][0]), game_slug, is_result
+            )
+            png = await self.images.banners.get(key)
+            if png is None:
+                placed = []
+                for role, slot, scale, outline in banner_layout(is_result, game_slug):
+                    digest, img = sources[role]
+                    variant = await self.images.get_variant(digest, img, logo_target_size(scale), outline)
+                    placed.append((slot, variant))
+                png = await asyncio.to_thread(compose_banner, placed)
+                await self.images.banners.put(key, png)
+            return discord.File(BytesIO(png), filename="match_banner.png")
+        except Exception as e:
+            logger.error(f"Banner generation failed: {e}")
+            return None
 
     async def manage_team_emojis(self, interaction: discord.Interaction) -> int:
         data = load_data_sync()
@@ -1671,73 +1642,72 @@ class Esports(commands.Cog):
         emoji_map = data.get("emoji_map", {})
         added_count = 0
 
-        async with aiohttp.ClientSession() as session:
-            for img_url, team_info in teams_by_logo.items():
-                keys = team_info["keys"]
-                if not keys:
-                    continue
+        for img_url, team_info in teams_by_logo.items():
+            keys = team_info["keys"]
+            if not keys:
+                continue
 
-                # Check if this team already has an emoji (any key already mapped)
-                existing_emoji = None
-                for key in keys:
-                    if key in emoji_map:
-                        existing_emoji = emoji_map[key]
-                        break
+            # Check if this team already has an emoji (any key already mapped)
+            existing_emoji = None
+            for key in keys:
+                if key in emoji_map:
+                    existing_emoji = emoji_map[key]
+                    break
 
-                if existing_emoji:
-                    # Backfill: map any missing keys to the same existing emoji
-                    backfilled = False
-                    for key in keys:
-                        if key not in emoji_map:
-                            emoji_map[key] = existing_emoji
-                            backfilled = True
-                    if backfilled:
-                        async with self.data_lock:
-                            d = load_data_sync()
-                            d["emoji_map"] = emoji_map
-                            save_data_sync(d)
-                    continue
+            if existing_emoji:
+                # Backfill: map any missing keys to the same existing emoji
+                backfilled = False
+                for key in keys:
+                    if key not in emoji_map:
+                        emoji_map[key] = existing_emoji
+                        backfilled = True
+                if backfilled:
+                    async with self.data_lock:
+                        d = load_data_sync()
+                        d["emoji_map"] = emoji_map
+                        save_data_sync(d)
+                continue
 
-                # Upload ONE emoji for this team
-                if added_count >= 150:
-                    break
+            # Upload ONE emoji for this team
+            if added_count >= 150:
+                break
 
-                target = next((g for g in target_guilds if len(g.emojis) < g.emoji_limit), None)
-                if not target:
-                    break
+            target = next((g for g in target_guilds if len(g.emojis) < g.emoji_limit), None)
+            if not target:
+                break
 
-                try:
-                    async with session.get(img_url) as resp:
-                        if resp.status != 200:
-                            continue
-                        img_data = await resp.read()
+            try:
+                resp = await self.http.get(img_url)
+                if resp.status != 200:
+                    continue
+                img_data = resp.body
 
-                    img = Image.open(BytesIO(img_data)).convert("RGBA")
-                    img.thumbnail((128, 128))
-                    img = add_white_outline(img, thickness=3)
+                img = Image.open(BytesIO(img_data)).convert("RGBA")
+                img.thumbnail((128, 128))
+                img = add_white_outline(img, thickness=3)
 
-                    out = BytesIO()
-                    img.save(out, format="PNG")
-                    out.seek(0)
+                out = BytesIO()
+                img.save(out, format="PNG")
+                out.seek(0)
 
-                    # Use the shortest key for the emoji name
-                    primary_key = min(keys, key=len)
-                    emoji_name = f"esp_{primary_key}"[:32]
-                    new_emoji = await target.create_custom_emoji(name=emoji_name, image=out.read())
-                    emoji_str = str(new_emoji)
+                # Use the shortest key for the emoji name
+                primary_key = min(keys, key=len)
+                emoji_name = f"esp_{primary_key}"[:32]
+                new_emoji = await target.create_custom_emoji(name=emoji_name, image=out.read())
+                emoji_str = str(new_emoji)
 
-                    # Map ALL keys for this team to the single emoji
-                    async with self.data_lock:
-                        d = load_data_sync()
-                        for key in keys:
-                            d["emoji_map"][key] = emoji_str
-                        save_data_sync(d)
-                        emoji_map = d["emoji_map"]
+                # Map ALL keys for this team to the single emoji
+                async with self.data_lock:
+                    d = load_data_sync()
+                    for key in keys:
+                        d["emoji_map"][key] = emoji_str
+                    save_data_sync(d)
+                    emoji_map = d["emoji_map"]
 
-                    added_count += 1
-                    await asyncio.sleep(1.5)
-                except Exception as e:
-                    logger.error(f"Emoji upload failed for {team_info['name']}: {e}")
+                added_count += 1
+                await asyncio.sleep(1.5)
+            except Exception as e:
+                logger.error(f"Emoji upload failed for {team_info['name']}: {e}")
 
         return added_count
 
@@ -2323,8 +2293,8 @@ class Esports(commands.Cog):
             return
 
         async with self.data_lock:
+            if is_match_processed(match_id): return
             data = load_data_sync()
-            if match_id in data.get("processed_matches", []): return
             data["processed_matches"].append(match_id)
             if len(data["processed_matches"]) > MAX_PROCESSED_HISTORY: data["processed_matches"] = data["processed_matches"][-MAX_PROCESSED_HISTORY:]
 
@@ -2685,24 +2655,12 @@ class Esports(commands.Cog):
                     data["last_reset_month"] = cur_m
                     save_data_sync(data)
 
-                # Purge match history older than 7 days
-                history = data.get("match_history", {})
-                if history:
-                    now_utc = datetime.datetime.now(datetime.timezone.utc)
-                    expired = [
-                        mid for mid, mh in history.items()
-                        if (now_utc - safe_parse_datetime(mh.get("processed_at", ""))).total_seconds() > 7 * 86400
-                        if safe_parse_datetime(mh.get("processed_at"))
-                    ]
-                    if expired:
-                        for mid in expired:
-                            del history[mid]
-                        # Also purge corresponding map data cache entries
-                        map_cache = data.get("map_data_cache", {})
-                        for mid in expired:
-                            map_cache.pop(mid, None)
-                        logger.info(f"Purged {len(expired)} match history entries older than 7 days")
-                        save_data_sync(data)
+                # Purge match history (and its map data) older than 7 days, plus stale processed IDs
+                purged_processed, purged_history = purge_expired_data()
+                if purged_history:
+                    logger.info(f"Purged {purged_history} match history entries older than 7 days")
+                if purged_processed:
+                    logger.info(f"Purged {purged_processed} processed match IDs past retention")
 
             if not chan_id: return
             channel = self.bot.get_channel(chan_id)
@@ -2733,8 +2691,8 @@ class Esports(commands.Cog):
 
                     should_skip = False
                     async with self.data_lock:
-                        data = load_data_sync()
-                        if mid in data["active_matches"] or mid in data["processed_matches"]:
+                        data = load_data_sync("active_matches")
+                        if mid in data["active_matches"] or is_match_processed(mid):
                             should_skip = True
 
                         # Team-pair dedup: PandaScore can regenerate match IDs for the same matchup
@@ -2887,7 +2845,7 @@ class Esports(commands.Cog):
                                 )
                                 if map_data and self._is_map_data_displayable(map_data):
                                     async with self.data_lock:
-                                        d = load_data_sync()
+                                        d = load_data_sync("map_data_cache")
                                         if "map_data_cache" not in d:
                                             d["map_data_cache"] = {}
                                         d["map_data_cache"][mid] = {"maps": map_data, "fetched_at": now.isoformat()}
@@ -2939,8 +2897,7 @@ class Esports(commands.Cog):
 
                     if w_idx != -1:
                         async with self.data_lock:
-                            pre_check = load_data_sync()
-                            if mid in pre_check.get("processed_matches", []):
+                            if is_match_processed(mid):
                                 logger.info(f"Match {mid} already in processed_matches, skipping")
                                 to_remove.append(mid)
                                 games_needing_refresh.add(info.get('game_slug'))
@@ -2955,7 +2912,7 @@ class Esports(commands.Cog):
                             logger.info(f"Successfully fetched {len(map_data)} maps for match {mid}")
                             if self._is_map_data_displayable(map_data):
                                 async with self.data_lock:
-                                    d = load_data_sync()
+                                    d = load_data_sync("map_data_cache")
                                     if "map_data_cache" not in d:
                                         d["map_data_cache"] = {}
                                     d["map_data_cache"][mid] = {
@@ -3442,9 +3399,9 @@ class Esports(commands.Cog):
         """Background task to retry fetching map data for recent results missing it."""
         try:
             async with self.data_lock:
-                data = load_data_sync()
-                history = data.get("match_history", {})
-                cache = data.get("map_data_cache", {})
+                data = load_data_sync("match_history", "map_data_cache")
+                history = data["match_history"]
+                cache = data["map_data_cache"]
 
             now = datetime.datetime.now(datetime.timezone.utc)
             for mid, mh in history.items():
@@ -3490,7 +3447,7 @@ class Esports(commands.Cog):
 
                 # Record this attempt timestamp
                 async with self.data_lock:
-                    d = load_data_sync()
+                    d = load_data_sync("map_data_cache")
                     if "map_data_cache" not in d:
                         d["map_data_cache"] = {}
                     if mid not in d["map_data_cache"]:
@@ -3509,7 +3466,7 @@ class Esports(commands.Cog):
 
                     if map_data and self._is_map_data_displayable(map_data):
                         async with self.data_lock:
-                            d = load_data_sync()
+                            d = load_data_sync("map_data_cache")
                             if "map_data_cache" not in d:
                                 d["map_data_cache"] = {}
                             d["map_data_cache"][mid] = {
@@ -3737,7 +3694,7 @@ class Esports(commands.Cog):
 
         async with self.data_lock:
             d = load_data_sync()
-            if mid in d.get("active_matches", {}) or mid in d.get("processed_matches", []):
+            if mid in d.get("active_matches", {}) or is_match_processed(mid):
                 logger.info(f"Force publish: match {mid} already posted/processed")
                 return False
 
@@ -3805,9 +3762,7 @@ class Esports(commands.Cog):
             if not matches:
                 continue
             async with self.data_lock:
-                d = load_data_sync()
-                active = d.get("active_matches", {})
-                processed = d.get("processed_matches", [])
+                active = load_data_sync("active_matches")["active_matches"]
             # Build set of active team pairs for this game for dedup
             active_team_pairs = set()
             for info in active.values():
@@ -3821,7 +3776,7 @@ class Esports(commands.Cog):
                 mid = str(m['id'])
                 if len(m.get('opponents', [])) < 2:
                     continue
-                if mid in active or mid in processed:
+                if mid in active or is_match_processed(mid):
                     continue
                 # Team-pair dedup: skip if same teams already active
                 new_pair = frozenset({m['opponents'][0]['opponent']['id'], m['opponents'][1]['opponent']['id']})
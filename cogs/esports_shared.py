@@ -5,13 +5,17 @@ import datetime
 import asyncio
 import logging
 import secrets
-import shutil
+import sqlite3
 import re
+import hashlib
+from pathlib import Path
 from typing import Dict, List, Optional, Any, Union, Set, Tuple
 from PIL import Image, ImageOps, ImageFilter, ImageDraw, ImageFont
 from io import BytesIO
 from collections import OrderedDict
 
+from utils.render_cache import RenderCache
+
 # --- CONFIGURATION ---
 GAMES = {
     "valorant": "Valorant",
@@ -236,6 +240,14 @@ GAME_MAP_FALLBACK = {
 
 DATA_FILE = "data/esports_data.json"
 BACKUP_FILE = "data/esports_data.json.bak"
+DB_FILE = "data/esports.db"
+IMAGE_CACHE_DIR = Path("data/esports_images")
+LOGO_REVALIDATE_SECONDS = 24 * 3600
+LOGO_VARIANT_CACHE_MAX_BYTES = 50 * 1024 * 1024
+BANNER_CACHE_MAX_BYTES = 100 * 1024 * 1024
+BANNER_LAYOUT_VERSION = "v1"  # bump when banner_layout/compose_banner output changes
+PROCESSED_TTL_SECONDS = 30 * 86400  # processed IDs only guard against reposting recent matches
+HISTORY_TTL_SECONDS = 7 * 86400     # match history is kept for overturns
 MAX_LEADERBOARD_NAME_LENGTH = 12
 MAX_BUTTON_LABEL_LENGTH = 80
 MAX_MAP_NAME_LENGTH = 18
@@ -243,75 +255,317 @@ USERNAME_PATTERN = re.compile(r'^[\w\-\.]{2,20}$', re.UNICODE)
 
 logger = logging.getLogger("esports_shared")
 
-# --- DATA HELPERS ---
-def ensure_data_file():
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    
-    if not os.path.exists(DATA_FILE):
-        default_data = {
-            "channel_id": None,
-            "active_matches": {},
-            "processed_matches": [],
-            "leaderboards": {k: {} for k in GAMES.keys()},
-            "last_reset_month": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m"),
-            "emoji_map": {},
-            "emoji_storage_guilds": []
+# --- DATA STORE ---
+# Keyed sections get their own table so a tick that touches one match writes
+# one row.  Everything else (channel_id, emoji maps, ...) lives in `kv`.
+_SECTION_TABLES = {
+    "active_matches": "active_matches",
+    "match_history": "match_history",
+    "map_data_cache": "map_data_cache",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS kv (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS active_matches (
+    match_id TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS processed_matches (
+    match_id TEXT PRIMARY KEY,
+    processed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_processed_matches_at ON processed_matches(processed_at);
+CREATE TABLE IF NOT EXISTS match_history (
+    match_id TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS map_data_cache (
+    match_id TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leaderboards (
+    game TEXT NOT NULL,
+    user_id TEXT NOT NULL,
+    value TEXT NOT NULL,
+    PRIMARY KEY (game, user_id)
+);
+"""
+
+
+def _dump(value) -> str:
+    return json.dumps(value, sort_keys=True)
+
+
+class EsportsStore:
+    """SQLite-backed replacement for the old esports_data.json.
+
+    load() hands out the same plain dict the JSON file used to hold, so
+    callers can keep mutating it in place.  save() diffs that dict against
+    the last persisted state row by row and writes only what changed, in
+    one transaction.  Sections missing from the dict passed to save() are
+    left untouched, which lets hot paths load just the section they need.
+
+    A mirror of every row's serialized value is kept in memory, so loads
+    never hit the disk and membership checks on processed IDs are O(1).
+    """
+
+    def __init__(self, path: str = DB_FILE):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._kv: Dict[str, str] = {}
+        self._sections: Dict[str, Dict[str, str]] = {name: {} for name in _SECTION_TABLES}
+        self._leaderboards: Dict[Tuple[str, str], str] = {}
+        self._processed: Dict[str, float] = {}  # match_id -> processed_at, oldest first
+
+    def open(self) -> sqlite3.Connection:
+        """Open the database on first use, migrating the legacy JSON file if needed."""
+        if self._conn is None:
+            self._open()
+        return self._conn
+
+    def _open(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.executescript(_SCHEMA)
+        self._conn = conn
+        fresh = conn.execute("SELECT 1 FROM kv LIMIT 1").fetchone() is None
+        if fresh:
+            self._import_json()
+        self._load_mirror()
+
+    def _import_json(self):
+        """One-time migration from esports_data.json (or its backup)."""
+        data = None
+        for path in (DATA_FILE, BACKUP_FILE):
+            try:
+                with open(path, "r") as f:
+                    data = json.load(f)
+                break
+            except (json.JSONDecodeError, FileNotFoundError):
+                continue
+        if data is None:
+            data = {
+                "channel_id": None,
+                "last_reset_month": datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m"),
+            }
+        self._load_mirror()
+        # Keep the original list order as processing order for the trim in process_result
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        processed = [str(mid) for mid in data.get("processed_matches") or []]
+        data["processed_matches"] = processed
+        stamps = {mid: now - (len(processed) - i) for i, mid in enumerate(processed)}
+        self._write(data, processed_stamps=stamps)
+        if os.path.exists(DATA_FILE):
+            try:
+                os.replace(DATA_FILE, f"{DATA_FILE}.migrated")
+            except OSError as e:
+                logger.warning(f"Could not rename {DATA_FILE} after migration: {e}")
+        logger.info(f"Migrated esports data to {self.path}")
+
+    def _load_mirror(self):
+        conn = self._conn
+        self._kv = dict(conn.execute("SELECT key, value FROM kv"))
+        for name, table in _SECTION_TABLES.items():
+            self._sections[name] = dict(conn.execute(f"SELECT match_id, value FROM {table}"))
+        self._leaderboards = {
+            (game, uid): value
+            for game, uid, value in conn.execute("SELECT game, user_id, value FROM leaderboards")
         }
+        self._processed = dict(conn.execute(
+            "SELECT match_id, processed_at FROM processed_matches ORDER BY processed_at"
+        ))
+
+    # --- reads ---
+
+    def load(self, *sections: str) -> dict:
+        self.open()
+        wanted = set(sections) if sections else None
+
+        def want(name):
+            return wanted is None or name in wanted
+
+        data = {}
+        if wanted is None:
+            data = {k: json.loads(v) for k, v in self._kv.items()}
+        else:
+            for k in wanted:
+                if k in self._kv:
+                    data[k] = json.loads(self._kv[k])
+        for name in _SECTION_TABLES:
+            if want(name):
+                data[name] = {k: json.loads(v) for k, v in self._sections[name].items()}
+        if want("processed_matches"):
+            data["processed_matches"] = list(self._processed)
+        if want("leaderboards"):
+            boards = {k: {} for k in GAMES.keys()}
+            for (game, uid), value in self._leaderboards.items():
+                boards.setdefault(game, {})[uid] = json.loads(value)
+            data["leaderboards"] = boards
+        return data
+
+    def is_processed(self, match_id: str) -> bool:
+        self.open()
+        return match_id in self._processed
+
+    # --- writes ---
+
+    def save(self, data: dict):
+        self.open()
+        self._write(data)
+
+    def _write(self, data: dict, processed_stamps: Optional[Dict[str, float]] = None):
+        conn = self._conn
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        kv_new = dict(self._kv)
+        sections_new = {}
+        leaderboards_new = None
+        processed_new = None
+        ops = []  # (sql, rows)
+
+        for key, value in data.items():
+            if key in _SECTION_TABLES:
+                table = _SECTION_TABLES[key]
+                old = self._sections[key]
+                new = {str(k): _dump(v) for k, v in (value or {}).items()}
+                upserts = [(k, v) for k, v in new.items() if old.get(k) != v]
+                deletes = [(k,) for k in old if k not in new]
+                if upserts:
+                    ops.append((f"INSERT OR REPLACE INTO {table} (match_id, value) VALUES (?, ?)", upserts))
+                if deletes:
+                    ops.append((f"DELETE FROM {table} WHERE match_id = ?", deletes))
+                sections_new[key] = new
+            elif key == "processed_matches":
+                ids = [str(m) for m in (value or [])]
+                stamps = processed_stamps or {}
+                processed_new = {}
+                inserts = []
+                for mid in ids:
+                    if mid in self._processed:
+                        processed_new[mid] = self._processed[mid]
+                    elif mid not in processed_new:
+                        processed_new[mid] = stamps.get(mid, now)
+                        inserts.append((mid, processed_new[mid]))
+                deletes = [(mid,) for mid in self._processed if mid not in processed_new]
+                if inserts:
+                    ops.append(("INSERT OR REPLACE INTO processed_matches (match_id, processed_at) VALUES (?, ?)", inserts))
+                if deletes:
+                    ops.append(("DELETE FROM processed_matches WHERE match_id = ?", deletes))
+            elif key == "leaderboards":
+                leaderboards_new = {
+                    (str(game), str(uid)): _dump(stats)
+                    for game, board in (value or {}).items()
+                    if isinstance(board, dict)
+                    for uid, stats in board.items()
+                }
+                old = self._leaderboards
+                upserts = [(g, u, v) for (g, u), v in leaderboards_new.items() if old.get((g, u)) != v]
+                deletes = [(g, u) for (g, u) in old if (g, u) not in leaderboards_new]
+                if upserts:
+                    ops.append(("INSERT OR REPLACE INTO leaderboards (game, user_id, value) VALUES (?, ?, ?)", upserts))
+                if deletes:
+                    ops.append(("DELETE FROM leaderboards WHERE game = ? AND user_id = ?", deletes))
+            else:
+                dumped = _dump(value)
+                if self._kv.get(key) != dumped:
+                    kv_new[key] = dumped
+                    ops.append(("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", [(key, dumped)]))
+
+        if not self._kv and not any(sql.startswith("INSERT OR REPLACE INTO kv") for sql, _ in ops):
+            # Mark the store as initialized even if the first save carries no scalars
+            kv_new["channel_id"] = _dump(None)
+            ops.append(("INSERT OR REPLACE INTO kv (key, value) VALUES (?, ?)", [("channel_id", kv_new["channel_id"])]))
+
+        if not ops:
+            return
         try:
-            with open(DATA_FILE, "w") as f:
-                json.dump(default_data, f, indent=4)
-        except Exception as e:
-            logger.error(f"Failed to create data file: {e}")
-
-def load_data_sync():
-    def _load(filepath):
-        with open(filepath, "r") as f:
-            return json.load(f)
-    try:
-        data = _load(DATA_FILE)
-    except (json.JSONDecodeError, FileNotFoundError):
+            with conn:
+                for sql, rows in ops:
+                    conn.executemany(sql, rows)
+        except sqlite3.Error as e:
+            logger.error(f"Failed to save esports data: {e}")
+            return
+
+        self._kv = kv_new
+        self._sections.update(sections_new)
+        if leaderboards_new is not None:
+            self._leaderboards = leaderboards_new
+        if processed_new is not None:
+            self._processed = dict(sorted(processed_new.items(), key=lambda kv: kv[1]))
+
+    def purge_expired(self) -> Tuple[int, int]:
+        """Drop processed IDs and match history (plus its map data) past their TTL.
+
+        Returns (processed_purged, history_purged).
+        """
+        conn = self.open()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        processed_cutoff = now.timestamp() - PROCESSED_TTL_SECONDS
+        stale_processed = [mid for mid, at in self._processed.items() if at < processed_cutoff]
+
+        expired = []
+        for mid, raw in self._sections["match_history"].items():
+            processed_at = safe_parse_datetime(json.loads(raw).get("processed_at"))
+            if processed_at and (now - processed_at).total_seconds() > HISTORY_TTL_SECONDS:
+                expired.append(mid)
+
+        if not stale_processed and not expired:
+            return 0, 0
         try:
-            data = _load(BACKUP_FILE)
-            save_data_sync(data)
-        except Exception as e: 
-            logger.error(f"Failed to load backup data: {e}")
-            return {"channel_id": None, "active_matches": {}, "processed_matches": [], "leaderboards": {k: {} for k in GAMES.keys()}}
+            with conn:
+                conn.executemany("DELETE FROM processed_matches WHERE match_id = ?", [(m,) for m in stale_processed])
+                conn.executemany("DELETE FROM match_history WHERE match_id = ?", [(m,) for m in expired])
+                conn.executemany("DELETE FROM map_data_cache WHERE match_id = ?", [(m,) for m in expired])
+        except sqlite3.Error as e:
+            logger.error(f"Failed to purge esports data: {e}")
+            return 0, 0
+
+        for mid in stale_processed:
+            self._processed.pop(mid, None)
+        for mid in expired:
+            self._sections["match_history"].pop(mid, None)
+            self._sections["map_data_cache"].pop(mid, None)
+        return len(stale_processed), len(expired)
+
+
+store = EsportsStore()
+
+
+# --- DATA HELPERS ---
+def ensure_data_file():
+    store.open()
+
+
+def load_data_sync(*sections: str):
+    """Return the esports data dict (or only the named top-level sections)."""
+    data = store.load(*sections)
+    if sections:
+        return data
 
     # Ensure keys exist
-    if "processed_matches" not in data: data["processed_matches"] = []
+    if "channel_id" not in data: data["channel_id"] = None
     if "last_reset_month" not in data: data["last_reset_month"] = datetime.datetime.now(datetime.timezone.utc).strftime("%Y-%m")
     if "emoji_map" not in data: data["emoji_map"] = {}
     if "emoji_storage_guilds" not in data: data["emoji_storage_guilds"] = []
-    if "match_history" not in data: data["match_history"] = {}
-    if "map_data_cache" not in data: data["map_data_cache"] = {}
     if "game_vote_emojis" not in data: data["game_vote_emojis"] = {}
-
-    # Ensure leaderboards exists and has all game keys
-    if "leaderboards" not in data:
-        data["leaderboards"] = {k: {} for k in GAMES.keys()}
-    else:
-        # Ensure each game has its own leaderboard dict
-        for game_key in GAMES.keys():
-            if game_key not in data["leaderboards"]:
-                data["leaderboards"][game_key] = {}
-            # Ensure it's a dict, not some other type
-            elif not isinstance(data["leaderboards"][game_key], dict):
-                data["leaderboards"][game_key] = {}
-
     return data
 
+
 def save_data_sync(data):
-    temp_file = f"{DATA_FILE}.tmp"
-    try:
-        if os.path.exists(DATA_FILE):
-            shutil.copy2(DATA_FILE, BACKUP_FILE)
-        with open(temp_file, "w") as f:
-            json.dump(data, f, indent=4)
-        os.replace(temp_file, DATA_FILE)
-    except Exception as e:
-        logger.error(f"Failed to save data to disk: {e}")
-        if os.path.exists(temp_file): os.remove(temp_file)
+    store.save(data)
+
+
+def is_match_processed(match_id: str) -> bool:
+    return store.is_processed(str(match_id))
+
+
+def purge_expired_data() -> Tuple[int, int]:
+    return store.purge_expired()
+
 
 def get_team_button_emoji(team_data: dict) -> Optional[discord.PartialEmoji]:
     """Resolve the custom emoji for a team's vote button.
@@ -383,46 +637,165 @@ def add_white_outline(img, thickness=4):
     final_img.paste(img, (0, 0), img)
     return final_img
 
-def stitch_images(img_a, img_b, img_g, img_team_p, img_game_p, is_result=False, game_slug=""):
-    try:
-        width, height = 600, 200
-        slot_w = width // 3
-        canvas = Image.new("RGBA", (width, height), (0, 0, 0, 0)) 
-        
-        if not img_team_p: img_team_p = Image.new("RGBA", (150, 150), (50, 50, 50, 255))
-        if not img_game_p: img_game_p = Image.new("RGBA", (150, 150), (50, 50, 50, 255))
-
-        final_a = img_a if img_a else img_team_p
-        final_b = img_b if img_b else img_team_p
-        final_g = img_g if img_g else img_game_p
-
-        def place_image(img, x_offset, scale=1.0, add_outline=True):
-            if not img: return
-            if add_outline: img = add_white_outline(img)
-            img_copy = img.copy()
-            target_size = int(180 * scale)
-            img_copy.thumbnail((target_size, target_size), Image.Resampling.LANCZOS)
-            x = x_offset + (slot_w - img_copy.width) // 2
-            y = (height - img_copy.height) // 2
-            canvas.paste(img_copy, (x, y), img_copy)
-
-        if is_result:
-            place_image(final_g, 0, scale=0.6) 
-            place_image(final_a, slot_w, scale=1.0)
-            place_image(final_g, slot_w * 2, scale=0.6)
+BANNER_WIDTH, BANNER_HEIGHT = 600, 200
+
+
+def banner_layout(is_result: bool, game_slug: str) -> List[Tuple[str, int, float, bool]]:
+    """(image role, slot index, scale, outline) for each logo placed on a banner."""
+    if is_result:
+        return [("game", 0, 0.6, True), ("a", 1, 1.0, True), ("game", 2, 0.6, True)]
+    mid_scale = 0.9 if game_slug == 'rl' else 0.6
+    return [("a", 0, 1.0, True), ("game", 1, mid_scale, False), ("b", 2, 1.0, True)]
+
+
+def logo_target_size(scale: float) -> int:
+    return int(180 * scale)
+
+
+def make_logo_variant(img, size: int, outline: bool = True):
+    """Outline (optionally) and thumbnail a logo exactly as a banner slot needs it."""
+    if outline: img = add_white_outline(img)
+    img_copy = img.copy()
+    img_copy.thumbnail((size, size), Image.Resampling.LANCZOS)
+    return img_copy
+
+
+def compose_banner(placed) -> bytes:
+    """Paste prepared logo variants [(slot index, image)] onto a banner; returns PNG bytes."""
+    slot_w = BANNER_WIDTH // 3
+    canvas = Image.new("RGBA", (BANNER_WIDTH, BANNER_HEIGHT), (0, 0, 0, 0))
+    for slot, img in placed:
+        if not img: continue
+        x = slot * slot_w + (slot_w - img.width) // 2
+        y = (BANNER_HEIGHT - img.height) // 2
+        canvas.paste(img, (x, y), img)
+    buffer = BytesIO()
+    canvas.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def placeholder_logo():
+    return Image.new("RGBA", (150, 150), (50, 50, 50, 255))
+
+
+class EsportsImageCache:
+    """Disk-backed cache for team/game logos, their banner variants and finished banners.
+
+    Source images are stored per URL alongside their ETag / Last-Modified and
+    revalidated with a conditional GET once they are older than
+    LOGO_REVALIDATE_SECONDS; a failed revalidation keeps serving the copy on
+    disk.  Each source is identified by the SHA-256 of its bytes, so outlined
+    and thumbnailed variants and composed banners are content-addressed: a
+    logo that changes upstream gets new keys and stale renders are never
+    served.  Variants and banners age out through RenderCache's LRU.
+    """
+
+    def __init__(self, http, directory: Path = IMAGE_CACHE_DIR, *, max_images: int = 100):
+        self.http = http
+        self.sources_dir = directory / "sources"
+        self.variants = RenderCache(directory / "variants", max_bytes=LOGO_VARIANT_CACHE_MAX_BYTES)
+        self.banners = RenderCache(directory / "banners", max_bytes=BANNER_CACHE_MAX_BYTES)
+        self.max_images = max_images
+        self._images: "OrderedDict[str, Tuple[str, Image.Image, float]]" = OrderedDict()  # url -> (digest, decoded, checked_at)
+
+    def _source_paths(self, url: str) -> Tuple[Path, Path]:
+        name = hashlib.sha256(url.encode()).hexdigest()
+        return self.sources_dir / f"{name}.img", self.sources_dir / f"{name}.json"
+
+    def _read_source(self, url: str) -> Tuple[dict, Optional[bytes]]:
+        body_path, meta_path = self._source_paths(url)
+        try:
+            meta = json.loads(meta_path.read_text())
+            return meta, body_path.read_bytes()
+        except (OSError, ValueError):
+            return {}, None
+
+    def _write_source(self, url: str, meta: dict, body: Optional[bytes]):
+        body_path, meta_path = self._source_paths(url)
+        try:
+            self.sources_dir.mkdir(parents=True, exist_ok=True)
+            if body is not None:
+                body_path.write_bytes(body)
+            meta_path.write_text(json.dumps(meta))
+        except OSError as e:
+            logger.warning(f"Logo cache write failed for {url}: {e}")
+
+    async def get_logo(self, url: str) -> Optional[Tuple[str, "Image.Image"]]:
+        """Return (content digest, RGBA image) for `url`, or None if unavailable.
+
+        The returned image is shared; callers must copy before mutating.
+        """
+        if not url or not url.startswith(('http', 'https')): return None
+        now = datetime.datetime.now(datetime.timezone.utc).timestamp()
+        hit = self._images.get(url)
+        if hit is not None:
+            self._images.move_to_end(url)
+            if now - hit[2] <= LOGO_REVALIDATE_SECONDS:
+                return hit[0], hit[1]
+
+        meta, body = await asyncio.to_thread(self._read_source, url)
+        if body is None or now - meta.get("checked_at", 0) > LOGO_REVALIDATE_SECONDS:
+            headers = {}
+            if body is not None:
+                if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+                if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+            try:
+                resp = await self.http.get(url, headers=headers, timeout=10)
+                if resp.status == 304 and body is not None:
+                    meta["checked_at"] = now
+                    await asyncio.to_thread(self._write_source, url, meta, None)
+                elif resp.status == 200:
+                    body = resp.body
+                    meta = {
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                        "checked_at": now,
+                        "digest": hashlib.sha256(body).hexdigest(),
+                    }
+                    await asyncio.to_thread(self._write_source, url, meta, body)
+            except Exception as e:
+                logger.debug(f"Logo fetch failed for {url}: {e}")
+            if body is None:
+                return (hit[0], hit[1]) if hit is not None else None
+
+        digest = meta.get("digest") or hashlib.sha256(body).hexdigest()
+        if hit is not None and hit[0] == digest:
+            img = hit[1]  # revalidated unchanged; keep the decoded copy
         else:
-            place_image(final_a, 0)          
-            mid_scale = 0.9 if game_slug == 'rl' else 0.6
-            place_image(final_g, slot_w, scale=mid_scale, add_outline=False) 
-            place_image(final_b, slot_w * 2) 
-
-        buffer = BytesIO()
-        canvas.save(buffer, format="PNG")
-        buffer.seek(0)
-        return discord.File(buffer, filename="match_banner.png")
-    except Exception as e:
-        logger.error(f"Banner generation failed: {e}")
-        return None
+            try:
+                img = await asyncio.to_thread(lambda: Image.open(BytesIO(body)).convert("RGBA"))
+            except Exception as e:
+                logger.debug(f"Logo decode failed for {url}: {e}")
+                return None
+        self._images[url] = (digest, img, meta.get("checked_at", now))
+        if len(self._images) > self.max_images:
+            self._images.popitem(last=False)
+        return digest, img
+
+    async def get_variant(self, digest: str, img, size: int, outline: bool):
+        """Outlined/thumbnailed copy of a logo, served from disk when already built."""
+        key = RenderCache.make_key("logo", f"{size}:{int(outline)}", digest)
+        data = await self.variants.get(key)
+        if data is not None:
+            try:
+                return await asyncio.to_thread(lambda: Image.open(BytesIO(data)).convert("RGBA"))
+            except Exception:
+                pass
+
+        def build():
+            variant = make_logo_variant(img, size, outline)
+            out = BytesIO()
+            variant.save(out, format="PNG")
+            return variant, out.getvalue()
+
+        variant, png = await asyncio.to_thread(build)
+        await self.variants.put(key, png)
+        return variant
+
+    @staticmethod
+    def banner_key(digests: Tuple[str, str, str], game_slug: str, is_result: bool) -> str:
+        return RenderCache.make_key("banner", BANNER_LAYOUT_VERSION, [list(digests), game_slug, bool(is_result)])
+
 
 # --- UI VIEWS ---
 
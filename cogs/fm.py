@@ -10,9 +10,14 @@ import base64
 import re
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont, ImageFilter
-from typing import Optional, Dict, List, Tuple
+from typing import Optional, Dict, List, NamedTuple, Tuple
 import colorsys
 import logging
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
+from utils import database
+from utils.http_client import TokenBucket
 
 # Set up logging for this cog (INFO level for production)
 logger = logging.getLogger("FM_Cog")
@@ -27,6 +32,487 @@ logger.setLevel(logging.INFO)
 # Get Last.fm API key at: https://www.last.fm/api/account/create
 # Get Spotify credentials at: https://developer.spotify.com/dashboard
 
+# Last.fm allows roughly 5 requests/second per key averaged over a few minutes
+LASTFM_RATE_PER_SECOND = 4
+LASTFM_BURST = 8
+
+# Spotify tokens are renewed in the background once they get this close to expiry
+SPOTIFY_TOKEN_REFRESH_MARGIN = 300
+
+# --- LOOKUP CACHE ---
+FM_CACHE_DB = "data/fm_cache.db"
+
+# Per-(Last.fm user, artist) play counts, filled by !fm and !whoknows lookups.
+# !whoknows answers from here and refreshes stale rows in the background.
+PLAYCOUNT_TTL_SECONDS = 6 * 3600
+PLAYCOUNT_REFRESH_CONCURRENCY = 4  # leaves room in the rate budget for interactive commands
+WHOKNOWS_COLD_WAIT_SECONDS = 8  # how long !whoknows waits on uncached listeners before answering
+
+
+# Resolved streaming links per (artist, track).  Rows missing any link are
+# misses and get retried sooner, since a search may just have timed out.
+TRACK_LINK_TTL_SECONDS = 30 * 86400
+TRACK_LINK_MISS_TTL_SECONDS = 12 * 3600
+
+
+def artist_key(artist: str) -> str:
+    """Normalise an artist name for the lookup cache."""
+    return " ".join(artist.split()).casefold()
+
+
+def clean_track_query(artist: str, track: str) -> Tuple[str, str]:
+    """Strip featured artists and version suffixes so searches match the base track."""
+    clean_track = track.split(" (")[0].split(" feat")[0].split(" ft.")[0].strip()
+    clean_artist = artist.split(" feat")[0].split(" ft.")[0].split(",")[0].strip()
+    return clean_artist, clean_track
+
+
+# --- CARD RENDERING ---
+# PIL work for the now-playing and who-knows cards runs in a small process
+# pool so it never blocks the event loop.  Everything below is module-level
+# so the worker processes can import it.
+
+FONT_PATH = "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf"
+FONT_BOLD_PATH = "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf"
+PRELOAD_FONT_SIZES = (11, 12, 13, 14, 16, 18, 20, 24, 34, 36, 44, 120)  # every size the cards use
+
+RENDER_WORKERS = 2
+ALBUM_ART_CACHE_MAX_BYTES = 64 * 1024 * 1024  # prepared art is raw RGBA, ~2.5 MB per album
+
+NP_WIDTH, NP_HEIGHT = 1000, 480
+NP_ART_SIZE = 390
+
+# Color scheme - Modern dark theme
+COLORS = {
+    "bg_dark": (18, 18, 24),
+    "bg_card": (28, 28, 36),
+    "bg_lighter": (48, 48, 60),
+    "accent": (185, 0, 0),  # Last.fm red
+    "accent_glow": (255, 50, 50),
+    "text_primary": (255, 255, 255),
+    "text_secondary": (200, 200, 210),
+    "text_muted": (150, 150, 165),
+    "gold": (255, 215, 0),
+    "silver": (192, 192, 192),
+    "bronze": (205, 127, 50),
+    "bar_bg": (55, 55, 70),
+    "bar_fill": (185, 0, 0),
+}
+
+_fonts: Dict[Tuple[int, bool], ImageFont.FreeTypeFont] = {}
+_fonts_available: Optional[bool] = None
+
+
+def init_render_worker():
+    """Process-pool initializer: load every card font once per worker."""
+    for size in PRELOAD_FONT_SIZES:
+        get_font(size)
+        get_font(size, bold=True)
+
+
+def get_font(size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
+    """Load a font with fallback, cached per process."""
+    global _fonts_available
+    key = (size, bold)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+    if _fonts_available is None:
+        try:
+            ImageFont.truetype(FONT_PATH, 12)
+            _fonts_available = True
+        except OSError:
+            logger.warning("Custom fonts not found, using default fonts")
+            _fonts_available = False
+    try:
+        font = ImageFont.truetype(FONT_BOLD_PATH if bold else FONT_PATH, size) if _fonts_available else ImageFont.load_default()
+    except OSError:
+        font = ImageFont.load_default()
+    _fonts[key] = font
+    return font
+
+
+def round_corners(img: Image.Image, radius: int) -> Image.Image:
+    """Apply rounded corners to an image."""
+    if img.mode != "RGBA":
+        img = img.convert("RGBA")
+
+    mask = Image.new("L", img.size, 0)
+    draw = ImageDraw.Draw(mask)
+    draw.rounded_rectangle([(0, 0), img.size], radius=radius, fill=255)
+
+    result = img.copy()
+    result.putalpha(mask)
+    return result
+
+
+def truncate_text(text: str, font: ImageFont.FreeTypeFont, max_width: int) -> str:
+    """Truncate text to fit within max_width."""
+    if not text:
+        return ""
+    try:
+        if font.getlength(text) <= max_width:
+            return text
+
+        while font.getlength(text + "...") > max_width and len(text) > 0:
+            text = text[:-1]
+        return text + "..." if text else "..."
+    except Exception:
+        # Fallback for default font
+        return text[:30] + "..." if len(text) > 30 else text
+
+
+def get_dominant_color(img: Image.Image) -> tuple:
+    """Extract dominant color from image for accent."""
+    try:
+        small = img.resize((50, 50))
+        pixels = list(small.getdata())
+
+        # Filter out very dark and very light pixels
+        filtered = [p for p in pixels if len(p) >= 3 and 30 < sum(p[:3])/3 < 225]
+        if not filtered:
+            return COLORS["accent"]
+
+        # Get average color
+        r = sum(p[0] for p in filtered) // len(filtered)
+        g = sum(p[1] for p in filtered) // len(filtered)
+        b = sum(p[2] for p in filtered) // len(filtered)
+
+        # Boost saturation for more vibrant accent
+        h, l, s = colorsys.rgb_to_hls(r/255, g/255, b/255)
+        s = min(1.0, s * 1.5)
+        l = max(0.4, min(0.6, l))
+        r, g, b = colorsys.hls_to_rgb(h, l, s)
+
+        return (int(r * 255), int(g * 255), int(b * 255))
+    except Exception as e:
+        logger.debug(f"Failed to get dominant color: {e}")
+        return COLORS["accent"]
+
+
+def draw_medal(draw: ImageDraw.Draw, x: int, y: int, rank: int, size: int = 24):
+    """Draw a medal circle for top 3 ranks or rank number for others."""
+    if rank == 1:
+        color = COLORS["gold"]
+        text = "1"
+    elif rank == 2:
+        color = COLORS["silver"]
+        text = "2"
+    elif rank == 3:
+        color = COLORS["bronze"]
+        text = "3"
+    else:
+        # For ranks 4+, just draw the number
+        font = get_font(14, bold=True)
+        draw.text((x, y + 2), f"#{rank}", font=font, fill=COLORS["text_muted"])
+        return
+
+    # Draw medal circle for top 3
+    circle_x = x + size // 2
+    circle_y = y + size // 2
+    radius = size // 2
+
+    # Draw outer circle
+    draw.ellipse(
+        [circle_x - radius, circle_y - radius, circle_x + radius, circle_y + radius],
+        fill=color
+    )
+
+    # Draw inner darker circle for depth
+    inner_radius = radius - 3
+    darker_color = tuple(max(0, c - 40) for c in color)
+    draw.ellipse(
+        [circle_x - inner_radius, circle_y - inner_radius,
+         circle_x + inner_radius, circle_y + inner_radius],
+        fill=darker_color
+    )
+
+    # Draw rank number in center
+    font = get_font(14, bold=True)
+    try:
+        text_bbox = font.getbbox(text)
+        text_width = text_bbox[2] - text_bbox[0]
+        text_height = text_bbox[3] - text_bbox[1]
+    except AttributeError:
+        # Fallback for older PIL versions
+        text_width, text_height = 10, 14
+
+    text_x = circle_x - text_width // 2
+    text_y = circle_y - text_height // 2 - 2
+
+    draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
+
+
+class AlbumArt(NamedTuple):
+    """Album art pre-processed for the now-playing card (raw RGBA bytes)."""
+    background: bytes  # NP_WIDTH x NP_HEIGHT, blurred and darkened
+    cover: bytes       # NP_ART_SIZE square with rounded corners
+    accent: Tuple[int, int, int]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.background) + len(self.cover)
+
+
+def prepare_album_art(data: bytes) -> Optional[AlbumArt]:
+    """Decode downloaded art and build the resized variants the card needs."""
+    try:
+        album_art = Image.open(BytesIO(data)).convert("RGBA")
+    except Exception as e:
+        logger.debug(f"Failed to decode album art: {e}")
+        return None
+
+    # Get accent from album art
+    accent_color = get_dominant_color(album_art)
+
+    # Create blurred background from album art
+    bg_art = album_art.resize((NP_WIDTH, NP_HEIGHT))
+    bg_art = bg_art.filter(ImageFilter.GaussianBlur(radius=30))
+
+    # Darken the blurred background
+    background = Image.new("RGBA", (NP_WIDTH, NP_HEIGHT), COLORS["bg_dark"])
+    background.paste(bg_art, (0, 0))
+    background = Image.alpha_composite(background, Image.new("RGBA", (NP_WIDTH, NP_HEIGHT), (0, 0, 0, 180)))
+
+    cover = album_art.resize((NP_ART_SIZE, NP_ART_SIZE), Image.Resampling.LANCZOS)
+    cover = round_corners(cover, 20)
+    return AlbumArt(background.tobytes(), cover.tobytes(), accent_color)
+
+
+def render_now_playing(card: Dict, art: Optional[AlbumArt]) -> bytes:
+    """Draw the now-playing card; `card` holds the text fields of FM.create_now_playing_image."""
+    width, height = NP_WIDTH, NP_HEIGHT
+    accent_color = COLORS["accent"]
+
+    if art:
+        accent_color = art.accent
+        img = Image.frombytes("RGBA", (width, height), art.background)
+    else:
+        img = Image.new("RGBA", (width, height), COLORS["bg_dark"])
+    draw = ImageDraw.Draw(img)
+
+    # Draw main card background
+    card_margin = 16
+    draw.rounded_rectangle(
+        (card_margin, card_margin, width - card_margin, height - card_margin),
+        radius=24,
+        fill=(*COLORS["bg_card"], 240)
+    )
+
+    # Album art section (left side) - LARGE
+    art_size = NP_ART_SIZE
+    art_x, art_y = 32, 45
+
+    if art:
+        cover = Image.frombytes("RGBA", (art_size, art_size), art.cover)
+        img.paste(cover, (art_x, art_y), cover)
+    else:
+        # Placeholder
+        draw.rounded_rectangle(
+            (art_x, art_y, art_x + art_size, art_y + art_size),
+            radius=20,
+            fill=COLORS["bg_lighter"]
+        )
+        # Music note icon placeholder
+        note_font = get_font(120, bold=True)
+        draw.text((art_x + 125, art_y + 115), "♪", font=note_font, fill=COLORS["text_muted"])
+
+    # Accent line on left of album art
+    draw.rectangle((art_x - 6, art_y, art_x - 2, art_y + art_size), fill=accent_color)
+
+    # Text section (right side)
+    text_x = art_x + art_size + 36
+    text_y = 55
+    max_text_width = width - text_x - 40
+
+    # Status badge
+    status_text = "NOW PLAYING" if card["is_now_playing"] else "LAST PLAYED"
+    status_font = get_font(18, bold=True)
+    badge_width = int(status_font.getlength(status_text)) + 30
+    badge_color = accent_color if card["is_now_playing"] else COLORS["bg_lighter"]
+
+    draw.rounded_rectangle(
+        (text_x, text_y, text_x + badge_width, text_y + 36),
+        radius=8,
+        fill=badge_color
+    )
+    draw.text((text_x + 15, text_y + 7), status_text, font=status_font, fill=COLORS["text_primary"])
+
+    # Track name - LARGE
+    text_y += 58
+    track_font = get_font(44, bold=True)
+    track_display = truncate_text(card["track_name"], track_font, max_text_width)
+    draw.text((text_x, text_y), track_display, font=track_font, fill=COLORS["text_primary"])
+
+    # Artist name - White text with shadow
+    text_y += 62
+    artist_font = get_font(34, bold=True)
+    artist_display = truncate_text(card["artist"], artist_font, max_text_width)
+
+    # Draw artist shadow for visibility
+    draw.text((text_x + 1, text_y + 1), artist_display, font=artist_font, fill=(0, 0, 0, 140))
+    draw.text((text_x, text_y), artist_display, font=artist_font, fill=COLORS["text_primary"])
+
+    # Album name
+    if card["album"]:
+        text_y += 52
+        album_font = get_font(24, bold=True)
+        album_display = truncate_text(f"on {card['album']}", album_font, max_text_width)
+        draw.text((text_x, text_y), album_display, font=album_font, fill=COLORS["text_secondary"])
+
+    # Playcount badge at bottom (only if playcount provided)
+    if card["playcount"] is not None:
+        plays_y = 360
+        plays_font = get_font(20, bold=True)
+        plays_text = f"▶ {card['playcount']} plays"
+
+        draw.rounded_rectangle(
+            (text_x, plays_y, text_x + int(plays_font.getlength(plays_text)) + 34, plays_y + 42),
+            radius=10,
+            fill=COLORS["bg_lighter"]
+        )
+        draw.text((text_x + 17, plays_y + 9), plays_text, font=plays_font, fill=COLORS["text_secondary"])
+
+    # Discord username in bottom right - LARGE
+    # Truncate display name to 20 characters
+    display_name = card["display_name"]
+    safe_display_name = display_name[:20] if len(display_name) > 20 else display_name
+    user_font = get_font(36, bold=True)
+    username_text = f"@{safe_display_name}"
+    username_width = int(user_font.getlength(username_text))
+
+    # Draw username with shadow for visibility
+    username_x = width - card_margin - username_width - 26
+    username_y = height - card_margin - 58
+    draw.text((username_x + 2, username_y + 2), username_text, font=user_font, fill=(0, 0, 0, 150))
+    draw.text((username_x, username_y), username_text, font=user_font, fill=COLORS["text_primary"])
+
+    # Apply final rounded corners to entire image
+    img = round_corners(img, 24)
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+def render_now_playing_with_art(card: Dict, art_data: bytes) -> Tuple[bytes, Optional[AlbumArt]]:
+    """Prepare freshly downloaded art and draw the card; the art is returned for the parent's cache."""
+    art = prepare_album_art(art_data)
+    return render_now_playing(card, art), art
+
+
+def render_whoknows(artist_name: str, leaderboard: List[Tuple[str, int, str]]) -> bytes:
+    """Draw the who-knows leaderboard card."""
+    # Dimensions based on entries
+    entry_height = 55
+    header_height = 100
+    padding = 20
+    num_entries = min(len(leaderboard), 10)
+
+    width = 600
+    height = header_height + (num_entries * entry_height) + padding * 2
+
+    # Create base image
+    img = Image.new("RGBA", (width, height), COLORS["bg_dark"])
+    draw = ImageDraw.Draw(img)
+
+    # Draw main card
+    draw.rounded_rectangle(
+        (10, 10, width - 10, height - 10),
+        radius=20,
+        fill=COLORS["bg_card"]
+    )
+
+    # Header section
+    header_font = get_font(13, bold=True)
+    title_font = get_font(24, bold=True)
+
+    # "WHO KNOWS" label
+    draw.text((30, 25), "WHO KNOWS", font=header_font, fill=COLORS["accent"])
+
+    # Artist name
+    artist_display = truncate_text(artist_name, title_font, width - 80)
+    draw.text((30, 48), artist_display, font=title_font, fill=COLORS["text_primary"])
+
+    # Accent line under header
+    draw.rectangle((30, 90, width - 30, 92), fill=COLORS["bg_lighter"])
+
+    # Get max plays for bar scaling
+    max_plays = leaderboard[0][1] if leaderboard else 1
+
+    # Draw entries
+    y_offset = header_height + 10
+
+    for i, (name, plays, avatar_url) in enumerate(leaderboard[:10]):
+        entry_y = y_offset + (i * entry_height)
+
+        # Draw medal or rank number
+        rank_x = 30
+        draw_medal(draw, rank_x, entry_y + 14, i + 1, size=24)
+
+        # Username
+        name_x = 80
+        name_font = get_font(16, bold=True)
+        name_display = truncate_text(name, name_font, 200)
+        name_color = COLORS["text_primary"]
+        draw.text((name_x, entry_y + 8), name_display, font=name_font, fill=name_color)
+
+        # Play count
+        plays_font = get_font(12, bold=True)
+        plays_text = f"{plays:,} plays"
+        draw.text((name_x, entry_y + 30), plays_text, font=plays_font, fill=COLORS["text_secondary"])
+
+        # Progress bar
+        bar_x = 320
+        bar_width = 220
+        bar_height = 12
+        bar_y = entry_y + 20
+
+        # Background bar
+        draw.rounded_rectangle(
+            (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
+            radius=6,
+            fill=COLORS["bar_bg"]
+        )
+
+        # Fill bar
+        fill_width = int((plays / max_plays) * bar_width) if max_plays > 0 else 0
+        if fill_width > 0:
+            # Color based on rank
+            if i == 0:
+                bar_color = COLORS["gold"]
+            else:
+                bar_color = COLORS["accent"]
+
+            draw.rounded_rectangle(
+                (bar_x, bar_y, bar_x + max(fill_width, 12), bar_y + bar_height),
+                radius=6,
+                fill=bar_color
+            )
+
+        # Separator line (except for last entry)
+        if i < num_entries - 1:
+            sep_y = entry_y + entry_height - 2
+            draw.rectangle((30, sep_y, width - 30, sep_y + 1), fill=COLORS["bg_lighter"])
+
+    # Footer
+    footer_font = get_font(11, bold=True)
+    footer_text = f"Showing top {num_entries} listeners"
+    footer_width = int(footer_font.getlength(footer_text))
+    draw.text(
+        (width - footer_width - 30, height - 30),
+        footer_text,
+        font=footer_font,
+        fill=COLORS["text_muted"]
+    )
+
+    # Apply rounded corners
+    img = round_corners(img, 20)
+
+    buffer = BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
 
 class FM(commands.Cog):
     """Last.fm integration cog for Discord."""
@@ -55,7 +541,6 @@ class FM(commands.Cog):
         self._file_lock = asyncio.Lock()  # In-memory lock for file operations
         self.api_key = os.getenv("LASTFM_API_KEY")
         self._session: Optional[aiohttp.ClientSession] = None
-        self._rate_limit_delay = 0.15  # Slightly increased for safety
         self._api_timeout = aiohttp.ClientTimeout(total=10)
         
         # Link listener cooldown per user (prevent spam)
@@ -67,42 +552,48 @@ class FM(commands.Cog):
         self.spotify_client_secret = os.getenv("SPOTIFY_CLIENT_SECRET")
         self.spotify_token: Optional[str] = None
         self.spotify_token_expires: float = 0
+        self._spotify_token_lock = asyncio.Lock()
+        self._spotify_token_refresh: Optional[asyncio.Task] = None
         
-        # Image generation settings
-        self.font_path = "/usr/share/fonts/truetype/noto/NotoSans-Regular.ttf"
-        self.font_bold_path = "/usr/share/fonts/truetype/noto/NotoSans-Bold.ttf"
-        self._font_available = self._check_fonts()
-        
-        # Color scheme - Modern dark theme
-        self.colors = {
-            "bg_dark": (18, 18, 24),
-            "bg_card": (28, 28, 36),
-            "bg_lighter": (48, 48, 60),
-            "accent": (185, 0, 0),  # Last.fm red
-            "accent_glow": (255, 50, 50),
-            "text_primary": (255, 255, 255),
-            "text_secondary": (200, 200, 210),
-            "text_muted": (150, 150, 165),
-            "gold": (255, 215, 0),
-            "silver": (192, 192, 192),
-            "bronze": (205, 127, 50),
-            "bar_bg": (55, 55, 70),
-            "bar_fill": (185, 0, 0),
-        }
+        # Card rendering (process pool is created on first use)
+        self._render_pool: Optional[ProcessPoolExecutor] = None
+        self._art_cache: "OrderedDict[str, Optional[AlbumArt]]" = OrderedDict()  # url -> prepared art (None = undecodable)
+        self._art_cache_bytes = 0
 
-    def _check_fonts(self) -> bool:
-        """Check if custom fonts are available."""
-        try:
-            ImageFont.truetype(self.font_path, 12)
-            return True
-        except OSError:
-            logger.warning("Custom fonts not found, using default fonts")
-            return False
+        # Last.fm rate budget shared by every command and background refresh
+        self._lastfm_bucket = TokenBucket(LASTFM_RATE_PER_SECOND, LASTFM_BURST)
+        self._users_cache: Optional[Dict[str, str]] = None
+        self._playcount_refreshes: Dict[Tuple[str, str], asyncio.Task] = {}
+        self._refresh_slots = asyncio.Semaphore(PLAYCOUNT_REFRESH_CONCURRENCY)
 
     async def cog_load(self):
         """Called when the cog is loaded."""
         try:
             self._session = aiohttp.ClientSession(timeout=self._api_timeout)
+            async with database.connect(FM_CACHE_DB) as db:
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS playcounts (
+                        artist TEXT NOT NULL,
+                        lastfm_user TEXT NOT NULL,
+                        plays INTEGER NOT NULL,
+                        fetched_at REAL NOT NULL,
+                        PRIMARY KEY (artist, lastfm_user)
+                    )
+                ''')
+                await db.execute('''
+                    CREATE TABLE IF NOT EXISTS track_links (
+                        artist TEXT NOT NULL,
+                        track TEXT NOT NULL,
+                        spotify TEXT,
+                        apple TEXT,
+                        youtube TEXT,
+                        album_art TEXT,
+                        album_name TEXT,
+                        fetched_at REAL NOT NULL,
+                        PRIMARY KEY (artist, track)
+                    )
+                ''')
+                await db.commit()
             logger.info("FM Cog loaded successfully!")
             
             if not self.api_key:
@@ -110,6 +601,7 @@ class FM(commands.Cog):
             
             if self.spotify_client_id and self.spotify_client_secret:
                 logger.info("Spotify API configured - direct links enabled")
+                self._spotify_token_refresh = asyncio.create_task(self._refresh_spotify_token(SPOTIFY_TOKEN_REFRESH_MARGIN))
             else:
                 logger.warning("Spotify API not configured - using search URLs")
                 
@@ -118,8 +610,15 @@ class FM(commands.Cog):
 
     async def cog_unload(self):
         """Called when the cog is unloaded."""
+        for task in list(self._playcount_refreshes.values()):
+            task.cancel()
+        if self._spotify_token_refresh and not self._spotify_token_refresh.done():
+            self._spotify_token_refresh.cancel()
         if self._session and not self._session.closed:
             await self._session.close()
+        if self._render_pool is not None:
+            self._render_pool.shutdown(wait=False, cancel_futures=True)
+            self._render_pool = None
         logger.info("FM Cog unloaded.")
 
     @property
@@ -130,53 +629,17 @@ class FM(commands.Cog):
         return self._session
 
     # =========================================================================
-    # IMAGE UTILITIES
+    # IMAGE RENDERING
     # =========================================================================
-    
-    def get_font(self, size: int, bold: bool = False) -> ImageFont.FreeTypeFont:
-        """Load a font with fallback."""
-        if not self._font_available:
-            return ImageFont.load_default()
-        try:
-            path = self.font_bold_path if bold else self.font_path
-            return ImageFont.truetype(path, size)
-        except OSError:
-            return ImageFont.load_default()
 
-    def round_corners(self, img: Image.Image, radius: int) -> Image.Image:
-        """Apply rounded corners to an image."""
-        if img.mode != "RGBA":
-            img = img.convert("RGBA")
-        
-        mask = Image.new("L", img.size, 0)
-        draw = ImageDraw.Draw(mask)
-        draw.rounded_rectangle([(0, 0), img.size], radius=radius, fill=255)
-        
-        result = img.copy()
-        result.putalpha(mask)
-        return result
-
-    def draw_rounded_rect(self, draw: ImageDraw.Draw, coords: tuple, radius: int, fill: tuple):
-        """Draw a rounded rectangle."""
-        draw.rounded_rectangle(coords, radius=radius, fill=fill)
-
-    def truncate_text(self, text: str, font: ImageFont.FreeTypeFont, max_width: int) -> str:
-        """Truncate text to fit within max_width."""
-        if not text:
-            return ""
-        try:
-            if font.getlength(text) <= max_width:
-                return text
-            
-            while font.getlength(text + "...") > max_width and len(text) > 0:
-                text = text[:-1]
-            return text + "..." if text else "..."
-        except Exception:
-            # Fallback for default font
-            return text[:30] + "..." if len(text) > 30 else text
-
-    async def fetch_image(self, url: str) -> Optional[Image.Image]:
-        """Fetch an image from URL with timeout and error handling."""
+    async def _render(self, fn, *args):
+        """Run a card renderer in the process pool."""
+        if self._render_pool is None:
+            self._render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, initializer=init_render_worker)
+        return await self.bot.loop.run_in_executor(self._render_pool, fn, *args)
+
+    async def fetch_image_bytes(self, url: str) -> Optional[bytes]:
+        """Fetch raw image bytes from URL with timeout and error handling."""
         if not url or not url.strip():
             return None
         try:
@@ -190,96 +653,26 @@ class FM(commands.Cog):
                     if len(data) > 10 * 1024 * 1024:  # 10MB limit
                         logger.warning(f"Image too large: {len(data)} bytes")
                         return None
-                    return Image.open(BytesIO(data)).convert("RGBA")
+                    return data
         except asyncio.TimeoutError:
             logger.debug(f"Image fetch timeout: {url}")
         except Exception as e:
             logger.debug(f"Failed to fetch image from {url}: {e}")
         return None
 
-    def get_dominant_color(self, img: Image.Image) -> tuple:
-        """Extract dominant color from image for accent."""
-        try:
-            small = img.resize((50, 50))
-            pixels = list(small.getdata())
-            
-            # Filter out very dark and very light pixels
-            filtered = [p for p in pixels if len(p) >= 3 and 30 < sum(p[:3])/3 < 225]
-            if not filtered:
-                return self.colors["accent"]
-            
-            # Get average color
-            r = sum(p[0] for p in filtered) // len(filtered)
-            g = sum(p[1] for p in filtered) // len(filtered)
-            b = sum(p[2] for p in filtered) // len(filtered)
-            
-            # Boost saturation for more vibrant accent
-            h, l, s = colorsys.rgb_to_hls(r/255, g/255, b/255)
-            s = min(1.0, s * 1.5)
-            l = max(0.4, min(0.6, l))
-            r, g, b = colorsys.hls_to_rgb(h, l, s)
-            
-            return (int(r * 255), int(g * 255), int(b * 255))
-        except Exception as e:
-            logger.debug(f"Failed to get dominant color: {e}")
-            return self.colors["accent"]
-
-    def draw_medal(self, draw: ImageDraw.Draw, x: int, y: int, rank: int, size: int = 24):
-        """Draw a medal circle for top 3 ranks or rank number for others."""
-        if rank == 1:
-            color = self.colors["gold"]
-            text = "1"
-        elif rank == 2:
-            color = self.colors["silver"]
-            text = "2"
-        elif rank == 3:
-            color = self.colors["bronze"]
-            text = "3"
-        else:
-            # For ranks 4+, just draw the number
-            font = self.get_font(14, bold=True)
-            draw.text((x, y + 2), f"#{rank}", font=font, fill=self.colors["text_muted"])
-            return
-        
-        # Draw medal circle for top 3
-        circle_x = x + size // 2
-        circle_y = y + size // 2
-        radius = size // 2
-        
-        # Draw outer circle
-        draw.ellipse(
-            [circle_x - radius, circle_y - radius, circle_x + radius, circle_y + radius],
-            fill=color
-        )
-        
-        # Draw inner darker circle for depth
-        inner_radius = radius - 3
-        darker_color = tuple(max(0, c - 40) for c in color)
-        draw.ellipse(
-            [circle_x - inner_radius, circle_y - inner_radius, 
-             circle_x + inner_radius, circle_y + inner_radius],
-            fill=darker_color
-        )
-        
-        # Draw rank number in center
-        font = self.get_font(14, bold=True)
-        try:
-            text_bbox = font.getbbox(text)
-            text_width = text_bbox[2] - text_bbox[0]
-            text_height = text_bbox[3] - text_bbox[1]
-        except AttributeError:
-            # Fallback for older PIL versions
-            text_width, text_height = 10, 14
-        
-        text_x = circle_x - text_width // 2
-        text_y = circle_y - text_height // 2 - 2
-        
-        draw.text((text_x, text_y), text, font=font, fill=(255, 255, 255))
+    def _remember_art(self, url: str, art: Optional[AlbumArt]):
+        previous = self._art_cache.pop(url, None)
+        self._art_cache_bytes -= previous.nbytes if previous else 0
+        self._art_cache[url] = art
+        self._art_cache_bytes += art.nbytes if art else 0
+        while self._art_cache_bytes > ALBUM_ART_CACHE_MAX_BYTES and len(self._art_cache) > 1:
+            _, evicted = self._art_cache.popitem(last=False)
+            self._art_cache_bytes -= evicted.nbytes if evicted else 0
 
     # =========================================================================
     # NOW PLAYING IMAGE (Unified for !fm and link shares)
     # =========================================================================
-    
+
     async def create_now_playing_image(
         self,
         track_name: str,
@@ -291,7 +684,7 @@ class FM(commands.Cog):
         playcount: Optional[str] = None  # None = don't show plays section
     ) -> BytesIO:
         """Create a modern now playing card.
-        
+
         Args:
             track_name: The track title
             artist: The artist name
@@ -300,146 +693,36 @@ class FM(commands.Cog):
             display_name: Discord display name to show (max 20 chars)
             is_now_playing: True for "NOW PLAYING", False for "LAST PLAYED"
             playcount: If provided, shows play count. If None, hides plays section.
+
+        Art is downloaded here, then blurred/resized and its accent color
+        picked in the render pool; the prepared variants are cached by URL
+        so repeat plays from the same album only draw text.
         """
-        
-        # Canvas dimensions - taller for more impact
-        width, height = 1000, 480
-        
-        # Create base image
-        img = Image.new("RGBA", (width, height), self.colors["bg_dark"])
-        draw = ImageDraw.Draw(img)
-        
-        # Fetch album art
-        album_art = await self.fetch_image(album_art_url)
-        accent_color = self.colors["accent"]
-        
-        if album_art:
-            # Get accent from album art
-            accent_color = self.get_dominant_color(album_art)
-            
-            # Create blurred background from album art
-            bg_art = album_art.resize((width, height))
-            bg_art = bg_art.filter(ImageFilter.GaussianBlur(radius=30))
-            
-            # Darken the blurred background
-            dark_overlay = Image.new("RGBA", (width, height), (0, 0, 0, 180))
-            img.paste(bg_art, (0, 0))
-            img = Image.alpha_composite(img, dark_overlay)
-            draw = ImageDraw.Draw(img)
-        
-        # Draw main card background
-        card_margin = 16
-        self.draw_rounded_rect(
-            draw,
-            (card_margin, card_margin, width - card_margin, height - card_margin),
-            radius=24,
-            fill=(*self.colors["bg_card"], 240)
-        )
-        
-        # Album art section (left side) - LARGE
-        art_size = 390
-        art_x, art_y = 32, 45
-        
-        if album_art:
-            album_art = album_art.resize((art_size, art_size), Image.Resampling.LANCZOS)
-            album_art = self.round_corners(album_art, 20)
-            img.paste(album_art, (art_x, art_y), album_art)
+        card = {
+            "track_name": track_name,
+            "artist": artist,
+            "album": album,
+            "display_name": display_name,
+            "is_now_playing": is_now_playing,
+            "playcount": playcount,
+        }
+
+        if album_art_url in self._art_cache:
+            self._art_cache.move_to_end(album_art_url)
+            png = await self._render(render_now_playing, card, self._art_cache[album_art_url])
         else:
-            # Placeholder
-            self.draw_rounded_rect(
-                draw,
-                (art_x, art_y, art_x + art_size, art_y + art_size),
-                radius=20,
-                fill=self.colors["bg_lighter"]
-            )
-            # Music note icon placeholder
-            note_font = self.get_font(120, bold=True)
-            draw.text((art_x + 125, art_y + 115), "♪", font=note_font, fill=self.colors["text_muted"])
-        
-        # Accent line on left of album art
-        draw.rectangle((art_x - 6, art_y, art_x - 2, art_y + art_size), fill=accent_color)
-        
-        # Text section (right side)
-        text_x = art_x + art_size + 36
-        text_y = 55
-        max_text_width = width - text_x - 40
-        
-        # Status badge
-        status_text = "NOW PLAYING" if is_now_playing else "LAST PLAYED"
-        status_font = self.get_font(18, bold=True)
-        badge_width = int(status_font.getlength(status_text)) + 30
-        badge_color = accent_color if is_now_playing else self.colors["bg_lighter"]
-        
-        self.draw_rounded_rect(
-            draw,
-            (text_x, text_y, text_x + badge_width, text_y + 36),
-            radius=8,
-            fill=badge_color
-        )
-        draw.text((text_x + 15, text_y + 7), status_text, font=status_font, fill=self.colors["text_primary"])
-        
-        # Track name - LARGE
-        text_y += 58
-        track_font = self.get_font(44, bold=True)
-        track_display = self.truncate_text(track_name, track_font, max_text_width)
-        draw.text((text_x, text_y), track_display, font=track_font, fill=self.colors["text_primary"])
-        
-        # Artist name - White text with shadow
-        text_y += 62
-        artist_font = self.get_font(34, bold=True)
-        artist_display = self.truncate_text(artist, artist_font, max_text_width)
-        
-        # Draw artist shadow for visibility
-        draw.text((text_x + 1, text_y + 1), artist_display, font=artist_font, fill=(0, 0, 0, 140))
-        draw.text((text_x, text_y), artist_display, font=artist_font, fill=self.colors["text_primary"])
-        
-        # Album name
-        if album:
-            text_y += 52
-            album_font = self.get_font(24, bold=True)
-            album_display = self.truncate_text(f"on {album}", album_font, max_text_width)
-            draw.text((text_x, text_y), album_display, font=album_font, fill=self.colors["text_secondary"])
-        
-        # Playcount badge at bottom (only if playcount provided)
-        if playcount is not None:
-            plays_y = 360
-            plays_font = self.get_font(20, bold=True)
-            plays_text = f"▶ {playcount} plays"
-            
-            self.draw_rounded_rect(
-                draw,
-                (text_x, plays_y, text_x + int(plays_font.getlength(plays_text)) + 34, plays_y + 42),
-                radius=10,
-                fill=self.colors["bg_lighter"]
-            )
-            draw.text((text_x + 17, plays_y + 9), plays_text, font=plays_font, fill=self.colors["text_secondary"])
-        
-        # Discord username in bottom right - LARGE
-        # Truncate display name to 20 characters
-        safe_display_name = display_name[:20] if len(display_name) > 20 else display_name
-        user_font = self.get_font(36, bold=True)
-        username_text = f"@{safe_display_name}"
-        username_width = int(user_font.getlength(username_text))
-        
-        # Draw username with shadow for visibility
-        username_x = width - card_margin - username_width - 26
-        username_y = height - card_margin - 58
-        draw.text((username_x + 2, username_y + 2), username_text, font=user_font, fill=(0, 0, 0, 150))
-        draw.text((username_x, username_y), username_text, font=user_font, fill=self.colors["text_primary"])
-        
-        # Apply final rounded corners to entire image
-        img = self.round_corners(img, 24)
-        
-        # Save to BytesIO
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer
+            art_data = await self.fetch_image_bytes(album_art_url)
+            if art_data is None:
+                png = await self._render(render_now_playing, card, None)
+            else:
+                png, art = await self._render(render_now_playing_with_art, card, art_data)
+                self._remember_art(album_art_url, art)
+        return BytesIO(png)
 
     # =========================================================================
     # WHO KNOWS IMAGE
     # =========================================================================
-    
+
     async def create_whoknows_image(
         self,
         artist_name: str,
@@ -447,128 +730,23 @@ class FM(commands.Cog):
         artist_image_url: Optional[str] = None
     ) -> BytesIO:
         """Create a modern who knows leaderboard image."""
-        
-        # Dimensions based on entries
-        entry_height = 55
-        header_height = 100
-        padding = 20
-        num_entries = min(len(leaderboard), 10)
-        
-        width = 600
-        height = header_height + (num_entries * entry_height) + padding * 2
-        
-        # Create base image
-        img = Image.new("RGBA", (width, height), self.colors["bg_dark"])
-        draw = ImageDraw.Draw(img)
-        
-        # Draw main card
-        self.draw_rounded_rect(
-            draw,
-            (10, 10, width - 10, height - 10),
-            radius=20,
-            fill=self.colors["bg_card"]
-        )
-        
-        # Header section
-        header_font = self.get_font(13, bold=True)
-        title_font = self.get_font(24, bold=True)
-        
-        # "WHO KNOWS" label
-        draw.text((30, 25), "WHO KNOWS", font=header_font, fill=self.colors["accent"])
-        
-        # Artist name
-        artist_display = self.truncate_text(artist_name, title_font, width - 80)
-        draw.text((30, 48), artist_display, font=title_font, fill=self.colors["text_primary"])
-        
-        # Accent line under header
-        draw.rectangle((30, 90, width - 30, 92), fill=self.colors["bg_lighter"])
-        
-        # Get max plays for bar scaling
-        max_plays = leaderboard[0][1] if leaderboard else 1
-        
-        # Draw entries
-        y_offset = header_height + 10
-        
-        for i, (name, plays, avatar_url) in enumerate(leaderboard[:10]):
-            entry_y = y_offset + (i * entry_height)
-            
-            # Draw medal or rank number
-            rank_x = 30
-            self.draw_medal(draw, rank_x, entry_y + 14, i + 1, size=24)
-            
-            # Username
-            name_x = 80
-            name_font = self.get_font(16, bold=True)
-            name_display = self.truncate_text(name, name_font, 200)
-            name_color = self.colors["text_primary"]
-            draw.text((name_x, entry_y + 8), name_display, font=name_font, fill=name_color)
-            
-            # Play count
-            plays_font = self.get_font(12, bold=True)
-            plays_text = f"{plays:,} plays"
-            draw.text((name_x, entry_y + 30), plays_text, font=plays_font, fill=self.colors["text_secondary"])
-            
-            # Progress bar
-            bar_x = 320
-            bar_width = 220
-            bar_height = 12
-            bar_y = entry_y + 20
-            
-            # Background bar
-            self.draw_rounded_rect(
-                draw,
-                (bar_x, bar_y, bar_x + bar_width, bar_y + bar_height),
-                radius=6,
-                fill=self.colors["bar_bg"]
-            )
-            
-            # Fill bar
-            fill_width = int((plays / max_plays) * bar_width) if max_plays > 0 else 0
-            if fill_width > 0:
-                # Color based on rank
-                if i == 0:
-                    bar_color = self.colors["gold"]
-                else:
-                    bar_color = self.colors["accent"]
-                
-                self.draw_rounded_rect(
-                    draw,
-                    (bar_x, bar_y, bar_x + max(fill_width, 12), bar_y + bar_height),
-                    radius=6,
-                    fill=bar_color
-                )
-            
-            # Separator line (except for last entry)
-            if i < num_entries - 1:
-                sep_y = entry_y + entry_height - 2
-                draw.rectangle((30, sep_y, width - 30, sep_y + 1), fill=self.colors["bg_lighter"])
-        
-        # Footer
-        footer_font = self.get_font(11, bold=True)
-        footer_text = f"Showing top {num_entries} listeners"
-        footer_width = int(footer_font.getlength(footer_text))
-        draw.text(
-            (width - footer_width - 30, height - 30),
-            footer_text,
-            font=footer_font,
-            fill=self.colors["text_muted"]
-        )
-        
-        # Apply rounded corners
-        img = self.round_corners(img, 20)
-        
-        buffer = BytesIO()
-        img.save(buffer, format="PNG")
-        buffer.seek(0)
-        return buffer
+        png = await self._render(render_whoknows, artist_name, leaderboard[:10])
+        return BytesIO(png)
 
     # =========================================================================
     # DATABASE HELPERS
     # =========================================================================
     
     async def load_users(self) -> Dict[str, str]:
-        """Load users from JSON file with locking."""
+        """Load users from JSON file with locking.
+
+        The file is read once and kept in memory; save_users() keeps that
+        copy current.  Callers get their own dict to modify.
+        """
         async with self._file_lock:
+            if self._users_cache is not None:
+                return dict(self._users_cache)
+
             def _load():
                 try:
                     if not os.path.exists(self.users_file):
@@ -583,11 +761,15 @@ class FM(commands.Cog):
                         return data
                 except json.JSONDecodeError as e:
                     logger.error(f"JSON decode error: {e}")
-                    return {}
+                    return None
                 except Exception as e:
                     logger.error(f"Failed to load users: {e}")
-                    return {}
-            return await asyncio.to_thread(_load)
+                    return None
+            data = await asyncio.to_thread(_load)
+            if data is None:
+                return {}  # don't cache a failed read
+            self._users_cache = data
+            return dict(data)
 
     async def save_users(self, users: Dict[str, str]) -> bool:
         """Save users to JSON file with locking. Returns success status."""
@@ -609,7 +791,10 @@ class FM(commands.Cog):
                     except Exception:
                         pass
                     return False
-            return await asyncio.to_thread(_save)
+            saved = await asyncio.to_thread(_save)
+            if saved:
+                self._users_cache = dict(users)
+            return saved
 
     async def load_settings(self) -> Dict:
         """Load settings from JSON file."""
@@ -675,7 +860,11 @@ class FM(commands.Cog):
         return users.get(str(user_id))
 
     async def api_request(self, params: dict) -> Optional[dict]:
-        """Make a request to the Last.fm API with timeout and error handling."""
+        """Make a request to the Last.fm API with timeout and error handling.
+
+        Every call draws from the cog-wide Last.fm rate budget first.
+        """
+        await self._lastfm_bucket.acquire()
         try:
             async with self.session.get(
                 self.api_url, 
@@ -707,18 +896,83 @@ class FM(commands.Cog):
             logger.error(f"Failed to parse Last.fm response: {e}")
             return None
 
+    # =========================================================================
+    # PLAY COUNT CACHE
+    # =========================================================================
+
+    async def store_playcount(self, lastfm_user: str, artist: str, plays: int):
+        """Remember a user's play count for an artist."""
+        try:
+            async with database.connect(FM_CACHE_DB) as db:
+                await db.execute(
+                    "INSERT OR REPLACE INTO playcounts (artist, lastfm_user, plays, fetched_at) VALUES (?, ?, ?, ?)",
+                    (artist_key(artist), lastfm_user.lower(), plays, time.time()),
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to store play count: {e}")
+
+    async def cached_playcounts(self, artist: str) -> Dict[str, Tuple[int, float]]:
+        """Cached play counts for an artist: lastfm_user (lowercase) -> (plays, fetched_at)."""
+        try:
+            async with database.connect(FM_CACHE_DB) as db:
+                async with db.execute(
+                    "SELECT lastfm_user, plays, fetched_at FROM playcounts WHERE artist = ?",
+                    (artist_key(artist),),
+                ) as cursor:
+                    rows = await cursor.fetchall()
+        except Exception as e:
+            logger.error(f"Failed to read play counts: {e}")
+            return {}
+        return {user: (plays, fetched_at) for user, plays, fetched_at in rows}
+
+    async def fetch_playcount(self, lastfm_user: str, artist: str) -> Optional[int]:
+        """Ask Last.fm for a user's play count of an artist and cache it. None if the lookup failed."""
+        params = {
+            "method": "artist.getinfo",
+            "artist": artist,
+            "username": lastfm_user,
+            "api_key": self.api_key,
+            "format": "json"
+        }
+        data = await self.api_request(params)
+        if not data or "artist" not in data:
+            return None
+        try:
+            plays = int(data["artist"].get("stats", {}).get("userplaycount", 0))
+        except (KeyError, TypeError, ValueError):
+            return None
+        await self.store_playcount(lastfm_user, artist, plays)
+        return plays
+
+    def refresh_playcount(self, lastfm_user: str, artist: str) -> asyncio.Task:
+        """Start (or join) a background refresh of one cached play count.
+
+        Refreshes share PLAYCOUNT_REFRESH_CONCURRENCY slots, so a big server
+        never queues more than a few requests ahead of someone's !fm.
+        """
+        key = (lastfm_user.lower(), artist_key(artist))
+        task = self._playcount_refreshes.get(key)
+        if task is not None:
+            return task
+
+        async def _refresh() -> Optional[int]:
+            async with self._refresh_slots:
+                return await self.fetch_playcount(lastfm_user, artist)
+
+        task = asyncio.create_task(_refresh())
+        self._playcount_refreshes[key] = task
+        task.add_done_callback(lambda _: self._playcount_refreshes.pop(key, None))
+        return task
+
     # =========================================================================
     # STREAMING LINK HELPERS
     # =========================================================================
 
     async def get_streaming_links(self, artist: str, track: str) -> Dict[str, str]:
-        """Get streaming links for a track."""
-        # Clean up the query
-        clean_track = track.split(" (")[0].split(" feat")[0].split(" ft.")[0].strip()
-        clean_artist = artist.split(" feat")[0].split(" ft.")[0].split(",")[0].strip()
-        
-        query = f"{clean_artist} {clean_track}"
-        q_enc = urllib.parse.quote_plus(query)
+        """Get streaming links for a track, falling back to search URLs."""
+        clean_artist, clean_track = clean_track_query(artist, track)
+        q_enc = urllib.parse.quote_plus(f"{clean_artist} {clean_track}")
         
         # Fallback search URLs
         fallback = {
@@ -727,30 +981,77 @@ class FM(commands.Cog):
             "youtube": f"https://music.youtube.com/search?q={q_enc}"
         }
         
-        logger.debug(f"Getting streaming links for: {clean_artist} - {clean_track}")
-        
-        # Get Spotify link and album art
-        spotify_result = await self._spotify_search(clean_artist, clean_track)
-        spotify_url = spotify_result.get("url") if spotify_result else None
-        
-        # Get Apple Music link
-        apple_url = await self.search_apple_music(clean_artist, clean_track)
-        
-        # Get YouTube via Odesli if we have Spotify
-        youtube_url = None
-        if spotify_url:
-            odesli_links = await self.get_odesli_links(spotify_url)
-            if odesli_links:
-                if not apple_url and odesli_links.get("apple"):
-                    apple_url = odesli_links["apple"]
-                if odesli_links.get("youtube"):
-                    youtube_url = odesli_links["youtube"]
-        
-        return {
-            "spotify": spotify_url or fallback["spotify"],
-            "apple": apple_url or fallback["apple"],
-            "youtube": youtube_url or fallback["youtube"]
+        resolved = await self.resolve_track(artist, track)
+        return {platform: resolved.get(platform) or url for platform, url in fallback.items()}
+
+    async def resolve_track(self, artist: str, track: str) -> Dict[str, Optional[str]]:
+        """Resolve a track's Spotify/Apple/YouTube links and Spotify album art, cached in SQLite.
+
+        Returns a dict with spotify, apple, youtube, album_art and album_name
+        (any of them None if not found).  The Spotify (then Odesli) chain and
+        the iTunes search run concurrently on a cache miss.
+        """
+        clean_artist, clean_track = clean_track_query(artist, track)
+        key = (artist_key(clean_artist), artist_key(clean_track))
+
+        cached = await self._cached_track_links(*key)
+        if cached is not None:
+            return cached
+
+        logger.debug(f"Resolving streaming links for: {clean_artist} - {clean_track}")
+
+        async def spotify_then_odesli():
+            spotify_result = await self._spotify_search(clean_artist, clean_track)
+            spotify_url = spotify_result.get("url") if spotify_result else None
+            odesli_links = await self.get_odesli_links(spotify_url) if spotify_url else None
+            return spotify_result or {}, odesli_links or {}
+
+        (spotify_result, odesli_links), apple_url = await asyncio.gather(
+            spotify_then_odesli(),
+            self.search_apple_music(clean_artist, clean_track),
+        )
+
+        resolved = {
+            "spotify": spotify_result.get("url"),
+            "apple": apple_url or odesli_links.get("apple"),
+            "youtube": odesli_links.get("youtube"),
+            "album_art": spotify_result.get("album_art"),
+            "album_name": spotify_result.get("album_name"),
         }
+        await self._store_track_links(*key, resolved)
+        return resolved
+
+    async def _cached_track_links(self, artist: str, track: str) -> Optional[Dict[str, Optional[str]]]:
+        try:
+            async with database.connect(FM_CACHE_DB) as db:
+                async with db.execute(
+                    "SELECT spotify, apple, youtube, album_art, album_name, fetched_at FROM track_links WHERE artist = ? AND track = ?",
+                    (artist, track),
+                ) as cursor:
+                    row = await cursor.fetchone()
+        except Exception as e:
+            logger.error(f"Failed to read track links: {e}")
+            return None
+        if row is None:
+            return None
+        spotify, apple, youtube, album_art, album_name, fetched_at = row
+        ttl = TRACK_LINK_TTL_SECONDS if spotify and apple and youtube else TRACK_LINK_MISS_TTL_SECONDS
+        if time.time() - fetched_at > ttl:
+            return None
+        return {"spotify": spotify, "apple": apple, "youtube": youtube, "album_art": album_art, "album_name": album_name}
+
+    async def _store_track_links(self, artist: str, track: str, resolved: Dict[str, Optional[str]]):
+        try:
+            async with database.connect(FM_CACHE_DB) as db:
+                await db.execute(
+                    "INSERT OR REPLACE INTO track_links (artist, track, spotify, apple, youtube, album_art, album_name, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (artist, track, resolved["spotify"], resolved["apple"], resolved["youtube"],
+                     resolved["album_art"], resolved["album_name"], time.time()),
+                )
+                await db.commit()
+        except Exception as e:
+            logger.error(f"Failed to store track links: {e}")
 
     async def get_odesli_links(self, music_url: str) -> Optional[Dict[str, str]]:
         """Get links from other platforms using Odesli/song.link API."""
@@ -893,14 +1194,33 @@ class FM(commands.Cog):
             return None
 
     async def get_spotify_token(self) -> Optional[str]:
-        """Get a Spotify access token using client credentials flow."""
+        """Get a Spotify access token using client credentials flow.
+
+        A token close to expiry is still handed out while a replacement is
+        fetched in the background, so lookups rarely wait on the auth call.
+        """
         if not self.spotify_client_id or not self.spotify_client_secret:
             return None
         
-        # Check if current token is still valid (with 60 second buffer)
-        if self.spotify_token and time.time() < self.spotify_token_expires - 60:
+        remaining = self.spotify_token_expires - time.time()
+        if self.spotify_token and remaining > SPOTIFY_TOKEN_REFRESH_MARGIN:
             return self.spotify_token
-        
+        if self.spotify_token and remaining > 60:
+            if self._spotify_token_refresh is None or self._spotify_token_refresh.done():
+                self._spotify_token_refresh = asyncio.create_task(
+                    self._refresh_spotify_token(SPOTIFY_TOKEN_REFRESH_MARGIN)
+                )
+            return self.spotify_token
+        return await self._refresh_spotify_token(60)
+
+    async def _refresh_spotify_token(self, min_remaining: float) -> Optional[str]:
+        """Fetch a new token unless another caller already got one valid for `min_remaining` seconds."""
+        async with self._spotify_token_lock:
+            if self.spotify_token and time.time() < self.spotify_token_expires - min_remaining:
+                return self.spotify_token
+            return await self._fetch_spotify_token()
+
+    async def _fetch_spotify_token(self) -> Optional[str]:
         try:
             # Encode credentials
             credentials = f"{self.spotify_client_id}:{self.spotify_client_secret}"
@@ -1426,13 +1746,24 @@ class FM(commands.Cog):
             # Get album art and album name - Spotify primary, Last.fm fallback
             image_url = ""
             
+            # Resolve streaming links and Spotify art alongside the play count lookup
+            artist_params = {
+                "method": "artist.getinfo",
+                "artist": artist,
+                "username": username,
+                "api_key": self.api_key,
+                "format": "json"
+            }
+            resolved, a_data = await asyncio.gather(
+                self.resolve_track(artist, track_name),
+                self.api_request(artist_params),
+            )
+            
             # Try Spotify first (more reliable album art)
-            spotify_metadata = await self.get_spotify_track_metadata(artist, track_name)
-            if spotify_metadata:
-                if spotify_metadata.get("album_art"):
-                    image_url = spotify_metadata["album_art"]
-                if not album and spotify_metadata.get("album_name"):
-                    album = spotify_metadata["album_name"]
+            if resolved.get("album_art"):
+                image_url = resolved["album_art"]
+            if not album and resolved.get("album_name"):
+                album = resolved["album_name"]
             
             # Fallback to Last.fm if Spotify didn't have art
             if not image_url:
@@ -1447,21 +1778,14 @@ class FM(commands.Cog):
 
             # Get playcount for this artist
             playcount = "0"
-            artist_params = {
-                "method": "artist.getinfo",
-                "artist": artist,
-                "username": username,
-                "api_key": self.api_key,
-                "format": "json"
-            }
-            a_data = await self.api_request(artist_params)
             if a_data and "artist" in a_data:
                 try:
                     playcount = a_data["artist"].get("stats", {}).get("userplaycount", "0")
-                except (KeyError, TypeError):
+                    await self.store_playcount(username, artist, int(playcount))
+                except (KeyError, TypeError, ValueError):
                     pass
 
-            # Fetch streaming links
+            # Fetch streaming links (already resolved above, so this is a cache read)
             streaming_links = await self.get_streaming_links(artist, track_name)
 
             # Create the image
@@ -1574,46 +1898,45 @@ class FM(commands.Cog):
         if not guild_users:
             return await ctx.reply("❌ No linked users in this server.", mention_author=False)
 
-        # Fetch play counts for all users
+        # Answer from the play count cache; only uncached listeners hold up the reply
         async with ctx.typing():
+            cached = await self.cached_playcounts(artist_name)
+            now = time.time()
             leaderboard: List[Tuple[str, int, str]] = []
-            
-            async def fetch_user_plays(lastfm_user: str, display_name: str) -> Optional[Tuple[str, int, str]]:
-                params = {
-                    "method": "artist.getinfo",
-                    "artist": artist_name,
-                    "username": lastfm_user,
-                    "api_key": self.api_key,
-                    "format": "json"
-                }
-                data = await self.api_request(params)
-                if data and "artist" in data:
-                    try:
-                        plays = int(data["artist"].get("stats", {}).get("userplaycount", 0))
-                        return (display_name, plays, "")
-                    except (KeyError, TypeError, ValueError):
-                        pass
-                return None
+            cold: Dict[asyncio.Task, List[str]] = {}  # several members may share one Last.fm account
 
-            # Process in batches to avoid rate limiting
-            batch_size = 5
-            user_list = list(guild_users.values())
-            
-            for i in range(0, len(user_list), batch_size):
-                batch = user_list[i:i + batch_size]
-                tasks = [fetch_user_plays(lastfm_user, display_name) for lastfm_user, display_name in batch]
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                for result in results:
-                    if isinstance(result, tuple) and result[1] > 0:
-                        leaderboard.append(result)
-                
-                if i + batch_size < len(user_list):
-                    await asyncio.sleep(self._rate_limit_delay)
+            for lastfm_user, display_name in guild_users.values():
+                entry = cached.get(lastfm_user.lower())
+                if entry is None:
+                    cold.setdefault(self.refresh_playcount(lastfm_user, artist_name), []).append(display_name)
+                    continue
+                plays, fetched_at = entry
+                if now - fetched_at > PLAYCOUNT_TTL_SECONDS:
+                    self.refresh_playcount(lastfm_user, artist_name)
+                if plays > 0:
+                    leaderboard.append((display_name, plays, ""))
+
+            still_loading = 0
+            if cold:
+                # Unfinished lookups keep running and land in the cache for next time
+                done, pending = await asyncio.wait(cold, timeout=WHOKNOWS_COLD_WAIT_SECONDS)
+                still_loading = sum(len(cold[task]) for task in pending)
+                for task in done:
+                    if task.cancelled() or task.exception() is not None:
+                        continue
+                    plays = task.result()
+                    if plays:
+                        leaderboard.extend((name, plays, "") for name in cold[task])
 
             leaderboard.sort(key=lambda x: x[1], reverse=True)
 
+        note = None
+        if still_loading:
+            note = f"-# Still fetching {still_loading} listener(s) — run it again in a bit for the full list."
+
         if not leaderboard:
+            if still_loading:
+                return await ctx.reply(f"⏳ Still fetching play counts for **{artist_name}** — try again in a bit.", mention_author=False)
             return await ctx.reply(f"❌ Nobody has listened to **{artist_name}**.", mention_author=False)
 
         # Try image response, fall back to embed
@@ -1622,7 +1945,7 @@ class FM(commands.Cog):
                 artist_name=artist_name,
                 leaderboard=leaderboard
             )
-            await ctx.send(file=discord.File(wk_image, "whoknows.png"))
+            await ctx.send(content=note, file=discord.File(wk_image, "whoknows.png"))
         except Exception as img_error:
             logger.error(f"Who Knows image generation failed: {img_error}", exc_info=True)
             # Fallback to embed
@@ -1637,7 +1960,7 @@ class FM(commands.Cog):
                 color=discord.Color.gold()
             )
             embed.set_footer(text=f"Showing top {min(len(leaderboard), 10)} of {len(leaderboard)} listeners")
-            await ctx.send(embed=embed)
+            await ctx.send(content=note, embed=embed)
 
 
 async def setup(bot: commands.Bot):
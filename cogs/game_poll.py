@@ -12,11 +12,8 @@ from pathlib import Path
 from zoneinfo import ZoneInfo
 import logging
 
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+from utils.render_service import PLAYWRIGHT_AVAILABLE
+from utils import database
 
 EASTERN = ZoneInfo("America/New_York")
 
@@ -33,12 +30,14 @@ ERROR_COLOR = 0xED4245   # Red
 
 MAX_GAME_NAME_LEN = 25
 MIN_VC_SECONDS = 15 * 60 # 15 minutes to become a returning player
+POLL_END_TIMER = "game_poll_end"  # scheduler kind; key is the active_poll id
+POLL_END_RETRY_SECONDS = 60
 
 class DB:
     """Helper class for SQLite database operations."""
     @staticmethod
     async def setup():
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             # Enable Write-Ahead Logging for high concurrency / race condition prevention
             await db.execute("PRAGMA journal_mode=WAL;")
 
@@ -95,14 +94,14 @@ class DB:
 
     @staticmethod
     async def get_setting(key: str, default=None):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT value FROM settings WHERE key = ?", (key,)) as cursor:
                 row = await cursor.fetchone()
                 return row[0] if row else default
 
     @staticmethod
     async def set_setting(key: str, value: str):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES (?, ?)", (key, str(value)))
             await db.commit()
 
@@ -126,7 +125,7 @@ class GameModal(discord.ui.Modal):
     async def on_submit(self, interaction: discord.Interaction):
         name = self.name_input.value.strip()
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             if self.game_id:
                 await db.execute("UPDATE games SET name = ? WHERE id = ?", (name, self.game_id))
             else:
@@ -380,7 +379,7 @@ class AdminPanel:
         active_poll = await DB.get_setting('active_poll_id')
         active_vc = await DB.get_setting('active_vc_id')
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT COUNT(*) FROM returning_players") as cur:
                 ret_players = (await cur.fetchone())[0]
 
@@ -413,7 +412,7 @@ class AdminPanel:
         embed = discord.Embed(title="Draft Poll", color=EMBED_COLOR)
 
         if self.draft_game_ids:
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 placeholders = ",".join("?" for _ in self.draft_game_ids)
                 async with db.execute(f"SELECT id, name FROM games WHERE id IN ({placeholders})", self.draft_game_ids) as cur:
                     game_rows = {r[0]: r[1] for r in await cur.fetchall()}
@@ -446,7 +445,7 @@ class AdminPanel:
         if active_poll:
             embed.set_footer(text="A poll is currently active — end it before posting a new one.")
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT id, name FROM games") as cursor:
                 all_games = await cursor.fetchall()
 
@@ -457,7 +456,7 @@ class AdminPanel:
         self.games_page = page
         per_page = 5
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT id, name, banner_url FROM games LIMIT ? OFFSET ?", (per_page + 1, page * per_page)) as cursor:
                 games = await cursor.fetchall()
 
@@ -512,7 +511,7 @@ class AdminPanel:
     async def show_returning_players(self, interaction):
         embed = discord.Embed(title="Returning Players", color=EMBED_COLOR)
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT user_id FROM returning_players") as cur:
                 rows = await cur.fetchall()
 
@@ -577,7 +576,7 @@ class AdminPanel:
     async def show_game_banners(self, interaction, selected_game_id=None):
         embed = discord.Embed(title="Game Banners", color=EMBED_COLOR)
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT id, name, banner_url FROM games") as cur:
                 all_games = await cur.fetchall()
 
@@ -632,7 +631,7 @@ class AdminPanel:
         if not primary_channels and not secondary_channels:
             return False, "None of the configured channels were found. Re-configure in Channels."
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             placeholders = ",".join("?" for _ in self.draft_game_ids)
             async with db.execute(f"SELECT name FROM games WHERE id IN ({placeholders})", self.draft_game_ids) as cur:
                 game_names = [row[0] for row in await cur.fetchall()]
@@ -659,7 +658,7 @@ class AdminPanel:
         ping_enabled = await DB.get_setting('ping_role_enabled', '0')
         ping_content = f"<@&{role_id}>" if role_id and ping_enabled == '1' else None
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             cursor = await db.execute(
                 "INSERT INTO active_poll (channel_id, message_id, end_time) VALUES (?, ?, ?)",
                 (0, 0, self.draft_end_time.timestamp())
@@ -700,6 +699,7 @@ class AdminPanel:
 
             await db.commit()
 
+        await self.cog.bot.scheduler.schedule(POLL_END_TIMER, poll_id, self.draft_end_time.timestamp())
         await self.clear_draft()
         return True, "Poll posted!"
 
@@ -916,7 +916,7 @@ class GamesView(discord.ui.View):
 
     async def edit_cb(self, interaction: discord.Interaction):
         game_id = int(self.select.values[0])
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT name FROM games WHERE id = ?", (game_id,)) as cur:
                 row = await cur.fetchone()
         if row:
@@ -1034,14 +1034,14 @@ class ReturningPlayersView(discord.ui.View):
     async def add_cb(self, interaction: discord.Interaction):
         user = interaction.data["resolved"]["users"]
         user_id = int(list(user.keys())[0])
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute("INSERT OR IGNORE INTO returning_players (user_id) VALUES (?)", (user_id,))
             await db.commit()
         await self.panel.show_returning_players(interaction)
 
     async def remove_cb(self, interaction: discord.Interaction):
         user_id = int(interaction.data["values"][0])
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute("DELETE FROM returning_players WHERE user_id = ?", (user_id,))
             await db.commit()
         await self.panel.show_returning_players(interaction)
@@ -1203,7 +1203,7 @@ class GameBannersView(discord.ui.View):
     async def set_cb(self, interaction: discord.Interaction):
         game_id = self.selected_id
         async def save_banner(i, url):
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute("UPDATE games SET banner_url = ? WHERE id = ?", (url, game_id))
                 await db.commit()
             await i.response.defer()
@@ -1211,7 +1211,7 @@ class GameBannersView(discord.ui.View):
         await interaction.response.send_modal(BannerURLModal(save_banner))
 
     async def remove_cb(self, interaction: discord.Interaction):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute("UPDATE games SET banner_url = '' WHERE id = ?", (self.selected_id,))
             await db.commit()
         await self.panel.show_game_banners(interaction, selected_game_id=self.selected_id)
@@ -1257,7 +1257,7 @@ class PublicVoteView(discord.ui.View):
         if cog and interaction.user.id in cog._active_voters:
             return await interaction.followup.send("You already have a voting session open!", ephemeral=True)
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT 1 FROM votes WHERE poll_id = ? AND user_id = ?", (poll_id, interaction.user.id)) as cursor:
                 if await cursor.fetchone():
                     return await interaction.followup.send("You have already voted! Votes cannot be changed.", ephemeral=True)
@@ -1394,7 +1394,7 @@ class VotingProcessView(discord.ui.View):
             btn_cancel.disabled = True
             await i.response.edit_message(view=self) # Lock UI immediately
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 try:
                     for rank, gid, name in self.choices:
                         used_mult = 1 if (rank == 1 and self.has_multiplier) else 0
@@ -1410,7 +1410,7 @@ class VotingProcessView(discord.ui.View):
 
             # Update public embed footer across all channels
             try:
-                async with aiosqlite.connect(DB_PATH) as db:
+                async with database.connect(DB_PATH) as db:
                     async with db.execute("SELECT COUNT(DISTINCT user_id) FROM votes WHERE poll_id = ?", (self.poll_id,)) as cur:
                         voters = (await cur.fetchone())[0]
 
@@ -1453,14 +1453,12 @@ class GamePoll(commands.Cog):
         self.vc_empty_minutes = 0
         self.poll_lock = asyncio.Lock()
         self._active_voters = set()
-        self.playwright = None
-        self.browser = None
-        self._page_semaphore = asyncio.Semaphore(2)
         self._results_template = None
 
     async def cog_load(self):
         await DB.setup()
-        self.poll_monitor.start()
+        self.bot.scheduler.register(POLL_END_TIMER, self._on_poll_end)
+        await self._schedule_active_poll_end()
         self.vc_monitor.start()
         self.bot.add_view(PublicVoteView())
         # Retroactively update active poll messages to include the Game Night Role button
@@ -1470,27 +1468,19 @@ class GamePoll(commands.Cog):
         # Initialize playwright for results card rendering
         if PLAYWRIGHT_AVAILABLE:
             try:
-                self.playwright = await async_playwright().start()
-                self.browser = await self.playwright.chromium.launch(
-                    args=['--font-render-hinting=none', '--disable-lcd-text', '--enable-font-antialiasing']
-                )
                 self._results_template = RESULTS_TEMPLATE_PATH.read_text()
                 logger.info("GamePoll: Playwright browser initialized.")
             except Exception as e:
                 logger.warning(f"GamePoll: Failed to initialize Playwright: {e}")
 
     async def cog_unload(self):
-        self.poll_monitor.cancel()
+        self.bot.scheduler.unregister(POLL_END_TIMER)
         self.vc_monitor.cancel()
         self._active_voters.clear()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
 
     async def generate_results_image(self, detail_data: dict) -> io.BytesIO | None:
         """Render the vote breakdown as a styled image using Playwright."""
-        if not self.browser or not self._results_template:
+        if not self._results_template:
             return None
 
         try:
@@ -1499,7 +1489,7 @@ class GamePoll(commands.Cog):
             # Fetch banner URLs for game icons — map by both id and name for backwards compat
             banner_by_id = {}
             banner_by_name = {}
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 async with db.execute("SELECT id, name, banner_url FROM games") as cur:
                     for row in await cur.fetchall():
                         if row[2]:
@@ -1543,19 +1533,9 @@ class GamePoll(commands.Cog):
                 rows_html=rows_html
             )
 
-            async with self._page_semaphore:
-                page = await self.browser.new_page(
-                    viewport={'width': 716, 'height': 400},
-                    device_scale_factor=2
-                )
-                try:
-                    await page.set_content(html)
-                    await page.wait_for_timeout(100)
-                    body_height = await page.evaluate('document.body.scrollHeight')
-                    await page.set_viewport_size({'width': 716, 'height': body_height})
-                    screenshot = await page.screenshot(type='png')
-                finally:
-                    await page.close()
+            screenshot = await self.bot.render_service.render(html, width=716, height=400, pad=0)
+            if not screenshot:
+                return None
 
             return io.BytesIO(screenshot)
 
@@ -1569,7 +1549,7 @@ class GamePoll(commands.Cog):
         poll_id = await DB.get_setting('active_poll_id')
         if not poll_id:
             return
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT channel_id, message_id FROM poll_messages WHERE poll_id = ?", (poll_id,)) as cur:
                 rows = await cur.fetchall()
         for ch_id, msg_id in rows:
@@ -1593,7 +1573,7 @@ class GamePoll(commands.Cog):
             return
 
         # Read persisted join times from the DB
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT user_id, join_time FROM vc_sessions WHERE join_time IS NOT NULL") as cur:
                 db_join_times = {r[0]: r[1] for r in await cur.fetchall()}
 
@@ -1610,7 +1590,7 @@ class GamePoll(commands.Cog):
     async def _update_results_views(self):
         """Edit any results messages to include the updated ResultsDetailView."""
         await self.bot.wait_until_ready()
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             async with db.execute("SELECT poll_id, channel_id, message_id FROM results_messages") as cur:
                 rows = await cur.fetchall()
         for poll_id, ch_id, msg_id in rows:
@@ -1673,7 +1653,7 @@ class GamePoll(commands.Cog):
                 self.vc_empty_minutes = 0
                 # Flush elapsed time for active VC members and promote qualifiers live
                 now = time.time()
-                async with aiosqlite.connect(DB_PATH) as db:
+                async with database.connect(DB_PATH) as db:
                     for user_id, join_time in list(self.vc_join_times.items()):
                         elapsed = now - join_time
                         await db.execute(
@@ -1688,24 +1668,36 @@ class GamePoll(commands.Cog):
         except Exception as e:
             await self.bot.error_reporter.report("GamePoll", f"vc_monitor: {e}")
 
-    @tasks.loop(minutes=1)
-    async def poll_monitor(self):
-        """Check if active poll has expired."""
+    async def _schedule_active_poll_end(self):
+        """Make sure a poll posted before poll ends moved to the scheduler has its timer."""
+        poll_id = await DB.get_setting('active_poll_id')
+        if not poll_id or self.bot.scheduler.due_at(POLL_END_TIMER, poll_id) is not None:
+            return
+        async with database.connect(DB_PATH) as db:
+            async with db.execute("SELECT end_time FROM active_poll WHERE id = ?", (poll_id,)) as cur:
+                row = await cur.fetchone()
+        if row:
+            await self.bot.scheduler.schedule(POLL_END_TIMER, poll_id, row[0])
+
+    async def _on_poll_end(self, key: str, payload):
+        """Scheduler handler: end the active poll once its close time passes."""
         try:
             poll_id = await DB.get_setting('active_poll_id')
-            if not poll_id: return
+            if poll_id != key: return  # Ended early or replaced since scheduling
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 async with db.execute("SELECT end_time FROM active_poll WHERE id = ?", (poll_id,)) as cur:
                     row = await cur.fetchone()
-                    if not row: return
+            if not row: return
 
-                    if datetime.now(EASTERN).timestamp() >= row[0]:
-                        await self.end_poll()
+            if datetime.now(EASTERN).timestamp() < row[0]:
+                await self.bot.scheduler.schedule(POLL_END_TIMER, poll_id, row[0])
+            elif not await self.end_poll():
+                # Partially failed (e.g. results couldn't post) — try again shortly
+                await self.bot.scheduler.schedule(POLL_END_TIMER, poll_id, time.time() + POLL_END_RETRY_SECONDS)
         except Exception as e:
-            await self.bot.error_reporter.report("GamePoll", f"poll_monitor: {e}")
+            await self.bot.error_reporter.report("GamePoll", f"poll end {key}: {e}")
 
-    @poll_monitor.before_loop
     @vc_monitor.before_loop
     async def before_monitors(self):
         await self.bot.wait_until_ready()
@@ -1723,7 +1715,7 @@ class GamePoll(commands.Cog):
 
             results = {}
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 async with db.execute("SELECT g.id, g.name, g.banner_url FROM games g JOIN poll_games pg ON g.id = pg.game_id WHERE pg.poll_id = ?", (poll_id,)) as cur:
                     for row in await cur.fetchall():
                         results[row[0]] = {'points': 0, 'first_places': 0, 'multiplier_points': 0, 'name': row[1], 'banner': row[2]}
@@ -1791,33 +1783,38 @@ class GamePoll(commands.Cog):
                     gn_ts = int(float(gn_time))
                     embed.add_field(name="Game Night", value=f"<t:{gn_ts}:F>\n(<t:{gn_ts}:R>)", inline=False)
 
-                # Store vote breakdown for Details button
-                await db.execute("INSERT OR REPLACE INTO poll_results (poll_id, data_json) VALUES (?, ?)",
-                                 (int(poll_id), json.dumps(detail_data)))
-
-                success = True
                 async with db.execute("SELECT channel_id, message_id FROM poll_messages WHERE poll_id = ?", (poll_id,)) as cur:
                     poll_msgs = await cur.fetchall()
 
-                for ch_id, msg_id in poll_msgs:
-                    channel = self.bot.get_channel(ch_id)
-                    if not channel:
-                        logger.warning(f"Poll channel {ch_id} not found when posting results.")
-                        continue
-                    try:
-                        results_msg = await channel.send(embed=embed, view=ResultsDetailView(int(poll_id)))
-                        await db.execute("INSERT INTO results_messages (poll_id, channel_id, message_id) VALUES (?, ?, ?)",
-                                         (int(poll_id), ch_id, results_msg.id))
-                    except Exception as e:
-                        logger.error(f"Error posting poll results to channel {ch_id}: {e}")
-                        success = False
-                    try:
-                        old_msg = await channel.fetch_message(msg_id)
-                        await old_msg.delete()
-                    except discord.NotFound:
-                        pass
-                    except Exception as e:
-                        logger.warning(f"Failed to delete poll message {msg_id}: {e}")
+            # Post results outside the DB block so other writers aren't held up by Discord
+            success = True
+            results_rows = []
+            for ch_id, msg_id in poll_msgs:
+                channel = self.bot.get_channel(ch_id)
+                if not channel:
+                    logger.warning(f"Poll channel {ch_id} not found when posting results.")
+                    continue
+                try:
+                    results_msg = await channel.send(embed=embed, view=ResultsDetailView(int(poll_id)))
+                    results_rows.append((int(poll_id), ch_id, results_msg.id))
+                except Exception as e:
+                    logger.error(f"Error posting poll results to channel {ch_id}: {e}")
+                    success = False
+                try:
+                    old_msg = await channel.fetch_message(msg_id)
+                    await old_msg.delete()
+                except discord.NotFound:
+                    pass
+                except Exception as e:
+                    logger.warning(f"Failed to delete poll message {msg_id}: {e}")
+
+            async with database.connect(DB_PATH) as db:
+                # Store vote breakdown for Details button
+                await db.execute("INSERT OR REPLACE INTO poll_results (poll_id, data_json) VALUES (?, ?)",
+                                 (int(poll_id), json.dumps(detail_data)))
+                if results_rows:
+                    await db.executemany("INSERT INTO results_messages (poll_id, channel_id, message_id) VALUES (?, ?, ?)",
+                                         results_rows)
 
                 # Always cleanup the DB even if posting failed
                 await db.execute("DELETE FROM active_poll")
@@ -1827,13 +1824,13 @@ class GamePoll(commands.Cog):
                 await db.execute("DELETE FROM returning_players")
                 await db.commit()
 
-                return success
+            return success
 
     async def finalize_vc_session(self):
         """Flushes memory VC times to DB safely."""
         now = time.time()
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             for user_id, join_time in list(self.vc_join_times.items()):
                 duration = now - join_time
                 await db.execute(
@@ -1888,7 +1885,7 @@ class GamePoll(commands.Cog):
         if custom_id.startswith("results_detail:"):
             poll_id = int(custom_id.split(":")[1])
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 async with db.execute("SELECT data_json FROM poll_results WHERE poll_id = ?", (poll_id,)) as cur:
                     row = await cur.fetchone()
 
@@ -1928,7 +1925,7 @@ class GamePoll(commands.Cog):
         if joined_active and not left_active:
             now = time.time()
             self.vc_join_times[member.id] = now
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute(
                     "INSERT INTO vc_sessions (user_id, total_seconds, join_time) VALUES (?, 0, ?) ON CONFLICT(user_id) DO UPDATE SET join_time = ?",
                     (member.id, now, now))
@@ -1938,7 +1935,7 @@ class GamePoll(commands.Cog):
             join_time = self.vc_join_times.pop(member.id, None)
             if join_time:
                 duration = time.time() - join_time
-                async with aiosqlite.connect(DB_PATH) as db:
+                async with database.connect(DB_PATH) as db:
                     await db.execute(
                         "INSERT INTO vc_sessions (user_id, total_seconds, join_time) VALUES (?, ?, NULL) ON CONFLICT(user_id) DO UPDATE SET total_seconds = total_seconds + ?, join_time = NULL",
                         (member.id, duration, duration))
@@ -7,14 +7,17 @@ from datetime import datetime, timedelta, time
 from zoneinfo import ZoneInfo
 import random
 import os
-import io
 import json
 import logging
+import shutil
 import uuid
+from concurrent.futures import ProcessPoolExecutor
 from PIL import Image
 from thefuzz import fuzz
 from cogs.image_guesser_fetcher import ImageFetcher
 
+from utils import database
+
 # =====================================================================================
 # UTILS & CONSTANTS
 # =====================================================================================
@@ -34,6 +37,8 @@ DEFAULT_FUZZY_THRESHOLD = 80
 DEFAULT_GUESSES_PER_STAGE = 3
 DEFAULT_POST_TIME = "12:00"
 DEFAULT_TIMEZONE = "America/Chicago"
+STAGE_RENDER_WORKERS = 2
+STAGE_WEBP_QUALITY = 90
 
 CATEGORIES = [
     "Name this Location",
@@ -167,12 +172,45 @@ def process_stage(image: Image.Image, stage: int, total_stages: int,
     return small.resize((w, h), Image.NEAREST)
 
 
-def image_to_bytes(image: Image.Image) -> io.BytesIO:
-    """Convert a PIL Image to a BytesIO buffer for Discord upload."""
-    buf = io.BytesIO()
-    image.save(buf, format="PNG")
-    buf.seek(0)
-    return buf
+def stage_dir_for(file_path: str) -> str:
+    """Directory holding the pre-rendered reveal stages for a queued image."""
+    return os.path.splitext(file_path)[0] + ".stages"
+
+
+def stage_file_path(file_path: str, stage: int, total_stages: int) -> str:
+    """Pre-rendered file for a stage; the last stage is the clear answer image."""
+    if stage >= total_stages:
+        return os.path.join(stage_dir_for(file_path), "answer.webp")
+    return os.path.join(stage_dir_for(file_path), f"{total_stages}_{stage}.webp")
+
+
+def render_stage_pyramid(file_path: str, total_stages: int) -> None:
+    """Render every reveal stage of an image to WebP files next to the source.
+
+    Runs in a worker process. Pixelated stages are stored lossless (flat
+    blocks compress to almost nothing); the clear answer is lossy WebP.
+    Files are written to a temp name and renamed so a reader never sees a
+    partial file.
+    """
+    os.makedirs(stage_dir_for(file_path), exist_ok=True)
+    with Image.open(file_path) as src:
+        original = src.convert("RGB")
+    for stage in range(1, total_stages + 1):
+        target = stage_file_path(file_path, stage, total_stages)
+        if os.path.exists(target):
+            continue
+        if stage >= total_stages:
+            rendered, options = original, {"quality": STAGE_WEBP_QUALITY, "method": 4}
+        else:
+            rendered = process_stage(original, stage=stage, total_stages=total_stages, file_path=file_path)
+            options = {"lossless": True, "method": 4}
+        tmp = f"{target}.{uuid.uuid4().hex}.tmp"
+        rendered.save(tmp, format="WEBP", **options)
+        os.replace(tmp, target)
+
+
+def remove_stage_files(file_path: str):
+    shutil.rmtree(stage_dir_for(file_path), ignore_errors=True)
 
 
 async def is_guesser_admin_check(interaction: discord.Interaction) -> bool:
@@ -489,7 +527,7 @@ class GuesserAdminPanelView(discord.ui.View):
         # Queue count
         queue_count = 0
         try:
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 async with db.execute("SELECT COUNT(*) FROM images WHERE used = 0 AND guild_id = ?", (interaction.guild.id,)) as c:
                     queue_count = (await c.fetchone())[0]
         except Exception as e:
@@ -537,7 +575,7 @@ class GuesserAdminPanelView(discord.ui.View):
         await interaction.response.defer(ephemeral=True, thinking=True)
         images = []
         try:
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 db.row_factory = aiosqlite.Row
                 async with db.execute("SELECT * FROM images WHERE used = 0 AND guild_id = ? ORDER BY added_at ASC LIMIT 25", (interaction.guild.id,)) as c:
                     rows = await c.fetchall()
@@ -568,7 +606,7 @@ class GuesserAdminPanelView(discord.ui.View):
     async def reset_queue(self, interaction: discord.Interaction, button: discord.ui.Button):
         await interaction.response.defer(ephemeral=True, thinking=True)
         try:
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 async with db.execute("SELECT COUNT(*) FROM images WHERE used = 1 AND guild_id = ?", (interaction.guild.id,)) as c:
                     count = (await c.fetchone())[0]
                 await db.execute("UPDATE images SET used = 0, used_date = NULL WHERE guild_id = ?", (interaction.guild.id,))
@@ -693,7 +731,7 @@ class QueueRemoveView(discord.ui.View):
             return await interaction.response.send_message("You don't have permission for this.", ephemeral=True)
         image_id = int(self.select.values[0])
         try:
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 # Get the file path to delete the image file too
                 async with db.execute("SELECT file_path FROM images WHERE id = ?", (image_id,)) as c:
                     row = await c.fetchone()
@@ -703,6 +741,8 @@ class QueueRemoveView(discord.ui.View):
             # Delete the actual image file
             if row and row[0] and os.path.exists(row[0]):
                 os.remove(row[0])
+            if row and row[0]:
+                remove_stage_files(row[0])
 
             for item in self.children:
                 item.disabled = True
@@ -735,12 +775,13 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
         self.assets_dir = ASSETS_DIR
         self.pending_uploads = {}  # user_id → {guild_id, channel_id, category, answer, hint}
         self.fetcher = ImageFetcher()
+        self._stage_pool: ProcessPoolExecutor | None = None
         os.makedirs(self.assets_dir, exist_ok=True)
         self.bot.loop.create_task(self._init_db())
 
     async def _init_db(self):
         """Create the images table if it doesn't exist."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute('''CREATE TABLE IF NOT EXISTS images (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 guild_id INTEGER NOT NULL,
@@ -751,7 +792,8 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
                 added_by INTEGER NOT NULL,
                 added_at TEXT NOT NULL,
                 used INTEGER DEFAULT 0,
-                used_date TEXT DEFAULT NULL
+                used_date TEXT DEFAULT NULL,
+                content_hash TEXT DEFAULT NULL
             )''')
             # Migrate: add guild_id column if missing (existing DBs)
             try:
@@ -759,6 +801,12 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             except Exception:
                 await db.execute("ALTER TABLE images ADD COLUMN guild_id INTEGER NOT NULL DEFAULT 0")
                 log.info("Migrated images table: added guild_id column.")
+            # Migrate: add content_hash column (auto-fill dedupe) if missing
+            try:
+                await db.execute("SELECT content_hash FROM images LIMIT 1")
+            except Exception:
+                await db.execute("ALTER TABLE images ADD COLUMN content_hash TEXT DEFAULT NULL")
+                log.info("Migrated images table: added content_hash column.")
             await db.commit()
         log.info("Image guesser DB initialized.")
 
@@ -796,6 +844,18 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
         self.backup_save_loop.cancel()
         self.auto_fill_loop.cancel()
         await self.fetcher.close()
+        if self._stage_pool is not None:
+            self._stage_pool.shutdown(wait=False, cancel_futures=True)
+            self._stage_pool = None
+
+    async def _get_stage_file(self, file_path: str, stage: int, total_stages: int) -> str:
+        """Path of a pre-rendered stage, rendering the whole pyramid in the process pool on first use."""
+        target = stage_file_path(file_path, stage, total_stages)
+        if not os.path.exists(target):
+            if self._stage_pool is None:
+                self._stage_pool = ProcessPoolExecutor(max_workers=STAGE_RENDER_WORKERS)
+            await self.bot.loop.run_in_executor(self._stage_pool, render_stage_pyramid, file_path, total_stages)
+        return target
 
     async def cog_app_command_error(self, interaction: discord.Interaction, error: app_commands.AppCommandError):
         log.error(f"Error in command '{interaction.command.name}': {error}", exc_info=True)
@@ -968,7 +1028,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
 
         image_data = None
         try:
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 db.row_factory = aiosqlite.Row
                 # Try today's scheduled categories first
                 if today_categories:
@@ -1003,10 +1063,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
         # Generate the first (most pixelated + zoomed) stage
         stages = cfg.get("reveal_stages", DEFAULT_REVEAL_STAGES)
         try:
-            original = Image.open(image_data["file_path"]).convert("RGB")
-            processed = process_stage(original, stage=1, total_stages=stages, file_path=image_data["file_path"])
-            image_bytes = image_to_bytes(processed)
-            original.close()
+            stage_path = await self._get_stage_file(image_data["file_path"], 1, stages)
         except Exception as e:
             log.error(f"Error processing image: {e}", exc_info=True)
             return False
@@ -1021,9 +1078,9 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             color=EMBED_COLOR,
         )
         embed.set_footer(text=f"Stage 1/{stages}")
-        embed.set_image(url="attachment://mystery.png")
+        embed.set_image(url="attachment://mystery.webp")
 
-        file = discord.File(image_bytes, filename="mystery.png")
+        file = discord.File(stage_path, filename="mystery.webp")
         try:
             # Unpin the previous game's message if it exists
             try:
@@ -1114,10 +1171,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             return False
 
         try:
-            original = Image.open(file_path).convert("RGB")
-            processed = process_stage(original, stage=new_stage, total_stages=stages, file_path=file_path)
-            image_bytes = image_to_bytes(processed)
-            original.close()
+            stage_path = await self._get_stage_file(file_path, new_stage, stages)
         except Exception as e:
             log.error(f"Error processing reveal image: {e}", exc_info=True)
             return False
@@ -1135,7 +1189,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             title=f"Getting clearer... (Stage {new_stage}/{stages})",
             color=EMBED_COLOR,
         )
-        embed.set_image(url="attachment://mystery.png")
+        embed.set_image(url="attachment://mystery.webp")
         embed.set_footer(text=f"Stage {new_stage}/{stages}")
 
         # Post hint at the middle stage if available
@@ -1148,7 +1202,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
         if new_stage == middle_stage:
             # Get the hint from the image
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with database.connect(self.db_path) as db:
                     async with db.execute("SELECT hint FROM images WHERE id = ?", (active["image_id"],)) as c:
                         row = await c.fetchone()
                     if row and row[0]:
@@ -1156,7 +1210,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             except Exception:
                 pass
 
-        file = discord.File(image_bytes, filename="mystery.png")
+        file = discord.File(stage_path, filename="mystery.webp")
         try:
             reveal_msg = await thread.send(embed=embed, file=file)
             try:
@@ -1217,10 +1271,9 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             # Post the clear original image
             if file_path and os.path.exists(file_path):
                 try:
-                    original = Image.open(file_path).convert("RGB")
-                    image_bytes = image_to_bytes(original)
-                    original.close()
-                    file = discord.File(image_bytes, filename="answer.png")
+                    stages = cfg.get("reveal_stages", DEFAULT_REVEAL_STAGES)
+                    answer_path = await self._get_stage_file(file_path, stages, stages)
+                    file = discord.File(answer_path, filename="answer.webp")
 
                     if reason == "time_up":
                         embed = discord.Embed(
@@ -1240,7 +1293,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
                             description=f"The answer was **{answer}**.",
                             color=EMBED_COLOR,
                         )
-                    embed.set_image(url="attachment://answer.png")
+                    embed.set_image(url="attachment://answer.webp")
                     answer_msg = await thread.send(embed=embed, file=file)
                     try:
                         await answer_msg.pin()
@@ -1267,7 +1320,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
         # Mark image as used in DB
         if active.get("image_id"):
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with database.connect(self.db_path) as db:
                     await db.execute(
                         "UPDATE images SET used = 1, used_date = ? WHERE id = ?",
                         (datetime.now().strftime("%Y-%m-%d"), active["image_id"])
@@ -1275,6 +1328,8 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
                     await db.commit()
             except Exception as e:
                 log.error(f"Error marking image as used: {e}", exc_info=True)
+        if file_path:
+            remove_stage_files(file_path)
 
         # Schedule thread for deletion in 48 hours
         thread_id = active.get("thread_id")
@@ -1334,7 +1389,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
                 return await message.reply("That doesn't appear to be a valid image.", delete_after=10)
 
             try:
-                async with aiosqlite.connect(self.db_path) as db:
+                async with database.connect(self.db_path) as db:
                     await db.execute(
                         "INSERT INTO images (guild_id, file_path, answer, category, hint, added_by, added_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
                         (message.guild.id, file_path, pending["answer"], pending["category"],
@@ -1437,16 +1492,14 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             # Post the clear image
             file_path = active.get("file_path")
             file = None
+            stages = cfg.get("reveal_stages", DEFAULT_REVEAL_STAGES)
             if file_path and os.path.exists(file_path):
                 try:
-                    original = Image.open(file_path).convert("RGB")
-                    image_bytes = image_to_bytes(original)
-                    original.close()
-                    file = discord.File(image_bytes, filename="answer.png")
+                    answer_path = await self._get_stage_file(file_path, stages, stages)
+                    file = discord.File(answer_path, filename="answer.webp")
                 except Exception:
                     pass
 
-            stages = cfg.get("reveal_stages", DEFAULT_REVEAL_STAGES)
             stage_solved = active.get("current_stage", 1)
 
             embed = discord.Embed(
@@ -1456,7 +1509,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             )
             embed.set_footer(text=f"Solved at stage {stage_solved}/{stages}")
             if file:
-                embed.set_image(url="attachment://answer.png")
+                embed.set_image(url="attachment://answer.webp")
 
             try:
                 reply_msg = await message.reply(embed=embed, file=file)
@@ -1482,7 +1535,7 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
             # Mark image as used
             if active.get("image_id"):
                 try:
-                    async with aiosqlite.connect(self.db_path) as db:
+                    async with database.connect(self.db_path) as db:
                         await db.execute(
                             "UPDATE images SET used = 1, used_date = ? WHERE id = ?",
                             (datetime.now().strftime("%Y-%m-%d"), active["image_id"])
@@ -1490,6 +1543,8 @@ class ImageGuesser(commands.Cog, name="ImageGuesser"):
                         await db.commit()
                 except Exception as e:
                     log.error(f"Error marking image as used: {e}", exc_info=True)
+            if file_path:
+                remove_stage_files(file_path)
 
     # ---------------------------------------------------------------------------------
     # Slash commands
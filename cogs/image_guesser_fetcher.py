@@ -12,13 +12,16 @@ APIs used:
 """
 
 import aiohttp
-import aiosqlite
 import asyncio
+import hashlib
 import logging
 import os
 import random
 import uuid
 from datetime import datetime
+from typing import NamedTuple
+
+from utils import database
 
 log = logging.getLogger("discord.image_guesser.fetcher")
 
@@ -30,6 +33,18 @@ DB_PATH = os.path.join(_cog_dir, '..', 'image_guesser.db')
 FETCH_BATCH = 3
 # Minimum unused images per category before auto-fetch kicks in
 MIN_QUEUE_DEPTH = 3
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Category fetchers run concurrently; these cap how many hit the same API at once.
+# Jikan and Unsplash stay at 1 since their fetchers pace requests themselves.
+PROVIDER_CONCURRENCY = {
+    "tmdb": 3,
+    "igdb": 1,
+    "jikan": 1,
+    "lastfm": 1,
+    "unsplash": 1,
+    "wikipedia": 1,
+}
 
 # Curated landmarks for Unsplash location/country fetching
 LANDMARKS = [
@@ -140,6 +155,37 @@ def _build_title_answers(title: str) -> str:
     return ", ".join(answers)
 
 
+class DownloadedImage(NamedTuple):
+    path: str
+    content_hash: str
+
+
+class FillBatch:
+    """Images gathered during one auto_fill run for a guild, inserted in one transaction.
+
+    Seeded with the guild's existing answers and content hashes so repeats
+    (same answer in a category, or byte-identical files from different URLs)
+    are rejected before they reach the DB.
+    """
+
+    def __init__(self, guild_id: int, answers: set, hashes: set):
+        self.guild_id = guild_id
+        self._answers = answers  # {(category, answer)}
+        self._hashes = hashes
+        self.rows: list[tuple] = []
+
+    def add(self, image: DownloadedImage, answer: str, category: str, hint: str | None = None) -> bool:
+        """Queue a downloaded image; deletes the file and returns False if it's a repeat."""
+        if (category, answer) in self._answers or image.content_hash in self._hashes:
+            if os.path.exists(image.path):
+                os.remove(image.path)
+            return False
+        self._answers.add((category, answer))
+        self._hashes.add(image.content_hash)
+        self.rows.append((image.path, image.content_hash, answer, category, hint))
+        return True
+
+
 class ImageFetcher:
     """Fetches images from various APIs and inserts them into the image guesser DB."""
 
@@ -152,6 +198,7 @@ class ImageFetcher:
         self._igdb_token = None
         self._igdb_token_expires = 0
         self._session: aiohttp.ClientSession | None = None
+        self._provider_limits = {name: asyncio.Semaphore(n) for name, n in PROVIDER_CONCURRENCY.items()}
         os.makedirs(ASSETS_DIR, exist_ok=True)
 
     @property
@@ -171,16 +218,14 @@ class ImageFetcher:
     # Helpers
     # ---------------------------------------------------------------------------
 
-    async def _download_image(self, url: str) -> str | None:
-        """Download an image from a URL, save to assets, return file path."""
+    async def _download_image(self, url: str) -> DownloadedImage | None:
+        """Stream an image from a URL into assets, hashing it on the way."""
+        path = None
         try:
             async with self.session.get(url) as resp:
                 if resp.status != 200:
                     log.warning(f"Failed to download image: HTTP {resp.status} from {url}")
                     return None
-                data = await resp.read()
-                if len(data) < 1024:  # Skip tiny/broken images
-                    return None
                 # Determine extension from content type
                 ct = resp.content_type or ""
                 if "png" in ct:
@@ -191,55 +236,65 @@ class ImageFetcher:
                     ext = ".webp"
                 else:
                     ext = ".jpg"
-                filename = f"{uuid.uuid4().hex}{ext}"
-                path = os.path.join(ASSETS_DIR, filename)
+                path = os.path.join(ASSETS_DIR, f"{uuid.uuid4().hex}{ext}")
+                digest = hashlib.sha256()
+                size = 0
                 with open(path, "wb") as f:
-                    f.write(data)
-                return path
+                    async for chunk in resp.content.iter_chunked(DOWNLOAD_CHUNK_SIZE):
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+            if size < 1024:  # Skip tiny/broken images
+                os.remove(path)
+                return None
+            return DownloadedImage(path, digest.hexdigest())
         except Exception as e:
             log.error(f"Error downloading image from {url}: {e}")
+            if path and os.path.exists(path):
+                os.remove(path)
             return None
 
-    async def _insert_image(self, guild_id: int, file_path: str, answer: str,
-                            category: str, hint: str | None = None):
-        """Insert a fetched image into the DB."""
-        async with aiosqlite.connect(DB_PATH) as db:
-            # Check for duplicate answers in same category to avoid repeats
+    async def _start_batch(self, guild_id: int) -> tuple[FillBatch, dict[str, int]]:
+        """Load the guild's existing answers/hashes and per-category unused depth in one query."""
+        answers, hashes, depths = set(), set(), {}
+        async with database.connect(DB_PATH) as db:
             async with db.execute(
-                "SELECT COUNT(*) FROM images WHERE guild_id = ? AND category = ? AND answer = ?",
-                (guild_id, category, answer)
+                "SELECT category, answer, content_hash, used FROM images WHERE guild_id = ?", (guild_id,)
             ) as c:
-                count = (await c.fetchone())[0]
-            if count > 0:
-                # Already have this one, skip
-                if os.path.exists(file_path):
-                    os.remove(file_path)
-                return False
-            await db.execute(
-                "INSERT INTO images (guild_id, file_path, answer, category, hint, added_by, added_at) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (guild_id, file_path, answer, category, hint, 0, datetime.now().isoformat())
-            )
-            await db.commit()
-        log.info(f"Auto-queued: [{category}] {answer}")
-        return True
-
-    async def _get_queue_depth(self, guild_id: int, category: str) -> int:
-        """Get the number of unused images for a category."""
+                async for category, answer, content_hash, used in c:
+                    answers.add((category, answer))
+                    if content_hash:
+                        hashes.add(content_hash)
+                    if not used:
+                        depths[category] = depths.get(category, 0) + 1
+        return FillBatch(guild_id, answers, hashes), depths
+
+    async def _insert_batch(self, batch: FillBatch):
+        """Insert every image gathered in a batch in a single transaction."""
+        if not batch.rows:
+            return
+        added_at = datetime.now().isoformat()
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
-                async with db.execute(
-                    "SELECT COUNT(*) FROM images WHERE used = 0 AND guild_id = ? AND category = ?",
-                    (guild_id, category)
-                ) as c:
-                    return (await c.fetchone())[0]
+            async with database.connect(DB_PATH) as db:
+                await db.executemany(
+                    "INSERT INTO images (guild_id, file_path, content_hash, answer, category, hint, added_by, added_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, 0, ?)",
+                    [(batch.guild_id, *row, added_at) for row in batch.rows]
+                )
+                await db.commit()
         except Exception:
-            return 0
+            for row in batch.rows:
+                if os.path.exists(row[0]):
+                    os.remove(row[0])
+            raise
+        for _, _, answer, category, _ in batch.rows:
+            log.info(f"Auto-queued: [{category}] {answer}")
 
     # ---------------------------------------------------------------------------
     # TMDB — Movies, TV Shows, People
     # ---------------------------------------------------------------------------
 
-    async def fetch_movies(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_movies(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch well-known movie backdrops from TMDB (1985+, high vote count)."""
         if not self.tmdb_key:
             log.warning("TMDB_API_KEY not set, skipping movie fetch")
@@ -272,20 +327,20 @@ class ImageFetcher:
                     continue
 
                 image_url = f"https://image.tmdb.org/t/p/w1280{backdrop}"
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 year = (movie.get("release_date") or "")[:4]
                 hint = f"Released in {year}" if year else None
                 answer = _build_title_answers(title)
-                if await self._insert_image(guild_id, file_path, answer, "Name this Movie", hint):
+                if batch.add(image, answer, "Name this Movie", hint):
                     added += 1
         except Exception as e:
             log.error(f"Error fetching movies: {e}", exc_info=True)
         return added
 
-    async def fetch_tv_shows(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_tv_shows(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch well-known TV show backdrops from TMDB (1990+, high vote count)."""
         if not self.tmdb_key:
             return 0
@@ -316,20 +371,20 @@ class ImageFetcher:
                     continue
 
                 image_url = f"https://image.tmdb.org/t/p/w1280{backdrop}"
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 year = (show.get("first_air_date") or "")[:4]
                 hint = f"First aired in {year}" if year else None
                 answer = _build_title_answers(name)
-                if await self._insert_image(guild_id, file_path, answer, "Name this TV Show", hint):
+                if batch.add(image, answer, "Name this TV Show", hint):
                     added += 1
         except Exception as e:
             log.error(f"Error fetching TV shows: {e}", exc_info=True)
         return added
 
-    async def fetch_people(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_people(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch well-known person photos from TMDB.
         Filters: page 1-2 only, popularity >= 40, known_for must include
         at least one title with 500+ votes (proves mainstream recognition)."""
@@ -365,13 +420,13 @@ class ImageFetcher:
                     continue
 
                 image_url = f"https://image.tmdb.org/t/p/w780{profile}"
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 dept = person.get("known_for_department")
                 hint = f"Known for {dept.lower()}" if dept else None
-                if await self._insert_image(guild_id, file_path, name, "Name this Person", hint):
+                if batch.add(image, name, "Name this Person", hint):
                     added += 1
         except Exception as e:
             log.error(f"Error fetching people: {e}", exc_info=True)
@@ -409,7 +464,7 @@ class ImageFetcher:
             log.error(f"Error getting IGDB token: {e}")
             return None
 
-    async def fetch_video_games(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_video_games(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch well-known video game screenshots from IGDB (high rating count, 2000+)."""
         token = await self._get_igdb_token()
         if not token:
@@ -451,8 +506,8 @@ class ImageFetcher:
                     continue
 
                 image_url = f"https://images.igdb.com/igdb/image/upload/t_screenshot_big/{image_id}.jpg"
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 # Build hint from release year
@@ -466,7 +521,7 @@ class ImageFetcher:
                         pass
 
                 answer = _build_title_answers(name)
-                if await self._insert_image(guild_id, file_path, answer, "Name this Video Game", hint):
+                if batch.add(image, answer, "Name this Video Game", hint):
                     added += 1
         except Exception as e:
             log.error(f"Error fetching video games: {e}", exc_info=True)
@@ -476,7 +531,7 @@ class ImageFetcher:
     # Jikan (MyAnimeList) — Anime, Characters
     # ---------------------------------------------------------------------------
 
-    async def fetch_anime(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_anime(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch popular anime images from Jikan (top-rated, score >= 7.5)."""
         added = 0
         try:
@@ -504,8 +559,8 @@ class ImageFetcher:
                 if score < 7.5:
                     continue
 
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 year = anime.get("year")
@@ -514,7 +569,7 @@ class ImageFetcher:
                 alt_title = anime.get("title") if anime.get("title_english") else None
                 answer = f"{title}, {alt_title}" if alt_title and alt_title != title else title
 
-                if await self._insert_image(guild_id, file_path, answer, "Name this Anime", hint):
+                if batch.add(image, answer, "Name this Anime", hint):
                     added += 1
 
                 await asyncio.sleep(0.4)  # Jikan rate limit: ~3 req/sec
@@ -522,7 +577,7 @@ class ImageFetcher:
             log.error(f"Error fetching anime: {e}", exc_info=True)
         return added
 
-    async def fetch_characters(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_characters(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch popular anime characters from Jikan (top 75)."""
         added = 0
         try:
@@ -547,8 +602,8 @@ class ImageFetcher:
                 if not name or not image_url:
                     continue
 
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 # Use the "about" field first line as hint if available
@@ -559,7 +614,7 @@ class ImageFetcher:
                     if len(first_line) < 100:
                         hint = first_line
 
-                if await self._insert_image(guild_id, file_path, name, "Name this Character", hint):
+                if batch.add(image, name, "Name this Character", hint):
                     added += 1
 
                 await asyncio.sleep(0.4)
@@ -571,7 +626,7 @@ class ImageFetcher:
     # Last.fm — Albums
     # ---------------------------------------------------------------------------
 
-    async def fetch_albums(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_albums(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch iconic album art via Last.fm — picks top albums from charting artists."""
         if not self.lastfm_key:
             log.warning("LASTFM_API_KEY not set, skipping album fetch")
@@ -631,12 +686,12 @@ class ImageFetcher:
                 if not image_url:
                     continue
 
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 hint = f"By {artist_name}"
-                if await self._insert_image(guild_id, file_path, name, "Name this Album", hint):
+                if batch.add(image, name, "Name this Album", hint):
                     added += 1
 
                 await asyncio.sleep(0.2)
@@ -648,7 +703,7 @@ class ImageFetcher:
     # Unsplash — Locations, Countries
     # ---------------------------------------------------------------------------
 
-    async def fetch_locations(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_locations(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch landmark photos from Unsplash."""
         if not self.unsplash_key:
             log.warning("UNSPLASH_ACCESS_KEY not set, skipping location fetch")
@@ -681,8 +736,8 @@ class ImageFetcher:
                 if not image_url:
                     continue
 
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 hint_parts = []
@@ -691,7 +746,7 @@ class ImageFetcher:
                 hint_parts.append(f"Country: {country}")
                 hint = ", ".join(hint_parts) if hint_parts else None
 
-                if await self._insert_image(guild_id, file_path, landmark_name, "Name this Location", hint):
+                if batch.add(image, landmark_name, "Name this Location", hint):
                     added += 1
 
                 await asyncio.sleep(1.0)  # Unsplash: 50 req/hour, be conservative
@@ -699,7 +754,7 @@ class ImageFetcher:
                 log.error(f"Error fetching location {landmark_name}: {e}")
         return added
 
-    async def fetch_countries(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_countries(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch country landmark photos from Unsplash for 'Name this Country'."""
         if not self.unsplash_key:
             return 0
@@ -730,12 +785,12 @@ class ImageFetcher:
                 if not image_url:
                     continue
 
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
                 hint = f"Famous landmark: {landmark_name}"
-                if await self._insert_image(guild_id, file_path, country, "Name this Country", hint):
+                if batch.add(image, country, "Name this Country", hint):
                     added += 1
 
                 await asyncio.sleep(1.0)
@@ -747,7 +802,7 @@ class ImageFetcher:
     # Wikipedia — Historical Events
     # ---------------------------------------------------------------------------
 
-    async def fetch_historical_events(self, guild_id: int, count: int = FETCH_BATCH) -> int:
+    async def fetch_historical_events(self, batch: FillBatch, count: int = FETCH_BATCH) -> int:
         """Fetch historical event images from Wikipedia article pages."""
         added = 0
         events = random.sample(HISTORICAL_EVENTS, min(count * 3, len(HISTORICAL_EVENTS)))
@@ -771,11 +826,11 @@ class ImageFetcher:
                 if not image_url:
                     continue
 
-                file_path = await self._download_image(image_url)
-                if not file_path:
+                image = await self._download_image(image_url)
+                if not image:
                     continue
 
-                if await self._insert_image(guild_id, file_path, event_name, "Name this Historical Event"):
+                if batch.add(image, event_name, "Name this Historical Event"):
                     added += 1
 
                 await asyncio.sleep(0.5)
@@ -800,22 +855,45 @@ class ImageFetcher:
         "Name this Historical Event": "fetch_historical_events",
     }
 
+    CATEGORY_PROVIDERS = {
+        "Name this Movie": "tmdb",
+        "Name this TV Show": "tmdb",
+        "Name this Person": "tmdb",
+        "Name this Video Game": "igdb",
+        "Name this Anime": "jikan",
+        "Name this Character": "jikan",
+        "Name this Album": "lastfm",
+        "Name this Location": "unsplash",
+        "Name this Country": "unsplash",
+        "Name this Historical Event": "wikipedia",
+    }
+
+    async def _fill_category(self, batch: FillBatch, category: str, needed: int):
+        async with self._provider_limits[self.CATEGORY_PROVIDERS[category]]:
+            log.info(f"[{category}] fetching {needed} images...")
+            await getattr(self, self.CATEGORY_FETCHERS[category])(batch, count=needed)
+
     async def auto_fill(self, guild_id: int) -> dict[str, int]:
         """Check all categories and fetch images for any that are below MIN_QUEUE_DEPTH.
-        Returns a dict of {category: images_added}."""
-        results = {}
-        for category, method_name in self.CATEGORY_FETCHERS.items():
-            depth = await self._get_queue_depth(guild_id, category)
+
+        Category fetchers run concurrently (bounded per API provider) and the
+        results are inserted together at the end. Returns {category: images_added}.
+        """
+        batch, depths = await self._start_batch(guild_id)
+        jobs = []
+        for category in self.CATEGORY_FETCHERS:
+            depth = depths.get(category, 0)
             if depth >= MIN_QUEUE_DEPTH:
                 log.debug(f"[{category}] queue depth {depth} >= {MIN_QUEUE_DEPTH}, skipping")
                 continue
+            jobs.append(self._fill_category(batch, category, MIN_QUEUE_DEPTH - depth))
 
-            needed = MIN_QUEUE_DEPTH - depth
-            log.info(f"[{category}] queue depth {depth}, fetching {needed} images...")
-            fetcher = getattr(self, method_name)
-            added = await fetcher(guild_id, count=needed)
-            if added > 0:
-                results[category] = added
+        for outcome in await asyncio.gather(*jobs, return_exceptions=True):
+            if isinstance(outcome, Exception):
+                log.error(f"Auto-fill fetcher failed: {outcome}", exc_info=outcome)
 
-            await asyncio.sleep(1)  # Breathing room between API calls
+        await self._insert_batch(batch)
+        results = {}
+        for _, _, _, category, _ in batch.rows:
+            results[category] = results.get(category, 0) + 1
         return results
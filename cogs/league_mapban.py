@@ -11,7 +11,8 @@ import traceback
 import re
 from io import BytesIO
 from pathlib import Path
-import aiohttp
+
+from utils import database
 
 # Pillow for image stitching
 try:
@@ -464,7 +465,7 @@ async def init_database():
     """Initialize the database with required tables."""
     Path("data").mkdir(exist_ok=True)
     
-    async with aiosqlite.connect(DATABASE_PATH) as db:
+    async with database.connect(DATABASE_PATH) as db:
         await db.execute("PRAGMA journal_mode=WAL")
         # Guild settings table
         await db.execute("""
@@ -676,13 +677,12 @@ def format_time_remaining(seconds: int) -> str:
     return f"{minutes}:{secs:02d}"
 
 
-async def fetch_image(url: str) -> Optional[bytes]:
-    """Fetch an image from a URL."""
+async def fetch_image(http, url: str) -> Optional[bytes]:
+    """Fetch an image from a URL through the bot's shared HTTP client."""
     try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url, timeout=10) as response:
-                if response.status == 200:
-                    return await response.read()
+        response = await http.get(url, timeout=10)
+        if response.status == 200:
+            return response.body
     except Exception as e:
         print(f"Failed to fetch image from {url}: {e}")
     return None
@@ -743,28 +743,10 @@ ASSETS_DIR = Path(__file__).parent.parent / "assets"
 MAPS_ASSET_DIR = ASSETS_DIR / "maps"
 AGENTS_ASSET_DIR = ASSETS_DIR / "agents"
 
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
-    logger.warning("Playwright not installed. Summary cards will not be generated.")
-
-# Shared browser instance (lazy-initialized)
-_summary_browser = None
-_summary_playwright = None
+from utils.render_service import PLAYWRIGHT_AVAILABLE
 
-
-async def _get_summary_browser():
-    """Get or create a shared Playwright browser for summary cards."""
-    global _summary_browser, _summary_playwright
-    if _summary_browser is None or not _summary_browser.is_connected():
-        if _summary_playwright is None:
-            _summary_playwright = await async_playwright().start()
-        _summary_browser = await _summary_playwright.chromium.launch(
-            executable_path="/usr/bin/chromium"
-        )
-    return _summary_browser
+if not PLAYWRIGHT_AVAILABLE:
+    logger.warning("Playwright not installed. Summary cards will not be generated.")
 
 
 def _parse_summary_data(session: Dict) -> Dict:
@@ -1020,18 +1002,15 @@ async def generate_summary_card(session: Dict, guild_id: int, cog) -> Optional[B
         tmp_path = tmp.name
 
         try:
-            browser = await _get_summary_browser()
-            page = await browser.new_page(
-                viewport={"width": 960, "height": 540},
-                device_scale_factor=2,
+            screenshot = await cog.bot.render_service.render(
+                url=f"file://{tmp_path}",
+                width=960,
+                height=540,
+                wait_until="networkidle",
+                wait_ms=200,
+                fit_content=False,
             )
-            await page.goto(f"file://{tmp_path}")
-            await page.wait_for_load_state("networkidle")
-            await page.wait_for_timeout(200)
-
-            screenshot = await page.screenshot(type="png")
-            await page.close()
-            return BytesIO(screenshot)
+            return BytesIO(screenshot) if screenshot else None
         finally:
             Path(tmp_path).unlink(missing_ok=True)
 
@@ -2757,7 +2736,7 @@ class MapBanCog(commands.Cog):
     
     async def get_guild_settings(self, guild_id: int) -> Dict:
         """Get settings for a guild."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM guild_settings WHERE guild_id = ?",
@@ -2786,7 +2765,7 @@ class MapBanCog(commands.Cog):
         if key not in self.ALLOWED_GUILD_SETTINGS:
             raise ValueError(f"Invalid guild setting: {key}")
 
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute(
                 f"UPDATE guild_settings SET {key} = ?, updated_at = CURRENT_TIMESTAMP WHERE guild_id = ?",
                 (value, guild_id)
@@ -2795,7 +2774,7 @@ class MapBanCog(commands.Cog):
     
     async def get_maps(self, guild_id: int) -> List[Dict]:
         """Get all maps for a guild."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM maps WHERE guild_id = ? ORDER BY map_name",
@@ -2806,7 +2785,7 @@ class MapBanCog(commands.Cog):
     
     async def get_enabled_maps(self, guild_id: int) -> List[str]:
         """Get enabled map names for a guild."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             async with db.execute(
                 "SELECT map_name FROM maps WHERE guild_id = ? AND enabled = 1 ORDER BY map_name",
                 (guild_id,)
@@ -2817,7 +2796,7 @@ class MapBanCog(commands.Cog):
     async def add_map(self, guild_id: int, map_name: str) -> bool:
         """Add a map to the guild's pool."""
         try:
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with database.connect(DATABASE_PATH) as db:
                 await db.execute(
                     "INSERT INTO maps (guild_id, map_name) VALUES (?, ?)",
                     (guild_id, map_name)
@@ -2829,7 +2808,7 @@ class MapBanCog(commands.Cog):
     
     async def remove_map(self, guild_id: int, map_name: str):
         """Remove a map from the guild's pool."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute(
                 "DELETE FROM maps WHERE guild_id = ? AND map_name = ?",
                 (guild_id, map_name)
@@ -2838,7 +2817,7 @@ class MapBanCog(commands.Cog):
     
     async def toggle_map(self, guild_id: int, map_name: str) -> bool:
         """Toggle a map's enabled status. Returns new state."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             async with db.execute(
                 "SELECT enabled FROM maps WHERE guild_id = ? AND map_name = ?",
                 (guild_id, map_name)
@@ -2856,7 +2835,7 @@ class MapBanCog(commands.Cog):
     
     async def set_map_image(self, guild_id: int, map_name: str, url: str):
         """Set a map's image URL."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute(
                 "UPDATE maps SET map_image_url = ? WHERE guild_id = ? AND map_name = ?",
                 (url, guild_id, map_name)
@@ -2865,7 +2844,7 @@ class MapBanCog(commands.Cog):
     
     async def get_map_image_url(self, guild_id: int, map_name: str) -> Optional[str]:
         """Get a map's image URL."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             async with db.execute(
                 "SELECT map_image_url FROM maps WHERE guild_id = ? AND map_name = ?",
                 (guild_id, map_name)
@@ -2879,7 +2858,7 @@ class MapBanCog(commands.Cog):
 
     async def get_agents(self, guild_id: int) -> List[Dict]:
         """Get all agents for a guild."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM agents WHERE guild_id = ? ORDER BY agent_name",
@@ -2890,7 +2869,7 @@ class MapBanCog(commands.Cog):
 
     async def get_enabled_agents(self, guild_id: int) -> List[str]:
         """Get enabled agent names for a guild."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             async with db.execute(
                 "SELECT agent_name FROM agents WHERE guild_id = ? AND enabled = 1 ORDER BY agent_name",
                 (guild_id,)
@@ -2901,7 +2880,7 @@ class MapBanCog(commands.Cog):
     async def add_agents(self, guild_id: int, agent_names: List[str]) -> int:
         """Add multiple agents to the guild's pool. Returns count of agents added."""
         added = 0
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             for name in agent_names:
                 name = name.strip()
                 if not name:
@@ -2919,7 +2898,7 @@ class MapBanCog(commands.Cog):
 
     async def remove_agent(self, guild_id: int, agent_name: str):
         """Remove an agent from the guild's pool."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute(
                 "DELETE FROM agents WHERE guild_id = ? AND agent_name = ?",
                 (guild_id, agent_name)
@@ -2928,7 +2907,7 @@ class MapBanCog(commands.Cog):
 
     async def toggle_agent(self, guild_id: int, agent_name: str) -> bool:
         """Toggle an agent's enabled status. Returns new state."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             async with db.execute(
                 "SELECT enabled FROM agents WHERE guild_id = ? AND agent_name = ?",
                 (guild_id, agent_name)
@@ -2946,7 +2925,7 @@ class MapBanCog(commands.Cog):
 
     async def set_agent_image(self, guild_id: int, agent_name: str, url: str):
         """Set an agent's image URL."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute(
                 "UPDATE agents SET agent_image_url = ? WHERE guild_id = ? AND agent_name = ?",
                 (url, guild_id, agent_name)
@@ -3057,7 +3036,7 @@ class MapBanCog(commands.Cog):
 
     async def save_session(self, session: Dict):
         """Save a session to the database."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute("""
                 INSERT OR REPLACE INTO sessions (
                     session_id, guild_id, matchup_name, format, captain1_id, captain2_id,
@@ -3116,7 +3095,7 @@ class MapBanCog(commands.Cog):
     
     async def get_session(self, session_id: str) -> Optional[Dict]:
         """Get a session from database."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM sessions WHERE session_id = ?",
@@ -3129,7 +3108,7 @@ class MapBanCog(commands.Cog):
     
     async def get_active_sessions(self, guild_id: int) -> List[Dict]:
         """Get all active sessions for a guild."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM sessions WHERE guild_id = ? AND status = 'active'",
@@ -3140,7 +3119,7 @@ class MapBanCog(commands.Cog):
     
     async def delete_session(self, session_id: str):
         """Delete a session from database."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             await db.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
             await db.commit()
 
@@ -3152,7 +3131,7 @@ class MapBanCog(commands.Cog):
     
     async def load_active_sessions(self):
         """Load active sessions into memory on startup."""
-        async with aiosqlite.connect(DATABASE_PATH) as db:
+        async with database.connect(DATABASE_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(
                 "SELECT * FROM sessions WHERE status = 'active'"
@@ -4347,7 +4326,7 @@ class MapBanCog(commands.Cog):
         try:
             now = datetime.now(timezone.utc)
 
-            async with aiosqlite.connect(DATABASE_PATH) as db:
+            async with database.connect(DATABASE_PATH) as db:
                 db.row_factory = aiosqlite.Row
 
                 # Get completed sessions older than 3 hours for thread deletion
@@ -13,10 +13,8 @@ import pandas as pd
 import io
 import base64
 
-try:
-    from playwright.async_api import async_playwright
-except ImportError:
-    async_playwright = None
+from utils.render_service import PLAYWRIGHT_AVAILABLE
+from utils import database
 
 logger = logging.getLogger('league_stats')
 if not logger.handlers:
@@ -416,7 +414,7 @@ class DB:
         with open(teamvsteam_path, "w", encoding="utf-8") as f:
             f.write(TEAMVSTEAM_HTML)
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.executescript(SCHEMA)
             # Migrate existing tables
             try:
@@ -439,28 +437,28 @@ class DB:
 
     @staticmethod
     async def get_active_event():
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM events WHERE is_active = 1 LIMIT 1") as cursor:
                 return await cursor.fetchone()
 
     @staticmethod
     async def fetch_all(query, params=()):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(query, params) as cursor:
                 return await cursor.fetchall()
 
     @staticmethod
     async def fetch_one(query, params=()):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute(query, params) as cursor:
                 return await cursor.fetchone()
 
     @staticmethod
     async def execute(query, params=()):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             cursor = await db.execute(query, params)
             await db.commit()
             return cursor.lastrowid
@@ -543,32 +541,23 @@ class DB:
         return series, rows
 
 class PlaywrightGenerator:
-    _playwright = None
-    _browser = None
+    _renderer = None
 
     @classmethod
-    async def init(cls):
-        if not async_playwright:
+    async def init(cls, renderer):
+        if not PLAYWRIGHT_AVAILABLE:
             logger.warning("Playwright is not installed. Images cannot be generated.")
             return
-        if not cls._playwright:
-            try:
-                cls._playwright = await async_playwright().start()
-                cls._browser = await cls._playwright.chromium.launch(headless=True)
-                logger.info("League Playwright initialized.")
-            except Exception as e:
-                logger.error(f"Failed to init playwright in LeagueStats: {e}")
+        cls._renderer = renderer
+        logger.info("League Playwright initialized.")
 
     @classmethod
     async def close(cls):
-        try:
-            if cls._browser: await cls._browser.close()
-            if cls._playwright: await cls._playwright.stop()
-        except: pass
+        cls._renderer = None
 
     @classmethod
     async def generate_allplayers(cls, event_id: int) -> io.BytesIO:
-        if not cls._browser: return None
+        if not cls._renderer: return None
         stats = await DB.get_all_player_stats(event_id)
         if not stats: return None
 
@@ -634,19 +623,14 @@ class PlaywrightGenerator:
 
         html = html.replace('{rows}', rows_html)
 
-        page = await cls._browser.new_page(viewport={'width': 2000, 'height': 800}, device_scale_factor=2)
-        await page.set_content(html)
-        await page.wait_for_timeout(200)
-        body_height = await page.evaluate('document.body.scrollHeight')
-        await page.set_viewport_size({'width': 2000, 'height': max(body_height, 400)})
-
-        img = await page.screenshot(type='png')
-        await page.close()
+        img = await cls._renderer.render(html, width=2000, height=800, wait_ms=200, pad=0, min_height=400)
+        if not img:
+            return None
         return io.BytesIO(img)
 
     @classmethod
     async def generate_teamvsteam(cls, series_id: int) -> io.BytesIO:
-        if not cls._browser: return None
+        if not cls._renderer: return None
         series, rows = await DB.get_series_stats(series_id)
         if not series or not rows: return None
 
@@ -782,14 +766,9 @@ class PlaywrightGenerator:
         html = html.replace('{team_a_rows}', ta_rows)
         html = html.replace('{team_b_rows}', tb_rows)
 
-        page = await cls._browser.new_page(viewport={'width': 2000, 'height': 800}, device_scale_factor=2)
-        await page.set_content(html)
-        await page.wait_for_timeout(200)
-        body_height = await page.evaluate('document.body.scrollHeight')
-        await page.set_viewport_size({'width': 2000, 'height': max(body_height, 400)})
-
-        img = await page.screenshot(type='png')
-        await page.close()
+        img = await cls._renderer.render(html, width=2000, height=800, wait_ms=200, pad=0, min_height=400)
+        if not img:
+            return None
         return io.BytesIO(img)
 
 class ExcelGenerator:
@@ -872,7 +851,8 @@ class ExcelGenerator:
 class HenrikDevLeagueAPI:
     BASE_URL = "https://api.henrikdev.xyz"
     
-    def __init__(self, api_key: str = None):
+    def __init__(self, http, api_key: str = None):
+        self.http = http
         self.api_key = api_key or os.getenv("HENRIK_API_KEY")
     
     async def get_match_details(self, match_id: str) -> dict:
@@ -880,14 +860,13 @@ class HenrikDevLeagueAPI:
         if self.api_key:
             headers["Authorization"] = self.api_key
         
-        async with aiohttp.ClientSession(headers=headers) as session:
-            url = f"{self.BASE_URL}/valorant/v2/match/{match_id}"
-            async with session.get(url) as resp:
-                if resp.status == 200:
-                    return await resp.json()
-                else:
-                    logger.error(f"HenrikDev API Error: {resp.status} - {await resp.text()}")
-                    return None
+        url = f"{self.BASE_URL}/valorant/v2/match/{match_id}"
+        resp = await self.http.get(url, headers=headers)
+        if resp.status == 200:
+            return resp.json()
+        else:
+            logger.error(f"HenrikDev API Error: {resp.status} - {resp.text()}")
+            return None
 
 # ==========================================
 # UI COMPONENTS
@@ -1869,11 +1848,11 @@ class StatsPublicView(discord.ui.View):
 class LeagueStatsCog(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.api = HenrikDevLeagueAPI()
+        self.api = HenrikDevLeagueAPI(bot.http_client)
         
     async def cog_load(self):
         await DB.init()
-        await PlaywrightGenerator.init()
+        await PlaywrightGenerator.init(self.bot.render_service)
         self.bot.loop.create_task(self.download_agent_logos())
 
     async def cog_unload(self):
@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import json
 import os
@@ -20,6 +20,8 @@ CONFIG_FILE_MAP = "map_voter_config.json"
 EMBED_COLOR_MAP = 0xE91E63
 ADMIN_EMBED_COLOR = 0x3498DB
 VOTE_MAP_COUNT = 3
+VOTE_END_TIMER = "mapvote_end"  # scheduler kind; key is "<guild_id>:<message_id>"
+BUMP_RETRY_SECONDS = 15
 MAPS_ASSETS_DIR = Path(__file__).parent.parent / "assets" / "maps"
 MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB limit for thumbnail downloads
 _MAP_NAME_RE = None  # lazy-compiled regex
@@ -628,7 +630,6 @@ class MapVote(commands.Cog, name="mapvote"):
         self.config_manager = ConfigManager(CONFIG_FILE_MAP)
         self.active_config: Dict[str, Any] = {}
         self.config_lock = asyncio.Lock()
-        self.vote_check_loop.start()
 
     async def cog_load(self):
         try:
@@ -658,12 +659,30 @@ class MapVote(commands.Cog, name="mapvote"):
                 else:
                     self.active_config = loaded_config
 
+                pending = []
+                for gid, g_cfg in self.active_config.get("guild_data", {}).items():
+                    for mid, vote in g_cfg.get("active_votes", {}).items():
+                        if not isinstance(vote, dict) or not vote.get("end_time_iso"):
+                            log_map.warning(f"Skipping malformed active vote {mid} in guild {gid}")
+                            continue
+                        if not vote.get("overtime"):
+                            pending.append((gid, mid, vote["end_time_iso"]))
+
         except Exception as e:
             log_map.error(f"Failed to load MapVote cog: {e}", exc_info=True)
             raise e
 
+        self.bot.scheduler.register(VOTE_END_TIMER, self._on_vote_end)
+        # Votes started before vote deadlines moved to the scheduler
+        for gid, mid, end_time_iso in pending:
+            if self.bot.scheduler.due_at(VOTE_END_TIMER, f"{gid}:{mid}") is None:
+                try:
+                    await self._schedule_vote_end(gid, mid, end_time_iso)
+                except (ValueError, TypeError) as e:
+                    log_map.error(f"Error parsing timestamp for vote {mid} in guild {gid}: {e}")
+
     def cog_unload(self):
-        self.vote_check_loop.cancel()
+        self.bot.scheduler.unregister(VOTE_END_TIMER)
         
     
     # --- NEW/MODIFIED HELPER FUNCTIONS ---
@@ -1062,7 +1081,7 @@ class MapVote(commands.Cog, name="mapvote"):
 
     async def bump_vote_embed(self, guild_id: int, match_id: int, channel: discord.TextChannel):
         """Resend the map vote embed to a channel after a reshuffle, preserving all vote data."""
-        # Mark the vote as "bumping" under lock so vote_check_loop and conclude_vote skip it
+        # Mark the vote as "bumping" under lock so the vote-end timer and conclude_vote skip it
         vote_mid = None
         vote_data = None
         async with self.config_lock:
@@ -1132,6 +1151,11 @@ class MapVote(commands.Cog, name="mapvote"):
                 vote_entry["channel_id"] = channel.id
                 active_votes[str(new_msg.id)] = vote_entry
                 await self._save_config()
+            else:
+                vote_entry = None
+
+        if vote_entry and not vote_entry.get("overtime"):
+            await self._schedule_vote_end(guild_id, new_msg.id, vote_entry["end_time_iso"])
 
         try:
             old_msg = await channel.fetch_message(int(vote_mid))
@@ -1361,57 +1385,45 @@ class MapVote(commands.Cog, name="mapvote"):
             await msg.edit(view=disabled_view); await msg.reply(embed=discord.Embed(title="🚫 Vote Cancelled", color=discord.Color.red(), description=desc))
         except (discord.NotFound, discord.Forbidden) as e: log_map.warning(f"Failed cancel reply: {e}")
 
-    @tasks.loop(seconds=15)
-    async def vote_check_loop(self):
-        try:
-            now = datetime.now(timezone.utc)
-            to_process = []
+    async def _schedule_vote_end(self, guild_id, message_id, end_time_iso: str, due: Optional[float] = None):
+        if due is None:
+            due = datetime.fromisoformat(end_time_iso).timestamp()
+        await self.bot.scheduler.schedule(VOTE_END_TIMER, f"{guild_id}:{message_id}", due)
 
-            active_votes_copy = {}
-            try:
-                async with self.config_lock:
-                    active_votes_copy = copy.deepcopy(self.active_config.get("guild_data", {}))
-            except Exception as e:
-                log_map.error(f"Error copying active config in vote_check_loop: {e}", exc_info=True)
-                return # Don't proceed if copy failed
-
-            for gid, g_cfg in active_votes_copy.items():
-                for mid, vote in g_cfg.get("active_votes", {}).items():
-                    try:
-                        if now >= datetime.fromisoformat(vote["end_time_iso"]):
-                            to_process.append((gid, mid, vote))
-                    except Exception as e:
-                        log_map.error(f"Error parsing timestamp for vote {mid} in guild {gid}: {e}")
-
-            for gid, mid, _vote in to_process:
-                try:
-                    # Re-read current state under lock to avoid stale-copy race
-                    async with self.config_lock:
-                        guild_cfg = self._get_guild_config_sync(gid)
-                        live_vote = guild_cfg.get("active_votes", {}).get(mid)
-                        if not live_vote or live_vote.get("_bumping"):
-                            continue  # Already concluded/cancelled/being bumped
-                        # Skip votes already in overtime (they conclude via process_vote)
-                        if live_vote.get("overtime"):
-                            continue
-                        voter_count = len({u for ul in live_vote.get("votes", {}).values() for u in ul})
-                        max_votes = live_vote.get("max_votes", 10)
-                        majority = (max_votes // 2) + 1
-                        vote_snapshot = copy.deepcopy(live_vote)
+    async def _on_vote_end(self, key: str, payload):
+        """Scheduler handler: conclude a vote at its deadline, or send it to overtime without a majority."""
+        gid, mid = key.split(":", 1)
+        try:
+            async with self.config_lock:
+                guild_cfg = self._get_guild_config_sync(gid)
+                live_vote = guild_cfg.get("active_votes", {}).get(mid)
+                if not live_vote:
+                    return  # Already concluded/cancelled, or bumped to a new message
+                # Skip votes already in overtime (they conclude via process_vote)
+                if live_vote.get("overtime"):
+                    return
+                end_time_iso = live_vote["end_time_iso"]
+                bumping = live_vote.get("_bumping")
+                voter_count = len({u for ul in live_vote.get("votes", {}).values() for u in ul})
+                max_votes = live_vote.get("max_votes", 10)
+                majority = (max_votes // 2) + 1
+                vote_snapshot = copy.deepcopy(live_vote)
+
+            if bumping:
+                # The bump re-keys the vote; if it fails, try this one again shortly
+                due = datetime.now(timezone.utc).timestamp() + BUMP_RETRY_SECONDS
+                await self._schedule_vote_end(gid, mid, end_time_iso, due=due)
+                return
 
-                    if voter_count >= majority:
-                        await self.conclude_vote(gid, mid)
-                    else:
-                        # Not enough votes yet — enter overtime: ping non-voters
-                        # and wait for majority before concluding
-                        await self._enter_overtime(gid, mid, vote_snapshot)
-                except Exception as e:
-                    log_map.error(f"Error processing vote {mid} in guild {gid}: {e}", exc_info=True)
+            if voter_count >= majority:
+                await self.conclude_vote(gid, mid)
+            else:
+                # Not enough votes yet — enter overtime: ping non-voters
+                # and wait for majority before concluding
+                await self._enter_overtime(gid, mid, vote_snapshot)
         except Exception as e:
-            await self.bot.error_reporter.report("MapVote", f"vote_check_loop: {e}")
-
-    @vote_check_loop.before_loop
-    async def before_loops(self): await self.bot.wait_until_ready();
+            log_map.error(f"Error processing vote {mid} in guild {gid}: {e}", exc_info=True)
+            await self.bot.error_reporter.report("MapVote", f"vote end {key}: {e}")
 
     # --- Command Group ---
     mapvote = app_commands.Group(name="mapvote", description="Commands for map voting and configuration.")
@@ -1515,6 +1527,7 @@ class MapVote(commands.Cog, name="mapvote"):
             guild_cfg = self._get_guild_config_sync(inter.guild_id)
             guild_cfg.setdefault("active_votes", {})[str(msg.id)] = vote_data
             await self._save_config()
+        await self._schedule_vote_end(inter.guild_id, msg.id, vote_data["end_time_iso"])
 
     @mapvote.command(name="admin", description="Access the Map Voter admin panel.")
     @app_commands.checks.has_permissions(manage_guild=True)
@@ -1827,6 +1840,7 @@ class MapVote(commands.Cog, name="mapvote"):
                 guild_cfg = self._get_guild_config_sync(guild_id)
                 guild_cfg.setdefault("active_votes", {})[str(msg.id)] = vote_data
                 await self._save_config()
+            await self._schedule_vote_end(guild_id, msg.id, vote_data["end_time_iso"])
 
             log_map.info(f"Programmatic {'mode' if is_mode_vote else 'map'} vote started for {game_name} in channel {channel.id}")
             return msg.id
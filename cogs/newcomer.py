@@ -1,7 +1,6 @@
 import discord
 from discord import app_commands, ui
 from discord.ext import commands, tasks
-import aiosqlite
 import logging
 import io
 import textwrap
@@ -9,6 +8,8 @@ import datetime
 from PIL import Image, ImageDraw, ImageFont
 import os
 
+from utils import database
+
 # --- CONFIGURATION ---
 DB_NAME = "intro_system.db"
 # Font paths - Noto Sans for broad Unicode coverage
@@ -61,7 +62,7 @@ class IntroCog(commands.Cog):
         self._settings_cache.pop(key, None)
 
     async def init_db(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("PRAGMA journal_mode=WAL")
             await db.execute('CREATE TABLE IF NOT EXISTS settings (key TEXT PRIMARY KEY, value TEXT)')
             
@@ -305,7 +306,7 @@ class IntroCog(commands.Cog):
             
             # INTRO BUTTON CLICK
             if custom_id == "start_intro_modal":
-                async with aiosqlite.connect(self.db_path) as db:
+                async with database.connect(self.db_path) as db:
                     cursor = await db.execute("SELECT 1 FROM blacklist WHERE user_id = ?", (interaction.user.id,))
                     if await cursor.fetchone():
                         return await interaction.response.send_message("You are blocked from using this.", ephemeral=True)
@@ -333,7 +334,7 @@ class IntroCog(commands.Cog):
             elif custom_id and custom_id.startswith("close_thread_btn"):
                 # Check DB for ownership
                 thread_id = interaction.channel_id
-                async with aiosqlite.connect(self.db_path) as db:
+                async with database.connect(self.db_path) as db:
                     cursor = await db.execute("SELECT user_id, lore_msg_id, parent_channel_id FROM intro_metadata WHERE thread_id = ?", (thread_id,))
                     row = await cursor.fetchone()
                 
@@ -372,7 +373,7 @@ class IntroCog(commands.Cog):
         # avoid double-dipping reply points + thread points on the same message.
         in_intro_thread = False
         if isinstance(message.channel, discord.Thread):
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 thread_parent_setting = await self._get_setting(db, 'thread_channel_id')
             if thread_parent_setting:
                 try:
@@ -407,7 +408,7 @@ class IntroCog(commands.Cog):
                 # replied_to.author may be a User, not a Member.
                 target_member = message.guild.get_member(replied_to.author.id)
 
-                async with aiosqlite.connect(self.db_path) as db:
+                async with database.connect(self.db_path) as db:
                     role_value = await self._get_setting(db, 'newcomer_role')
                     if role_value and target_member:
                         try:
@@ -484,7 +485,7 @@ class IntroCog(commands.Cog):
             return
 
         # Intro Thread Points Logic
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             thread_parent_setting = await self._get_setting(db, 'thread_channel_id')
             if not thread_parent_setting:
                 return
@@ -580,7 +581,7 @@ class IntroCog(commands.Cog):
         if not removed_roles and not added_roles:
             return
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             # Load all configured base roles
             cursor = await db.execute("SELECT base_rank, role_id FROM base_roles")
             base_map = dict(await cursor.fetchall())
@@ -630,7 +631,7 @@ class IntroCog(commands.Cog):
     @commands.Cog.listener()
     async def on_member_remove(self, member):
         """Clean up all intro data when a user leaves the server"""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             # Get intro metadata for this user
             cursor = await db.execute(
                 "SELECT thread_id, lore_msg_id, parent_channel_id, qa_msg_id, intro_channel_id FROM intro_metadata WHERE user_id = ?",
@@ -765,32 +766,25 @@ class IntroCog(commands.Cog):
     async def check_role_upgrade(self, member, db):
         await self.sync_tier_role(member, db)
 
-    async def repost_sticky_button(self, channel, db=None):
+    async def repost_sticky_button(self, channel):
         """Delete old button message and repost at bottom"""
-        close_db = False
-        if db is None:
-            db = await aiosqlite.connect(self.db_path)
-            close_db = True
-
-        try:
+        async with database.connect(self.db_path) as db:
             cursor = await db.execute("SELECT value FROM settings WHERE key='intro_button_msg_id'")
             res = await cursor.fetchone()
 
-            # Delete old button message
-            if res:
-                try:
-                    old_msg = await channel.fetch_message(int(res[0]))
-                    await old_msg.delete()
-                except Exception:
-                    pass  # Message already deleted or not found
+        # Delete old button message
+        if res:
+            try:
+                old_msg = await channel.fetch_message(int(res[0]))
+                await old_msg.delete()
+            except Exception:
+                pass  # Message already deleted or not found
 
-            # Send new button
-            new_msg = await channel.send("Click below to introduce yourself!", view=IntroButtonView())
+        # Send new button
+        new_msg = await channel.send("Click below to introduce yourself!", view=IntroButtonView())
+        async with database.connect(self.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('intro_button_msg_id', ?)", (str(new_msg.id),))
             await db.commit()
-        finally:
-            if close_db:
-                await db.close()
 
     @tasks.loop(hours=1)
     async def decay_task(self):
@@ -798,7 +792,7 @@ class IntroCog(commands.Cog):
         try:
             today = datetime.date.today().isoformat()
 
-            async with aiosqlite.connect(self.db_path) as db:
+            async with database.connect(self.db_path) as db:
                 # Find all expired, undecayed ledger entries grouped by user
                 cursor = await db.execute(
                     "SELECT user_id, SUM(points) FROM point_ledger WHERE expires_at <= ? AND decayed = 0 GROUP BY user_id",
@@ -834,7 +828,7 @@ class IntroCog(commands.Cog):
                     for user_id, _ in decay_rows:
                         member = guild.get_member(user_id)
                         if member:
-                            async with aiosqlite.connect(self.db_path) as db:
+                            async with database.connect(self.db_path) as db:
                                 await self.sync_tier_role(member, db)
 
             # Audit: find members with tier roles for base ranks they no longer hold
@@ -847,7 +841,7 @@ class IntroCog(commands.Cog):
 
     async def _audit_stale_tier_roles(self):
         """Check all members for tier roles whose base role they don't have. Fix any found."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             cursor = await db.execute("SELECT base_rank, role_id FROM base_roles")
             base_map = dict(await cursor.fetchall())
             if not base_map:
@@ -920,7 +914,7 @@ class IntroCog(commands.Cog):
                         logger.error(f"Audit: failed to remove stale roles from {member.name}: {e}")
 
                 if needs_sync:
-                    async with aiosqlite.connect(self.db_path) as db:
+                    async with database.connect(self.db_path) as db:
                         try:
                             refreshed = guild.get_member(member.id) or await guild.fetch_member(member.id)
                         except Exception:
@@ -982,7 +976,7 @@ class DynamicIntroModal(ui.Modal):
             username = interaction.user.display_name
 
             # Get and increment the rotating color index
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 cursor = await db.execute("SELECT value FROM settings WHERE key='color_index'")
                 res = await cursor.fetchone()
                 color_index = int(res[0]) if res else 0
@@ -1010,86 +1004,77 @@ class DynamicIntroModal(ui.Modal):
             file_lore = discord.File(bin_lore, filename="lore.png")
             file_qa = discord.File(bin_qa, filename="qa.png")
 
-            async with aiosqlite.connect(self.cog.db_path) as db:
-                # Get Parent Channel
+            # Read settings up front; Discord calls happen outside the DB block
+            async with database.connect(self.cog.db_path) as db:
                 cursor = await db.execute("SELECT value FROM settings WHERE key='thread_channel_id'")
                 res = await cursor.fetchone()
-                if not res: return await interaction.followup.send("Thread Parent Channel not configured!")
-                
-                parent_channel_id = int(res[0])
-                parent_channel = interaction.guild.get_channel(parent_channel_id)
-                if not parent_channel:
-                    # Try fetch
-                    try: parent_channel = await interaction.guild.fetch_channel(parent_channel_id)
-                    except Exception: return await interaction.followup.send("Thread Parent Channel invalid!")
-
-                # Send Hook (Lore Drop)
-                hook_msg = await parent_channel.send(file=file_lore)
-                
-                # Create Thread (ID = hook_msg.id)
-                thread = await hook_msg.create_thread(name=f"Welcome {ign}!", auto_archive_duration=60) # 1h
-                
-                # Send Welcome in Thread
                 cursor = await db.execute("SELECT value FROM settings WHERE key='welcome_msg'")
                 w_res = await cursor.fetchone()
-                
-                # Default Message
-                w_default = (
-                    "Thanks for the Lore Drop, {username}!\n\n"
-                    "We’ve pinned your intro here so the welcome wagon can say hello without it getting lost in the main chat scroll.\n\n"
-                    "**This space is totally optional.** Feel free to chat here, or if you prefer to just jump into the main channels, "
-                    "you can delete this thread instantly using the **Close Thread** button below."
-                )
-                
-                w_msg = w_res[0] if w_res else w_default
-                w_msg = w_msg.replace("{username}", interaction.user.mention)
-
-                close_view = CloseThreadView()
-                await thread.send(content=w_msg, file=file_qa, view=close_view)
-
-                # Send Q&A to intro channel as well
                 cursor = await db.execute("SELECT value FROM settings WHERE key='intro_channel_id'")
                 intro_res = await cursor.fetchone()
-                intro_channel = None
-                if intro_res:
-                    intro_channel = interaction.guild.get_channel(int(intro_res[0]))
-                    if not intro_channel:
-                        try: intro_channel = await interaction.guild.fetch_channel(int(intro_res[0]))
-                        except Exception: intro_channel = None
-
-                    if intro_channel:
-                        # Re-create file since discord.File can only be used once
-                        bin_qa2 = io.BytesIO()
-                        qa_img.save(bin_qa2, "PNG")
-                        bin_qa2.seek(0)
-                        file_qa2 = discord.File(bin_qa2, filename="qa.png")
-                        qa_intro_msg = await intro_channel.send(f"**{ign}** just introduced themselves!", file=file_qa2)
-
-                        # Save Metadata for Deletion (includes Q&A message in intro channel)
-                        await db.execute('''
-                            INSERT OR REPLACE INTO intro_metadata (thread_id, user_id, lore_msg_id, parent_channel_id, qa_msg_id, intro_channel_id)
-                            VALUES (?, ?, ?, ?, ?, ?)
-                        ''', (thread.id, interaction.user.id, hook_msg.id, parent_channel.id, qa_intro_msg.id, intro_channel.id))
-                        await db.commit()
-
-                        # Repost sticky button
-                        await self.cog.repost_sticky_button(intro_channel, db)
-                    else:
-                        # Intro channel found but not accessible, save metadata without Q&A message ID
-                        await db.execute('''
-                            INSERT OR REPLACE INTO intro_metadata (thread_id, user_id, lore_msg_id, parent_channel_id, qa_msg_id, intro_channel_id)
-                            VALUES (?, ?, ?, ?, NULL, NULL)
-                        ''', (thread.id, interaction.user.id, hook_msg.id, parent_channel.id))
-                        await db.commit()
-                else:
-                    # No intro channel configured at all, save metadata without Q&A message ID
-                    await db.execute('''
-                        INSERT OR REPLACE INTO intro_metadata (thread_id, user_id, lore_msg_id, parent_channel_id, qa_msg_id, intro_channel_id)
-                        VALUES (?, ?, ?, ?, NULL, NULL)
-                    ''', (thread.id, interaction.user.id, hook_msg.id, parent_channel.id))
-                    await db.commit()
 
-                await interaction.followup.send("✅ Introduction posted!", ephemeral=True)
+            # Get Parent Channel
+            if not res: return await interaction.followup.send("Thread Parent Channel not configured!")
+
+            parent_channel_id = int(res[0])
+            parent_channel = interaction.guild.get_channel(parent_channel_id)
+            if not parent_channel:
+                # Try fetch
+                try: parent_channel = await interaction.guild.fetch_channel(parent_channel_id)
+                except Exception: return await interaction.followup.send("Thread Parent Channel invalid!")
+
+            # Send Hook (Lore Drop)
+            hook_msg = await parent_channel.send(file=file_lore)
+
+            # Create Thread (ID = hook_msg.id)
+            thread = await hook_msg.create_thread(name=f"Welcome {ign}!", auto_archive_duration=60) # 1h
+
+            # Send Welcome in Thread
+            # Default Message
+            w_default = (
+                "Thanks for the Lore Drop, {username}!\n\n"
+                "We’ve pinned your intro here so the welcome wagon can say hello without it getting lost in the main chat scroll.\n\n"
+                "**This space is totally optional.** Feel free to chat here, or if you prefer to just jump into the main channels, "
+                "you can delete this thread instantly using the **Close Thread** button below."
+            )
+
+            w_msg = w_res[0] if w_res else w_default
+            w_msg = w_msg.replace("{username}", interaction.user.mention)
+
+            close_view = CloseThreadView()
+            await thread.send(content=w_msg, file=file_qa, view=close_view)
+
+            # Send Q&A to intro channel as well
+            intro_channel = None
+            qa_intro_msg = None
+            if intro_res:
+                intro_channel = interaction.guild.get_channel(int(intro_res[0]))
+                if not intro_channel:
+                    try: intro_channel = await interaction.guild.fetch_channel(int(intro_res[0]))
+                    except Exception: intro_channel = None
+
+                if intro_channel:
+                    # Re-create file since discord.File can only be used once
+                    bin_qa2 = io.BytesIO()
+                    qa_img.save(bin_qa2, "PNG")
+                    bin_qa2.seek(0)
+                    file_qa2 = discord.File(bin_qa2, filename="qa.png")
+                    qa_intro_msg = await intro_channel.send(f"**{ign}** just introduced themselves!", file=file_qa2)
+
+            # Save Metadata for Deletion (Q&A message only if the intro channel was reachable)
+            async with database.connect(self.cog.db_path) as db:
+                await db.execute('''
+                    INSERT OR REPLACE INTO intro_metadata (thread_id, user_id, lore_msg_id, parent_channel_id, qa_msg_id, intro_channel_id)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', (thread.id, interaction.user.id, hook_msg.id, parent_channel.id,
+                      qa_intro_msg.id if qa_intro_msg else None, intro_channel.id if qa_intro_msg else None))
+                await db.commit()
+
+            if qa_intro_msg:
+                # Repost sticky button
+                await self.cog.repost_sticky_button(intro_channel)
+
+            await interaction.followup.send("✅ Introduction posted!", ephemeral=True)
 
         except Exception as e:
             logger.error(f"Intro Fail: {e}", exc_info=True)
@@ -1141,7 +1126,7 @@ class RegenerateIntroModal(ui.Modal, title="Regenerate Intro"):
             username = self.user.display_name
 
             # Get current color index for this regeneration (use next in rotation)
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 cursor = await db.execute("SELECT value FROM settings WHERE key='color_index'")
                 res = await cursor.fetchone()
                 color_index = int(res[0]) if res else 0
@@ -1241,7 +1226,7 @@ class AddQuestionModal(ui.Modal, title="Add Question"):
         except Exception:
              return await interaction.response.send_message("Order must be 1-5", ephemeral=True)
 
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT INTO questions (text, style, order_num, is_optional) VALUES (?, ?, ?, ?)", 
                              (self.q_text.value, self.style_in.value.lower(), o_num, is_optional))
             await db.commit()
@@ -1270,7 +1255,7 @@ class AdminPanelView(ui.View):
 
     @ui.button(label="Points/Tiers", style=discord.ButtonStyle.secondary, row=1)
     async def points_btn(self, interaction, button):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             cursor = await db.execute("SELECT tier, points_required FROM point_config")
             rows = await cursor.fetchall()
             pts = {1: 0, 2: 0, 3: 0}
@@ -1328,7 +1313,7 @@ class ChannelSelectView(ui.View):
 
         try:
             btn_msg = await ch.send("Click below to introduce yourself!", view=IntroButtonView())
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('intro_channel_id', ?)", (str(ch.id),))
                 await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('intro_button_msg_id', ?)", (str(btn_msg.id),))
                 await db.commit()
@@ -1344,7 +1329,7 @@ class ChannelSelectView(ui.View):
              try: ch = await interaction.guild.fetch_channel(ch_partial.id)
              except Exception: ch = ch_partial 
 
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('thread_channel_id', ?)", (str(ch.id),))
             await db.commit()
         self.cog._invalidate_setting('thread_channel_id')
@@ -1361,7 +1346,7 @@ class QuestionManagerView(ui.View):
 
     @ui.button(label="Delete Question", style=discord.ButtonStyle.danger)
     async def del_q(self, interaction, button):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             cursor = await db.execute("SELECT id, text, order_num FROM questions ORDER BY order_num")
             qs = await cursor.fetchall()
         
@@ -1397,7 +1382,7 @@ class ShiftConfirmView(ui.View):
     async def no(self, interaction, button): await self.execute_delete(interaction, shift=False)
 
     async def execute_delete(self, interaction, shift):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             cursor = await db.execute("SELECT order_num FROM questions WHERE id = ?", (self.q_id,))
             res = await cursor.fetchone()
             if not res: return
@@ -1425,7 +1410,7 @@ class RoleConfigMainView(ui.View):
     async def base5(self, interaction, select): await self.set_base(interaction, 5, select.values[0])
 
     async def set_base(self, interaction, rank, role):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO base_roles (base_rank, role_id) VALUES (?, ?)", (rank, role.id))
             await db.commit()
         await interaction.response.send_message(f"Base {rank} set to {role.name}. Now select Tiers:", view=TierConfigView(self.cog, rank), ephemeral=True)
@@ -1443,7 +1428,7 @@ class TierConfigView(ui.View):
     async def t3(self, interaction, select): await self.set_tier(interaction, 3, select.values[0])
 
     async def set_tier(self, interaction, tier, role):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO role_config (base_rank, tier, role_id) VALUES (?, ?, ?)", (self.base_rank, tier, role.id))
             await db.commit()
         await interaction.response.send_message(f"Base {self.base_rank} Tier {tier} set to {role.name}", ephemeral=True)
@@ -1456,7 +1441,7 @@ class NewcomerRoleSelectView(ui.View):
     @ui.select(cls=ui.RoleSelect, placeholder="Select Newcomer Role", min_values=1, max_values=1)
     async def nc_role(self, interaction, select):
         role = select.values[0]
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('newcomer_role', ?)", (str(role.id),))
             await db.commit()
         self.cog._invalidate_setting('newcomer_role')
@@ -1481,7 +1466,7 @@ class PointThresholdModal(ui.Modal, title="Points Required per Tier"):
             p1, p2, p3 = int(self.t1.value), int(self.t2.value), int(self.t3.value)
             p_reply = float(self.reply_pts.value)
         except Exception: return await interaction.response.send_message("Must be valid numbers.", ephemeral=True)
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             for t, p in [(1, p1), (2, p2), (3, p3)]:
                 await db.execute("INSERT OR REPLACE INTO point_config (tier, points_required) VALUES (?, ?)", (t, p))
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('reply_points', ?)", (str(p_reply),))
@@ -1504,7 +1489,7 @@ class HourlyCapModal(ui.Modal, title="Hourly Point Cap"):
         except ValueError:
             return await interaction.response.send_message("Must be a positive number (or 0 for no limit).", ephemeral=True)
 
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('hourly_point_cap', ?)", (str(cap_val),))
             await db.commit()
         self.cog._invalidate_setting('hourly_point_cap')
@@ -1520,7 +1505,7 @@ class WelcomeMsgModal(ui.Modal, title="Set Welcome Message"):
         super().__init__()
         self.cog = cog
     async def on_submit(self, interaction):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO settings (key, value) VALUES ('welcome_msg', ?)", (self.msg.value,))
             await db.commit()
         await interaction.response.send_message("Welcome message saved.", ephemeral=True)
@@ -1534,7 +1519,7 @@ class UserSelectView(ui.View):
     async def callback(self, interaction, select):
         user = select.values[0]
         if self.mode == 'blacklist':
-            async with aiosqlite.connect(self.cog.db_path) as db:
+            async with database.connect(self.cog.db_path) as db:
                 await db.execute("INSERT OR IGNORE INTO blacklist (user_id) VALUES (?)", (user.id,))
                 await db.commit()
             await interaction.response.send_message(f"{user.name} blacklisted.", ephemeral=True)
@@ -1569,7 +1554,7 @@ class WipeAllConfirmView(ui.View):
 
     @ui.button(label="Yes, Wipe Everything", style=discord.ButtonStyle.danger)
     async def confirm(self, interaction: discord.Interaction, button: ui.Button):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("DELETE FROM user_points")
             await db.execute("DELETE FROM point_ledger")
             await db.execute("DELETE FROM thread_logs")
@@ -1590,7 +1575,7 @@ class WipeMemberSelectView(ui.View):
     async def select_member(self, interaction: discord.Interaction, select: ui.UserSelect):
         user = select.values[0]
         # Get current points
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             cursor = await db.execute("SELECT points FROM user_points WHERE user_id = ?", (user.id,))
             row = await cursor.fetchone()
             current_points = row[0] if row else 0
@@ -1622,7 +1607,7 @@ class WipeMemberActionView(ui.View):
 
     @ui.button(label="Wipe All", style=discord.ButtonStyle.danger)
     async def wipe_btn(self, interaction: discord.Interaction, button: ui.Button):
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             await db.execute("DELETE FROM user_points WHERE user_id = ?", (self.user.id,))
             await db.execute("DELETE FROM point_ledger WHERE user_id = ?", (self.user.id,))
             await db.execute("DELETE FROM thread_logs WHERE user_id = ?", (self.user.id,))
@@ -1652,7 +1637,7 @@ class PointAmountModal(ui.Modal, title="Enter Amount"):
         earned_at = datetime.date.today().isoformat()
         expires_at = (datetime.date.today() + datetime.timedelta(days=30)).isoformat()
 
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             if self.action == "add":
                 await db.execute(
                     "INSERT INTO user_points (user_id, points) VALUES (?, ?) ON CONFLICT(user_id) DO UPDATE SET points = points + ?",
@@ -1702,7 +1687,7 @@ class LeaderboardPaginatedView(ui.View):
     async def load_data(self, mode):
         self.current_mode = mode
         self.page = 0
-        async with aiosqlite.connect(self.cog.db_path) as db:
+        async with database.connect(self.cog.db_path) as db:
             if mode == "30days":
                 cursor = await db.execute("SELECT user_id, points FROM user_points WHERE points > 0 ORDER BY points DESC")
                 self.data = await cursor.fetchall()
@@ -9,6 +9,7 @@ import re
 
 # Updated import to match your new file name
 from utils.helper_fetcher import fetch_valorant_patch, fetch_steam_patch, fetch_overwatch_patch
+from utils import database
 
 logger = logging.getLogger('bot_main')
 
@@ -46,7 +47,7 @@ class PatchnotesPanel(discord.ui.View):
             color=discord.Color.dark_theme()
         )
 
-        async with aiosqlite.connect("patchnotes.db") as db:
+        async with database.connect("patchnotes.db") as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM configs WHERE server_id = ?", (guild_id,)) as cursor:
                 configs = await cursor.fetchall()
@@ -106,7 +107,7 @@ class PatchnotesPanel(discord.ui.View):
 
         channel_id = select.values[0].id
 
-        async with aiosqlite.connect("patchnotes.db") as db:
+        async with database.connect("patchnotes.db") as db:
             await db.execute("""
                 INSERT INTO configs (server_id, game, channel_id, is_enabled)
                 VALUES (?, ?, ?, 1)
@@ -133,7 +134,7 @@ class PatchnotesPanel(discord.ui.View):
         # V7 fix: defer before DB write
         await interaction.response.defer()
 
-        async with aiosqlite.connect("patchnotes.db") as db:
+        async with database.connect("patchnotes.db") as db:
             await db.execute("UPDATE configs SET is_enabled = 0 WHERE server_id = ? AND game = ?", (interaction.guild_id, selected_game))
             await db.commit()
 
@@ -182,7 +183,7 @@ class PatchnotesPanel(discord.ui.View):
         # V3/V12 fix: per-game lock prevents races with patch_checker and double-clicks
         lock = self.bot._patchnotes_locks.setdefault(selected_game, asyncio.Lock())
         async with lock:
-            async with aiosqlite.connect("patchnotes.db") as db:
+            async with database.connect("patchnotes.db") as db:
                 db.row_factory = aiosqlite.Row
                 async with db.execute("SELECT * FROM configs WHERE server_id = ? AND game = ?", (interaction.guild_id, selected_game)) as cursor:
                     config = await cursor.fetchone()
@@ -219,7 +220,7 @@ class PatchnotesPanel(discord.ui.View):
                 return await interaction.followup.send("I don't have permission to send messages in that channel!", ephemeral=True)
 
             # V13 fix: update DB immediately after sending to minimize orphan window
-            async with aiosqlite.connect("patchnotes.db") as db:
+            async with database.connect("patchnotes.db") as db:
                 await db.execute("""
                     UPDATE configs
                     SET last_patch_id = ?, last_message_id = ?
@@ -289,7 +290,7 @@ class Patchnotes(commands.Cog):
 
     async def setup_db(self):
         """Creates the database table if it doesn't exist."""
-        async with aiosqlite.connect("patchnotes.db") as db:
+        async with database.connect("patchnotes.db") as db:
             await db.execute("PRAGMA journal_mode=WAL")
             await db.execute("""
                 CREATE TABLE IF NOT EXISTS configs (
@@ -328,7 +329,7 @@ class Patchnotes(commands.Cog):
             logger.info("Checking for new patch notes...")
 
             # V9 fix: read configs and release DB connection BEFORE HTTP fetches
-            async with aiosqlite.connect("patchnotes.db") as db:
+            async with database.connect("patchnotes.db") as db:
                 db.row_factory = aiosqlite.Row
                 async with db.execute("SELECT * FROM configs WHERE is_enabled = 1") as cursor:
                     configs = await cursor.fetchall()
@@ -371,7 +372,7 @@ class Patchnotes(commands.Cog):
                             continue
 
                         # V9/V13 fix: separate short-lived DB connection, update immediately after send
-                        async with aiosqlite.connect("patchnotes.db") as db:
+                        async with database.connect("patchnotes.db") as db:
                             await db.execute("""
                                 UPDATE configs
                                 SET last_patch_id = ?, last_message_id = ?
@@ -1,5 +1,5 @@
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 import aiosqlite
 import os
@@ -12,6 +12,8 @@ import logging
 from PIL import Image, ImageDraw, ImageFont
 import io
 
+from utils import database
+
 logger = logging.getLogger('bot_main')
 
 # --- CONFIG & CONSTANTS ---
@@ -31,7 +33,7 @@ class AsyncPickemsDB:
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         os.makedirs(ASSETS_DIR, exist_ok=True)
 
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("PRAGMA journal_mode=WAL")
             db.row_factory = aiosqlite.Row
             # Settings
@@ -96,19 +98,19 @@ class AsyncPickemsDB:
             await db.commit()
 
     async def set_config(self, key: str, value: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)", (key, str(value)))
             await db.commit()
 
     async def get_config(self, key: str) -> Optional[str]:
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT value FROM config WHERE key = ?", (key,)) as cursor:
                 row = await cursor.fetchone()
                 return row['value'] if row else None
 
     async def create_draft(self, title: str, team1: str, team2: str, stream_url: str, team1_url: str, team2_url: str, body_text: str) -> int:
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             cursor = await db.execute(
                 "INSERT INTO matches (title, team1, team2, stream_url, team1_stream_url, team2_stream_url, body_text) VALUES (?, ?, ?, ?, ?, ?, ?)",
                 (title, team1, team2, stream_url, team1_url, team2_url, body_text)
@@ -117,7 +119,7 @@ class AsyncPickemsDB:
             return cursor.lastrowid
 
     async def update_draft(self, match_id: int, title: str, team1: str, team2: str, stream_url: str, team1_url: str, team2_url: str, body_text: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute(
                 "UPDATE matches SET title = ?, team1 = ?, team2 = ?, stream_url = ?, team1_stream_url = ?, team2_stream_url = ?, body_text = ? WHERE id = ?",
                 (title, team1, team2, stream_url, team1_url, team2_url, body_text, match_id)
@@ -125,63 +127,63 @@ class AsyncPickemsDB:
             await db.commit()
 
     async def update_draft_images(self, match_id: int, logo_path: str, map_path: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("UPDATE matches SET logo_path = ?, map_path = ? WHERE id = ?", (logo_path, map_path, match_id))
             await db.commit()
             
     async def delete_draft(self, match_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("DELETE FROM matches WHERE id = ?", (match_id,))
             await db.commit()
 
     async def get_matches_by_status(self, status: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM matches WHERE status = ?", (status,)) as cursor:
                 return await cursor.fetchall()
 
     async def get_resolvable_matches(self):
         """Returns matches that are published OR closed."""
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM matches WHERE status IN ('published', 'closed')") as cursor:
                 return await cursor.fetchall()
 
     async def get_match_by_id(self, match_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM matches WHERE id = ?", (match_id,)) as cursor:
                 return await cursor.fetchone()
 
     async def get_match_by_message_id(self, message_id: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM matches WHERE message_id = ?", (str(message_id),)) as cursor:
                 return await cursor.fetchone()
 
     async def publish_match(self, match_id: int, message_id: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("UPDATE matches SET status = 'published', message_id = ? WHERE id = ?", (message_id, match_id))
             await db.commit()
 
     async def set_match_status(self, match_id: int, status: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("UPDATE matches SET status = ? WHERE id = ?", (status, match_id))
             await db.commit()
 
     async def set_match_close_time(self, match_id: int, close_time: Optional[int]):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("UPDATE matches SET close_time = ? WHERE id = ?", (close_time, match_id))
             await db.commit()
 
     async def get_user_prediction(self, user_id: int, match_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM predictions WHERE user_id = ? AND match_id = ?", (str(user_id), match_id)) as cursor:
                 return await cursor.fetchone()
 
     async def save_prediction(self, user_id: int, match_id: int, winner: int, score_1: int, score_2: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute('''
                 INSERT OR REPLACE INTO predictions (user_id, match_id, predicted_winner, predicted_score_1, predicted_score_2)
                 VALUES (?, ?, ?, ?, ?)
@@ -189,7 +191,7 @@ class AsyncPickemsDB:
             await db.commit()
 
     async def resolve_match(self, match_id: int, winner: int, score_1: int, score_2: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             await db.execute(
                 "UPDATE matches SET status = 'resolved', winner = ?, score_1 = ?, score_2 = ? WHERE id = ?",
@@ -210,7 +212,7 @@ class AsyncPickemsDB:
             await db.commit()
 
     async def get_leaderboard(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute('''
                 SELECT user_id, SUM(points) as total_points 
@@ -222,19 +224,19 @@ class AsyncPickemsDB:
 
     # --- TEAM OPERATIONS ---
     async def get_all_teams(self):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM teams ORDER BY name ASC") as cursor:
                 return await cursor.fetchall()
 
     async def get_team_by_id(self, team_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM teams WHERE id = ?", (team_id,)) as cursor:
                 return await cursor.fetchone()
 
     async def upsert_team(self, name: str, stream_url: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute('''
                 INSERT OR REPLACE INTO teams (name, stream_url) 
                 VALUES (?, ?)
@@ -245,12 +247,12 @@ class AsyncPickemsDB:
                 return row[0]
 
     async def update_team_logo(self, team_id: int, logo_path: str):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("UPDATE teams SET logo_path = ? WHERE id = ?", (logo_path, team_id))
             await db.commit()
 
     async def delete_team(self, team_id: int):
-        async with aiosqlite.connect(self.db_path) as db:
+        async with database.connect(self.db_path) as db:
             await db.execute("DELETE FROM teams WHERE id = ?", (team_id,))
             await db.commit()
 
@@ -264,6 +266,16 @@ def get_user_lock(user_id: int) -> asyncio.Lock:
         vote_locks[user_id] = asyncio.Lock()
     return vote_locks[user_id]
 
+# --- AUTO-CLOSE TIMERS ---
+AUTO_CLOSE_TIMER = "pickems_close"
+
+async def schedule_auto_close(bot: commands.Bot, match_id: int, close_time: Optional[int]):
+    """Ask the bot scheduler to close a published match's picks at `close_time`."""
+    if close_time:
+        await bot.scheduler.schedule(AUTO_CLOSE_TIMER, match_id, close_time)
+    else:
+        await bot.scheduler.cancel(AUTO_CLOSE_TIMER, match_id)
+
 # --- HELPER FUNCTIONS ---
 
 def stitch_team_logos(logo1_path: str, logo2_path: str, dest_path: str):
@@ -1110,6 +1122,7 @@ class VotingTimerModal(discord.ui.Modal, title='Set Voting Close Time'):
         close_timestamp = int(target.timestamp())
         await db.set_match_status(self.match_data['id'], 'published') # Ensure it's not 'closed'
         await db.set_match_close_time(self.match_data['id'], close_timestamp)
+        await schedule_auto_close(self.bot, self.match_data['id'], close_timestamp)
         await update_match_message(self.bot, self.match_data['id'])
         
         await interaction.response.send_message(f"Timer updated. Voting will close <t:{close_timestamp}:R> ({target.strftime('%I:%M %p')}).", ephemeral=True)
@@ -1261,6 +1274,8 @@ class AdminPanelView(discord.ui.View):
 
             msg = await channel.send(embed=embed, files=files, view=PersistentMatchVoteView())
             await db.publish_match(match['id'], str(msg.id))
+            if match['close_time']:
+                await schedule_auto_close(interaction.client, match['id'], match['close_time'])
 
         await interaction.followup.send(f"Playday published successfully. {len(drafts)} matches dispatched.", ephemeral=True)
 
@@ -1393,33 +1408,35 @@ class Pickems(commands.Cog):
         await db.init_db()
         self.bot.add_view(PersistentMatchVoteView())
         self.bot.add_view(PersistentLeaderboardTrigger())
-        self.auto_close_loop.start()
+        self.bot.scheduler.register(AUTO_CLOSE_TIMER, self._auto_close_match)
+
+        # Matches published before auto-close moved to the scheduler
+        for match in await db.get_matches_by_status('published'):
+            if match['close_time'] and self.bot.scheduler.due_at(AUTO_CLOSE_TIMER, match['id']) != match['close_time']:
+                await schedule_auto_close(self.bot, match['id'], match['close_time'])
 
     async def cog_unload(self):
-        self.auto_close_loop.cancel()
+        self.bot.scheduler.unregister(AUTO_CLOSE_TIMER)
 
-    @tasks.loop(seconds=30)
-    async def auto_close_loop(self):
-        """Background task that sweeps for expired timers and automatically closes them."""
+    async def _auto_close_match(self, key: str, payload):
+        """Scheduler handler: close a published match once its close time has passed."""
         try:
-            matches = await db.get_matches_by_status('published')
-            current_time = int(time.time())
-            for match in matches:
-                if match['close_time'] and current_time >= match['close_time']:
-                    await db.set_match_status(match['id'], 'closed')
-                    await update_match_message(self.bot, match['id'])
-                    logger.info(f"Auto-closed Pick'em match {match['id']}")
+            match = await db.get_match_by_id(int(key))
+            if not match or match['status'] != 'published' or not match['close_time']:
+                return  # Closed by hand, resolved, or timer cleared since scheduling
+            if int(time.time()) < match['close_time']:
+                await schedule_auto_close(self.bot, match['id'], match['close_time'])
+                return
+            await db.set_match_status(match['id'], 'closed')
+            await update_match_message(self.bot, match['id'])
+            logger.info(f"Auto-closed Pick'em match {match['id']}")
 
             # Prune idle vote locks to prevent unbounded memory growth
             idle = [uid for uid, lock in vote_locks.items() if not lock.locked()]
             for uid in idle:
                 vote_locks.pop(uid, None)
         except Exception as e:
-            await self.bot.error_reporter.report("Pickems", f"auto_close_loop: {e}")
-
-    @auto_close_loop.before_loop
-    async def before_auto_close(self):
-        await self.bot.wait_until_ready()
+            await self.bot.error_reporter.report("Pickems", f"auto_close {key}: {e}")
 
     @app_commands.command(name="pickem_panel", description="Administration dashboard for Valorant Pick'ems.")
     @app_commands.default_permissions(administrator=True)
@@ -12,6 +12,8 @@ import math
 import json
 import asyncio
 
+from utils import database
+
 # --- Configuration ---
 DB_FILE = "qotd_database.db"
 
@@ -25,7 +27,7 @@ ALLOWED_SETTINGS_KEYS = [
 # --- Database Setup and Helpers ---
 async def db_init():
     """Initializes the database. This version is safe and will not fail on load."""
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with database.connect(DB_FILE) as db:
         await db.execute("PRAGMA journal_mode=WAL")
         await db.execute('''CREATE TABLE IF NOT EXISTS questions (id INTEGER PRIMARY KEY AUTOINCREMENT, question_text TEXT NOT NULL UNIQUE, added_by_id INTEGER, last_used_timestamp INTEGER DEFAULT 0, times_used INTEGER DEFAULT 0)''')
         await db.execute('''CREATE TABLE IF NOT EXISTS guild_settings (guild_id INTEGER PRIMARY KEY, enabled BOOLEAN DEFAULT FALSE, source_channel_id INTEGER, source_bot_id INTEGER, post_channel_ids TEXT DEFAULT '[]', ping_role_id INTEGER, suggestion_log_channel_id INTEGER, post_time TEXT DEFAULT '10:00', timezone TEXT DEFAULT 'UTC', auto_thread BOOLEAN DEFAULT TRUE)''')
@@ -45,7 +47,7 @@ async def db_init():
         await db.commit()
 
 async def get_guild_settings(guild_id: int):
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with database.connect(DB_FILE) as db:
         db.row_factory = aiosqlite.Row
         async with db.execute("SELECT * FROM guild_settings WHERE guild_id = ?", (guild_id,)) as cursor:
             settings = await cursor.fetchone()
@@ -62,12 +64,12 @@ async def update_guild_setting(guild_id: int, key: str, value):
         print(f"CRITICAL: Attempted to update invalid setting key: {key}")
         return
 
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with database.connect(DB_FILE) as db:
         await db.execute(f"UPDATE guild_settings SET {key} = ? WHERE guild_id = ?", (value, guild_id))
         await db.commit()
 
 async def get_question_counts():
-    async with aiosqlite.connect(DB_FILE) as db:
+    async with database.connect(DB_FILE) as db:
         async with db.execute("SELECT COUNT(*) FROM questions") as cursor:
             total_count = (await cursor.fetchone())[0]
         async with db.execute("SELECT COUNT(*) FROM questions WHERE last_used_timestamp = 0") as cursor:
@@ -107,7 +109,7 @@ class AddQuestionModal(discord.ui.Modal, title="Add Questions in Bulk"):
                 return
             
             added, skipped = 0, 0
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 for q in questions_to_add:
                     try:
                         await db.execute("INSERT INTO questions (question_text, added_by_id) VALUES (?, ?)", (q, interaction.user.id))
@@ -292,7 +294,7 @@ class DeleteQuestionView(discord.ui.View):
     async def confirm_delete_button(self, interaction: discord.Interaction, button: discord.ui.Button):
         if self.selected_question_id is None: await interaction.response.send_message("You must select a question first.", ephemeral=True); return
         
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             await db.execute("DELETE FROM questions WHERE id = ?", (self.selected_question_id,))
             await db.commit()
             async with db.execute("SELECT id, question_text FROM questions ORDER BY id") as cursor:
@@ -328,7 +330,7 @@ class PersistentSuggestView(discord.ui.View):
                 await interaction.followup.send("Your suggestion was received, but the suggestion log channel could not be found.", ephemeral=True)
                 return
             
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 async with db.execute("INSERT INTO suggestions (question_text, suggester_id, guild_id) VALUES (?, ?, ?)",(question_text, interaction.user.id, interaction.guild.id)) as cursor:
                     suggestion_id = cursor.lastrowid
                 await db.commit()
@@ -361,7 +363,7 @@ class SuggestionReviewView(discord.ui.View):
         self.deny_button.custom_id = f"qotd_deny_{suggestion_id}"; self.deny_w_reason_button.custom_id = f"qotd_deny_reason_{suggestion_id}"
     
     async def _handle_decision(self, interaction: discord.Interaction, decision: str, reason: Optional[str] = None):
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             db.row_factory = aiosqlite.Row
             async with db.execute("SELECT * FROM suggestions WHERE id = ?", (self.suggestion_id,)) as cursor:
                 suggestion = await cursor.fetchone()
@@ -425,7 +427,7 @@ class ResetConfirmView(discord.ui.View):
     
     @discord.ui.button(label="Confirm Reset", style=discord.ButtonStyle.danger)
     async def confirm_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             await db.execute("UPDATE questions SET last_used_timestamp = 0"); await db.commit()
         for item in self.children: item.disabled = True
         await interaction.response.edit_message(content="✅ The entire question pool has been reset.", view=self)
@@ -441,7 +443,7 @@ class ClearSeenConfirmView(discord.ui.View):
     
     @discord.ui.button(label="Confirm Clear Seen", style=discord.ButtonStyle.danger)
     async def confirm_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             cursor = await db.execute("DELETE FROM questions WHERE last_used_timestamp > 0")
             deleted_count = cursor.rowcount
             await db.commit()
@@ -787,7 +789,7 @@ class QuestionReviewView(discord.ui.View):
 
         added, skipped = 0, 0
         try:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 for q in self.pending_questions:
                     try:
                         await db.execute("INSERT INTO questions (question_text, added_by_id) VALUES (?, ?)", (q, interaction.user.id))
@@ -855,7 +857,7 @@ class AdminPanelView(discord.ui.View):
 
     @discord.ui.button(label="View Questions", style=discord.ButtonStyle.primary, row=1)
     async def view_pool_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             async with db.execute("SELECT id, question_text FROM questions ORDER BY id") as cursor:
                 questions = await cursor.fetchall()
         if not questions: await interaction.response.send_message("The question pool is empty.", ephemeral=True); return
@@ -868,7 +870,7 @@ class AdminPanelView(discord.ui.View):
 
     @discord.ui.button(label="Delete Question", style=discord.ButtonStyle.danger, row=1)
     async def delete_question_button(self, interaction: discord.Interaction, button: discord.ui.Button):
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             async with db.execute("SELECT id, question_text FROM questions ORDER BY id") as cursor:
                 questions = await cursor.fetchall()
         if not questions: await interaction.response.send_message("The question pool is empty.", ephemeral=True); return
@@ -931,7 +933,7 @@ class QOTDCog(commands.Cog):
     async def cog_load(self):
         await db_init()
         self.bot.add_view(PersistentSuggestView())
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             async with db.execute("SELECT id FROM suggestions WHERE status = 'pending'") as cursor:
                 pending_suggestions = await cursor.fetchall()
         for (suggestion_id,) in pending_suggestions: self.bot.add_view(SuggestionReviewView(suggestion_id))
@@ -962,7 +964,7 @@ class QOTDCog(commands.Cog):
     async def qotd_task(self):
         try:
             await self.bot.wait_until_ready()
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 db.row_factory = aiosqlite.Row
                 async with db.execute("SELECT * FROM guild_settings WHERE enabled = TRUE") as cursor:
                     enabled_guilds = await cursor.fetchall()
@@ -1019,74 +1021,75 @@ class QOTDCog(commands.Cog):
             if interaction: await interaction.followup.send(f"❌ Error: No post channels set. Use the `/qotd setup` command.", ephemeral=True)
             return
         
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             # Select an unseen question
             async with db.execute("SELECT id, question_text, added_by_id FROM questions WHERE last_used_timestamp = 0 ORDER BY RANDOM() LIMIT 1") as cursor:
                 question_data = await cursor.fetchone()
 
-            if not question_data:
-                if interaction: await interaction.followup.send(f"❌ Error: I've run out of unseen questions! Use 'Reset Pool' in the admin panel.", ephemeral=True)
-                else:
-                    try:
-                        first_channel_id = post_channel_ids[0]
-                        first_channel = self.bot.get_channel(first_channel_id)
-                        if first_channel: await first_channel.send("I've run out of questions! An admin can use the 'Reset Pool' button to make them available again.")
-                    except (IndexError, AttributeError):
-                         pass
-                return
+        if not question_data:
+            if interaction: await interaction.followup.send(f"❌ Error: I've run out of unseen questions! Use 'Reset Pool' in the admin panel.", ephemeral=True)
+            else:
+                try:
+                    first_channel_id = post_channel_ids[0]
+                    first_channel = self.bot.get_channel(first_channel_id)
+                    if first_channel: await first_channel.send("I've run out of questions! An admin can use the 'Reset Pool' button to make them available again.")
+                except (IndexError, AttributeError):
+                     pass
+            return
 
-            question_id, question_text, added_by_id = question_data
+        question_id, question_text, added_by_id = question_data
 
-            embed = discord.Embed(title="❓ Question of the Day ❓", description=f"## {question_text}", color=discord.Color.blue())
-            total_questions, unseen_count = await get_question_counts()
-            footer_text = f"{unseen_count - 1 if not is_test and unseen_count > 0 else unseen_count} questions remaining."
+        embed = discord.Embed(title="❓ Question of the Day ❓", description=f"## {question_text}", color=discord.Color.blue())
+        total_questions, unseen_count = await get_question_counts()
+        footer_text = f"{unseen_count - 1 if not is_test and unseen_count > 0 else unseen_count} questions remaining."
 
-            suggester = None
-            if added_by_id and added_by_id > 1:
-                try:
-                    suggester = await self.bot.fetch_user(added_by_id)
-                except (discord.NotFound, discord.HTTPException):
-                    pass
-            if suggester: footer_text = f"Suggested by: {suggester.display_name} • {footer_text}"
-            embed.set_footer(text=footer_text)
-
-            content = ""; ping_role_id = settings.get('ping_role_id'); role = None
-            if ping_role_id and not is_test:
-                guild = self.bot.get_guild(guild_id)
-                if guild: role = guild.get_role(ping_role_id)
-            if role and role.mentionable:
-                content = role.mention
-
-            posted_successfully = False
-            for channel_id in post_channel_ids:
-                post_channel = self.bot.get_channel(channel_id)
-                if not post_channel: continue
-                try:
-                    if is_test and interaction:
-                        await interaction.followup.send(f"This is a test post for {post_channel.mention}.", embed=embed, ephemeral=True)
-                    else:
-                        message = await post_channel.send(content=content, embed=embed, view=PersistentSuggestView())
-                        if settings.get('auto_thread') and isinstance(post_channel, (discord.TextChannel, discord.VoiceChannel, discord.ForumChannel)):
-                            try:
-                                await message.create_thread(name=f"Discussion for QOTD - {datetime.datetime.now().strftime('%Y-%m-%d')}")
-                            except (discord.Forbidden, discord.HTTPException) as e:
-                                print(f"Failed to create thread in {post_channel.name}: {e}")
-                    posted_successfully = True
-                except discord.Forbidden:
-                    if interaction: await interaction.followup.send(f"❌ Error: I don't have permission to post in {post_channel.mention}.", ephemeral=True)
-                except Exception as e:
-                    if interaction: await interaction.followup.send(f"❌ An unknown error occurred: {e}", ephemeral=True)
-
-            if posted_successfully and not is_test:
+        suggester = None
+        if added_by_id and added_by_id > 1:
+            try:
+                suggester = await self.bot.fetch_user(added_by_id)
+            except (discord.NotFound, discord.HTTPException):
+                pass
+        if suggester: footer_text = f"Suggested by: {suggester.display_name} • {footer_text}"
+        embed.set_footer(text=footer_text)
+
+        content = ""; ping_role_id = settings.get('ping_role_id'); role = None
+        if ping_role_id and not is_test:
+            guild = self.bot.get_guild(guild_id)
+            if guild: role = guild.get_role(ping_role_id)
+        if role and role.mentionable:
+            content = role.mention
+
+        posted_successfully = False
+        for channel_id in post_channel_ids:
+            post_channel = self.bot.get_channel(channel_id)
+            if not post_channel: continue
+            try:
+                if is_test and interaction:
+                    await interaction.followup.send(f"This is a test post for {post_channel.mention}.", embed=embed, ephemeral=True)
+                else:
+                    message = await post_channel.send(content=content, embed=embed, view=PersistentSuggestView())
+                    if settings.get('auto_thread') and isinstance(post_channel, (discord.TextChannel, discord.VoiceChannel, discord.ForumChannel)):
+                        try:
+                            await message.create_thread(name=f"Discussion for QOTD - {datetime.datetime.now().strftime('%Y-%m-%d')}")
+                        except (discord.Forbidden, discord.HTTPException) as e:
+                            print(f"Failed to create thread in {post_channel.name}: {e}")
+                posted_successfully = True
+            except discord.Forbidden:
+                if interaction: await interaction.followup.send(f"❌ Error: I don't have permission to post in {post_channel.mention}.", ephemeral=True)
+            except Exception as e:
+                if interaction: await interaction.followup.send(f"❌ An unknown error occurred: {e}", ephemeral=True)
+
+        if posted_successfully and not is_test:
+            async with database.connect(DB_FILE) as db:
                 await db.execute("DELETE FROM questions WHERE id = ?", (question_id,))
                 await db.execute("UPDATE guild_settings SET last_post_timestamp = ? WHERE guild_id = ?", (int(datetime.datetime.now().timestamp()), guild_id))
                 await db.commit()
 
-                if interaction and interaction.message:
-                    await interaction.followup.send("✅ Manually posted the Question of the Day.", ephemeral=True)
-                    await self.update_admin_panel(interaction.message)
-            elif interaction and not posted_successfully:
-                 await interaction.followup.send("❌ Failed to post. Check bot permissions for the configured channels.", ephemeral=True)
+            if interaction and interaction.message:
+                await interaction.followup.send("✅ Manually posted the Question of the Day.", ephemeral=True)
+                await self.update_admin_panel(interaction.message)
+        elif interaction and not posted_successfully:
+             await interaction.followup.send("❌ Failed to post. Check bot permissions for the configured channels.", ephemeral=True)
 
     qotd_group = app_commands.Group(name="qotd", description="Commands for the Question of the Day feature.")
 
@@ -1,6 +1,6 @@
 import aiohttp
 import discord
-from discord.ext import commands, tasks
+from discord.ext import commands
 from discord import app_commands
 from datetime import datetime, timezone, timedelta
 from zoneinfo import ZoneInfo
@@ -11,6 +11,10 @@ import time
 import re
 import logging
 import copy
+from itertools import islice
+from typing import NamedTuple, Optional
+
+from utils import database
 
 # --- LOGGING SETUP ---
 logger = logging.getLogger('reminders_cog')
@@ -21,9 +25,12 @@ if not logger.handlers:
     logger.addHandler(handler)
     logger.setLevel(logging.DEBUG)
 
-# File to store reminders
+# Reminders live one row per reminder in REMINDERS_DB; REMINDERS_FILE is the legacy store, imported once
 REMINDERS_FILE = "reminders.json"
+REMINDERS_DB = "reminders.db"
 REMINDERS_CONFIG_FILE = "reminders_config.json"
+REMINDER_TIMER = "reminder"  # scheduler kind; key is the reminder id
+REMINDER_GRACE_MINUTES = 5  # a wake-up this late still sends the occurrence it was scheduled for
 
 def load_reminders_config():
     if os.path.exists(REMINDERS_CONFIG_FILE):
@@ -62,26 +69,65 @@ EMBED_COLORS = {
 class Reminders(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
-        self.reminders = self.load_reminders()
+        self.reminders = {}
         self.config = load_reminders_config()
         self.sticky_locks = {}
         self.sticky_timers = {}  # Tracks active sticky timers for debouncing
-        self.reminder_loop.start()
+        self._saved_json = {}  # rid -> JSON last written to REMINDERS_DB
+        self._compiled = {}  # rid -> CompiledSchedule (or None when the schedule is invalid)
+        self._legacy_import = False
+
+    async def cog_load(self):
+        self.reminders = await self.load_reminders()
+        saved = await self.async_save_reminders()  # writes only rows changed by migrations / the legacy import
+        if self._legacy_import:
+            if saved:
+                os.replace(REMINDERS_FILE, REMINDERS_FILE + ".migrated")
+                logger.info(f"Imported {len(self.reminders)} reminders from {REMINDERS_FILE} into {REMINDERS_DB}")
+            else:
+                logger.error(f"Failed to import {REMINDERS_FILE} into {REMINDERS_DB}; keeping it to retry on next load")
+
+        self.bot.scheduler.register(REMINDER_TIMER, self._on_reminder_due)
+        for rid in list(self.reminders):
+            await self._reschedule(rid)
+        for rid in self.bot.scheduler.pending(REMINDER_TIMER):
+            if rid not in self.reminders:
+                await self.bot.scheduler.cancel(REMINDER_TIMER, rid)
 
     def cog_unload(self):
-        self.reminder_loop.cancel()
+        self.bot.scheduler.unregister(REMINDER_TIMER)
         for task in self.sticky_timers.values():
             task.cancel()
         self.sticky_timers.clear()
 
-    def load_reminders(self):
-        if not os.path.exists(REMINDERS_FILE):
-            logger.info("No reminders file found. Starting fresh.")
+    async def load_reminders(self):
+        async with database.connect(REMINDERS_DB) as db:
+            await db.execute("CREATE TABLE IF NOT EXISTS reminders (rid TEXT PRIMARY KEY, data TEXT NOT NULL)")
+            await db.commit()
+            async with db.execute("SELECT rid, data FROM reminders") as cursor:
+                rows = await cursor.fetchall()
+
+        data = {}
+        for rid, raw in rows:
+            try:
+                data[rid] = json.loads(raw)
+                self._saved_json[rid] = raw
+            except json.JSONDecodeError as e:
+                logger.error(f"Corrupted reminder {rid}, skipping: {e}")
+
+        if not rows and os.path.exists(REMINDERS_FILE):
+            try:
+                with open(REMINDERS_FILE, 'r') as f:
+                    data = json.load(f)
+                self._legacy_import = True
+            except (json.JSONDecodeError, IOError) as e:
+                logger.error(f"Failed to load reminders: {e}")
+                return {}
+        elif not rows:
+            logger.info("No reminders found. Starting fresh.")
             return {}
-        try:
-            with open(REMINDERS_FILE, 'r') as f:
-                data = json.load(f)
 
+        try:
             clean_data = {}
             for k, v in data.items():
                 clean_data[k] = self.sanitize_data(v)
@@ -117,7 +163,6 @@ class Reminders(commands.Cog):
 
             if migrated:
                 logger.info("Migrated reminders.")
-                self.save_reminders_internal(data)
 
             # Timezone-aware migration
             migrated_timezone = False
@@ -166,7 +211,6 @@ class Reminders(commands.Cog):
 
             if migrated_timezone:
                 logger.info("Migrated to timezone-aware format")
-                self.save_reminders_internal(data)
 
             # Fix corrupted string-encoded lists (from old sanitize_data bug)
             migrated_lists = False
@@ -197,37 +241,75 @@ class Reminders(commands.Cog):
 
             if migrated_lists:
                 logger.info("Fixed corrupted list data")
-                self.save_reminders_internal(data)
 
             logger.info(f"Loaded {len(data)} reminders.")
             return data
-        except (json.JSONDecodeError, IOError) as e:
-            logger.error(f"Failed to load reminders: {e}")
-            return {}
+        except (TypeError, ValueError, AttributeError) as e:
+            # Keep what was read: returning nothing would delete every stored row on the next save
+            logger.error(f"Failed to migrate reminders: {e}")
+            return data
 
-    def save_reminders(self):
-        self.save_reminders_internal(self.reminders)
+    def _serialize_reminder(self, data) -> str:
+        try:
+            return json.dumps(data)
+        except TypeError:
+            logger.warning("Corrupt memory detected. Running deep cleaning...")
+            return json.dumps(self.sanitize_data(data))
 
-    def save_reminders_internal(self, data_to_save):
+    async def _write_reminders(self, upserts, deleted):
         try:
-            try:
-                json.dumps(data_to_save)
-            except TypeError:
-                logger.warning("Corrupt memory detected. Running deep cleaning...")
-                cleaned = {}
-                for k, v in data_to_save.items():
-                    cleaned[k] = self.sanitize_data(v)
-                data_to_save = cleaned
-
-            with open(REMINDERS_FILE, 'w') as f:
-                json.dump(data_to_save, f, indent=4)
+            async with database.connect(REMINDERS_DB) as db:
+                if upserts:
+                    await db.executemany("INSERT OR REPLACE INTO reminders (rid, data) VALUES (?, ?)", upserts)
+                if deleted:
+                    await db.executemany("DELETE FROM reminders WHERE rid = ?", [(rid,) for rid in deleted])
+                await db.commit()
         except Exception as e:
             logger.error(f"CRITICAL SAVE ERROR: {e}")
+            return False
+        for rid, raw in upserts:
+            self._saved_json[rid] = raw
+        for rid in deleted:
+            self._saved_json.pop(rid, None)
+        return True
 
     async def async_save_reminders(self):
-        """Non-blocking save — offloads file I/O to a thread."""
-        loop = asyncio.get_running_loop()
-        await loop.run_in_executor(None, self.save_reminders)
+        """Persist every reminder that changed (or was deleted) since it was last written.
+
+        Returns False if the write failed.
+        """
+        upserts = []
+        for rid, data in self.reminders.items():
+            raw = self._serialize_reminder(data)
+            if self._saved_json.get(rid) != raw:
+                upserts.append((rid, raw))
+        deleted = [rid for rid in self._saved_json if rid not in self.reminders]
+        if not upserts and not deleted:
+            return True
+        if not await self._write_reminders(upserts, deleted):
+            return False
+        for rid, _ in upserts:
+            self._compiled.pop(rid, None)
+            await self._reschedule(rid)
+        for rid in deleted:
+            self._compiled.pop(rid, None)
+            await self.bot.scheduler.cancel(REMINDER_TIMER, rid)
+        return True
+
+    async def async_save_reminder(self, rid):
+        """Persist a single reminder; use where only `rid` can have changed."""
+        data = self.reminders.get(rid)
+        if data is None:
+            if rid in self._saved_json:
+                await self._write_reminders([], [rid])
+            self._compiled.pop(rid, None)
+            await self.bot.scheduler.cancel(REMINDER_TIMER, rid)
+            return
+        raw = self._serialize_reminder(data)
+        if self._saved_json.get(rid) != raw:
+            await self._write_reminders([(rid, raw)], [])
+            self._compiled.pop(rid, None)
+        await self._reschedule(rid)
 
     @staticmethod
     def sanitize_data(data):
@@ -364,232 +446,92 @@ class Reminders(commands.Cog):
 
         return result
 
-    def get_next_fire_time(self, data) -> str:
-        """Calculate next fire time (timezone-aware)."""
+    def get_next_fire_time(self, data, rid=None) -> str:
+        """Next fire time as a Discord timestamp (timezone-aware, honoring skipped dates)."""
         if data.get('type') != 'scheduled':
             return "N/A"
         if not data.get('enabled', True):
             return "Disabled"
 
-        schedule_data = data.get('schedule_data', {})
-        if not schedule_data:
-            return "Invalid schedule"
-
-        now_utc = datetime.now(timezone.utc)
-        frequency = schedule_data.get('frequency')
-        time_utc_str = schedule_data.get('time_utc')
-
-        if not time_utc_str or ':' not in str(time_utc_str):
-            return "Unknown"
-
         try:
-            hour, minute = map(int, str(time_utc_str).split(':'))
-        except (ValueError, AttributeError):
-            return "Invalid time format"
-
-        # Calculate next occurrence
-        if frequency == 'daily':
-            next_fire = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            if next_fire <= now_utc:
-                next_fire += timedelta(days=1)
-
-        elif frequency == 'monthly':
-            try:
-                dom = int(schedule_data.get('day_of_month', 1))
-            except (ValueError, TypeError):
-                return "Invalid day of month"
-            # Try current month first
-            try:
-                next_fire = now_utc.replace(day=dom, hour=hour, minute=minute, second=0, microsecond=0)
-                if next_fire <= now_utc:
-                    raise ValueError("Already passed")
-            except ValueError:
-                # Try next month
-                year = now_utc.year if now_utc.month < 12 else now_utc.year + 1
-                month = now_utc.month + 1 if now_utc.month < 12 else 1
-                for _ in range(12):  # Try up to 12 months
-                    try:
-                        next_fire = datetime(year, month, dom, hour, minute, tzinfo=timezone.utc)
-                        break
-                    except ValueError:
-                        month += 1
-                        if month > 12:
-                            month = 1
-                            year += 1
-                else:
-                    return "No valid date found"
-
-        elif frequency in ['weekly', 'biweekly']:
-            days_of_week = schedule_data.get('days_of_week', [])
-            if not days_of_week:
-                return "No days configured"
-
-            # Ensure days are integers (could be strings from corrupted data)
-            try:
-                days_of_week = [int(d) for d in days_of_week]
-            except (ValueError, TypeError):
-                return "Invalid days configuration"
-
-            # Find next matching day
-            candidates = []
-            for target_dow in days_of_week:
-                days_ahead = (target_dow - now_utc.weekday()) % 7
-                if days_ahead == 0:
-                    candidate = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    if candidate <= now_utc:
-                        days_ahead = 7
-                    else:
-                        candidates.append(candidate)
-                        continue
-
-                candidate = now_utc + timedelta(days=days_ahead)
-                candidate = candidate.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                candidates.append(candidate)
-
-            if not candidates:
-                return "Unknown"
-
-            next_fire = min(candidates)
-
-            # For biweekly, check if we need to skip a week
-            if frequency == 'biweekly':
-                last_fire = schedule_data.get('last_biweekly_fire')
-                if last_fire:
-                    last_date = datetime.fromisoformat(last_fire).date()
-                    if (next_fire.date() - last_date).days < 14:
-                        next_fire += timedelta(weeks=1)
+            compiled = self.compiled_schedule(rid, data) if rid else compile_schedule(data.get('schedule_data'))
+        except ValueError as e:
+            return str(e)
+        if compiled is None:
+            return "Invalid schedule"
 
-        elif frequency == 'every_x_days':
-            try:
-                interval = int(schedule_data.get('interval_days', 1))
-            except (ValueError, TypeError):
-                return "Invalid interval"
-            last_ts = data.get('last_sent_timestamp')
-            if last_ts:
-                try:
-                    ts = int(last_ts) if isinstance(last_ts, str) else last_ts
-                    last_sent = datetime.fromtimestamp(ts, tz=timezone.utc)
-                    next_fire = last_sent.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=interval)
-                    if next_fire <= now_utc:
-                        # Already passed, next is today or tomorrow at fire time
-                        next_fire = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                        if next_fire <= now_utc:
-                            next_fire += timedelta(days=1)
-                except (ValueError, TypeError, OSError):
-                    next_fire = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                    if next_fire <= now_utc:
-                        next_fire += timedelta(days=1)
-            else:
-                next_fire = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-                if next_fire <= now_utc:
-                    next_fire += timedelta(days=1)
-        else:
-            return "Unknown frequency"
+        next_fire = next_unskipped_occurrence(compiled, data, datetime.now(timezone.utc))
+        if next_fire is None:
+            return "No valid date found"
 
         # Return Discord timestamp
         return f"<t:{int(next_fire.timestamp())}:F> (<t:{int(next_fire.timestamp())}:R>)"
 
-    def check_schedule(self, schedule_data, last_sent_timestamp, guild_id):
-        """Check if reminder should fire now (timezone-aware)."""
-        now_utc = datetime.now(timezone.utc)
-        current_time_utc = now_utc.strftime("%H:%M")
-
-        if last_sent_timestamp:
+    def compiled_schedule(self, rid, data) -> Optional["CompiledSchedule"]:
+        """Parsed schedule for a stored reminder, compiled once and reused until the reminder is saved again."""
+        if rid not in self._compiled:
             try:
-                # Ensure timestamp is an integer
-                ts = int(last_sent_timestamp) if isinstance(last_sent_timestamp, str) else last_sent_timestamp
-                last_sent = datetime.fromtimestamp(ts, tz=timezone.utc)
-                if last_sent.date() == now_utc.date():
-                    return False
-            except (ValueError, TypeError, OSError):
-                pass  # Invalid timestamp, continue checking
-
-        frequency = schedule_data.get('frequency')
-        time_utc = schedule_data.get('time_utc')
+                self._compiled[rid] = compile_schedule(data.get('schedule_data'))
+            except ValueError:
+                self._compiled[rid] = None
+        return self._compiled[rid]
+
+    # --- SCHEDULING ---
+    async def _reschedule(self, rid):
+        """Point the scheduler at this reminder's next occurrence, or drop its timer if it has none."""
+        data = self.reminders.get(rid)
+        due = None
+        if data and data.get('type') == 'scheduled' and data.get('enabled', True) and data.get('guild_id'):
+            compiled = self.compiled_schedule(rid, data)
+            if compiled is not None:
+                next_fire = next_unskipped_occurrence(compiled, data, datetime.now(timezone.utc))
+                if next_fire is not None:
+                    due = next_fire.timestamp()
+
+        current = self.bot.scheduler.due_at(REMINDER_TIMER, rid)
+        if due is None:
+            if current is not None:
+                await self.bot.scheduler.cancel(REMINDER_TIMER, rid)
+        elif current != due:
+            await self.bot.scheduler.schedule(REMINDER_TIMER, rid, due)
+
+    async def _on_reminder_due(self, rid, payload):
+        """Scheduler handler: send (or skip) the occurrence a reminder was woken for, then schedule the next."""
+        try:
+            data = self.reminders.get(rid)
+            if not data or not data.get('enabled', True) or data.get('type') == 'sticky':
+                return
+            compiled = self.compiled_schedule(rid, data)
+            if compiled is None:
+                return
 
-        if not frequency or not time_utc or current_time_utc != time_utc:
-            return False
+            now_utc = datetime.now(timezone.utc)
+            # The reminder may have been edited since this timer was set; only fire a current occurrence
+            due = next_unskipped_occurrence(compiled, data, now_utc - timedelta(minutes=REMINDER_GRACE_MINUTES))
+            if due is None or due.timestamp() > now_utc.timestamp() + 1:
+                await self._reschedule(rid)
+                return
 
-        if frequency == 'daily':
-            return True
-        elif frequency == 'monthly':
-            try:
-                dom = int(schedule_data.get('day_of_month', 0))
-                return now_utc.day == dom
-            except (ValueError, TypeError):
-                return False
-        elif frequency in ['weekly', 'biweekly']:
-            days_of_week = schedule_data.get('days_of_week', [])
-            # Ensure days are integers for comparison
-            try:
-                days_of_week = [int(d) for d in days_of_week]
-            except (ValueError, TypeError):
-                return False
-            if now_utc.weekday() not in days_of_week:
-                return False
-            if frequency == 'weekly':
-                return True
-            else:  # biweekly
-                last_fire = schedule_data.get('last_biweekly_fire')
-                if not last_fire:
-                    return True
-                last_date = datetime.fromisoformat(last_fire).date()
-                return (now_utc.date() - last_date).days >= 14
-        elif frequency == 'every_x_days':
+            # Ensure skip_next is an integer
+            skip_next = data.get('skip_next', 0)
             try:
-                interval = int(schedule_data.get('interval_days', 1))
+                skip_next = int(skip_next) if isinstance(skip_next, str) else (skip_next or 0)
             except (ValueError, TypeError):
-                return False
-            if not last_sent_timestamp:
-                return True  # Never sent, fire now
-            try:
-                ts = int(last_sent_timestamp) if isinstance(last_sent_timestamp, str) else last_sent_timestamp
-                last_sent = datetime.fromtimestamp(ts, tz=timezone.utc)
-                days_since = (now_utc.date() - last_sent.date()).days
-                return days_since >= interval
-            except (ValueError, TypeError, OSError):
-                return True
-        return False
-
-    # --- MAIN LOOP ---
-    @tasks.loop(minutes=1)
-    async def reminder_loop(self):
-        try:
-            for rid, data in list(self.reminders.items()):
-                if not data.get('enabled', True) or data.get('type') == 'sticky':
-                    continue
-
-                schedule_data = data.get('schedule_data', {})
-                guild_id = data.get('guild_id')
-                if not schedule_data or not guild_id:
-                    continue
-
-                if self.check_schedule(schedule_data, data.get('last_sent_timestamp'), guild_id):
-                    # Ensure skip_next is an integer
-                    skip_next = data.get('skip_next', 0)
-                    try:
-                        skip_next = int(skip_next) if isinstance(skip_next, str) else (skip_next or 0)
-                    except (ValueError, TypeError):
-                        skip_next = 0
-
-                    if skip_next > 0:
-                        self.reminders[rid]['skip_next'] = skip_next - 1
-                        logger.info(f"Skipped {data['name']}")
-                        await self.async_save_reminders()
-                        continue
-
-                    if await self.send_reminder(data):
-                        now_utc = datetime.now(timezone.utc)
-                        self.reminders[rid]['last_sent_timestamp'] = int(now_utc.timestamp())
-                        if schedule_data.get('frequency') == 'biweekly':
-                            schedule_data['last_biweekly_fire'] = now_utc.date().isoformat()
-                        await self.async_save_reminders()
+                skip_next = 0
+
+            schedule_data = data.get('schedule_data', {})
+            if skip_next > 0:
+                data['skip_next'] = skip_next - 1
+                logger.info(f"Skipped {data['name']}")
+            elif await self.send_reminder(data):
+                now_utc = datetime.now(timezone.utc)
+                data['last_sent_timestamp'] = int(now_utc.timestamp())
+                if schedule_data.get('frequency') == 'biweekly':
+                    schedule_data['last_biweekly_fire'] = now_utc.date().isoformat()
+            await self.async_save_reminder(rid)
         except Exception as e:
-            await self.bot.error_reporter.report("Reminder", f"reminder_loop: {e}")
-
-    @reminder_loop.before_loop
-    async def before_loop(self):
-        await self.bot.wait_until_ready()
+            await self.bot.error_reporter.report("Reminder", f"reminder {rid}: {e}")
+            await self._reschedule(rid)
 
     async def send_reminder(self, data):
         cids = data.get('channel_ids', [])
@@ -918,7 +860,7 @@ class Reminders(commands.Cog):
 
                 sticky_map[str(channel.id)] = msg.id
                 data['last_sticky_ids'] = sticky_map
-                await self.async_save_reminders()
+                await self.async_save_reminder(rid)
 
             except asyncio.TimeoutError:
                 logger.error(f"Timed out sending new sticky to {channel.name}")
@@ -1032,7 +974,7 @@ class Reminders(commands.Cog):
                     data.pop('last_sent_date', None)
 
         self.reminders[rid] = data
-        await self.async_save_reminders()
+        await self.async_save_reminder(rid)
 
         guild_reminders = {k: v for k, v in self.reminders.items() if v.get('guild_id') == interaction.guild.id}
         count = len(data.get('channel_ids', []))
@@ -1111,7 +1053,7 @@ def build_detail_embed(cog, rid, data):
     lines = [f"**Type:** {rtype}", f"**Status:** {status}"]
     if data.get('type') == 'scheduled':
         lines.append(f"**Schedule:** {_format_schedule_summary(data)}")
-        next_fire = cog.get_next_fire_time(data)
+        next_fire = cog.get_next_fire_time(data, rid)
         lines.append(f"**Next:** {next_fire}")
         skip_next = data.get('skip_next', 0)
         skipped_dates = data.get('skipped_dates', [])
@@ -1159,84 +1101,147 @@ def build_skip_embed(data):
     )
 
 
-def get_next_occurrences(data, n=8):
-    """Get next N occurrence datetimes for a scheduled reminder."""
-    schedule_data = data.get('schedule_data') or {}
+class CompiledSchedule(NamedTuple):
+    """A reminder's schedule_data, validated and parsed once (all times UTC)."""
+    frequency: str
+    hour: int
+    minute: int
+    days_of_week: frozenset = frozenset()
+    day_of_month: int = 1
+    interval_days: int = 1
+
+
+MAX_OCCURRENCE_SCAN_DAYS = 800  # > 2 years: covers any monthly/biweekly gap
+
+
+def compile_schedule(schedule_data) -> CompiledSchedule:
+    """Parse schedule_data; raises ValueError with a short, displayable reason."""
+    if not schedule_data:
+        raise ValueError("Invalid schedule")
     frequency = schedule_data.get('frequency')
     time_utc_str = schedule_data.get('time_utc')
-    if not frequency or not time_utc_str:
-        return []
+    if not time_utc_str or ':' not in str(time_utc_str):
+        raise ValueError("Unknown")
     try:
         hour, minute = map(int, str(time_utc_str).split(':'))
     except (ValueError, AttributeError):
-        return []
-    now_utc = datetime.now(timezone.utc)
-    occurrences = []
+        raise ValueError("Invalid time format")
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError("Invalid time format")
+
     if frequency == 'daily':
-        next_dt = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if next_dt <= now_utc:
-            next_dt += timedelta(days=1)
-        for i in range(n):
-            occurrences.append(next_dt + timedelta(days=i))
-    elif frequency in ['weekly', 'biweekly']:
+        return CompiledSchedule(frequency, hour, minute)
+    if frequency == 'monthly':
         try:
-            days_of_week = [int(d) for d in schedule_data.get('days_of_week') or []]
+            dom = int(schedule_data.get('day_of_month', 1))
         except (ValueError, TypeError):
-            return []
+            raise ValueError("Invalid day of month")
+        if not 1 <= dom <= 31:
+            raise ValueError("Invalid day of month")
+        return CompiledSchedule(frequency, hour, minute, day_of_month=dom)
+    if frequency in ['weekly', 'biweekly']:
+        days_of_week = schedule_data.get('days_of_week', [])
         if not days_of_week:
-            return []
-        max_days = n * (14 if frequency == 'biweekly' else 7) + 14
-        for delta in range(max_days):
-            candidate = (now_utc + timedelta(days=delta)).replace(
-                hour=hour, minute=minute, second=0, microsecond=0
-            )
-            if candidate <= now_utc:
-                continue
-            if candidate.weekday() in days_of_week:
-                occurrences.append(candidate)
-                if len(occurrences) >= n:
-                    break
-    elif frequency == 'monthly':
+            raise ValueError("No days configured")
+        # Ensure days are integers (could be strings from corrupted data)
         try:
-            dom = int(schedule_data.get('day_of_month', 1))
+            days = frozenset(int(d) for d in days_of_week if 0 <= int(d) <= 6)
         except (ValueError, TypeError):
-            return []
-        year, month = now_utc.year, now_utc.month
-        for _ in range(n * 2 + 4):
-            try:
-                candidate = datetime(year, month, dom, hour, minute, tzinfo=timezone.utc)
-                if candidate > now_utc:
-                    occurrences.append(candidate)
-                    if len(occurrences) >= n:
-                        break
-            except ValueError:
-                pass
-            month += 1
-            if month > 12:
-                month = 1
-                year += 1
-    elif frequency == 'every_x_days':
+            raise ValueError("Invalid days configuration")
+        if not days:
+            raise ValueError("Invalid days configuration")
+        return CompiledSchedule(frequency, hour, minute, days_of_week=days)
+    if frequency == 'every_x_days':
         try:
-            interval = int(schedule_data.get('interval_days', 1))
+            interval = max(1, int(schedule_data.get('interval_days', 1)))
         except (ValueError, TypeError):
-            return []
-        next_dt = now_utc.replace(hour=hour, minute=minute, second=0, microsecond=0)
-        if next_dt <= now_utc:
-            next_dt += timedelta(days=1)
-        # Align to interval from last sent if available
-        last_ts = data.get('last_sent_timestamp')
-        if last_ts:
+            raise ValueError("Invalid interval")
+        return CompiledSchedule(frequency, hour, minute, interval_days=interval)
+    raise ValueError("Unknown frequency")
+
+
+def _last_sent_date(data):
+    last_ts = data.get('last_sent_timestamp')
+    if not last_ts:
+        return None
+    try:
+        ts = int(last_ts) if isinstance(last_ts, str) else last_ts
+        return datetime.fromtimestamp(ts, tz=timezone.utc).date()
+    except (ValueError, TypeError, OSError):
+        return None
+
+
+def iter_occurrences(compiled: CompiledSchedule, data, after: datetime):
+    """Yield the reminder's fire times strictly after `after`, in order.
+
+    Never more than once per UTC day, and not on the day it was last sent.
+    Biweekly reminders fire at most once per 14 days, walked from
+    last_biweekly_fire so slots that were skipped or missed still count no
+    matter when this is called; every_x_days counts from the last send.
+    """
+    last_sent = _last_sent_date(data)
+    last_biweekly = None
+    if compiled.frequency == 'biweekly':
+        last_fire = (data.get('schedule_data') or {}).get('last_biweekly_fire')
+        if last_fire:
             try:
-                ts = int(last_ts) if isinstance(last_ts, str) else last_ts
-                last_sent = datetime.fromtimestamp(ts, tz=timezone.utc)
-                aligned = last_sent.replace(hour=hour, minute=minute, second=0, microsecond=0) + timedelta(days=interval)
-                if aligned > now_utc:
-                    next_dt = aligned
-            except (ValueError, TypeError, OSError):
-                pass
-        for i in range(n):
-            occurrences.append(next_dt + timedelta(days=interval * i))
-    return occurrences[:n]
+                last_biweekly = datetime.fromisoformat(last_fire).date()
+            except (ValueError, TypeError):
+                last_biweekly = None
+
+    day = after.date()
+    if compiled.frequency == 'every_x_days' and last_sent:
+        day = max(day, last_sent + timedelta(days=compiled.interval_days))
+    end = day + timedelta(days=MAX_OCCURRENCE_SCAN_DAYS)
+    if last_biweekly is not None:
+        day = min(day, last_biweekly + timedelta(days=1))
+
+    while day < end:
+        candidate = datetime(day.year, day.month, day.day, compiled.hour, compiled.minute, tzinfo=timezone.utc)
+        # Past biweekly slots are still walked to keep the 14-day cadence
+        if day == last_sent or (candidate <= after and compiled.frequency != 'biweekly'):
+            day += timedelta(days=1)
+            continue
+
+        if compiled.frequency == 'every_x_days':
+            yield candidate
+            day += timedelta(days=compiled.interval_days)
+            continue
+
+        if compiled.frequency == 'monthly':
+            matches = day.day == compiled.day_of_month
+        elif compiled.frequency in ('weekly', 'biweekly'):
+            matches = day.weekday() in compiled.days_of_week
+        else:
+            matches = True
+
+        if matches and compiled.frequency == 'biweekly':
+            if last_biweekly is not None and (day - last_biweekly).days < 14:
+                matches = False
+            else:
+                last_biweekly = day
+        if matches and candidate > after:
+            yield candidate
+        day += timedelta(days=1)
+
+
+def next_unskipped_occurrence(compiled: CompiledSchedule, data, after: datetime) -> Optional[datetime]:
+    """First occurrence after `after` that isn't one of the reminder's skipped_dates."""
+    skipped = set(data.get('skipped_dates') or [])
+    for occurrence in iter_occurrences(compiled, data, after):
+        if occurrence.strftime('%Y-%m-%d') not in skipped:
+            return occurrence
+    return None
+
+
+def get_next_occurrences(data, n=8, compiled: Optional[CompiledSchedule] = None):
+    """Get next N occurrence datetimes for a scheduled reminder (skipped dates included)."""
+    if compiled is None:
+        try:
+            compiled = compile_schedule(data.get('schedule_data'))
+        except ValueError:
+            return []
+    return list(islice(iter_occurrences(compiled, data, datetime.now(timezone.utc)), n))
 
 
 # --- BASE VIEW ---
@@ -1407,7 +1412,7 @@ class ReminderDetailView(BaseView):
 
         elif action == "toggle":
             d['enabled'] = not d.get('enabled', True)
-            await self.cog.async_save_reminders()
+            await self.cog.async_save_reminder(self.rid)
             await interaction.response.edit_message(
                 content=None,
                 embed=build_detail_embed(self.cog, self.rid, d),
@@ -1602,7 +1607,7 @@ class DeleteConfirmView(BaseView):
                         pass
             if self.rid in self.cog.sticky_locks:
                 del self.cog.sticky_locks[self.rid]
-            await self.cog.async_save_reminders()
+            await self.cog.async_save_reminder(self.rid)
         guild_reminders = {k: v for k, v in self.cog.reminders.items() if v.get('guild_id') == self.guild.id}
         embed = build_panel_embed(guild_reminders)
         embed.set_footer(text="Reminder deleted.")
@@ -2387,7 +2392,7 @@ class SkipView(BaseView):
         self.guild = guild
 
         data = cog.reminders.get(rid, {})
-        occurrences = get_next_occurrences(data, n=8)
+        occurrences = get_next_occurrences(data, n=8, compiled=cog.compiled_schedule(rid, data) if data else None)
 
         # Row 0: multi-select of upcoming occurrences
         if occurrences:
@@ -2438,7 +2443,7 @@ class SkipView(BaseView):
         if not d:
             return await interaction.response.edit_message(content="Reminder no longer exists.", embed=None, view=None)
         d['skipped_dates'] = list(self.occ_select.values)
-        await self.cog.async_save_reminders()
+        await self.cog.async_save_reminder(self.rid)
         await interaction.response.edit_message(
             embed=build_skip_embed(d), view=SkipView(self.cog, self.rid, self.guild)
         )
@@ -2454,7 +2459,7 @@ class SkipView(BaseView):
             except (ValueError, TypeError):
                 current = 0
             d['skip_next'] = current + count
-            await self.cog.async_save_reminders()
+            await self.cog.async_save_reminder(self.rid)
             await interaction.response.edit_message(
                 embed=build_skip_embed(d), view=SkipView(self.cog, self.rid, self.guild)
             )
@@ -2464,7 +2469,7 @@ class SkipView(BaseView):
         d = self.cog.reminders.get(self.rid)
         if d:
             d['skip_next'] = 0
-            await self.cog.async_save_reminders()
+            await self.cog.async_save_reminder(self.rid)
         embed = build_skip_embed(d) if d else discord.Embed(title="Not found")
         await interaction.response.edit_message(embed=embed, view=SkipView(self.cog, self.rid, self.guild))
 
@@ -2472,7 +2477,7 @@ class SkipView(BaseView):
         d = self.cog.reminders.get(self.rid)
         if d:
             d['skipped_dates'] = []
-            await self.cog.async_save_reminders()
+            await self.cog.async_save_reminder(self.rid)
         embed = build_skip_embed(d) if d else discord.Embed(title="Not found")
         await interaction.response.edit_message(embed=embed, view=SkipView(self.cog, self.rid, self.guild))
 
@@ -2481,7 +2486,7 @@ class SkipView(BaseView):
         if d:
             d['skip_next'] = 0
             d['skipped_dates'] = []
-            await self.cog.async_save_reminders()
+            await self.cog.async_save_reminder(self.rid)
         embed = build_skip_embed(d) if d else discord.Embed(title="Not found")
         await interaction.response.edit_message(embed=embed, view=SkipView(self.cog, self.rid, self.guild))
 
@@ -2560,7 +2565,7 @@ class EditChannelsView(BaseView):
                 d.get('last_sticky_ids', {}).pop(str(cid), None)
 
         d['channel_ids'] = new_cids
-        await self.cog.async_save_reminders()
+        await self.cog.async_save_reminder(self.rid)
         await interaction.response.edit_message(
             content=None, embed=build_detail_embed(self.cog, self.rid, d),
             view=ReminderDetailView(self.cog, self.rid, self.guild)
@@ -23,6 +23,8 @@ from datetime import datetime, timedelta, timezone
 from typing import Optional
 import asyncio
 
+from utils import database
+
 logger = logging.getLogger('role_alerts')
 if not logger.handlers:
     handler = logging.StreamHandler()
@@ -47,7 +49,7 @@ async def init_db():
     import os
     os.makedirs("data", exist_ok=True)
 
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with database.connect(DB_PATH) as db:
         await db.execute("PRAGMA journal_mode=WAL")
         # Guild settings - minimal now, just for global toggle and thread format
         await db.execute("""
@@ -144,7 +146,7 @@ class CloseConfirmView(discord.ui.View):
             if thread:
                 await thread.delete()
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute(
                     "UPDATE active_alerts SET status = 'closed', thread_id = NULL WHERE alert_id = ?",
                     (self.alert_id,)
@@ -309,7 +311,7 @@ class ClaimButton(discord.ui.View):
             await interaction.response.send_message("You don't have permission.", ephemeral=True)
             return
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             cursor = await db.execute(
                 "SELECT claimed_by, status FROM active_alerts WHERE alert_id = ?",
                 (self.alert_id,)
@@ -394,7 +396,7 @@ class ClaimButton(discord.ui.View):
                 )
                 await thread.send(welcome_msg)
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute("""
                     UPDATE active_alerts
                     SET thread_id = ?, claimed_at = ?
@@ -437,7 +439,7 @@ class ClaimButton(discord.ui.View):
             await interaction.response.send_message("You don't have permission.", ephemeral=True)
             return
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE active_alerts SET status = 'dismissed', claimed_by = ? WHERE alert_id = ?",
                 (interaction.user.id, self.alert_id)
@@ -909,7 +911,7 @@ class ConfigPanel(discord.ui.View):
             return
 
         data = self.new_role_data
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute("""
                 INSERT INTO tracked_roles (
                     guild_id, role_id, alert_channel_id, thread_channel_id,
@@ -955,7 +957,7 @@ class ConfigPanel(discord.ui.View):
     async def on_edit_alert_channel(self, interaction: discord.Interaction):
         channel_id = int(interaction.data['values'][0]) if interaction.data['values'] else None
         if channel_id:
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute(
                     "UPDATE tracked_roles SET alert_channel_id = ? WHERE guild_id = ? AND role_id = ?",
                     (channel_id, self.guild.id, self.selected_role_id)
@@ -965,7 +967,7 @@ class ConfigPanel(discord.ui.View):
 
     async def on_edit_parent_channel(self, interaction: discord.Interaction):
         channel_id = int(interaction.data['values'][0]) if interaction.data['values'] else None
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE tracked_roles SET thread_channel_id = ? WHERE guild_id = ? AND role_id = ?",
                 (channel_id, self.guild.id, self.selected_role_id)
@@ -975,7 +977,7 @@ class ConfigPanel(discord.ui.View):
 
     async def on_edit_admin_role(self, interaction: discord.Interaction):
         role_id = int(interaction.data['values'][0]) if interaction.data['values'] else None
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE tracked_roles SET admin_role_id = ? WHERE guild_id = ? AND role_id = ?",
                 (role_id, self.guild.id, self.selected_role_id)
@@ -985,7 +987,7 @@ class ConfigPanel(discord.ui.View):
 
     async def on_edit_ping_role(self, interaction: discord.Interaction):
         role_id = int(interaction.data['values'][0]) if interaction.data['values'] else None
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE tracked_roles SET ping_role_id = ?, ping_enabled = ? WHERE guild_id = ? AND role_id = ?",
                 (role_id, 1 if role_id else 0, self.guild.id, self.selected_role_id)
@@ -994,7 +996,7 @@ class ConfigPanel(discord.ui.View):
         await self.refresh(interaction)
 
     async def on_clear_ping(self, interaction: discord.Interaction):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE tracked_roles SET ping_role_id = NULL, ping_enabled = 0 WHERE guild_id = ? AND role_id = ?",
                 (self.guild.id, self.selected_role_id)
@@ -1037,7 +1039,7 @@ class ConfigPanel(discord.ui.View):
         await self.cog.send_role_alert(interaction.user, role, role_settings)
 
     async def on_delete_role_alert(self, interaction: discord.Interaction):
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "DELETE FROM tracked_roles WHERE guild_id = ? AND role_id = ?",
                 (self.guild.id, self.selected_role_id)
@@ -1073,7 +1075,7 @@ class BypassRoleSelectView(discord.ui.View):
             else:
                 self.panel.new_role_data.pop('bypass_role_id', None)
         elif self.mode == "edit":
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute(
                     "UPDATE tracked_roles SET bypass_role_id = ? WHERE guild_id = ? AND role_id = ?",
                     (role_id, self.panel.guild.id, self.panel.selected_role_id)
@@ -1094,7 +1096,7 @@ class BypassRoleSelectView(discord.ui.View):
         if self.mode == "new":
             self.panel.new_role_data.pop('bypass_role_id', None)
         elif self.mode == "edit":
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute(
                     "UPDATE tracked_roles SET bypass_role_id = NULL WHERE guild_id = ? AND role_id = ?",
                     (self.panel.guild.id, self.panel.selected_role_id)
@@ -1157,7 +1159,7 @@ class EditWelcomeModal(discord.ui.Modal, title="Edit Welcome Message"):
     async def on_submit(self, interaction: discord.Interaction):
         value = self.welcome_msg.value if self.welcome_msg.value else None
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE tracked_roles SET welcome_message = ? WHERE guild_id = ? AND role_id = ?",
                 (value, interaction.guild_id, self.panel.selected_role_id)
@@ -1190,7 +1192,7 @@ class EditThreadFormatModal(discord.ui.Modal, title="Edit Thread Name Format"):
     async def on_submit(self, interaction: discord.Interaction):
         value = self.format_input.value if self.format_input.value else '{user}-{role}'
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE tracked_roles SET thread_name_format = ? WHERE guild_id = ? AND role_id = ?",
                 (value, interaction.guild_id, self.panel.selected_role_id)
@@ -1310,7 +1312,7 @@ class RoleAlerts(commands.Cog):
 
         role_settings = await self.get_tracked_role_settings(interaction.guild_id, role_id) if role_id else None
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             cursor = await db.execute(
                 "SELECT claimed_by, status, role_id FROM active_alerts WHERE alert_id = ?",
                 (alert_id,)
@@ -1394,7 +1396,7 @@ class RoleAlerts(commands.Cog):
                 )
                 await thread.send(welcome_msg)
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute("""
                     UPDATE active_alerts
                     SET thread_id = ?, claimed_at = ?
@@ -1424,7 +1426,7 @@ class RoleAlerts(commands.Cog):
             await interaction.response.send_message("You don't have permission.", ephemeral=True)
             return
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             await db.execute(
                 "UPDATE active_alerts SET status = 'dismissed', claimed_by = ? WHERE alert_id = ?",
                 (interaction.user.id, alert_id)
@@ -1470,7 +1472,7 @@ class RoleAlerts(commands.Cog):
 
     async def get_guild_settings(self, guild_id: int) -> Optional[dict]:
         """Get settings for a guild (legacy, mostly unused now)."""
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM guild_settings WHERE guild_id = ?",
@@ -1481,7 +1483,7 @@ class RoleAlerts(commands.Cog):
 
     async def get_tracked_roles(self, guild_id: int) -> list[int]:
         """Get list of tracked role IDs for a guild."""
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             cursor = await db.execute(
                 "SELECT role_id FROM tracked_roles WHERE guild_id = ?",
                 (guild_id,)
@@ -1491,7 +1493,7 @@ class RoleAlerts(commands.Cog):
 
     async def get_tracked_roles_with_settings(self, guild_id: int) -> list[dict]:
         """Get tracked roles with their settings."""
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM tracked_roles WHERE guild_id = ?",
@@ -1502,7 +1504,7 @@ class RoleAlerts(commands.Cog):
 
     async def get_tracked_role_settings(self, guild_id: int, role_id: int) -> Optional[dict]:
         """Get settings for a specific tracked role."""
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM tracked_roles WHERE guild_id = ? AND role_id = ?",
@@ -1513,7 +1515,7 @@ class RoleAlerts(commands.Cog):
 
     async def get_alert_data(self, alert_id: int) -> Optional[dict]:
         """Get data for a specific alert."""
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             db.row_factory = aiosqlite.Row
             cursor = await db.execute(
                 "SELECT * FROM active_alerts WHERE alert_id = ?",
@@ -1539,7 +1541,7 @@ class RoleAlerts(commands.Cog):
     async def check_expired_threads(self):
         """Check for threads that should be auto-deleted (7 days old)."""
         try:
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 db.row_factory = aiosqlite.Row
 
                 cursor = await db.execute(
@@ -1547,44 +1549,49 @@ class RoleAlerts(commands.Cog):
                 )
                 alerts = await cursor.fetchall()
 
-                for alert in alerts:
-                    claimed_at = datetime.fromisoformat(alert['claimed_at']) if alert['claimed_at'] else None
-                    if not claimed_at:
-                        continue
-
-                    if claimed_at.tzinfo is None:
-                        claimed_at = claimed_at.replace(tzinfo=timezone.utc)
-
-                    if datetime.now(timezone.utc) - claimed_at > timedelta(days=AUTO_DELETE_DAYS):
-                        try:
-                            guild = self.bot.get_guild(alert['guild_id'])
-                            if guild:
-                                thread = guild.get_channel_or_thread(alert['thread_id'])
-                                if thread:
-                                    await thread.delete()
-                                    logger.info(f"Auto-deleted thread {alert['thread_id']} after 7 days")
-
-                                await db.execute(
-                                    "UPDATE active_alerts SET status = 'auto_deleted', thread_id = NULL WHERE alert_id = ?",
-                                    (alert['alert_id'],)
-                                )
-
-                                channel = guild.get_channel(alert['channel_id'])
-                                if channel:
-                                    try:
-                                        message = await channel.fetch_message(alert['message_id'])
-                                        embed = message.embeds[0] if message.embeds else None
-                                        if embed:
-                                            embed.color = discord.Color.dark_gray()
-                                            embed.set_footer(text="Auto-deleted (7 days expired)")
-                                            await message.edit(embed=embed, view=None)
-                                    except discord.NotFound:
-                                        pass
-
-                        except Exception as e:
-                            logger.error(f"Error auto-deleting thread: {e}")
+            # Discord calls happen outside the DB block; the status updates are batched after
+            expired_ids = []
+            for alert in alerts:
+                claimed_at = datetime.fromisoformat(alert['claimed_at']) if alert['claimed_at'] else None
+                if not claimed_at:
+                    continue
 
-                await db.commit()
+                if claimed_at.tzinfo is None:
+                    claimed_at = claimed_at.replace(tzinfo=timezone.utc)
+
+                if datetime.now(timezone.utc) - claimed_at > timedelta(days=AUTO_DELETE_DAYS):
+                    try:
+                        guild = self.bot.get_guild(alert['guild_id'])
+                        if guild:
+                            thread = guild.get_channel_or_thread(alert['thread_id'])
+                            if thread:
+                                await thread.delete()
+                                logger.info(f"Auto-deleted thread {alert['thread_id']} after 7 days")
+
+                            expired_ids.append((alert['alert_id'],))
+
+                            channel = guild.get_channel(alert['channel_id'])
+                            if channel:
+                                try:
+                                    message = await channel.fetch_message(alert['message_id'])
+                                    embed = message.embeds[0] if message.embeds else None
+                                    if embed:
+                                        embed.color = discord.Color.dark_gray()
+                                        embed.set_footer(text="Auto-deleted (7 days expired)")
+                                        await message.edit(embed=embed, view=None)
+                                except discord.NotFound:
+                                    pass
+
+                    except Exception as e:
+                        logger.error(f"Error auto-deleting thread: {e}")
+
+            if expired_ids:
+                async with database.connect(DB_PATH) as db:
+                    await db.executemany(
+                        "UPDATE active_alerts SET status = 'auto_deleted', thread_id = NULL WHERE alert_id = ?",
+                        expired_ids
+                    )
+                    await db.commit()
         except Exception as e:
             await self.bot.error_reporter.report("RoleAlerts", f"check_expired_threads: {e}")
 
@@ -1646,7 +1653,7 @@ class RoleAlerts(commands.Cog):
         )
         embed.set_footer(text="Unclaimed")
 
-        async with aiosqlite.connect(DB_PATH) as db:
+        async with database.connect(DB_PATH) as db:
             cursor = await db.execute("""
                 INSERT INTO active_alerts (
                     guild_id, channel_id, user_id, role_id,
@@ -1668,7 +1675,7 @@ class RoleAlerts(commands.Cog):
         try:
             message = await channel.send(content=content, embed=embed, view=view)
 
-            async with aiosqlite.connect(DB_PATH) as db:
+            async with database.connect(DB_PATH) as db:
                 await db.execute(
                     "UPDATE active_alerts SET message_id = ? WHERE alert_id = ?",
                     (message.id, alert_id)
@@ -7,7 +7,8 @@ import re
 import logging
 import asyncio
 from datetime import datetime, timedelta, timezone
-from collections import defaultdict
+from collections import defaultdict, deque, Counter
+from typing import NamedTuple
 
 # --- Basic Setup ---
 log = logging.getLogger(__name__)
@@ -31,6 +32,7 @@ NUKE_WINDOW_SECS = 60        # audit log action window
 INVITE_STRIKE_COUNT = 3       # invite links before quarantine
 INVITE_STRIKE_WINDOW = 60    # seconds
 INVITE_WARN_DELETE_AFTER = 8  # auto-delete warning after N seconds
+HISTORY_IDLE_SECS = 30        # drop a member's message window after this much silence
 
 # --- Invite Link Regex ---
 INVITE_PATTERN = re.compile(
@@ -69,6 +71,88 @@ def save_infractions(data):
         json.dump(data, f, indent=4)
 
 
+# ============================================================
+#  Spam Tracking — per-member sliding windows
+# ============================================================
+
+class GuildRules(NamedTuple):
+    """Per-guild config flattened into sets for O(1) membership checks."""
+    admin_roles: frozenset
+    mod_roles: frozenset
+    whitelisted_users: frozenset
+    exempt_channels: frozenset
+    mention_exempt_roles: frozenset
+    enabled_modules: dict
+
+    @classmethod
+    def compile(cls, cfg: dict) -> "GuildRules":
+        return cls(
+            admin_roles=frozenset(cfg.get("admin_roles", [])),
+            mod_roles=frozenset(cfg.get("mod_roles", [])),
+            whitelisted_users=frozenset(cfg.get("whitelisted_users", [])),
+            exempt_channels=frozenset(cfg.get("exempt_channels", [])),
+            mention_exempt_roles=frozenset(cfg.get("mention_exempt_roles", [])),
+            enabled_modules=dict(cfg.get("enabled_modules", {})),
+        )
+
+    def enabled(self, module: str) -> bool:
+        return self.enabled_modules.get(module, True)
+
+
+class MessageWindow:
+    """Recent messages from one member, kept as time-ordered deques.
+
+    Each message is pushed once and popped once, so add() is amortised O(1):
+      * flood keeps the last FLOOD_MSG_COUNT messages - the flood rule fires
+        when the oldest of them is still inside FLOOD_WINDOW_SECS.
+      * dupes keeps non-empty messages from the last DUPLICATE_WINDOW_SECS,
+        with a Counter over their normalised-content hashes.
+    """
+
+    __slots__ = ("flood", "dupes", "dupe_counts", "last_seen")
+
+    def __init__(self):
+        self.flood: deque = deque(maxlen=FLOOD_MSG_COUNT)  # (ts, content)
+        self.dupes: deque = deque()  # (ts, key, content)
+        self.dupe_counts: Counter = Counter()
+        self.last_seen = 0.0
+
+    def add(self, now: float, content: str) -> int:
+        """Record a message and return how many copies of it are in the duplicate window."""
+        self.last_seen = now
+        self.flood.append((now, content))
+
+        dupes = self.dupes
+        while dupes and now - dupes[0][0] > DUPLICATE_WINDOW_SECS:
+            _, old_key, _ = dupes.popleft()
+            self.dupe_counts[old_key] -= 1
+            if not self.dupe_counts[old_key]:
+                del self.dupe_counts[old_key]
+
+        normalized = content.strip().lower()
+        if not normalized:
+            return 0
+        key = hash(normalized)
+        dupes.append((now, key, content))
+        self.dupe_counts[key] += 1
+        return self.dupe_counts[key]
+
+    def is_flooding(self, now: float) -> bool:
+        return len(self.flood) >= FLOOD_MSG_COUNT and now - self.flood[0][0] <= FLOOD_WINDOW_SECS
+
+    def flood_contents(self) -> list[str]:
+        return [c for _, c in self.flood]
+
+    def duplicate_contents(self, content: str) -> list[str]:
+        key = hash(content.strip().lower())
+        return [c for _, k, c in self.dupes if k == key]
+
+    def clear(self):
+        self.flood.clear()
+        self.dupes.clear()
+        self.dupe_counts.clear()
+
+
 # ============================================================
 #  Persistent Views — survive bot restarts via custom_id
 # ============================================================
@@ -567,15 +651,18 @@ class Security(commands.Cog):
         self.config = load_config()
 
         # Per-user message tracking for flood & duplicate detection
-        # guild_id -> user_id -> list of (timestamp, content)
-        self._message_history: dict[int, dict[int, list[tuple[float, str]]]] = defaultdict(lambda: defaultdict(list))
+        # guild_id -> user_id -> MessageWindow
+        self._message_history: dict[int, dict[int, MessageWindow]] = defaultdict(lambda: defaultdict(MessageWindow))
+
+        # Compiled per-guild rule sets, rebuilt lazily after each config save
+        self._rules: dict[int, GuildRules] = {}
 
         # Per-user audit log action tracking for anti-nuke
         # guild_id -> user_id -> list of (timestamp, action_type)
         self._audit_actions: dict[int, dict[int, list[tuple[float, str]]]] = defaultdict(lambda: defaultdict(list))
 
-        # Per-user invite link strike tracker: guild_id -> user_id -> list of timestamps
-        self._invite_strikes: dict[int, dict[int, list[float]]] = defaultdict(lambda: defaultdict(list))
+        # Per-user invite link strike tracker: guild_id -> user_id -> deque of timestamps
+        self._invite_strikes: dict[int, dict[int, deque]] = defaultdict(lambda: defaultdict(deque))
 
         # Cooldown: users recently ignored (guild_id -> set of user_ids)
         self._ignore_cooldown: dict[int, dict[int, float]] = defaultdict(dict)
@@ -615,33 +702,36 @@ class Security(commands.Cog):
 
     def save(self):
         save_config(self.config)
+        self._rules.clear()
+
+    def get_rules(self, guild_id: int) -> GuildRules:
+        rules = self._rules.get(guild_id)
+        if rules is None:
+            rules = self._rules[guild_id] = GuildRules.compile(self.get_guild_config(guild_id))
+        return rules
 
     def is_module_enabled(self, guild_id: int, module: str) -> bool:
-        cfg = self.get_guild_config(guild_id)
-        return cfg.get("enabled_modules", {}).get(module, True)
+        return self.get_rules(guild_id).enabled(module)
 
     def has_admin_role(self, member: discord.Member) -> bool:
         """Check if a member has an admin-whitelisted role (bypasses everything)."""
-        cfg = self.get_guild_config(member.guild.id)
-        admin_roles = cfg.get("admin_roles", [])
+        admin_roles = self.get_rules(member.guild.id).admin_roles
         return any(role.id in admin_roles for role in member.roles)
 
     def is_exempt(self, member: discord.Member, channel_id: int | None = None) -> bool:
         """Check if a member is exempt from spam detection."""
         if member.bot:
             return True
-        if self.has_admin_role(member):
-            return True
-        if member.guild_permissions.manage_messages:
-            return True
-        cfg = self.get_guild_config(member.guild.id)
-        mod_roles = cfg.get("mod_roles", [])
-        if any(role.id in mod_roles for role in member.roles):
+        rules = self.get_rules(member.guild.id)
+        if member.id in rules.whitelisted_users:
             return True
-        if member.id in cfg.get("whitelisted_users", []):
+        if channel_id and channel_id in rules.exempt_channels:
             return True
-        if channel_id and channel_id in cfg.get("exempt_channels", []):
+        if member.guild_permissions.manage_messages:
             return True
+        for role in member.roles:
+            if role.id in rules.admin_roles or role.id in rules.mod_roles:
+                return True
         # Ignore cooldown: if a mod recently hit "Ignore" on this user, give 5 min grace
         cooldowns = self._ignore_cooldown.get(member.guild.id, {})
         if member.id in cooldowns:
@@ -968,15 +1058,13 @@ class Security(commands.Cog):
             return
 
         now = datetime.now(timezone.utc).timestamp()
+        rules = self.get_rules(guild.id)
         history = self._message_history[guild.id][member.id]
         content = message.content or ""
-        history.append((now, content))
-
-        # Prune old entries (keep last 30 seconds)
-        history[:] = [(t, c) for t, c in history if now - t < 30]
+        dupe_count = history.add(now, content)
 
         # --- Invite Link Detection ---
-        if self.is_module_enabled(guild.id, "invite_links") and INVITE_PATTERN.search(content):
+        if rules.enabled("invite_links") and INVITE_PATTERN.search(content):
             # Always delete the message
             try:
                 await message.delete()
@@ -986,7 +1074,8 @@ class Security(commands.Cog):
             # Track strikes
             strikes = self._invite_strikes[guild.id][member.id]
             strikes.append(now)
-            strikes[:] = [t for t in strikes if now - t < INVITE_STRIKE_WINDOW]
+            while now - strikes[0] >= INVITE_STRIKE_WINDOW:
+                strikes.popleft()
 
             if len(strikes) >= INVITE_STRIKE_COUNT:
                 # 3rd strike in 60s — quarantine + full alert
@@ -1009,9 +1098,9 @@ class Security(commands.Cog):
             return
 
         # --- Mass Mention Detection ---
-        if self.is_module_enabled(guild.id, "mass_mentions"):
+        if rules.enabled("mass_mentions"):
             # Check if user has a mention-exempt role
-            mention_exempt = self.get_guild_config(guild.id).get("mention_exempt_roles", [])
+            mention_exempt = rules.mention_exempt_roles
             is_mention_exempt = any(role.id in mention_exempt for role in member.roles)
             if not is_mention_exempt:
                 unique_mentions = set()
@@ -1025,21 +1114,17 @@ class Security(commands.Cog):
                     return
 
         # --- Message Flood Detection ---
-        if self.is_module_enabled(guild.id, "message_flood"):
-            recent = [(t, c) for t, c in history if now - t <= FLOOD_WINDOW_SECS]
-            if len(recent) >= FLOOD_MSG_COUNT:
-                contents = [c for _, c in recent]
+        if rules.enabled("message_flood"):
+            if history.is_flooding(now):
+                contents = history.flood_contents()
                 history.clear()
                 await self.handle_flood_violation(guild, member, message.channel, contents)
                 return
 
         # --- Duplicate Spam Detection ---
-        if self.is_module_enabled(guild.id, "duplicate_spam") and content.strip():
-            recent = [(t, c) for t, c in history if now - t <= DUPLICATE_WINDOW_SECS]
-            normalized = content.strip().lower()
-            dupe_count = sum(1 for _, c in recent if c.strip().lower() == normalized)
+        if rules.enabled("duplicate_spam") and content.strip():
             if dupe_count >= DUPLICATE_COUNT:
-                contents = [c for _, c in recent if c.strip().lower() == normalized]
+                contents = history.duplicate_contents(content)
                 history.clear()
                 await self.handle_flood_violation(guild, member, message.channel, contents)
                 return
@@ -1131,8 +1216,7 @@ class Security(commands.Cog):
             for guild_id in list(self._message_history.keys()):
                 users = self._message_history[guild_id]
                 for user_id in list(users.keys()):
-                    users[user_id] = [(t, c) for t, c in users[user_id] if now - t < 30]
-                    if not users[user_id]:
+                    if now - users[user_id].last_seen >= HISTORY_IDLE_SECS:
                         del users[user_id]
                 if not users:
                     del self._message_history[guild_id]
@@ -1150,8 +1234,10 @@ class Security(commands.Cog):
             for guild_id in list(self._invite_strikes.keys()):
                 users = self._invite_strikes[guild_id]
                 for user_id in list(users.keys()):
-                    users[user_id] = [t for t in users[user_id] if now - t < INVITE_STRIKE_WINDOW]
-                    if not users[user_id]:
+                    strikes = users[user_id]
+                    while strikes and now - strikes[0] >= INVITE_STRIKE_WINDOW:
+                        strikes.popleft()
+                    if not strikes:
                         del users[user_id]
                 if not users:
                     del self._invite_strikes[guild_id]
@@ -10,19 +10,19 @@ import typing
 import traceback
 import re
 import aiohttp
+from collections import deque
 from contextlib import asynccontextmanager
 from pathlib import Path
 
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+from utils.render_service import PLAYWRIGHT_AVAILABLE
 
 # --- CONFIGURATION ---
 TRACKING_DB = "tracking_data.db"
 DATA_RETENTION_DAYS = 365
 EMOJI_PAGE_SIZE = 8
+INGEST_FLUSH_SECONDS = 2       # Max time an event sits in the write-behind buffer
+INGEST_FLUSH_ROWS = 500        # Flush early once this many rows are pending
+INGEST_MAX_ROWS = 50_000       # Per-table cap; oldest rows are dropped if the DB stalls
 FONT_PATH = "/usr/share/fonts/truetype/noto"
 TEMPLATE_DIR = Path(__file__).parent / "templates"
 
@@ -75,7 +75,8 @@ class TrackingDB:
             try:
                 yield self._db
                 await self._db.commit()
-            except Exception:
+            except BaseException:
+                # Also on cancellation, so the next BEGIN doesn't find this one still open
                 await self._db.rollback()
                 raise
 
@@ -93,6 +94,12 @@ class TrackingDB:
         await self._db.execute("CREATE TABLE IF NOT EXISTS user_inactivity_status (guild_id INTEGER, user_id INTEGER, status TEXT, snooze_until INTEGER, PRIMARY KEY (guild_id, user_id))")
         await self._db.execute("CREATE TABLE IF NOT EXISTS inactivity_alert_log (guild_id INTEGER, user_id INTEGER, rule TEXT, PRIMARY KEY (guild_id, user_id, rule))")
 
+        # Daily rollups (maintained at ingest, read by the overview cards)
+        async with self._db.execute("SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'daily_message_rollup'") as cursor:
+            rollups_exist = await cursor.fetchone() is not None
+        await self._db.execute("CREATE TABLE IF NOT EXISTS daily_message_rollup (guild_id INTEGER, user_id INTEGER, channel_id INTEGER, day TEXT, msgs INTEGER DEFAULT 0, PRIMARY KEY (guild_id, user_id, channel_id, day))")
+        await self._db.execute("CREATE TABLE IF NOT EXISTS daily_voice_rollup (guild_id INTEGER, user_id INTEGER, channel_id INTEGER, day TEXT, secs INTEGER DEFAULT 0, PRIMARY KEY (guild_id, user_id, channel_id, day))")
+
         # Indexes
         await self._db.execute("CREATE INDEX IF NOT EXISTS idx_msg_user_time ON message_logs(user_id, timestamp)")
         await self._db.execute("CREATE INDEX IF NOT EXISTS idx_msg_channel_time ON message_logs(channel_id, timestamp)")
@@ -100,6 +107,11 @@ class TrackingDB:
         await self._db.execute("CREATE INDEX IF NOT EXISTS idx_social_target ON social_interactions(target_user_id, guild_id)")
         await self._db.execute("CREATE INDEX IF NOT EXISTS idx_emoji_id ON emoji_logs(emoji_id, guild_id)")
         await self._db.execute("CREATE INDEX IF NOT EXISTS idx_member_events_guild_time ON member_events(guild_id, timestamp)")
+        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_voice_guild_start ON voice_sessions(guild_id, start_time)")
+        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_msg_rollup_guild_day ON daily_message_rollup(guild_id, day)")
+        await self._db.execute("CREATE INDEX IF NOT EXISTS idx_voice_rollup_guild_day ON daily_voice_rollup(guild_id, day)")
+        if not rollups_exist:
+            await self._rebuild_rollups()
         await self._db.commit()
 
     async def fetch_one(self, sql, params=()):
@@ -118,6 +130,12 @@ class TrackingDB:
             await self._db.execute(sql, params)
             await self._db.commit()
 
+    async def execute_batches(self, batches):
+        """Run several executemany() calls inside a single transaction."""
+        async with self.transaction() as conn:
+            for sql, rows in batches:
+                await conn.executemany(sql, rows)
+
     async def prune_old_data(self, cutoff_timestamp: int):
         await self._ensure_connected()
         async with self._lock:
@@ -127,8 +145,165 @@ class TrackingDB:
             await self._db.execute("DELETE FROM voice_sessions WHERE end_time < ?", (cutoff_timestamp,))
             await self._db.execute("DELETE FROM emoji_logs WHERE timestamp < ?", (cutoff_timestamp,))
             await self._db.execute("DELETE FROM member_events WHERE timestamp < ?", (cutoff_timestamp,))
+            await self._db.execute("DELETE FROM daily_message_rollup WHERE day < date(?, 'unixepoch')", (cutoff_timestamp,))
+            await self._db.execute("DELETE FROM daily_voice_rollup WHERE day < date(?, 'unixepoch')", (cutoff_timestamp,))
             await self._db.commit()
 
+    # --- DAILY ROLLUPS ---
+
+    # kind -> (rollup table, value column, raw table, raw time column, raw aggregate)
+    ROLLUPS = {
+        'messages': ("daily_message_rollup", "msgs", "message_logs", "timestamp", "count(*)"),
+        'voice': ("daily_voice_rollup", "secs", "voice_sessions", "start_time", "coalesce(sum(duration), 0)"),
+    }
+
+    async def _rebuild_rollups(self):
+        for table, value, raw_table, ts_col, agg in self.ROLLUPS.values():
+            await self._db.execute(f"DELETE FROM {table}")
+            await self._db.execute(
+                f"INSERT INTO {table} (guild_id, user_id, channel_id, day, {value}) "
+                f"SELECT guild_id, user_id, channel_id, date({ts_col}, 'unixepoch') AS day, {agg} "
+                f"FROM {raw_table} GROUP BY guild_id, user_id, channel_id, day"
+            )
+
+    async def rebuild_rollups(self) -> tuple[int, int]:
+        """Recompute both daily rollup tables from the raw logs. Returns (message rows, voice rows)."""
+        async with self.transaction() as conn:
+            await self._rebuild_rollups()
+            async with conn.execute("SELECT count(*) FROM daily_message_rollup") as cursor:
+                msg_rows = (await cursor.fetchone())[0]
+            async with conn.execute("SELECT count(*) FROM daily_voice_rollup") as cursor:
+                voice_rows = (await cursor.fetchone())[0]
+        return msg_rows, voice_rows
+
+    @classmethod
+    def rollup_source(cls, kind, guild_id, after, until=None, user_id=None, channel_id=None):
+        """Build a subquery of (user_id, channel_id, day, value) rows for events with after < ts [<= until].
+
+        Whole days are read from the rollup table; only the partial days at the
+        window edges touch the raw log table, so a year-long window costs a few
+        hundred rollup rows instead of a scan over every logged event.
+        """
+        table, value, raw_table, ts_col, agg = cls.ROLLUPS[kind]
+        filters, fparams = "", []
+        if user_id is not None:
+            filters += " AND user_id = ?"
+            fparams.append(user_id)
+        if channel_id is not None:
+            filters += " AND channel_id = ?"
+            fparams.append(channel_id)
+
+        lo_day = datetime.fromtimestamp(after, timezone.utc).strftime('%Y-%m-%d')
+        lo_end = (after // 86400 + 1) * 86400
+        if until is None:
+            day_sql, day_params = "day > ?", [lo_day]
+            raw_sql, raw_params = f"{ts_col} > ? AND {ts_col} < ?", [after, lo_end]
+        else:
+            hi_day = datetime.fromtimestamp(until, timezone.utc).strftime('%Y-%m-%d')
+            hi_start = until // 86400 * 86400
+            if hi_day == lo_day:
+                day_sql, day_params = "0", []
+                raw_sql, raw_params = f"{ts_col} > ? AND {ts_col} <= ?", [after, until]
+            else:
+                day_sql, day_params = "day > ? AND day < ?", [lo_day, hi_day]
+                raw_sql = f"(({ts_col} > ? AND {ts_col} < ?) OR ({ts_col} >= ? AND {ts_col} <= ?))"
+                raw_params = [after, lo_end, hi_start, until]
+
+        sql = (
+            f"SELECT user_id, channel_id, day, {value} FROM {table} WHERE guild_id = ? AND {day_sql}{filters} "
+            f"UNION ALL "
+            f"SELECT user_id, channel_id, date({ts_col}, 'unixepoch') AS day, {agg} AS {value} FROM {raw_table} "
+            f"WHERE guild_id = ? AND {raw_sql}{filters} GROUP BY user_id, channel_id, day"
+        )
+        params = (guild_id, *day_params, *fparams, guild_id, *raw_params, *fparams)
+        return sql, params
+
+
+class IngestBuffer:
+    """Write-behind buffer for high-volume tracker events.
+
+    Listeners append plain row tuples here instead of writing to SQLite.
+    flush() drains every table into one transaction with executemany(), so a
+    busy server pays one commit per batch instead of one per chat line.
+    """
+
+    STATEMENTS = {
+        'message_logs': "INSERT INTO message_logs (user_id, channel_id, guild_id, timestamp, has_attachment, is_reply, reply_latency, length) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+        'social_interactions': "INSERT INTO social_interactions (user_id, target_user_id, guild_id, channel_id, timestamp, interaction_type) VALUES (?, ?, ?, ?, ?, ?)",
+        'emoji_logs': "INSERT INTO emoji_logs (guild_id, user_id, emoji_id, emoji_name, timestamp, usage_type) VALUES (?, ?, ?, ?, ?, ?)",
+        'reaction_logs': "INSERT INTO reaction_logs (user_id, target_message_author_id, guild_id, emoji_name, timestamp) VALUES (?, ?, ?, ?, ?)",
+        'voice_sessions': "INSERT INTO voice_sessions (user_id, channel_id, guild_id, start_time, end_time, duration) VALUES (?,?,?,?,?,?)",
+    }
+    MESSAGE_ROLLUP_UPSERT = "INSERT INTO daily_message_rollup (guild_id, user_id, channel_id, day, msgs) VALUES (?, ?, ?, ?, ?) ON CONFLICT(guild_id, user_id, channel_id, day) DO UPDATE SET msgs = msgs + excluded.msgs"
+    VOICE_ROLLUP_UPSERT = "INSERT INTO daily_voice_rollup (guild_id, user_id, channel_id, day, secs) VALUES (?, ?, ?, ?, ?) ON CONFLICT(guild_id, user_id, channel_id, day) DO UPDATE SET secs = secs + excluded.secs"
+
+    def __init__(self, max_rows: int = INGEST_MAX_ROWS):
+        self._rows: dict[str, deque] = {table: deque(maxlen=max_rows) for table in self.STATEMENTS}
+        self._pending = 0
+        self._dropped = 0
+        self._flush_lock = asyncio.Lock()
+
+    def __len__(self):
+        return self._pending
+
+    def add(self, table: str, row: tuple):
+        q = self._rows[table]
+        if len(q) == q.maxlen:
+            self._dropped += 1
+        else:
+            self._pending += 1
+        q.append(row)
+
+    async def flush(self, db: TrackingDB) -> int:
+        """Write all pending rows. On failure the rows are put back for the next attempt."""
+        async with self._flush_lock:
+            batches = []
+            for table, q in self._rows.items():
+                if q:
+                    batches.append((table, list(q)))
+                    q.clear()
+            flushed = sum(len(rows) for _, rows in batches)
+            self._pending -= flushed
+            if self._dropped:
+                logger.warning(f"Ingest buffer overflowed, dropped {self._dropped} oldest rows.")
+                self._dropped = 0
+            if not batches:
+                return 0
+            statements = [(self.STATEMENTS[table], rows) for table, rows in batches]
+            statements.extend(self._rollup_deltas(dict(batches)))
+            try:
+                await db.execute_batches(statements)
+            except BaseException:
+                for table, rows in batches:
+                    q = self._rows[table]
+                    room = q.maxlen - len(q)
+                    q.extendleft(reversed(rows[-room:] if room else []))
+                    self._pending += min(len(rows), room)
+                raise
+            return flushed
+
+    @staticmethod
+    def _rollup_deltas(batches: dict[str, list]) -> list:
+        """Collapse buffered message/voice rows into per-(guild, user, channel, day) rollup increments."""
+        def _day(ts):
+            return datetime.fromtimestamp(ts, timezone.utc).strftime('%Y-%m-%d')
+
+        msg_deltas: dict[tuple, int] = {}
+        for user_id, channel_id, guild_id, ts, *_ in batches.get('message_logs', ()):
+            key = (guild_id, user_id, channel_id, _day(ts))
+            msg_deltas[key] = msg_deltas.get(key, 0) + 1
+        voice_deltas: dict[tuple, int] = {}
+        for user_id, channel_id, guild_id, start, _end, duration in batches.get('voice_sessions', ()):
+            key = (guild_id, user_id, channel_id, _day(start))
+            voice_deltas[key] = voice_deltas.get(key, 0) + duration
+
+        out = []
+        if msg_deltas:
+            out.append((IngestBuffer.MESSAGE_ROLLUP_UPSERT, [(*k, v) for k, v in msg_deltas.items()]))
+        if voice_deltas:
+            out.append((IngestBuffer.VOICE_ROLLUP_UPSERT, [(*k, v) for k, v in voice_deltas.items()]))
+        return out
+
 
 # =========================================================================
 # TRACKER CARD GENERATOR (Playwright)
@@ -136,20 +311,15 @@ class TrackingDB:
 
 class TrackerCardGenerator:
     def __init__(self):
-        self.browser = None
-        self.playwright = None
-        self._page_semaphore = asyncio.Semaphore(3)
+        self.renderer = None
         self._templates: dict[str, str] = {}
 
-    async def initialize(self):
-        if not PLAYWRIGHT_AVAILABLE:
+    async def initialize(self, renderer):
+        if not PLAYWRIGHT_AVAILABLE or renderer is None:
             logger.warning("Playwright not available for tracker cards.")
             return False
         try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch(
-                args=['--font-render-hinting=none', '--disable-lcd-text', '--enable-font-antialiasing']
-            )
+            self.renderer = renderer
             for path in TEMPLATE_DIR.glob("tracker_*.html"):
                 self._templates[path.stem] = path.read_text(encoding='utf-8')
             logger.info(f"Tracker card generator initialized ({len(self._templates)} templates).")
@@ -159,14 +329,11 @@ class TrackerCardGenerator:
             return False
 
     async def close(self):
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        self.renderer = None
 
     async def render(self, template_name: str, data: dict, width: int = 640) -> typing.Optional[io.BytesIO]:
         template = self._templates.get(template_name)
-        if not template or not self.browser:
+        if not template or not self.renderer:
             return None
         try:
             html = template.format(**data, font_path=FONT_PATH)
@@ -174,19 +341,9 @@ class TrackerCardGenerator:
             logger.error(f"Template placeholder missing: {e}")
             return None
 
-        async with self._page_semaphore:
-            page = await self.browser.new_page(
-                viewport={'width': width, 'height': 500},
-                device_scale_factor=2
-            )
-            try:
-                await page.set_content(html)
-                await page.wait_for_timeout(150)
-                body_height = await page.evaluate('document.body.scrollHeight')
-                await page.set_viewport_size({'width': width, 'height': body_height + 20})
-                screenshot = await page.screenshot(type='png')
-            finally:
-                await page.close()
+        screenshot = await self.renderer.render(html, width=width, height=500, wait_ms=150)
+        if not screenshot:
+            return None
         return io.BytesIO(screenshot)
 
 
@@ -447,6 +604,8 @@ class UserTracker(commands.Cog):
         self.db = TrackingDB()
         self.card_gen = TrackerCardGenerator()
         self.session = None
+        self.ingest = IngestBuffer()
+        self._ingest_flush_task: typing.Optional[asyncio.Task] = None
         self._voice_join_times: dict[tuple[int, int], tuple[int, int]] = {}
 
     async def cog_load(self):
@@ -456,20 +615,38 @@ class UserTracker(commands.Cog):
     async def _async_setup(self):
         await self.bot.wait_until_ready()
         await self.db.connect()
-        await self.card_gen.initialize()
+        await self.card_gen.initialize(self.bot.render_service)
         await self._reseed_voice_sessions()
         self.data_retention_task.start()
         self.voice_checkpoint_task.start()
+        self.ingest_flush_task.start()
 
     async def cog_unload(self):
         if self.session:
             await self.session.close()
         self.data_retention_task.cancel()
         self.voice_checkpoint_task.cancel()
+        # stop() lets an in-progress flush finish; the final flush below waits on its lock
+        self.ingest_flush_task.stop()
         await self._flush_voice_sessions()
+        await self._flush_ingest()
         await self.card_gen.close()
         await self.db.close()
 
+    # --- WRITE-BEHIND INGEST ---
+
+    def _queue_row(self, table: str, row: tuple):
+        """Buffer a row for the next batched flush, flushing early when the buffer fills up."""
+        self.ingest.add(table, row)
+        if len(self.ingest) >= INGEST_FLUSH_ROWS and (self._ingest_flush_task is None or self._ingest_flush_task.done()):
+            self._ingest_flush_task = asyncio.create_task(self._flush_ingest())
+
+    async def _flush_ingest(self):
+        try:
+            await self.ingest.flush(self.db)
+        except Exception as e:
+            await self.bot.error_reporter.report("Tracker", f"ingest flush: {e}")
+
     # --- VOICE SESSION HELPERS ---
 
     async def _reseed_voice_sessions(self):
@@ -489,10 +666,7 @@ class UserTracker(commands.Cog):
         for (uid, gid), (join_ts, cid) in self._voice_join_times.items():
             duration = now - join_ts
             if duration > 5:
-                await self.db.execute(
-                    "INSERT INTO voice_sessions (user_id, channel_id, guild_id, start_time, end_time, duration) VALUES (?,?,?,?,?,?)",
-                    (uid, cid, gid, join_ts, now, duration)
-                )
+                self.ingest.add('voice_sessions', (uid, cid, gid, join_ts, now, duration))
         self._voice_join_times.clear()
 
     # --- HELPERS ---
@@ -619,24 +793,26 @@ class UserTracker(commands.Cog):
             cutoff = int((now_dt - timedelta(days=days)).timestamp())
         prev_cutoff = int((now_dt - timedelta(days=days * 2)).timestamp()) if days < 3650 else 0
 
+        msg_src, msg_params = self.db.rollup_source('messages', guild.id, cutoff)
+        voice_src, voice_params = self.db.rollup_source('voice', guild.id, cutoff)
+
         # Totals
-        row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND timestamp > ?", (guild.id, cutoff))
+        row = await self.db.fetch_one(f"SELECT coalesce(sum(msgs), 0), count(distinct user_id) FROM ({msg_src})", msg_params)
         total_msgs = row[0] or 0
+        active_users = row[1] or 0
 
-        prev_row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND timestamp BETWEEN ? AND ?", (guild.id, prev_cutoff, cutoff))
+        prev_src, prev_params = self.db.rollup_source('messages', guild.id, prev_cutoff - 1, until=cutoff)
+        prev_row = await self.db.fetch_one(f"SELECT coalesce(sum(msgs), 0) FROM ({prev_src})", prev_params)
         prev_msgs = prev_row[0] or 0
         if prev_msgs > 0:
             growth = int(((total_msgs - prev_msgs) / prev_msgs) * 100)
         else:
             growth = 100 if total_msgs > 0 else 0
 
-        active_row = await self.db.fetch_one("SELECT count(distinct user_id) FROM message_logs WHERE guild_id = ? AND timestamp > ?", (guild.id, cutoff))
-        active_users = active_row[0] or 0
-
         new_row = await self.db.fetch_one("SELECT count(*) FROM member_events WHERE guild_id = ? AND event_type = 'join' AND timestamp > ?", (guild.id, cutoff))
         new_members = new_row[0] or 0
 
-        voice_row = await self.db.fetch_one("SELECT coalesce(sum(duration), 0) FROM voice_sessions WHERE guild_id = ? AND start_time > ?", (guild.id, cutoff))
+        voice_row = await self.db.fetch_one(f"SELECT coalesce(sum(secs), 0) FROM ({voice_src})", voice_params)
         voice_secs = voice_row[0] or 0
         # Add in-progress voice sessions from memory
         for (uid, gid), (join_ts, cid) in self._voice_join_times.items():
@@ -645,8 +821,8 @@ class UserTracker(commands.Cog):
 
         # Daily chart data
         daily_rows = await self.db.fetch_all(
-            "SELECT date(timestamp, 'unixepoch') as day, count(*) as msgs, count(distinct user_id) as contribs FROM message_logs WHERE guild_id = ? AND timestamp > ? GROUP BY day ORDER BY day",
-            (guild.id, cutoff)
+            f"SELECT day, sum(msgs) as msgs, count(distinct user_id) as contribs FROM ({msg_src}) GROUP BY day ORDER BY day",
+            msg_params
         )
         if days >= 3650 and daily_rows:
             first_date = datetime.strptime(daily_rows[0][0], '%Y-%m-%d').replace(tzinfo=timezone.utc)
@@ -659,7 +835,7 @@ class UserTracker(commands.Cog):
         daily = self._reduce_data(daily, max_points=60)
 
         # Top members
-        u_rows = await self.db.fetch_all("SELECT user_id, count(*) as c FROM message_logs WHERE guild_id = ? AND timestamp > ? GROUP BY user_id ORDER BY c DESC LIMIT 5", (guild.id, cutoff))
+        u_rows = await self.db.fetch_all(f"SELECT user_id, sum(msgs) as c FROM ({msg_src}) GROUP BY user_id ORDER BY c DESC LIMIT 5", msg_params)
         members_html = ""
         for i, r in enumerate(u_rows):
             u = guild.get_member(r[0])
@@ -669,7 +845,7 @@ class UserTracker(commands.Cog):
             members_html += f'<div class="list-item"><span class="rank">#{i+1}</span><span class="item-name">{name}</span><span class="item-value">{r[1]:,}</span></div>\n'
 
         # Top channels
-        c_rows = await self.db.fetch_all("SELECT channel_id, count(*) as c FROM message_logs WHERE guild_id = ? AND timestamp > ? GROUP BY channel_id ORDER BY c DESC LIMIT 5", (guild.id, cutoff))
+        c_rows = await self.db.fetch_all(f"SELECT channel_id, sum(msgs) as c FROM ({msg_src}) GROUP BY channel_id ORDER BY c DESC LIMIT 5", msg_params)
         channels_html = ""
         for i, r in enumerate(c_rows):
             ch = self.get_channel_safe(guild, r[0])
@@ -717,13 +893,11 @@ class UserTracker(commands.Cog):
 
         # Message counts for 1d/7d/14d/30d
         msg_counts = {}
-        for period, d in [('1d', 1), ('7d', 7), ('14d', 14), ('30d', 30)]:
-            c = now_ts - d * 86400
-            row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND user_id = ? AND timestamp > ?", (guild.id, user.id, c))
+        for period, d in [('1d', 1), ('7d', 7), ('14d', 14), ('30d', 30), ('all', None)]:
+            c = now_ts - d * 86400 if d else 0
+            src, params = self.db.rollup_source('messages', guild.id, c, user_id=user.id)
+            row = await self.db.fetch_one(f"SELECT coalesce(sum(msgs), 0) FROM ({src})", params)
             msg_counts[period] = row[0] or 0
-        # All-time message count
-        all_msg_row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND user_id = ?", (guild.id, user.id))
-        msg_counts['all'] = all_msg_row[0] or 0
 
         # Voice time for 1d/7d/14d/30d (include in-progress session from memory)
         active_voice = self._voice_join_times.get((user.id, guild.id))
@@ -731,26 +905,30 @@ class UserTracker(commands.Cog):
         voice_times = {}
         for period, d in [('1d', 1), ('7d', 7), ('14d', 14), ('30d', 30)]:
             c = now_ts - d * 86400
-            row = await self.db.fetch_one("SELECT coalesce(sum(duration), 0) FROM voice_sessions WHERE guild_id = ? AND user_id = ? AND start_time > ?", (guild.id, user.id, c))
+            src, params = self.db.rollup_source('voice', guild.id, c, user_id=user.id)
+            row = await self.db.fetch_one(f"SELECT coalesce(sum(secs), 0) FROM ({src})", params)
             v = row[0] or 0
             if active_voice and active_voice[0] > c:
                 v += active_dur
             voice_times[period] = v
         # All-time voice time
-        all_voice_row = await self.db.fetch_one("SELECT coalesce(sum(duration), 0) FROM voice_sessions WHERE guild_id = ? AND user_id = ?", (guild.id, user.id))
+        src, params = self.db.rollup_source('voice', guild.id, 0, user_id=user.id)
+        all_voice_row = await self.db.fetch_one(f"SELECT coalesce(sum(secs), 0) FROM ({src})", params)
         voice_times['all'] = (all_voice_row[0] or 0) + active_dur
 
         # Message rank
+        msg_src, msg_params = self.db.rollup_source('messages', guild.id, cutoff)
         rank_row = await self.db.fetch_one(
-            "SELECT rank FROM (SELECT user_id, ROW_NUMBER() OVER (ORDER BY count(*) DESC) as rank FROM message_logs WHERE guild_id = ? AND timestamp > ? GROUP BY user_id) WHERE user_id = ?",
-            (guild.id, cutoff, user.id)
+            f"SELECT rank FROM (SELECT user_id, ROW_NUMBER() OVER (ORDER BY sum(msgs) DESC) as rank FROM ({msg_src}) GROUP BY user_id) WHERE user_id = ?",
+            (*msg_params, user.id)
         )
         msg_rank = f"#{rank_row[0]}" if rank_row else "N/A"
 
         # Voice rank (merge DB + in-progress sessions)
+        voice_src, voice_params = self.db.rollup_source('voice', guild.id, cutoff)
         all_voice = await self.db.fetch_all(
-            "SELECT user_id, sum(duration) as total FROM voice_sessions WHERE guild_id = ? AND start_time > ? GROUP BY user_id",
-            (guild.id, cutoff)
+            f"SELECT user_id, sum(secs) as total FROM ({voice_src}) GROUP BY user_id",
+            voice_params
         )
         voice_totals = {r[0]: r[1] for r in all_voice}
         for (uid, gid), (jts, _) in self._voice_join_times.items():
@@ -766,7 +944,8 @@ class UserTracker(commands.Cog):
             voice_rank_class = "no-data"
 
         # Top channels
-        ch_rows = await self.db.fetch_all("SELECT channel_id, count(*) as c FROM message_logs WHERE guild_id = ? AND user_id = ? AND timestamp > ? GROUP BY channel_id ORDER BY c DESC LIMIT 6", (guild.id, user.id, cutoff))
+        user_src, user_params = self.db.rollup_source('messages', guild.id, cutoff, user_id=user.id)
+        ch_rows = await self.db.fetch_all(f"SELECT channel_id, sum(msgs) as c FROM ({user_src}) GROUP BY channel_id ORDER BY c DESC LIMIT 6", user_params)
         channels_html = ""
         for r in ch_rows:
             ch = self.get_channel_safe(guild, r[0])
@@ -779,12 +958,13 @@ class UserTracker(commands.Cog):
 
         # Activity sparkline (daily messages + voice for the period)
         daily_rows = await self.db.fetch_all(
-            "SELECT date(timestamp, 'unixepoch') as day, count(*) as msgs FROM message_logs WHERE guild_id = ? AND user_id = ? AND timestamp > ? GROUP BY day ORDER BY day",
-            (guild.id, user.id, cutoff)
+            f"SELECT day, sum(msgs) as msgs FROM ({user_src}) GROUP BY day ORDER BY day",
+            user_params
         )
+        user_voice_src, user_voice_params = self.db.rollup_source('voice', guild.id, cutoff, user_id=user.id)
         voice_daily_rows = await self.db.fetch_all(
-            "SELECT date(start_time, 'unixepoch') as day, coalesce(sum(duration), 0) as secs FROM voice_sessions WHERE guild_id = ? AND user_id = ? AND start_time > ? GROUP BY day ORDER BY day",
-            (guild.id, user.id, cutoff)
+            f"SELECT day, coalesce(sum(secs), 0) as secs FROM ({user_voice_src}) GROUP BY day ORDER BY day",
+            user_voice_params
         )
         # Determine chart range
         if days >= 3650 and daily_rows:
@@ -863,21 +1043,21 @@ class UserTracker(commands.Cog):
     async def gen_channel_overview(self, guild, channel, days):
         cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
 
-        row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ?", (guild.id, channel.id, cutoff))
-        total_msgs = row[0] or 0
+        src, params = self.db.rollup_source('messages', guild.id, cutoff, channel_id=channel.id)
 
-        contrib_row = await self.db.fetch_one("SELECT count(distinct user_id) FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ?", (guild.id, channel.id, cutoff))
-        contributors = contrib_row[0] or 0
+        row = await self.db.fetch_one(f"SELECT coalesce(sum(msgs), 0), count(distinct user_id) FROM ({src})", params)
+        total_msgs = row[0] or 0
+        contributors = row[1] or 0
 
         # Daily chart
         daily_rows = await self.db.fetch_all(
-            "SELECT date(timestamp, 'unixepoch') as day, count(*) as msgs FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ? GROUP BY day ORDER BY day",
-            (guild.id, channel.id, cutoff)
+            f"SELECT day, sum(msgs) as msgs FROM ({src}) GROUP BY day ORDER BY day",
+            params
         )
         daily = self._fill_daily(daily_rows, days)
 
         # Top contributors
-        u_rows = await self.db.fetch_all("SELECT user_id, count(*) as c FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ? GROUP BY user_id ORDER BY c DESC LIMIT 8", (guild.id, channel.id, cutoff))
+        u_rows = await self.db.fetch_all(f"SELECT user_id, sum(msgs) as c FROM ({src}) GROUP BY user_id ORDER BY c DESC LIMIT 8", params)
         max_c = u_rows[0][1] if u_rows else 1
         contributors_html = ""
         for i, r in enumerate(u_rows):
@@ -1000,9 +1180,10 @@ class UserTracker(commands.Cog):
         cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
 
         # Message leaderboard
+        msg_src, msg_params = self.db.rollup_source('messages', guild.id, cutoff)
         msg_rows = await self.db.fetch_all(
-            "SELECT user_id, count(*) as c FROM message_logs WHERE guild_id = ? AND timestamp > ? GROUP BY user_id ORDER BY c DESC LIMIT 10",
-            (guild.id, cutoff)
+            f"SELECT user_id, sum(msgs) as c FROM ({msg_src}) GROUP BY user_id ORDER BY c DESC LIMIT 10",
+            msg_params
         )
         max_msgs = msg_rows[0][1] if msg_rows else 1
         msg_lb_html = ""
@@ -1026,9 +1207,10 @@ class UserTracker(commands.Cog):
             msg_lb_html = '<div class="no-data">No message data yet</div>'
 
         # Voice leaderboard (merge DB + in-progress sessions)
+        voice_src, voice_params = self.db.rollup_source('voice', guild.id, cutoff)
         voice_rows_raw = await self.db.fetch_all(
-            "SELECT user_id, sum(duration) as total FROM voice_sessions WHERE guild_id = ? AND start_time > ? GROUP BY user_id ORDER BY total DESC",
-            (guild.id, cutoff)
+            f"SELECT user_id, sum(secs) as total FROM ({voice_src}) GROUP BY user_id ORDER BY total DESC",
+            voice_params
         )
         now_ts = int(datetime.now(timezone.utc).timestamp())
         voice_totals = {r[0]: r[1] for r in voice_rows_raw}
@@ -1074,23 +1256,26 @@ class UserTracker(commands.Cog):
     async def gen_comparison(self, guild, user1, user2, days):
         cutoff = int((datetime.now(timezone.utc) - timedelta(days=days)).timestamp())
         now_dt = datetime.now(timezone.utc)
+        guild_src, guild_params = self.db.rollup_source('messages', guild.id, cutoff)
 
         async def _user_stats(uid):
-            msg_row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND user_id = ? AND timestamp > ?", (guild.id, uid, cutoff))
+            user_src, user_params = self.db.rollup_source('messages', guild.id, cutoff, user_id=uid)
+            msg_row = await self.db.fetch_one(f"SELECT coalesce(sum(msgs), 0) FROM ({user_src})", user_params)
             msgs = msg_row[0] or 0
-            voice_row = await self.db.fetch_one("SELECT coalesce(sum(duration), 0) FROM voice_sessions WHERE guild_id = ? AND user_id = ? AND start_time > ?", (guild.id, uid, cutoff))
+            voice_src, voice_params = self.db.rollup_source('voice', guild.id, cutoff, user_id=uid)
+            voice_row = await self.db.fetch_one(f"SELECT coalesce(sum(secs), 0) FROM ({voice_src})", voice_params)
             voice_secs = voice_row[0] or 0
             # Include in-progress voice session
             active = self._voice_join_times.get((uid, guild.id))
             if active and active[0] > cutoff:
                 voice_secs += int(now_dt.timestamp()) - active[0]
-            rank_row = await self.db.fetch_one("SELECT rank FROM (SELECT user_id, ROW_NUMBER() OVER (ORDER BY count(*) DESC) as rank FROM message_logs WHERE guild_id = ? AND timestamp > ? GROUP BY user_id) WHERE user_id = ?", (guild.id, cutoff, uid))
+            rank_row = await self.db.fetch_one(f"SELECT rank FROM (SELECT user_id, ROW_NUMBER() OVER (ORDER BY sum(msgs) DESC) as rank FROM ({guild_src}) GROUP BY user_id) WHERE user_id = ?", (*guild_params, uid))
             rank = rank_row[0] if rank_row else None
             react_row = await self.db.fetch_one("SELECT count(*) FROM reaction_logs WHERE guild_id = ? AND target_message_author_id = ? AND timestamp > ?", (guild.id, uid, cutoff))
             reacts = react_row[0] or 0
-            daily_rows = await self.db.fetch_all("SELECT date(timestamp, 'unixepoch') as day, count(*) as msgs FROM message_logs WHERE guild_id = ? AND user_id = ? AND timestamp > ? GROUP BY day ORDER BY day", (guild.id, uid, cutoff))
+            daily_rows = await self.db.fetch_all(f"SELECT day, sum(msgs) as msgs FROM ({user_src}) GROUP BY day ORDER BY day", user_params)
             daily = self._fill_daily(daily_rows, days)
-            ch_rows = await self.db.fetch_all("SELECT channel_id, count(*) as c FROM message_logs WHERE guild_id = ? AND user_id = ? AND timestamp > ? GROUP BY channel_id ORDER BY c DESC LIMIT 4", (guild.id, uid, cutoff))
+            ch_rows = await self.db.fetch_all(f"SELECT channel_id, sum(msgs) as c FROM ({user_src}) GROUP BY channel_id ORDER BY c DESC LIMIT 4", user_params)
             return {'msgs': msgs, 'voice_secs': voice_secs, 'rank': rank, 'reacts': reacts, 'daily': daily, 'channels': ch_rows}
 
         s1 = await _user_stats(user1.id)
@@ -1164,14 +1349,14 @@ class UserTracker(commands.Cog):
         now_dt = datetime.now(timezone.utc)
 
         async def _ch_stats(cid):
-            msg_row = await self.db.fetch_one("SELECT count(*) FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ?", (guild.id, cid, cutoff))
+            src, params = self.db.rollup_source('messages', guild.id, cutoff, channel_id=cid)
+            msg_row = await self.db.fetch_one(f"SELECT coalesce(sum(msgs), 0), count(distinct user_id) FROM ({src})", params)
             msgs = msg_row[0] or 0
-            contrib_row = await self.db.fetch_one("SELECT count(distinct user_id) FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ?", (guild.id, cid, cutoff))
-            contribs = contrib_row[0] or 0
+            contribs = msg_row[1] or 0
             avg_day = round(msgs / max(days, 1), 1)
-            daily_rows = await self.db.fetch_all("SELECT date(timestamp, 'unixepoch') as day, count(*) as msgs FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ? GROUP BY day ORDER BY day", (guild.id, cid, cutoff))
+            daily_rows = await self.db.fetch_all(f"SELECT day, sum(msgs) as msgs FROM ({src}) GROUP BY day ORDER BY day", params)
             daily = self._fill_daily(daily_rows, days)
-            top_rows = await self.db.fetch_all("SELECT user_id, count(*) as c FROM message_logs WHERE guild_id = ? AND channel_id = ? AND timestamp > ? GROUP BY user_id ORDER BY c DESC LIMIT 4", (guild.id, cid, cutoff))
+            top_rows = await self.db.fetch_all(f"SELECT user_id, sum(msgs) as c FROM ({src}) GROUP BY user_id ORDER BY c DESC LIMIT 4", params)
             return {'msgs': msgs, 'contribs': contribs, 'avg_day': avg_day, 'daily': daily, 'top': top_rows}
 
         s1 = await _ch_stats(ch1.id)
@@ -1249,6 +1434,14 @@ class UserTracker(commands.Cog):
         else:
             await interaction.followup.send("Failed to generate stats card. Playwright may not be available.", ephemeral=True)
 
+    @commands.command(name="tracker_backfill")
+    @commands.is_owner()
+    async def tracker_backfill(self, ctx: commands.Context):
+        """Rebuild the daily rollup tables from the raw tracker logs."""
+        await self._flush_ingest()
+        msg_rows, voice_rows = await self.db.rebuild_rollups()
+        await ctx.send(f"Rebuilt tracker rollups: {msg_rows:,} message rows, {voice_rows:,} voice rows.")
+
     # --- LISTENERS ---
 
     @commands.Cog.listener()
@@ -1263,26 +1456,16 @@ class UserTracker(commands.Cog):
             delta = (message.created_at - message.reference.resolved.created_at).total_seconds()
             reply_latency = int(delta) if delta > 0 else None
 
-        async with self.db.transaction() as conn:
-            await conn.execute(
-                "INSERT INTO message_logs (user_id, channel_id, guild_id, timestamp, has_attachment, is_reply, reply_latency, length) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                (message.author.id, message.channel.id, message.guild.id, ts, bool(message.attachments), message.reference is not None, reply_latency, len(message.content))
-            )
-            # Social interactions (mentions)
-            if message.mentions:
-                for mention in message.mentions:
-                    if not mention.bot and mention.id != message.author.id:
-                        await conn.execute(
-                            "INSERT INTO social_interactions (user_id, target_user_id, guild_id, channel_id, timestamp, interaction_type) VALUES (?, ?, ?, ?, ?, ?)",
-                            (message.author.id, mention.id, message.guild.id, message.channel.id, ts, "mention")
-                        )
-            # Custom emoji tracking
-            custom_emojis = re.findall(r'<a?:([\w-]+):(\d+)>', message.content)
-            for name, eid in custom_emojis:
-                await conn.execute(
-                    "INSERT INTO emoji_logs (guild_id, user_id, emoji_id, emoji_name, timestamp, usage_type) VALUES (?, ?, ?, ?, ?, ?)",
-                    (message.guild.id, message.author.id, int(eid), name, ts, "text")
-                )
+        self._queue_row('message_logs', (message.author.id, message.channel.id, message.guild.id, ts, bool(message.attachments), message.reference is not None, reply_latency, len(message.content)))
+        # Social interactions (mentions)
+        if message.mentions:
+            for mention in message.mentions:
+                if not mention.bot and mention.id != message.author.id:
+                    self._queue_row('social_interactions', (message.author.id, mention.id, message.guild.id, message.channel.id, ts, "mention"))
+        # Custom emoji tracking
+        custom_emojis = re.findall(r'<a?:([\w-]+):(\d+)>', message.content)
+        for name, eid in custom_emojis:
+            self._queue_row('emoji_logs', (message.guild.id, message.author.id, int(eid), name, ts, "text"))
 
     @commands.Cog.listener()
     async def on_reaction_add(self, reaction, user):
@@ -1294,17 +1477,11 @@ class UserTracker(commands.Cog):
 
         # Log ALL reactions in reaction_logs for social impact tracking
         emoji_name = str(reaction.emoji) if isinstance(reaction.emoji, str) else reaction.emoji.name
-        await self.db.execute(
-            "INSERT INTO reaction_logs (user_id, target_message_author_id, guild_id, emoji_name, timestamp) VALUES (?, ?, ?, ?, ?)",
-            (user.id, author_id, guild_id, emoji_name, ts)
-        )
+        self._queue_row('reaction_logs', (user.id, author_id, guild_id, emoji_name, ts))
 
         # Log custom emojis in emoji_logs for emoji overview
         if isinstance(reaction.emoji, (discord.Emoji, discord.PartialEmoji)) and reaction.emoji.id:
-            await self.db.execute(
-                "INSERT INTO emoji_logs (guild_id, user_id, emoji_id, emoji_name, timestamp, usage_type) VALUES (?, ?, ?, ?, ?, ?)",
-                (guild_id, user.id, reaction.emoji.id, reaction.emoji.name, ts, "reaction")
-            )
+            self._queue_row('emoji_logs', (guild_id, user.id, reaction.emoji.id, reaction.emoji.name, ts, "reaction"))
 
     @commands.Cog.listener()
     async def on_voice_state_update(self, member: discord.Member, before: discord.VoiceState, after: discord.VoiceState):
@@ -1320,10 +1497,7 @@ class UserTracker(commands.Cog):
                 join_ts, channel_id = prev
                 duration = now - join_ts
                 if duration > 5:
-                    await self.db.execute(
-                        "INSERT INTO voice_sessions (user_id, channel_id, guild_id, start_time, end_time, duration) VALUES (?,?,?,?,?,?)",
-                        (member.id, channel_id, member.guild.id, join_ts, now, duration)
-                    )
+                    self._queue_row('voice_sessions', (member.id, channel_id, member.guild.id, join_ts, now, duration))
                     logger.info(f"Voice session saved: user={member.id} dur={duration}s ({duration//60}m) ch={channel_id}")
             else:
                 # User left VC but we had no join record — they were in VC before bot started and weren't reseeded, or a restart lost it
@@ -1364,6 +1538,11 @@ class UserTracker(commands.Cog):
         except Exception as e:
             await self.bot.error_reporter.report("Tracker", f"data_retention_task: {e}")
 
+    @tasks.loop(seconds=INGEST_FLUSH_SECONDS)
+    async def ingest_flush_task(self):
+        """Drain buffered message/reaction/emoji/voice rows into the DB in one transaction."""
+        await self._flush_ingest()
+
     @tasks.loop(minutes=5)
     async def voice_checkpoint_task(self):
         """Periodically save active voice sessions to DB so data survives crashes."""
@@ -1375,10 +1554,7 @@ class UserTracker(commands.Cog):
                 if duration < 30:
                     continue
                 # Write a session up to now, then reset the join time to now
-                await self.db.execute(
-                    "INSERT INTO voice_sessions (user_id, channel_id, guild_id, start_time, end_time, duration) VALUES (?,?,?,?,?,?)",
-                    (uid, cid, gid, join_ts, now, duration)
-                )
+                self._queue_row('voice_sessions', (uid, cid, gid, join_ts, now, duration))
                 self._voice_join_times[(uid, gid)] = (now, cid)
                 saved += 1
             if saved:
@@ -114,7 +114,7 @@ class AdjustPointsModal(discord.ui.Modal, title="Adjust User Points"):
             # Get global data
             global_data = self.main_cog.get_global_data()
             stats = self.main_cog.get_user_stats(user_id_val) # Global
-            score_data = global_data.setdefault("scores", {}).setdefault(str(user_id_val), {"score": 0, "timestamp": None}) # Global
+            score_data = self.main_cog.get_score_entry(user_id_val) # Global
             
             # Ensure score_data is a dict (migration from old int format)
             if isinstance(score_data, int):
@@ -153,6 +153,7 @@ class UserActionModal(discord.ui.Modal):
                 # Purge from global data
                 global_data.get("scores", {}).pop(user_id_str, None)
                 global_data.get("user_stats", {}).pop(user_id_str, None)
+                self.main_cog.mark_user_dirty(user_id_str)
                 message = f"✅ All trivia data purged for user `{user_id_val}`."
             elif self.action == 'block':
                 # Block in global data
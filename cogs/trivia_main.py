@@ -10,16 +10,13 @@ import random
 import copy
 import os
 import json
+import sqlite3
 import logging
 import typing
 import io
 from pathlib import Path
 
-try:
-    from playwright.async_api import async_playwright
-    PLAYWRIGHT_AVAILABLE = True
-except ImportError:
-    PLAYWRIGHT_AVAILABLE = False
+from utils.render_service import PLAYWRIGHT_AVAILABLE
 
 # =====================================================================================
 # UTILS & CONSTANTS
@@ -31,7 +28,8 @@ log_trivia = logging.getLogger("discord.trivia")
 # Gets the directory of this cog file (Vibey/cogs/)
 _cog_dir = os.path.dirname(os.path.abspath(__file__))
 # Joins it with '..' (parent folder) and the filename
-CONFIG_FILE_TRIVIA = os.path.join(_cog_dir, '..', 'trivia_config.json')
+CONFIG_FILE_TRIVIA = os.path.join(_cog_dir, '..', 'trivia_config.json')  # legacy, migrated into TRIVIA_DB_FILE
+TRIVIA_DB_FILE = os.path.join(_cog_dir, '..', 'trivia.db')
 TRIVIA_RECAP_TEMPLATE_PATH = Path(_cog_dir) / "templates" / "trivia_recap_card.html"
 
 # =====================================================================================
@@ -42,30 +40,21 @@ class TriviaImageGenerator:
     """Generates trivia recap card images using Playwright and HTML templates."""
 
     def __init__(self):
-        self.browser = None
-        self.playwright = None
+        self.renderer = None
 
-    async def initialize(self):
-        if not PLAYWRIGHT_AVAILABLE:
+    async def initialize(self, renderer):
+        if not PLAYWRIGHT_AVAILABLE or renderer is None:
             log_trivia.warning("Playwright not available. Recap cards will fall back to embed.")
             return False
-        try:
-            self.playwright = await async_playwright().start()
-            self.browser = await self.playwright.chromium.launch()
-            log_trivia.info("Trivia Image Generator initialized.")
-            return True
-        except Exception as e:
-            log_trivia.error(f"Failed to initialize trivia image generator: {e}")
-            return False
+        self.renderer = renderer
+        log_trivia.info("Trivia Image Generator initialized.")
+        return True
 
     async def close(self):
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        self.renderer = None
 
     async def generate_recap_image(self, data: dict) -> typing.Optional[io.BytesIO]:
-        if not self.browser:
+        if not self.renderer:
             return None
 
         try:
@@ -77,16 +66,15 @@ class TriviaImageGenerator:
 
             rendered_html = template.format(**data)
 
-            page = await self.browser.new_page(
-                viewport={'width': 1080, 'height': data['dynamic_height']},
-                device_scale_factor=2
+            screenshot = await self.renderer.render(
+                rendered_html,
+                width=1080,
+                height=data['dynamic_height'],
+                fit_content=False,
             )
-            await page.set_content(rendered_html)
-            await page.wait_for_timeout(100)
-
-            screenshot = await page.screenshot(type='png')
-            await page.close()
 
+            if not screenshot:
+                return None
             return io.BytesIO(screenshot)
 
         except Exception as e:
@@ -143,19 +131,182 @@ A new trivia gateway is posted daily at **midnight EST**. It is then reposted at
 class TriviaPostingError(Exception):
     pass
 
-def load_config_trivia():
-    if os.path.exists(CONFIG_FILE_TRIVIA):
+# --- TRIVIA STATE STORE ---
+# Per-user rows (monthly scores, all-time stats) are the bulk of the state, so
+# they are keyed individually; the rest of global_data is a small key/value set.
+TRIVIA_USER_SECTIONS = ("scores", "user_stats")
+
+_TRIVIA_SCHEMA = """
+CREATE TABLE IF NOT EXISTS config (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS global_data (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS guild_settings (guild_id TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS scores (user_id TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS user_stats (user_id TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS question_cache (id INTEGER PRIMARY KEY AUTOINCREMENT, value TEXT NOT NULL);
+"""
+
+
+class TriviaStore:
+    """SQLite persistence behind DailyTrivia.config.
+
+    The cog keeps working on the same nested dict it always has; save() writes
+    only the rows that differ from what was last persisted.  User rows are
+    re-serialized only for the user IDs passed in `dirty_users` (callers mark
+    users through get_user_stats / get_score_entry), unless the whole scores or
+    user_stats dict was replaced (monthly reset, admin wipe), which is detected
+    by identity and triggers a full diff of that section.  The question cache
+    is diffed as a queue, so popping the head and appending refills touches
+    only those rows.
+
+    load() and save() are blocking; the cog runs save() in the executor.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: typing.Optional[sqlite3.Connection] = None
+        self._config: dict[str, str] = {}
+        self._global: dict[str, str] = {}
+        self._guilds: dict[str, str] = {}
+        self._users: dict[str, dict[str, str]] = {name: {} for name in TRIVIA_USER_SECTIONS}
+        self._questions: list[tuple[int, str]] = []  # (row id, serialized), queue order
+        self._section_objs: dict[str, dict] = {}  # section -> dict object last persisted
+
+    @staticmethod
+    def _dump(value) -> str:
+        return json.dumps(value, sort_keys=True)
+
+    def load(self) -> dict:
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_TRIVIA_SCHEMA)
+        self._conn = conn
+
+        if conn.execute("SELECT 1 FROM global_data LIMIT 1").fetchone() is None and os.path.exists(CONFIG_FILE_TRIVIA):
+            self._import_json()
+
+        self._config = dict(conn.execute("SELECT key, value FROM config"))
+        self._global = dict(conn.execute("SELECT key, value FROM global_data"))
+        self._guilds = dict(conn.execute("SELECT guild_id, value FROM guild_settings"))
+        for name in TRIVIA_USER_SECTIONS:
+            self._users[name] = dict(conn.execute(f"SELECT user_id, value FROM {name}"))
+        self._questions = list(conn.execute("SELECT id, value FROM question_cache ORDER BY id"))
+
+        config = {k: json.loads(v) for k, v in self._config.items()}
+        global_data = {k: json.loads(v) for k, v in self._global.items()}
+        for name in TRIVIA_USER_SECTIONS:
+            global_data[name] = {uid: json.loads(v) for uid, v in self._users[name].items()}
+            self._section_objs[name] = global_data[name]
+        global_data["question_cache"] = [json.loads(v) for _, v in self._questions]
+        config["global_data"] = global_data
+        config["guild_settings"] = {gid: json.loads(v) for gid, v in self._guilds.items()}
+        return config
+
+    def _import_json(self):
+        """One-time migration from trivia_config.json."""
         try:
-            with open(CONFIG_FILE_TRIVIA, "r", encoding="utf-8") as f: return json.load(f)
+            with open(CONFIG_FILE_TRIVIA, "r", encoding="utf-8") as f:
+                config = json.load(f)
         except (json.JSONDecodeError, IOError) as e:
-            log_trivia.error(f"Error loading trivia config: {e}")
-    # Return structure with new global keys
-    return {"global_data": {}, "guild_settings": {}}
+            log_trivia.error(f"Error loading trivia config for migration: {e}")
+            return
+        config.setdefault("global_data", {})
+        config.setdefault("guild_settings", {})
+        self.save(config, None)
+        try:
+            os.replace(CONFIG_FILE_TRIVIA, f"{CONFIG_FILE_TRIVIA}.migrated")
+        except OSError as e:
+            log_trivia.warning(f"Could not rename trivia config after migration: {e}")
+        log_trivia.info(f"Migrated trivia config to {self.path}")
 
-def save_config_trivia(config):
-    try:
-        with open(CONFIG_FILE_TRIVIA, "w", encoding="utf-8") as f: json.dump(config, f, indent=4)
-    except IOError as e: log_trivia.error(f"Error saving trivia config: {e}")
+    @staticmethod
+    def _diff_keyed(old: dict, new: dict, dump) -> tuple[list, list, dict]:
+        upserts, mirror = [], {}
+        for key, value in new.items():
+            key = str(key)
+            mirror[key] = dump(value)
+            if old.get(key) != mirror[key]:
+                upserts.append((key, mirror[key]))
+        deletes = [(key,) for key in old if key not in mirror]
+        return upserts, deletes, mirror
+
+    def save(self, config: dict, dirty_users: typing.Optional[set]):
+        """Persist changed rows.  dirty_users=None re-diffs every user."""
+        dump = self._dump
+        global_data = config.get("global_data", {})
+        ops = []
+
+        # Top-level keys other than the two sections
+        rest = {k: v for k, v in config.items() if k not in ("global_data", "guild_settings")}
+        upserts, deletes, config_mirror = self._diff_keyed(self._config, rest, dump)
+        ops += [("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)", upserts),
+                ("DELETE FROM config WHERE key = ?", deletes)]
+
+        small = {k: v for k, v in global_data.items() if k not in TRIVIA_USER_SECTIONS and k != "question_cache"}
+        upserts, deletes, global_mirror = self._diff_keyed(self._global, small, dump)
+        ops += [("INSERT OR REPLACE INTO global_data (key, value) VALUES (?, ?)", upserts),
+                ("DELETE FROM global_data WHERE key = ?", deletes)]
+
+        upserts, deletes, guild_mirror = self._diff_keyed(self._guilds, config.get("guild_settings", {}), dump)
+        ops += [("INSERT OR REPLACE INTO guild_settings (guild_id, value) VALUES (?, ?)", upserts),
+                ("DELETE FROM guild_settings WHERE guild_id = ?", deletes)]
+
+        user_mirrors = {}
+        for name in TRIVIA_USER_SECTIONS:
+            pool = global_data.get(name)
+            if pool is None:
+                pool = {}
+            old = self._users[name]
+            if dirty_users is None or pool is not self._section_objs.get(name):
+                upserts, deletes, mirror = self._diff_keyed(old, pool, dump)
+            else:
+                upserts, deletes, mirror = [], [], dict(old)
+                for uid in dirty_users:
+                    if uid in pool:
+                        value = dump(pool[uid])
+                        if old.get(uid) != value:
+                            upserts.append((uid, value))
+                        mirror[uid] = value
+                    elif uid in old:
+                        deletes.append((uid,))
+                        del mirror[uid]
+            ops += [(f"INSERT OR REPLACE INTO {name} (user_id, value) VALUES (?, ?)", upserts),
+                    (f"DELETE FROM {name} WHERE user_id = ?", deletes)]
+            user_mirrors[name] = (pool, mirror)
+
+        # Question cache: find how many rows were consumed from the head, append the rest
+        new_questions = [dump(q) for q in global_data.get("question_cache", [])]
+        old_questions = [v for _, v in self._questions]
+        consumed = 0
+        while consumed < len(old_questions):
+            tail = old_questions[consumed:]
+            if new_questions[:len(tail)] == tail:
+                break
+            consumed += 1
+        kept = self._questions[consumed:]
+        appended = new_questions[len(kept):]
+
+        conn = self._conn
+        with conn:
+            for sql, rows in ops:
+                if rows:
+                    conn.executemany(sql, rows)
+            if consumed:
+                conn.executemany("DELETE FROM question_cache WHERE id = ?", [(qid,) for qid, _ in self._questions[:consumed]])
+            new_rows = []
+            for value in appended:
+                cur = conn.execute("INSERT INTO question_cache (value) VALUES (?)", (value,))
+                new_rows.append((cur.lastrowid, value))
+
+        self._config, self._global, self._guilds = config_mirror, global_mirror, guild_mirror
+        for name, (pool, mirror) in user_mirrors.items():
+            self._users[name] = mirror
+            self._section_objs[name] = pool
+        self._questions = kept + new_rows
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
 
 async def is_trivia_admin_check(interaction: discord.Interaction) -> bool:
     cog = interaction.client.get_cog("DailyTrivia")
@@ -202,7 +353,7 @@ class DailyGatewayView(discord.ui.View):
                 recap_data = full_global_data_copy.get("yesterdays_recap_data")
 
             if recap_data and recap_data.get("daily_question"):
-                if PLAYWRIGHT_AVAILABLE and self.cog.image_generator.browser:
+                if PLAYWRIGHT_AVAILABLE and self.cog.image_generator.renderer:
                     recap_data_dict = await self.cog.build_recap_image_data(interaction.guild, recap_data, full_global_data_copy)
                     image_buffer = await self.cog.image_generator.generate_recap_image(recap_data_dict)
                     if image_buffer:
@@ -368,7 +519,7 @@ class DoubleOrNothingPromptView(discord.ui.View):
             # --- BUG FIX: Deduct points IMMEDIATELY when accepted ---
             # This prevents users from ghosting the second question to keep points
             global_data = self.cog.get_global_data()
-            score_data = global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})
+            score_data = self.cog.get_score_entry(interaction.user.id)
             stats = self.cog.get_user_stats(interaction.user.id)
             
             # Deduct the points they are risking right now
@@ -388,7 +539,7 @@ class DoubleOrNothingPromptView(discord.ui.View):
                 stats = self.cog.get_user_stats(interaction.user.id)
                 global_data = self.cog.get_global_data()
                 stats["all_time_score"] += self.points_won
-                global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})["score"] += self.points_won
+                self.cog.get_score_entry(interaction.user.id)["score"] += self.points_won
                 self.cog.config_is_dirty = True
             return await interaction.followup.send(content="❌ Could not get challenge question. Acceptance canceled and points refunded.", ephemeral=True)
         
@@ -399,7 +550,7 @@ class DoubleOrNothingPromptView(discord.ui.View):
                 # Refund if error occurs
                 self.cog.get_user_stats(interaction.user.id)["don_accepted"] -= 1
                 self.cog.get_user_stats(interaction.user.id)["all_time_score"] += self.points_won
-                global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})["score"] += self.points_won
+                self.cog.get_score_entry(interaction.user.id)["score"] += self.points_won
                 self.cog.config_is_dirty = True
                 
             return await interaction.followup.send(
@@ -417,7 +568,7 @@ class DoubleOrNothingPromptView(discord.ui.View):
                 # Refund if error occurs
                 self.cog.get_user_stats(interaction.user.id)["don_accepted"] -= 1
                 self.cog.get_user_stats(interaction.user.id)["all_time_score"] += self.points_won
-                global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})["score"] += self.points_won
+                self.cog.get_score_entry(interaction.user.id)["score"] += self.points_won
                 self.cog.config_is_dirty = True
             return await interaction.followup.send(
                 content="❌ Failed to create buttons. Your acceptance has been canceled and points returned!", 
@@ -458,7 +609,7 @@ class DoubleOrNothingPromptView(discord.ui.View):
                 stats = self.cog.get_user_stats(interaction.user.id)
                 global_data = self.cog.get_global_data()
                 stats["all_time_score"] += self.points_won
-                global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})["score"] += self.points_won
+                self.cog.get_score_entry(interaction.user.id)["score"] += self.points_won
                 self.cog.config_is_dirty = True
             
             # Update gateway to reflect refund
@@ -584,7 +735,7 @@ class DoubleOrNothingQuestionView(discord.ui.View):
             if is_correct:
                 stats["all_time_timestamp"] = answer_time.isoformat()
             
-            score_data = global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})
+            score_data = self.cog.get_score_entry(interaction.user.id)
             score_data["score"] = score_data.get("score", 0) + pts_change
             # Only update timestamp when gaining points
             if is_correct:
@@ -669,9 +820,8 @@ class DoubleOrNothingQuestionView(discord.ui.View):
             stats["don_accepted"] -= 1
             
             # --- BUG FIX: REFUND POINTS ON REPORT ---
-            global_data = self.cog.get_global_data()
             stats["all_time_score"] += self.points_risked
-            global_data.setdefault("scores", {}).setdefault(str(interaction.user.id), {"score": 0, "timestamp": None})["score"] += self.points_risked
+            self.cog.get_score_entry(interaction.user.id)["score"] += self.points_risked
             # ----------------------------------------
             
             self.cog.config_is_dirty = True
@@ -945,10 +1095,12 @@ class DailyTrivia(commands.Cog, name="DailyTrivia"):
 
     def __init__(self, bot: commands.Bot):
         self.bot = bot
-        self.config = load_config_trivia()
+        self.store = TriviaStore(TRIVIA_DB_FILE)
+        self.config = self.store.load()
         self.session = None
         self.config_lock = asyncio.Lock()
         self.config_is_dirty = False
+        self._dirty_users: set[str] = set()  # user IDs whose score/stats rows need re-saving
         self.reveal_timestamps, self.don_reveal_timestamps, self.cheat_test_timestamps = {}, {}, {}
         self._name_cache: dict[str, str] = {}  # user_id_str -> display_name cache
         self.image_generator = TriviaImageGenerator()
@@ -957,7 +1109,7 @@ class DailyTrivia(commands.Cog, name="DailyTrivia"):
     async def setup_hook(self):
         await self.bot.wait_until_ready()
         self.session = aiohttp.ClientSession()
-        await self.image_generator.initialize()
+        await self.image_generator.initialize(self.bot.render_service)
         self.bot.add_view(DailyGatewayView(self))
 
     @commands.Cog.listener()
@@ -970,6 +1122,7 @@ class DailyTrivia(commands.Cog, name="DailyTrivia"):
     async def cog_unload(self):
         self.trivia_loop.cancel(); self.cache_refill_loop.cancel(); self.backup_save_loop.cancel()
         await self.save_config_now()
+        self.store.close()
         if self.session and not self.session.closed:
             await self.session.close()
         await self.image_generator.close()
@@ -1042,6 +1195,7 @@ class DailyTrivia(commands.Cog, name="DailyTrivia"):
         # This function is now global and doesn't need guild_id
         uid = str(user_id)
         global_data = self.get_global_data()
+        self._dirty_users.add(uid)  # callers mutate the returned dict in place
         
         # FIX: Added all_time_timestamp for tie-breaking
         default_stats = {
@@ -1069,18 +1223,33 @@ class DailyTrivia(commands.Cog, name="DailyTrivia"):
         
         return user_stats_ref
 
+    def get_score_entry(self, user_id) -> dict:
+        """Monthly score entry for a user, created if missing; marks the row for saving."""
+        uid = str(user_id)
+        self._dirty_users.add(uid)
+        return self.get_global_data().setdefault("scores", {}).setdefault(uid, {"score": 0, "timestamp": None})
+
+    def mark_user_dirty(self, user_id):
+        """Flag a user's rows for saving after changing them without the getters (e.g. deleting them)."""
+        self._dirty_users.add(str(user_id))
+        self.config_is_dirty = True
+
     async def save_config_now(self):
-        json_str = None
         async with self.config_lock:
-            if self.config_is_dirty:
-                # Serialize to JSON string in executor to avoid blocking the event loop.
-                # json.dumps produces an immutable string, so no deepcopy needed.
-                # (self.config is ~275K and serialization can stall the Pi for 500ms+)
-                json_str = await self.bot.loop.run_in_executor(None, lambda: json.dumps(self.config, indent=4))
-                self.config_is_dirty = False
-        if json_str:
-            await self.bot.loop.run_in_executor(None, lambda: Path(CONFIG_FILE_TRIVIA).write_text(json_str, encoding="utf-8"))
-            log_trivia.debug("Trivia config saved to disk.")
+            if not self.config_is_dirty:
+                return
+            dirty_users, self._dirty_users = self._dirty_users, set()
+            self.config_is_dirty = False
+            try:
+                # Only rows that changed are written, and only users touched since the
+                # last save are re-serialized, so this no longer scales with the whole
+                # config (the old full JSON dump stalled the Pi for 500ms+).
+                await self.bot.loop.run_in_executor(None, self.store.save, self.config, dirty_users)
+            except Exception:
+                self._dirty_users |= dirty_users
+                self.config_is_dirty = True
+                raise
+        log_trivia.debug("Trivia state saved.")
 
     async def is_user_admin(self, interaction: discord.Interaction) -> bool:
         if await self.bot.is_owner(interaction.user) or self.bot.is_bot_admin(interaction.user): return True
@@ -1859,7 +2028,7 @@ class DailyTrivia(commands.Cog, name="DailyTrivia"):
                     stats["current_streak"] = 0
                     self.reveal_timestamps.pop((interaction.guild.id, interaction.user.id), None)
 
-                score_data = global_data.setdefault("scores", {}).setdefault(user_id_str, {"score": 0, "timestamp": None})
+                score_data = self.get_score_entry(user_id_str)
                 if isinstance(score_data, int): score_data = {"score": score_data, "timestamp": None}
                 score_data["score"] = score_data.get("score", 0) + points
                 stats["all_time_score"] = stats.get("all_time_score", 0) + points
@@ -1,4 +1,3 @@
-import copy
 import discord
 from discord.ext import commands
 from discord import app_commands
@@ -29,6 +28,7 @@ class VC(commands.Cog):
         self._save_lock = asyncio.Lock()
         self._save_pending = False 
         self._save_task = None
+        self._saved_rows = {}  # vc_id -> row tuple last written to active_vcs
         
         # Hub Messaging
         self._hub_message_locks = {}
@@ -234,6 +234,7 @@ class VC(commands.Cog):
         shared.logger.info("Restoring VC state from database...")
         try:
             self.active_vcs = await shared.load_active_vcs()
+            self._saved_rows = {vc_id: shared.vc_row(vc_id, data) for vc_id, data in self.active_vcs.items()}
 
             to_delete = []
             owner_map = {}
@@ -805,15 +806,25 @@ class VC(commands.Cog):
                 return
             self._save_pending = False
             try:
-                # FIX: Deep copy active_vcs to avoid mutation during save
-                vcs_to_save = copy.deepcopy(self.active_vcs)
-                await shared.save_multiple_vcs(vcs_to_save)
+                await self._persist_changes()
                 shared.logger.debug("State saved successfully")
             except Exception as e:
                 shared.logger.error(f"Failed to save state: {e}", exc_info=True)
                 # FIX: Re-mark as pending so next save attempt will retry
                 self._save_pending = True
 
+    async def _persist_changes(self):
+        """Write only the VCs whose row differs from what was last saved, and delete VCs that are gone.
+
+        Rows are snapshotted synchronously before the write, so in-place edits
+        made while it's in flight just show up as a difference next time.
+        """
+        rows = {vc_id: shared.vc_row(vc_id, data) for vc_id, data in self.active_vcs.items()}
+        upserts = [row for vc_id, row in rows.items() if self._saved_rows.get(vc_id) != row]
+        deleted = [vc_id for vc_id in self._saved_rows if vc_id not in rows]
+        await shared.save_vc_changes(upserts, deleted)
+        self._saved_rows = rows
+
     def get_vc_data(self, voice_id):
         return self.active_vcs.get(voice_id)
 
@@ -860,8 +871,7 @@ class VC(commands.Cog):
             if self._save_task and not self._save_task.done():
                 self._save_task.cancel()
             try:
-                vcs_to_save = copy.deepcopy(self.active_vcs)
-                await shared.save_multiple_vcs(vcs_to_save)
+                await self._persist_changes()
                 shared.logger.debug("State saved immediately")
             except Exception as e:
                 shared.logger.error(f"Immediate save failed: {e}", exc_info=True)
@@ -1310,6 +1320,7 @@ class VC(commands.Cog):
             # Clean up database and memory
             try:
                 await shared.delete_vc_data(vc_id)
+                self._saved_rows.pop(vc_id, None)
 
                 async with self._active_vcs_lock:
                     self.active_vcs.pop(vc_id, None)
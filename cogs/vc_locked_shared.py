@@ -1,11 +1,12 @@
 import discord
 from discord.ext import commands
-import aiosqlite
 import json
 import asyncio
 import logging
 import time
 
+from utils import database
+
 # --- CONSTANTS ---
 DB_FILE = "vc_data.db"
 TRIGGER_NAME = "➕ Join to create locked vc"  # Locked VCs trigger
@@ -37,7 +38,7 @@ DB_SEMAPHORE = asyncio.Semaphore(10)
 async def init_db():
     logger.info("Initializing database...")
     try:
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             await db.execute("PRAGMA journal_mode=WAL")
             await db.execute("PRAGMA busy_timeout=5000")
             
@@ -119,7 +120,7 @@ async def init_db():
 async def get_config(key, default=None):
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 async with db.execute("SELECT value FROM config WHERE key = ?", (key,)) as cursor:
                     row = await cursor.fetchone()
                     return row[0] if row else default
@@ -130,7 +131,7 @@ async def get_config(key, default=None):
 async def set_config(key, value):
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 await db.execute("INSERT OR REPLACE INTO config (key, value) VALUES (?, ?)", (key, str(value) if value is not None else None))
                 await db.commit()
     except Exception as e:
@@ -141,7 +142,7 @@ async def load_active_vcs():
     logger.info("Loading active VCs from database...")
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 async with db.execute("SELECT vc_id, owner_id, message_id, knock_mgmt_msg_id, thread_id, ghost, unlocked, bans, mute_knock_pings, guild_id, is_basic, last_seen_occupied, created_at, spectator FROM active_vcs") as cursor:
                     rows = await cursor.fetchall()
                     result = {}
@@ -193,45 +194,52 @@ async def load_active_vcs():
         logger.error(f"Failed to load active VCs: {e}")
         return {}
 
-async def save_multiple_vcs(vcs_dict):
-    logger.debug(f"Saving {len(vcs_dict)} VCs to database...")
+def vc_row(vc_id, data):
+    """The active_vcs row for one tracked VC, in save_vc_changes column order."""
+    # FIX: Validate data before saving
+    try:
+        bans = data.get('bans', [])
+        if not isinstance(bans, list):
+            bans = []
+        bans_json = json.dumps([int(b) for b in bans if isinstance(b, (int, str)) and str(b).isdigit()])
+    except (TypeError, ValueError):
+        bans_json = '[]'
+
+    return (
+        int(vc_id),
+        int(data['owner_id']),
+        int(data['message_id']) if data.get('message_id') else None,
+        int(data['knock_mgmt_msg_id']) if data.get('knock_mgmt_msg_id') else None,
+        int(data['thread_id']) if data.get('thread_id') else None,
+        int(data.get('ghost', False)),
+        int(data.get('unlocked', False)),
+        bans_json,
+        int(data.get('mute_knock_pings', False)),
+        int(data['guild_id']) if data.get('guild_id') else None,
+        int(data.get('is_basic', False)),
+        int(data.get('spectator', False))
+    )
+
+async def save_vc_changes(upserts, deleted_ids):
+    """Write changed VC rows (from vc_row) and drop rows for VCs no longer tracked, in one transaction."""
+    if not upserts and not deleted_ids:
+        return
+    logger.debug(f"Saving VC changes: {len(upserts)} upserted, {len(deleted_ids)} deleted")
     try:
-        data_list = []
-        for vc_id, data in vcs_dict.items():
-            # FIX: Validate data before saving
-            try:
-                bans = data.get('bans', [])
-                if not isinstance(bans, list):
-                    bans = []
-                bans_json = json.dumps([int(b) for b in bans if isinstance(b, (int, str)) and str(b).isdigit()])
-            except (TypeError, ValueError):
-                bans_json = '[]'
-            
-            data_list.append((
-                int(vc_id),
-                int(data['owner_id']),
-                int(data['message_id']) if data.get('message_id') else None,
-                int(data['knock_mgmt_msg_id']) if data.get('knock_mgmt_msg_id') else None,
-                int(data['thread_id']) if data.get('thread_id') else None,
-                int(data.get('ghost', False)),
-                int(data.get('unlocked', False)),
-                bans_json,
-                int(data.get('mute_knock_pings', False)),
-                int(data['guild_id']) if data.get('guild_id') else None,
-                int(data.get('is_basic', False)),
-                int(data.get('spectator', False))
-            ))
-        if not data_list:
-            return
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 # FIX: Use explicit transaction for atomicity
                 try:
                     await db.execute("BEGIN TRANSACTION")
-                    await db.executemany('''
-                        INSERT OR REPLACE INTO active_vcs (vc_id, owner_id, message_id, knock_mgmt_msg_id, thread_id, ghost, unlocked, bans, mute_knock_pings, guild_id, is_basic, spectator)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ''', data_list)
+                    if upserts:
+                        await db.executemany('''
+                            INSERT OR REPLACE INTO active_vcs (vc_id, owner_id, message_id, knock_mgmt_msg_id, thread_id, ghost, unlocked, bans, mute_knock_pings, guild_id, is_basic, spectator)
+                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ''', upserts)
+                    if deleted_ids:
+                        params = [(vc_id,) for vc_id in deleted_ids]
+                        await db.executemany("DELETE FROM active_vcs WHERE vc_id = ?", params)
+                        await db.executemany("DELETE FROM accepted_knocks WHERE vc_id = ?", params)
                     await db.commit()
                 except Exception as e:
                     await db.rollback()
@@ -244,7 +252,7 @@ async def delete_vc_data(vc_id):
     logger.debug(f"Deleting VC data for {vc_id}")
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 await db.execute("DELETE FROM active_vcs WHERE vc_id = ?", (vc_id,))
                 # FIX: Also delete accepted knocks for this VC
                 await db.execute("DELETE FROM accepted_knocks WHERE vc_id = ?", (vc_id,))
@@ -260,7 +268,7 @@ async def save_accepted_knock(vc_id, user_id):
     """Save an accepted knock to database for persistence across restarts"""
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 await db.execute('''
                     INSERT OR REPLACE INTO accepted_knocks (vc_id, user_id, accepted_at)
                     VALUES (?, ?, ?)
@@ -275,7 +283,7 @@ async def delete_accepted_knock(vc_id, user_id):
     """Delete an accepted knock from database"""
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 await db.execute("DELETE FROM accepted_knocks WHERE vc_id = ? AND user_id = ?", (vc_id, user_id))
                 await db.commit()
         logger.debug(f"Deleted accepted knock: vc_id={vc_id}, user_id={user_id}")
@@ -287,7 +295,7 @@ async def load_accepted_knocks():
     """Load all accepted knocks from database"""
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 async with db.execute("SELECT vc_id, user_id, accepted_at FROM accepted_knocks") as cursor:
                     rows = await cursor.fetchall()
                     result = {}
@@ -307,7 +315,7 @@ async def cleanup_expired_accepted_knocks(max_age_seconds=300):
     try:
         cutoff = time.time() - max_age_seconds
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 cursor = await db.execute("DELETE FROM accepted_knocks WHERE accepted_at < ?", (cutoff,))
                 deleted = cursor.rowcount
                 await db.commit()
@@ -322,7 +330,7 @@ async def cleanup_expired_accepted_knocks(max_age_seconds=300):
 async def get_user_presets(user_id):
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 async with db.execute("SELECT preset_name, data FROM presets WHERE user_id = ?", (user_id,)) as cursor:
                     rows = await cursor.fetchall()
                     result = {}
@@ -364,7 +372,7 @@ async def save_preset(user_id, preset_name, data):
         raise ValueError(f"Preset data not serializable: {e}")
     
     async with DB_SEMAPHORE:
-        async with aiosqlite.connect(DB_FILE) as db:
+        async with database.connect(DB_FILE) as db:
             async with db.execute("SELECT COUNT(*) FROM presets WHERE user_id = ?", (user_id,)) as cursor:
                 count = (await cursor.fetchone())[0]
                 if count >= 10: 
@@ -375,7 +383,7 @@ async def save_preset(user_id, preset_name, data):
 async def delete_preset(user_id, preset_name):
     try:
         async with DB_SEMAPHORE:
-            async with aiosqlite.connect(DB_FILE) as db:
+            async with database.connect(DB_FILE) as db:
                 await db.execute("DELETE FROM presets WHERE user_id = ? AND preset_name = ?", (user_id, preset_name))
                 await db.commit()
     except Exception as e:
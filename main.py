@@ -7,6 +7,10 @@ from pathlib import Path
 import logging
 
 from utils.error_reporter import ErrorReporter
+from utils.render_service import RenderService
+from utils.http_client import HttpClient
+from utils.scheduler import Scheduler
+from utils import database
 
 # --- LOGGING SETUP ---
 logger = logging.getLogger('bot_main')
@@ -44,6 +48,16 @@ class Vibey(commands.Bot):
         self.error_reporter = ErrorReporter(self, flush_interval=300)
         self.error_reporter.start()
 
+        # Shared headless Chromium for every HTML -> PNG card (launched on first render)
+        self.render_service = RenderService(max_pages=3)
+
+        # Shared keep-alive HTTP pool with per-host rate limits and conditional GET caching
+        self.http_client = HttpClient()
+
+        # Shared persistent deadline scheduler; cogs register handlers in cog_load
+        self.scheduler = Scheduler(self)
+        await self.scheduler.start()
+
         cogs_folder = "cogs"
         if not os.path.exists(cogs_folder):
             os.makedirs(cogs_folder)
@@ -70,6 +84,13 @@ class Vibey(commands.Bot):
                     except Exception as e:
                         logger.error(f"❌ Failed to load cog package {cog_name}. Error: {e}", exc_info=True)
 
+    async def close(self):
+        await super().close()
+        await self.render_service.close()
+        await self.http_client.close()
+        await self.scheduler.close()
+        await database.close_all()
+
     async def on_ready(self):
         """This is called when the bot has successfully connected to Discord."""
         logger.info("=" * 50)
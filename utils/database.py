@@ -0,0 +1,319 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional
+
+import aiosqlite
+
+logger = logging.getLogger('bot_main.database')
+
+BUSY_TIMEOUT_MS = 5000
+STATEMENT_CACHE_SIZE = 256
+SLOW_QUERY_MS = 250
+
+
+class _Query:
+    """Result of Connection.execute: awaitable for a cursor, or usable as `async with`."""
+
+    __slots__ = ('_coro', '_cursor')
+
+    def __init__(self, coro):
+        self._coro = coro
+        self._cursor = None
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    async def __aenter__(self):
+        self._cursor = await self._coro
+        return self._cursor
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self._cursor.close()
+
+
+class _Rows:
+    """A read's fully fetched result, standing in for the cursor.
+
+    Reads share one connection, and a statement left half-read would pin its
+    snapshot for every other reader, so SELECTs are drained up front.
+    """
+
+    __slots__ = ('_rows', '_pos', 'description')
+
+    def __init__(self, rows: list, description):
+        self._rows = rows
+        self._pos = 0
+        self.description = description
+
+    async def fetchone(self):
+        if self._pos >= len(self._rows):
+            return None
+        row = self._rows[self._pos]
+        self._pos += 1
+        return row
+
+    async def fetchmany(self, size: int = 1):
+        rows = self._rows[self._pos:self._pos + size]
+        self._pos += len(rows)
+        return rows
+
+    async def fetchall(self):
+        rows = self._rows[self._pos:]
+        self._pos = len(self._rows)
+        return rows
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        row = await self.fetchone()
+        if row is None:
+            raise StopAsyncIteration
+        return row
+
+    async def close(self):
+        pass
+
+
+class Connection:
+    """Handle on a file's shared connections, lent out by SQLiteDatabase.connect().
+
+    Mirrors the aiosqlite.Connection calls the cogs use.  SELECTs run on the
+    file's read connection unless the block has an open write: its first
+    write takes the writer lock, and until it commits or rolls back
+    everything (reads included) goes through the write connection, so it
+    sees its own uncommitted changes (as do nested blocks in the same task).
+    row_factory is per handle (applied to each cursor), so one cog asking
+    for aiosqlite.Row doesn't change what another block on the same file
+    gets back.
+    """
+
+    def __init__(self, database: "SQLiteDatabase"):
+        self._database = database
+        self._writing = False
+        self.row_factory = None
+
+    @property
+    def in_transaction(self) -> bool:
+        return self._writing and self._database._conn.in_transaction
+
+    async def _writer(self) -> aiosqlite.Connection:
+        if not self._writing:
+            await self._database._acquire_writer()
+            self._writing = True
+        return self._database._conn
+
+    def execute(self, sql: str, parameters=None) -> _Query:
+        return _Query(self._execute(sql, parameters))
+
+    async def _execute(self, sql: str, parameters):
+        parameters = parameters if parameters is not None else ()
+        if not self._writing and _is_read(sql) and self._database._owner is not asyncio.current_task():
+            conn = await self._database._reader()
+            started = time.perf_counter()
+            cursor = await conn.execute(sql, parameters)
+            try:
+                cursor.row_factory = self.row_factory
+                rows = _Rows(await cursor.fetchall(), cursor.description)
+            finally:
+                await cursor.close()
+            self._database._record(sql, started)
+            return rows
+        conn = await self._writer()
+        started = time.perf_counter()
+        cursor = await conn.execute(sql, parameters)
+        cursor.row_factory = self.row_factory
+        self._database._record(sql, started)
+        return cursor
+
+    async def executemany(self, sql: str, parameters):
+        conn = await self._writer()
+        started = time.perf_counter()
+        cursor = await conn.executemany(sql, parameters)
+        self._database._record(sql, started)
+        return cursor
+
+    async def executescript(self, sql_script: str):
+        conn = await self._writer()
+        started = time.perf_counter()
+        cursor = await conn.executescript(sql_script)
+        self._database._record(sql_script, started)
+        return cursor
+
+    async def commit(self):
+        if not self._writing:
+            return  # nothing written since the last commit
+        started = time.perf_counter()
+        await self._database._conn.commit()
+        self._database._record("COMMIT", started)
+        await self._release()  # let other writers in; a later write takes the lock again
+
+    async def rollback(self):
+        if self._writing:
+            await self._database._conn.rollback()
+            await self._release()
+
+    async def _release(self):
+        if self._writing:
+            self._writing = False
+            await self._database._release_writer()
+
+
+def _is_read(sql: str) -> bool:
+    return sql.lstrip()[:6].upper() == "SELECT"
+
+
+class SQLiteDatabase:
+    """Persistent WAL connections for a SQLite file, shared by every caller.
+
+    Writes go through one connection guarded by an async lock (the writer
+    queue): a connect() block takes the lock at its first write and holds it
+    until it commits, rolls back or exits, so its writes are never committed
+    or rolled back by someone else's.  Other reads run on a separate read
+    connection without waiting, which WAL lets see the last committed state
+    while a writer is busy.  A block that exits with a transaction still
+    open is rolled back, matching what closing a per-call connection used to
+    do.  Nested connect() blocks in the same task share the writer lock
+    instead of deadlocking.  sqlite3's statement cache on the long-lived
+    connections means repeated queries skip re-preparing.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[aiosqlite.Connection] = None
+        self._read_conn: Optional[aiosqlite.Connection] = None
+        self._open_lock = asyncio.Lock()
+        self._lock = asyncio.Lock()
+        self._owner: Optional[asyncio.Task] = None
+        self._depth = 0
+        # Metrics
+        self._blocks = 0
+        self._queries = 0
+        self._query_ms_total = 0.0
+        self._max_query_ms = 0.0
+        self._slow_queries = 0
+        self._wait_ms_total = 0.0
+        self._max_wait_ms = 0.0
+
+    async def _open(self, query_only: bool = False) -> aiosqlite.Connection:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = await aiosqlite.connect(
+            self.path, timeout=BUSY_TIMEOUT_MS / 1000, cached_statements=STATEMENT_CACHE_SIZE
+        )
+        await conn.execute("PRAGMA journal_mode=WAL")
+        await conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+        await conn.execute("PRAGMA synchronous=NORMAL")
+        if query_only:
+            await conn.execute("PRAGMA query_only=ON")
+        logger.info(f"Opened shared {'read' if query_only else 'write'} connection to {self.path} (WAL mode)")
+        return conn
+
+    async def _reader(self) -> aiosqlite.Connection:
+        if self._read_conn is None:
+            async with self._open_lock:
+                if self._read_conn is None:
+                    self._read_conn = await self._open(query_only=True)
+        return self._read_conn
+
+    async def _acquire_writer(self):
+        task = asyncio.current_task()
+        if self._owner is not None and self._owner is task:
+            self._depth += 1
+            return
+        queued_at = time.perf_counter()
+        await self._lock.acquire()
+        waited = (time.perf_counter() - queued_at) * 1000
+        self._wait_ms_total += waited
+        self._max_wait_ms = max(self._max_wait_ms, waited)
+        self._owner = task
+        self._depth = 1
+        try:
+            if self._conn is None:
+                self._conn = await self._open()
+        except BaseException:
+            await self._release_writer()
+            raise
+
+    async def _release_writer(self):
+        self._depth -= 1
+        if self._depth > 0:
+            return
+        try:
+            if self._conn is not None and self._conn.in_transaction:
+                await self._conn.rollback()
+        finally:
+            self._owner = None
+            self._lock.release()
+
+    @asynccontextmanager
+    async def connect(self):
+        self._blocks += 1
+        handle = Connection(self)
+        try:
+            yield handle
+        finally:
+            await handle._release()
+
+    def _record(self, sql: str, started: float):
+        elapsed = (time.perf_counter() - started) * 1000
+        self._queries += 1
+        self._query_ms_total += elapsed
+        self._max_query_ms = max(self._max_query_ms, elapsed)
+        if elapsed >= SLOW_QUERY_MS:
+            self._slow_queries += 1
+            logger.warning(f"Slow query on {os.path.basename(self.path)} ({elapsed:.0f}ms): {' '.join(sql.split())[:120]}")
+
+    async def close(self):
+        async with self._lock:
+            if self._conn is not None:
+                await self._conn.close()
+                self._conn = None
+        async with self._open_lock:
+            if self._read_conn is not None:
+                await self._read_conn.close()
+                self._read_conn = None
+
+    def stats(self) -> dict:
+        return {
+            'open': self._conn is not None or self._read_conn is not None,
+            'queries': self._queries,
+            'avg_query_ms': round(self._query_ms_total / self._queries, 2) if self._queries else 0.0,
+            'max_query_ms': round(self._max_query_ms, 1),
+            'slow_queries': self._slow_queries,
+            'avg_wait_ms': round(self._wait_ms_total / self._blocks, 2) if self._blocks else 0.0,
+            'max_wait_ms': round(self._max_wait_ms, 1),
+        }
+
+
+_databases: dict[str, SQLiteDatabase] = {}
+
+
+def get_database(path: str) -> SQLiteDatabase:
+    key = os.path.abspath(path)
+    db = _databases.get(key)
+    if db is None:
+        db = _databases[key] = SQLiteDatabase(key)
+    return db
+
+
+def connect(path: str):
+    """Borrow the shared connections for `path`; a drop-in for `async with aiosqlite.connect(path) as db`."""
+    return get_database(path).connect()
+
+
+async def close_all():
+    for db in _databases.values():
+        try:
+            await db.close()
+        except Exception as e:
+            logger.error(f"Failed to close {db.path}: {e}")
+
+
+def stats() -> dict:
+    """Per-file query counts, timings and time spent waiting for the writer lock."""
+    return {os.path.basename(path): db.stats() for path, db in _databases.items()}
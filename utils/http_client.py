@@ -0,0 +1,234 @@
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Optional, Mapping
+from urllib.parse import urlsplit
+
+import aiohttp
+from yarl import URL
+
+logger = logging.getLogger('bot_main.http_client')
+
+# Per-host request budgets: host -> (requests per second, burst)
+DEFAULT_HOST_LIMITS = {
+    "liquipedia.net": (1 / 5, 1),           # MediaWiki API ToS: 1 request / 5s
+    "api.henrikdev.xyz": (25 / 60, 3),      # free tier is 30/min; small burst keeps any 60s window under it
+    "api.pandascore.co": (1000 / 3600, 10),
+}
+
+CONDITIONAL_CACHE_MAX_ENTRIES = 256
+CONDITIONAL_CACHE_MAX_BODY = 2 * 1024 * 1024
+
+
+class TokenBucket:
+    """Async token bucket: `rate` tokens per second, holding at most `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class HttpResult:
+    """A fully read response; `from_cache` is True when served from a 304."""
+
+    __slots__ = ('status', 'headers', 'body', 'from_cache')
+
+    def __init__(self, status: int, headers: Mapping[str, str], body: bytes, from_cache: bool = False):
+        self.status = status
+        self.headers = headers
+        self.body = body
+        self.from_cache = from_cache
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def text(self, encoding: str = 'utf-8') -> str:
+        return self.body.decode(encoding, errors='replace')
+
+    def json(self):
+        return json.loads(self.body)
+
+
+class _HostStats:
+    __slots__ = ('requests', 'errors', 'not_modified', 'latency_ms_total', 'max_latency_ms', 'wait_ms_total', 'statuses')
+
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.not_modified = 0
+        self.latency_ms_total = 0.0
+        self.max_latency_ms = 0.0
+        self.wait_ms_total = 0.0
+        self.statuses: dict[int, int] = {}
+
+
+class HttpClient:
+    """Bot-wide aiohttp session with keep-alive pooling and per-host politeness.
+
+    One ClientSession (created lazily) is shared by every cog so polling loops
+    reuse warm TCP/TLS connections and cached DNS.  Requests to a host with a
+    configured budget wait on that host's token bucket first.  GETs made with
+    conditional=True remember ETag / Last-Modified and replay the cached body
+    when the server answers 304.  Latency and status counts are tracked per
+    host (see stats()).
+    """
+
+    def __init__(self, *, limit: int = 100, limit_per_host: int = 10,
+                 host_limits: Optional[dict] = None, user_agent: Optional[str] = None):
+        self._limit = limit
+        self._limit_per_host = limit_per_host
+        self._user_agent = user_agent
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._buckets: dict[str, TokenBucket] = {}
+        for host, (rate, burst) in (host_limits if host_limits is not None else DEFAULT_HOST_LIMITS).items():
+            self.set_rate_limit(host, rate, burst)
+        self._conditional: "OrderedDict[str, tuple]" = OrderedDict()  # url -> (validators, status, headers, body)
+        self._stats: dict[str, _HostStats] = {}
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self._limit,
+                limit_per_host=self._limit_per_host,
+                ttl_dns_cache=300,
+                keepalive_timeout=60,
+            )
+            headers = {"User-Agent": self._user_agent} if self._user_agent else None
+            self._session = aiohttp.ClientSession(connector=connector, headers=headers)
+        return self._session
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def set_rate_limit(self, host: str, rate: float, burst: float = 1):
+        """Allow `rate` requests per second to `host`, bursting up to `burst`."""
+        self._buckets[host.lower()] = TokenBucket(rate, burst)
+
+    def _bucket_for(self, host: str) -> Optional[TokenBucket]:
+        host = host.lower()
+        bucket = self._buckets.get(host)
+        if bucket is None and host.startswith("www."):
+            bucket = self._buckets.get(host[4:])
+        return bucket
+
+    async def fetch(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        json_body=None,
+        data=None,
+        timeout: float = 30,
+        conditional: bool = False,
+    ) -> HttpResult:
+        """Send a request and return the fully read response.
+
+        Network errors and timeouts propagate exactly as they would from
+        aiohttp, so callers keep their existing except clauses.
+        """
+        host = urlsplit(url).hostname or ""
+        stats = self._stats.setdefault(host, _HostStats())
+
+        bucket = self._bucket_for(host)
+        if bucket is not None:
+            stats.wait_ms_total += await bucket.acquire() * 1000
+
+        cache_key = None
+        cached = None
+        req_headers = dict(headers or {})
+        if conditional and method.upper() == "GET":
+            cache_key = str(URL(url).update_query(params)) if params else url
+            cached = self._conditional.get(cache_key)
+            if cached is not None:
+                validators = cached[0]
+                if validators.get("etag"):
+                    req_headers["If-None-Match"] = validators["etag"]
+                if validators.get("last_modified"):
+                    req_headers["If-Modified-Since"] = validators["last_modified"]
+
+        started = time.monotonic()
+        stats.requests += 1
+        try:
+            async with self.session.request(
+                method, url, params=params, headers=req_headers or None, json=json_body, data=data,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+            ) as resp:
+                if resp.status == 304 and cached is not None:
+                    stats.not_modified += 1
+                    self._conditional.move_to_end(cache_key)
+                    _, status, cached_headers, body = cached
+                    result = HttpResult(status, cached_headers, body, from_cache=True)
+                else:
+                    body = await resp.read()
+                    result = HttpResult(resp.status, resp.headers, body)
+        except Exception:
+            stats.errors += 1
+            raise
+        finally:
+            elapsed = (time.monotonic() - started) * 1000
+            stats.latency_ms_total += elapsed
+            stats.max_latency_ms = max(stats.max_latency_ms, elapsed)
+
+        stats.statuses[resp.status] = stats.statuses.get(resp.status, 0) + 1
+        if cache_key is not None and not result.from_cache:
+            self._remember(cache_key, result)
+        return result
+
+    def _remember(self, key: str, result: HttpResult):
+        etag = result.headers.get("ETag")
+        last_modified = result.headers.get("Last-Modified")
+        if result.status != 200 or not (etag or last_modified) or len(result.body) > CONDITIONAL_CACHE_MAX_BODY:
+            self._conditional.pop(key, None)
+            return
+        validators = {"etag": etag, "last_modified": last_modified}
+        self._conditional[key] = (validators, result.status, dict(result.headers), result.body)
+        self._conditional.move_to_end(key)
+        while len(self._conditional) > CONDITIONAL_CACHE_MAX_ENTRIES:
+            self._conditional.popitem(last=False)
+
+    async def get(self, url: str, **kwargs) -> HttpResult:
+        return await self.fetch("GET", url, **kwargs)
+
+    async def post(self, url: str, **kwargs) -> HttpResult:
+        return await self.fetch("POST", url, **kwargs)
+
+    def stats(self) -> dict:
+        """Per-host request counts, 304 hits, latency and rate-limit waits."""
+        out = {}
+        for host, s in self._stats.items():
+            out[host] = {
+                'requests': s.requests,
+                'errors': s.errors,
+                'not_modified': s.not_modified,
+                'avg_latency_ms': round(s.latency_ms_total / s.requests, 1) if s.requests else 0.0,
+                'max_latency_ms': round(s.max_latency_ms, 1),
+                'rate_limit_wait_ms': round(s.wait_ms_total, 1),
+                'statuses': dict(s.statuses),
+            }
+        return out
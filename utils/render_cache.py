@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import json
+import logging
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Set, Iterable
+
+logger = logging.getLogger('bot_main.render_cache')
+
+
+# =============================================================================
+# CONTENT-ADDRESSED RENDER CACHE
+# =============================================================================
+
+class RenderCache:
+    """On-disk PNG cache for rendered cards, keyed by a hash of (template, input data).
+
+    Because the key covers everything that goes into the HTML, a changed stat
+    simply produces a new key - stale cards can never be served.  Entries are
+    evicted least-recently-used once the directory grows past `max_bytes`.
+
+    Callers may attach tags (e.g. 'player:123', 'game:4') to an entry so the
+    files can be dropped eagerly when a match finalizes instead of waiting for
+    LRU eviction.  Tags live in memory only; entries left over from a previous
+    run are still valid and age out through the LRU.
+    """
+
+    def __init__(self, directory: Path, *, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, int]" = OrderedDict()  # key -> size, oldest first
+        self._total = 0
+        self._tags: Dict[str, Set[str]] = {}      # tag -> keys
+        self._key_tags: Dict[str, Set[str]] = {}  # key -> tags
+        self._hits = 0
+        self._misses = 0
+        self._loaded = False
+
+    @staticmethod
+    def make_key(kind: str, template: str, payload) -> Optional[str]:
+        """Hash the template and input data; None if the payload isn't serializable."""
+        try:
+            blob = json.dumps(payload, sort_keys=True, default=str)
+        except (TypeError, ValueError):
+            return None
+        h = hashlib.sha256()
+        h.update(kind.encode())
+        h.update(b'\0')
+        h.update(template.encode())
+        h.update(b'\0')
+        h.update(blob.encode())
+        return h.hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+    def _scan(self):
+        """Seed the LRU from files already on disk, oldest mtime first."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        found = []
+        for path in self.directory.glob('*.png'):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            found.append((st.st_mtime, path.stem, st.st_size))
+        found.sort()
+        for _, key, size in found:
+            self._entries[key] = size
+            self._total += size
+
+    async def _ensure_loaded(self):
+        if not self._loaded:
+            self._loaded = True
+            await asyncio.to_thread(self._scan)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        await self._ensure_loaded()
+        if key not in self._entries:
+            self._misses += 1
+            return None
+        try:
+            data = await asyncio.to_thread(self._path(key).read_bytes)
+        except OSError:
+            self._forget(key)
+            self._misses += 1
+            return None
+        if not data:
+            # An empty PNG is never a valid card; drop it so the next call re-renders
+            self._forget(key)
+            await self._unlink([key])
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return data
+
+    async def put(self, key: str, data: bytes, tags: Iterable[str] = ()):
+        await self._ensure_loaded()
+        try:
+            await asyncio.to_thread(self._path(key).write_bytes, data)
+        except OSError as e:
+            logger.warning(f"Render cache write failed: {e}")
+            return
+        self._total -= self._entries.pop(key, 0)
+        self._entries[key] = len(data)
+        self._total += len(data)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+            self._key_tags.setdefault(key, set()).add(tag)
+        await self._evict()
+
+    def _forget(self, key: str):
+        self._total -= self._entries.pop(key, 0)
+        for tag in self._key_tags.pop(key, ()):
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    async def _unlink(self, keys: Iterable[str]):
+        paths = [self._path(k) for k in keys]
+        if not paths:
+            return
+
+        def remove():
+            for path in paths:
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    logger.warning(f"Render cache delete failed for {path.name}: {e}")
+
+        await asyncio.to_thread(remove)
+
+    async def _evict(self):
+        victims = []
+        while self._total > self.max_bytes and len(self._entries) > 1:
+            key = next(iter(self._entries))
+            self._forget(key)
+            victims.append(key)
+        await self._unlink(victims)
+
+    async def invalidate(self, *tags: str):
+        """Drop every entry carrying any of `tags`."""
+        keys = set()
+        for tag in tags:
+            keys |= self._tags.get(tag, set())
+        if not keys:
+            return
+        for key in keys:
+            self._forget(key)
+        await self._unlink(keys)
+
+    def stats(self) -> dict:
+        return {
+            'entries': len(self._entries),
+            'bytes': self._total,
+            'hits': self._hits,
+            'misses': self._misses,
+        }
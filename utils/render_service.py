@@ -0,0 +1,219 @@
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from typing import Optional
+
+try:
+    from playwright.async_api import async_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+logger = logging.getLogger('bot_main.render_service')
+
+# Lanes: lower value is served first when all pages are busy
+PRIORITY_INTERACTIVE = 0   # slash commands / button presses someone is waiting on
+PRIORITY_BACKGROUND = 10   # scheduled leaderboard refreshes, auto-posted recaps
+
+LAUNCH_ARGS = ['--font-render-hinting=none', '--disable-lcd-text', '--enable-font-antialiasing']
+
+
+class _PrioritySlots:
+    """Counting semaphore that hands freed slots to the lowest-priority-value waiter first."""
+
+    def __init__(self, size: int):
+        self._free = size
+        self._waiters: list = []  # heap of (priority, seq, future)
+        self._seq = itertools.count()
+
+    async def acquire(self, priority: int):
+        if self._free > 0 and not self._waiters:
+            self._free -= 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            # The slot may have been handed over just before we were cancelled
+            if fut.done() and not fut.cancelled():
+                self.release()
+            raise
+
+    def release(self):
+        while self._waiters:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                fut.set_result(None)
+                return
+        self._free += 1
+
+
+class RenderService:
+    """Bot-wide HTML -> PNG renderer backed by a single headless Chromium.
+
+    Keeps a warm pool of pages per device scale factor so renders skip page
+    creation, serves interactive requests ahead of background ones when the
+    pool is saturated, and tracks queue depth and timings (see stats()).
+    The browser is launched lazily on the first render.
+    """
+
+    def __init__(self, *, max_pages: int = 3, page_max_uses: int = 200):
+        self.max_pages = max_pages
+        self.page_max_uses = page_max_uses
+        self.playwright = None
+        self.browser = None
+        self._launch_lock = asyncio.Lock()
+        self._slots = _PrioritySlots(max_pages)
+        self._idle_pages: dict[int, list] = {}  # scale -> [(page, uses)]
+        # Metrics
+        self._queued: dict[int, int] = {}
+        self._in_flight = 0
+        self._renders = 0
+        self._failures = 0
+        self._render_ms_total = 0.0
+        self._wait_ms_total = 0.0
+        self._max_wait_ms = 0.0
+
+    @property
+    def available(self) -> bool:
+        return PLAYWRIGHT_AVAILABLE
+
+    async def _ensure_browser(self) -> bool:
+        if not PLAYWRIGHT_AVAILABLE:
+            return False
+        if self.browser and self.browser.is_connected():
+            return True
+        async with self._launch_lock:
+            if self.browser and self.browser.is_connected():
+                return True
+            try:
+                if self.playwright is None:
+                    self.playwright = await async_playwright().start()
+                self.browser = await self.playwright.chromium.launch(args=LAUNCH_ARGS)
+                self._idle_pages.clear()
+                logger.info("Render service browser launched.")
+                return True
+            except Exception as e:
+                logger.error(f"Failed to launch render service browser: {e}")
+                return False
+
+    async def close(self):
+        for pages in self._idle_pages.values():
+            for page, _ in pages:
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        self._idle_pages.clear()
+        if self.browser:
+            await self.browser.close()
+            self.browser = None
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+
+    async def _checkout(self, scale: int):
+        pages = self._idle_pages.get(scale)
+        if pages:
+            return pages.pop()
+        page = await self.browser.new_page(device_scale_factor=scale)
+        return page, 0
+
+    async def _checkin(self, scale: int, page, uses: int, healthy: bool):
+        if healthy and uses < self.page_max_uses and not page.is_closed():
+            self._idle_pages.setdefault(scale, []).append((page, uses))
+            return
+        try:
+            await page.close()
+        except Exception:
+            pass
+
+    async def render(
+        self,
+        html: Optional[str] = None,
+        *,
+        url: Optional[str] = None,
+        width: int,
+        height: int = 500,
+        scale: int = 2,
+        wait_ms: int = 100,
+        fit_content: bool = True,
+        pad: int = 20,
+        min_height: int = 0,
+        wait_for_fonts: bool = False,
+        wait_until: Optional[str] = None,
+        priority: int = PRIORITY_INTERACTIVE,
+    ) -> Optional[bytes]:
+        """Render `html` (or navigate to `url`) and return PNG bytes.
+
+        With fit_content the viewport is resized to the document's scroll
+        height plus `pad` (never below `min_height`) before the screenshot.
+        Returns None when Playwright is unavailable; render errors propagate.
+        """
+        if not await self._ensure_browser():
+            return None
+
+        queued_at = time.monotonic()
+        self._queued[priority] = self._queued.get(priority, 0) + 1
+        try:
+            await self._slots.acquire(priority)
+        finally:
+            self._queued[priority] -= 1
+        wait_ms_taken = (time.monotonic() - queued_at) * 1000
+        self._wait_ms_total += wait_ms_taken
+        self._max_wait_ms = max(self._max_wait_ms, wait_ms_taken)
+
+        self._in_flight += 1
+        started = time.monotonic()
+        page = None
+        uses = 0
+        healthy = False
+        try:
+            page, uses = await self._checkout(scale)
+            await page.set_viewport_size({'width': width, 'height': height})
+            if url:
+                await page.goto(url)
+                if wait_until:
+                    await page.wait_for_load_state(wait_until)
+            else:
+                await page.set_content(html, wait_until=wait_until or 'load')
+            if wait_for_fonts:
+                try:
+                    await page.evaluate('() => document.fonts.ready')
+                except Exception:
+                    pass
+            if wait_ms:
+                await page.wait_for_timeout(wait_ms)
+            if fit_content:
+                body_height = await page.evaluate('document.body.scrollHeight')
+                await page.set_viewport_size({'width': width, 'height': max(body_height + pad, min_height)})
+            screenshot = await page.screenshot(type='png')
+            healthy = True
+            self._renders += 1
+            return screenshot
+        except Exception:
+            self._failures += 1
+            raise
+        finally:
+            self._render_ms_total += (time.monotonic() - started) * 1000
+            self._in_flight -= 1
+            if page is not None:
+                await self._checkin(scale, page, uses + 1, healthy)
+            self._slots.release()
+
+    def stats(self) -> dict:
+        """Snapshot of queue depth per lane, pool size and render timings."""
+        completed = self._renders + self._failures
+        return {
+            'queued': {lane: n for lane, n in self._queued.items() if n},
+            'in_flight': self._in_flight,
+            'idle_pages': sum(len(p) for p in self._idle_pages.values()),
+            'renders': self._renders,
+            'failures': self._failures,
+            'avg_render_ms': round(self._render_ms_total / completed, 1) if completed else 0.0,
+            'avg_wait_ms': round(self._wait_ms_total / completed, 1) if completed else 0.0,
+            'max_wait_ms': round(self._max_wait_ms, 1),
+        }
@@ -0,0 +1,188 @@
+import asyncio
+import heapq
+import itertools
+import json
+import logging
+import time
+from typing import Awaitable, Callable, Optional
+
+from utils import database
+
+logger = logging.getLogger('bot_main.scheduler')
+
+DB_PATH = "data/scheduler.db"
+MAX_SLEEP_SECONDS = 300  # re-check at least this often in case the wall clock jumps
+
+Handler = Callable[[str, object], Awaitable[None]]
+
+
+class Scheduler:
+    """Bot-wide persistent deadline scheduler.
+
+    Cogs register a handler for a `kind` of timer, then schedule absolute
+    deadlines (unix timestamps) under string keys.  Timers live in a heap
+    and in data/scheduler.db, so a single task sleeps until the earliest
+    one is due and pending timers survive restarts.  Rescheduling a key
+    replaces its deadline; a row is deleted once its handler has run, so a
+    crash mid-handler fires it again on the next start.  Timers whose kind
+    has no handler yet (cog not loaded) wait until one is registered.
+    """
+
+    def __init__(self, bot, path: str = DB_PATH):
+        self.bot = bot
+        self.path = path
+        self._handlers: dict[str, Handler] = {}
+        self._timers: dict[tuple, tuple] = {}  # (kind, key) -> (due, payload)
+        self._heap: list = []  # (due, seq, kind, key); stale entries are skipped
+        self._parked: dict[str, list] = {}  # kind -> heap entries that came due with no handler
+        self._seq = itertools.count()
+        self._wake = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._running: set[asyncio.Task] = set()
+        self._loaded = asyncio.Event()
+        # Metrics
+        self._fired = 0
+        self._failures = 0
+
+    async def start(self):
+        async with database.connect(self.path) as db:
+            await db.execute('''
+                CREATE TABLE IF NOT EXISTS timers (
+                    kind TEXT NOT NULL,
+                    key TEXT NOT NULL,
+                    due REAL NOT NULL,
+                    payload TEXT,
+                    PRIMARY KEY (kind, key)
+                )
+            ''')
+            await db.commit()
+            async with db.execute("SELECT kind, key, due, payload FROM timers") as cursor:
+                rows = await cursor.fetchall()
+        for kind, key, due, payload in rows:
+            try:
+                payload = json.loads(payload) if payload is not None else None
+            except (json.JSONDecodeError, TypeError):
+                logger.warning(f"Dropping unreadable payload for timer {kind}:{key}")
+                payload = None
+            self._push(kind, key, due, payload)
+        self._loaded.set()
+        logger.info(f"Scheduler loaded {len(rows)} pending timers")
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        for task in list(self._running):
+            task.cancel()
+
+    def register(self, kind: str, handler: Handler):
+        """Route due timers of `kind` to `handler(key, payload)`. Overdue ones fire right away."""
+        self._handlers[kind] = handler
+        for entry in self._parked.pop(kind, []):
+            heapq.heappush(self._heap, entry)
+        self._wake.set()
+
+    def unregister(self, kind: str):
+        self._handlers.pop(kind, None)
+
+    async def schedule(self, kind: str, key, due: float, payload=None):
+        """Fire `kind` handler for `key` at unix time `due`, replacing any existing deadline for it.
+
+        `payload` must be JSON-serialisable; it is handed back to the handler as loaded JSON.
+        """
+        key = str(key)
+        await self._loaded.wait()
+        async with database.connect(self.path) as db:
+            await db.execute(
+                "INSERT OR REPLACE INTO timers (kind, key, due, payload) VALUES (?, ?, ?, ?)",
+                (kind, key, float(due), json.dumps(payload) if payload is not None else None),
+            )
+            await db.commit()
+        self._push(kind, key, float(due), payload)
+
+    async def cancel(self, kind: str, key):
+        key = str(key)
+        await self._loaded.wait()
+        if self._timers.pop((kind, key), None) is None:
+            return
+        async with database.connect(self.path) as db:
+            await db.execute("DELETE FROM timers WHERE kind = ? AND key = ?", (kind, key))
+            await db.commit()
+
+    def due_at(self, kind: str, key) -> Optional[float]:
+        timer = self._timers.get((kind, str(key)))
+        return timer[0] if timer else None
+
+    def pending(self, kind: str) -> list[str]:
+        return [key for (k, key) in self._timers if k == kind]
+
+    def _push(self, kind: str, key: str, due: float, payload):
+        self._timers[(kind, key)] = (due, payload)
+        earliest = self._heap[0][0] if self._heap else None
+        heapq.heappush(self._heap, (due, next(self._seq), kind, key))
+        if earliest is None or due < earliest:
+            self._wake.set()
+
+    async def _run(self):
+        await self.bot.wait_until_ready()
+        while not self.bot.is_closed():
+            try:
+                self._fire_due()
+                delay = MAX_SLEEP_SECONDS
+                if self._heap:
+                    delay = min(delay, max(0.0, self._heap[0][0] - time.time()))
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), timeout=delay)
+                except asyncio.TimeoutError:
+                    pass
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"Scheduler loop error: {e}", exc_info=True)
+                await asyncio.sleep(1)
+
+    def _fire_due(self):
+        now = time.time()
+        while self._heap and self._heap[0][0] <= now:
+            entry = heapq.heappop(self._heap)
+            due, _, kind, key = entry
+            timer = self._timers.get((kind, key))
+            if timer is None or timer[0] != due:
+                continue  # cancelled or rescheduled
+            if kind not in self._handlers:
+                self._parked.setdefault(kind, []).append(entry)
+                continue
+            del self._timers[(kind, key)]
+            task = asyncio.create_task(self._dispatch(kind, key, due, timer[1]))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _dispatch(self, kind: str, key: str, due: float, payload):
+        try:
+            await self._handlers[kind](key, payload)
+            self._fired += 1
+        except asyncio.CancelledError:
+            raise  # shutting down: leave the row so it fires after restart
+        except Exception as e:
+            self._failures += 1
+            logger.error(f"Timer {kind}:{key} failed: {e}", exc_info=True)
+            await self.bot.error_reporter.report("Scheduler", f"{kind}:{key}: {e}")
+        # A handler that rescheduled its own key wrote a newer due; leave that row alone
+        async with database.connect(self.path) as db:
+            await db.execute("DELETE FROM timers WHERE kind = ? AND key = ? AND due = ?", (kind, key, due))
+            await db.commit()
+
+    def stats(self) -> dict:
+        """Pending timers per kind, time until the next one, and handler outcomes."""
+        kinds: dict[str, int] = {}
+        for kind, _ in self._timers:
+            kinds[kind] = kinds.get(kind, 0) + 1
+        next_due = min((due for due, _ in self._timers.values()), default=None)
+        return {
+            'pending': kinds,
+            'next_due_in_s': round(next_due - time.time(), 1) if next_due is not None else None,
+            'fired': self._fired,
+            'failures': self._failures,
+        }